@@ -10,29 +10,65 @@ __author__ = "Bochner"
 __email__ = ""
 __license__ = "MIT"
 
+import importlib
 import os
 import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-# Include logging module in the package exports
-from .logging_module import (  # noqa: F401 — re-exported as public package API
-    APP_LOGGER,
-    CMD_LOGGER,
-    SCP_LOGGER,
-    SSH_LOGGER,
-    format_size,
-    get_connection_logger,
-    get_logger,
-    log_file_transfer,
-    log_scp_command,
-    log_ssh_command,
-    log_ssh_connection,
-    log_tunnel_creation,
-    set_debug_mode,
-    update_transfer_stats,
+if TYPE_CHECKING:
+    from .logging_module import (  # noqa: F401 — re-exported as public package API
+        APP_LOGGER,
+        CMD_LOGGER,
+        SCP_LOGGER,
+        SSH_LOGGER,
+        format_size,
+        get_connection_logger,
+        get_logger,
+        log_file_transfer,
+        log_scp_command,
+        log_ssh_command,
+        log_ssh_connection,
+        log_tunnel_creation,
+        set_debug_mode,
+        update_transfer_stats,
+    )
+
+# Logging module exports, resolved on first access: importing logging_module
+# sets up the application loggers and their log files, which plugins and other
+# light users of the package (e.g. ``lazyssh.console_instance``) do not need.
+_LAZY_EXPORTS = frozenset(
+    {
+        "APP_LOGGER",
+        "CMD_LOGGER",
+        "SCP_LOGGER",
+        "SSH_LOGGER",
+        "format_size",
+        "get_connection_logger",
+        "get_logger",
+        "log_file_transfer",
+        "log_scp_command",
+        "log_ssh_command",
+        "log_ssh_connection",
+        "log_tunnel_creation",
+        "set_debug_mode",
+        "update_transfer_stats",
+    }
 )
 
 
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(".logging_module", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | _LAZY_EXPORTS)
+
+
 def check_dependencies() -> tuple[list[str], list[str]]:
     """
     Check for required and optional external dependencies.
@@ -40,6 +76,8 @@ def check_dependencies() -> tuple[list[str], list[str]]:
     Returns:
         A tuple of (required_missing, optional_missing) where each is a list of missing dependencies.
     """
+    from .logging_module import APP_LOGGER
+
     required_missing = []
     optional_missing = []
 
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import subprocess
 import sys
+from typing import Any
 
 import click
 from rich.prompt import Confirm
@@ -22,12 +23,26 @@ from lazyssh.console_instance import (
     display_warning,
 )
 from lazyssh.logging_module import APP_LOGGER, ensure_log_directory
-from lazyssh.plugin_manager import ensure_runtime_plugins_dir
 from lazyssh.ssh import SSHManager
 from lazyssh.ui import display_banner, display_saved_configs, display_ssh_status, display_tunnels
 
-# Initialize the SSH manager for the application
-ssh_manager = SSHManager()
+# The application's SSH manager, created on first use rather than at import
+_ssh_manager: SSHManager | None = None
+
+
+def get_ssh_manager() -> SSHManager:
+    """Return the application's SSH manager, creating it on first use."""
+    global _ssh_manager
+    if _ssh_manager is None:
+        _ssh_manager = SSHManager()
+    return _ssh_manager
+
+
+def __getattr__(name: str) -> Any:
+    # ``ssh_manager`` used to be a module global created at import time
+    if name == "ssh_manager":
+        return get_ssh_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def show_status() -> None:
@@ -46,6 +61,7 @@ def show_status() -> None:
         display_saved_configs(configs)
 
     # Display active SSH connections
+    ssh_manager = get_ssh_manager()
     if ssh_manager.connections:
         display_ssh_status(ssh_manager.connections, ssh_manager.get_current_terminal_method())
         for socket_path, conn in ssh_manager.connections.items():
@@ -56,6 +72,7 @@ def show_status() -> None:
 def close_all_connections() -> None:
     """Close all active SSH connections before exiting."""
     display_info("\nClosing all connections...")
+    ssh_manager = get_ssh_manager()
     successful_closures = 0
     total_connections = len(ssh_manager.connections)
 
@@ -84,7 +101,7 @@ def check_active_connections() -> bool:
         True if the user confirmed or there are no active connections, False otherwise.
     """
     return not (
-        ssh_manager.connections
+        get_ssh_manager().connections
         and not Confirm.ask("You have active connections. Close them and exit?")
     )
 
@@ -128,6 +145,8 @@ def main(debug: bool, config: str | None) -> None:
         initialize_config_file()
 
         # Ensure runtime plugin directory exists (best-effort)
+        from lazyssh.plugin_manager import ensure_runtime_plugins_dir
+
         ensure_runtime_plugins_dir()
 
         # Display banner
@@ -171,7 +190,7 @@ def main(debug: bool, config: str | None) -> None:
         # Start in command mode (default interface)
         if APP_LOGGER:
             APP_LOGGER.info("Starting in command mode")
-        cmd_mode = CommandMode(ssh_manager)
+        cmd_mode = CommandMode(get_ssh_manager())
         cmd_mode.run()
 
     except KeyboardInterrupt:
@@ -0,0 +1,230 @@
+"""Tab completion for command mode.
+
+Kept apart from :mod:`lazyssh.command_mode` so that prompt_toolkit is only
+imported once the interactive prompt starts.
+"""
+
+from __future__ import annotations
+
+import shlex
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.document import Document
+
+if TYPE_CHECKING:
+    from .command_mode import CommandMode
+
+
+class LazySSHCompleter(Completer):
+    """Completer for prompt_toolkit with LazySSH commands"""
+
+    def __init__(self, command_mode: CommandMode) -> None:
+        self.command_mode = command_mode
+        self._completion_handlers: dict[
+            str, Callable[[list[str], str, str], Iterable[Completion]]
+        ] = {
+            "lazyssh": self._complete_lazyssh,
+            "tunc": self._complete_tunc,
+            "tund": self._complete_tund,
+            "terminal": self._complete_terminal,
+            "open": self._complete_single_arg_connection,
+            "close": self._complete_single_arg_connection,
+            "help": self._complete_help,
+            "scp": self._complete_single_arg_connection,
+            "connect": self._complete_single_arg_config,
+            "save-config": self._complete_single_arg_connection_name,
+            "delete-config": self._complete_single_arg_config,
+            "wizard": self._complete_wizard,
+            "plugin": self._complete_plugin,
+        }
+
+    def get_completions(self, document: Document, complete_event: Any) -> Iterable[Completion]:
+        text = document.text
+        word_before_cursor = document.get_word_before_cursor()
+
+        # Split the input into words
+        try:
+            words = shlex.split(text[: document.cursor_position])
+        except ValueError:
+            words = text[: document.cursor_position].split()
+
+        if not words or (len(words) == 1 and not text.endswith(" ")):
+            # Show base commands if at start
+            for cmd in self.command_mode.commands:
+                if not word_before_cursor or cmd.startswith(word_before_cursor):
+                    yield Completion(cmd, start_position=-len(word_before_cursor))
+            return
+
+        command = words[0].lower()
+        handler = self._completion_handlers.get(command)
+        if handler:
+            yield from handler(words, text, word_before_cursor)
+
+    def _complete_lazyssh(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the lazyssh command."""
+        used_args: dict[str, int] = {}
+        expecting_value = False
+        last_arg: str | None = None
+
+        for i, word in enumerate(words[1:], 1):
+            if expecting_value and last_arg is not None:
+                used_args[last_arg] = i
+                expecting_value = False
+                last_arg = None
+            elif word.startswith("-"):
+                if word in ["-proxy", "-no-term"]:
+                    used_args[word] = i
+                else:
+                    expecting_value = True
+                    last_arg = word
+            else:
+                i += 1
+
+        all_args = {"-ip", "-port", "-user", "-socket", "-proxy", "-ssh-key", "-shell", "-no-term"}
+        remaining_args = all_args - set(used_args.keys())
+
+        required_args = ["-ip", "-port", "-user", "-socket"]
+        optional_args = ["-proxy", "-ssh-key", "-shell", "-no-term"]
+
+        required_remaining = [arg for arg in required_args if arg in remaining_args]
+        optional_remaining = [arg for arg in optional_args if arg in remaining_args]
+
+        if expecting_value:
+            return
+
+        if words[-1].startswith("-") and not text.endswith(
+            " "
+        ):  # pragma: no cover - completion path
+            partial_arg = words[-1]
+            for arg in required_remaining:
+                if arg.startswith(partial_arg):
+                    yield Completion(arg, start_position=-len(partial_arg))
+            if not required_remaining:
+                for arg in optional_remaining:
+                    if arg.startswith(partial_arg):
+                        yield Completion(arg, start_position=-len(partial_arg))
+        elif text.endswith(" ") and not expecting_value:
+            if required_remaining:
+                yield Completion(required_remaining[0], start_position=-len(word_before_cursor))
+            elif optional_remaining:
+                for arg in optional_remaining:
+                    yield Completion(arg, start_position=-len(word_before_cursor))
+
+    def _complete_tunc(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the tunc command."""
+        arg_position = len(words) - 1
+        if text.endswith(" "):
+            arg_position += 1
+
+        if arg_position == 1:
+            for conn_name in self.command_mode._get_connection_completions():
+                if not word_before_cursor or conn_name.startswith(word_before_cursor):
+                    yield Completion(conn_name, start_position=-len(word_before_cursor))
+        elif arg_position == 2:
+            for type_option in ["l", "r"]:
+                if not word_before_cursor or type_option.startswith(word_before_cursor):
+                    yield Completion(type_option, start_position=-len(word_before_cursor))
+
+    def _complete_tund(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the tund command."""
+        arg_position = len(words) - 1
+        if text.endswith(" ") or (len(words) == 2 and arg_position == 1):
+            for _socket_path, conn in self.command_mode.ssh_manager.connections.items():
+                for tunnel in conn.tunnels:
+                    if not word_before_cursor or tunnel.id.startswith(word_before_cursor):
+                        yield Completion(tunnel.id, start_position=-len(word_before_cursor))
+
+    def _complete_terminal(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the terminal command."""
+        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
+            for method in ["auto", "native", "terminator"]:
+                if not word_before_cursor or method.startswith(word_before_cursor):
+                    yield Completion(method, start_position=-len(word_before_cursor))
+
+    def _complete_single_arg_connection(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete a single argument from active connection names."""
+        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
+            for conn_name in self.command_mode._get_connection_completions():
+                if not word_before_cursor or conn_name.startswith(word_before_cursor):
+                    yield Completion(conn_name, start_position=-len(word_before_cursor))
+
+    def _complete_single_arg_connection_name(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete a single argument from established connection socket names."""
+        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
+            for connection_name in self.command_mode._get_connection_name_completions():
+                if not word_before_cursor or connection_name.startswith(word_before_cursor):
+                    yield Completion(connection_name, start_position=-len(word_before_cursor))
+
+    def _complete_single_arg_config(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete a single argument from saved configuration names."""
+        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
+            for config_name in self.command_mode._get_config_name_completions():
+                if not word_before_cursor or config_name.startswith(word_before_cursor):
+                    yield Completion(config_name, start_position=-len(word_before_cursor))
+
+    def _complete_help(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the help command."""
+        arg_position = len(words) - 1
+        if text.endswith(" ") or (len(words) == 2 and arg_position == 1):
+            for cmd in self.command_mode.commands:
+                if not word_before_cursor or cmd.startswith(word_before_cursor):
+                    yield Completion(cmd, start_position=-len(word_before_cursor))
+
+    def _complete_wizard(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the wizard command."""
+        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
+            for workflow in ["lazyssh", "tunnel"]:
+                if not word_before_cursor or workflow.startswith(word_before_cursor):
+                    yield Completion(workflow, start_position=-len(word_before_cursor))
+
+    def _complete_plugin(
+        self, words: list[str], text: str, word_before_cursor: str
+    ) -> Iterable[Completion]:
+        """Complete arguments for the plugin command."""
+        arg_position = len(words) - 1
+        if text.endswith(" "):
+            arg_position += 1
+
+        if arg_position == 1:
+            for subcmd in ["list", "run", "info", "stats", "output", "search"]:
+                if not word_before_cursor or subcmd.startswith(word_before_cursor):
+                    yield Completion(subcmd, start_position=-len(word_before_cursor))
+        elif arg_position == 2:
+            if len(words) >= 2:  # pragma: no branch - always true when arg_position==2
+                subcommand = words[1]
+                if subcommand == "stats":
+                    for conn_name in self.command_mode._get_connection_completions():
+                        if not word_before_cursor or conn_name.startswith(word_before_cursor):
+                            yield Completion(conn_name, start_position=-len(word_before_cursor))
+                elif subcommand in ["run", "info"]:
+                    plugins = self.command_mode.plugin_manager.discover_plugins()
+                    for plugin_name in plugins:
+                        if not word_before_cursor or plugin_name.startswith(
+                            word_before_cursor
+                        ):  # pragma: no branch
+                            yield Completion(plugin_name, start_position=-len(word_before_cursor))
+        elif arg_position == 3:
+            if len(words) >= 2 and words[1] == "run":
+                for conn_name in self.command_mode._get_connection_completions():
+                    if not word_before_cursor or conn_name.startswith(word_before_cursor):
+                        yield Completion(conn_name, start_position=-len(word_before_cursor))
@@ -1,18 +1,20 @@
-"""Command mode interface for LazySSH using prompt_toolkit"""
+"""Command mode interface for LazySSH using prompt_toolkit
 
+prompt_toolkit, SCP mode and the plugin manager are imported on first use so
+that starting LazySSH does not pay for subsystems a session may never touch.
+"""
+
+from __future__ import annotations
+
+import importlib
 import shlex
 import subprocess
 import sys
-from collections.abc import Callable, Iterable
+import time
+from collections.abc import Callable
+from functools import cached_property
 from pathlib import Path
-from typing import Any
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.completion import Completer, Completion
-from prompt_toolkit.document import Document
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.styles import Style
+from typing import TYPE_CHECKING, Any
 
 from . import console_instance as console_instance
 from . import logging_module
@@ -34,8 +36,6 @@ from .logging_module import (  # noqa: F401 — plugin use
     set_debug_mode,
 )
 from .models import SSHConnection
-from .plugin_manager import PluginManager
-from .scp_mode import SCPMode
 from .ssh import SSHManager
 from .ui import (
     display_saved_configs,
@@ -43,214 +43,26 @@ from .ui import (
     display_tunnels,
 )
 
+if TYPE_CHECKING:
+    from prompt_toolkit.formatted_text import HTML
 
-class LazySSHCompleter(Completer):
-    """Completer for prompt_toolkit with LazySSH commands"""
-
-    def __init__(self, command_mode: "CommandMode") -> None:
-        self.command_mode = command_mode
-        self._completion_handlers: dict[
-            str, Callable[[list[str], str, str], Iterable[Completion]]
-        ] = {
-            "lazyssh": self._complete_lazyssh,
-            "tunc": self._complete_tunc,
-            "tund": self._complete_tund,
-            "terminal": self._complete_terminal,
-            "open": self._complete_single_arg_connection,
-            "close": self._complete_single_arg_connection,
-            "help": self._complete_help,
-            "scp": self._complete_single_arg_connection,
-            "connect": self._complete_single_arg_config,
-            "save-config": self._complete_single_arg_connection_name,
-            "delete-config": self._complete_single_arg_config,
-            "wizard": self._complete_wizard,
-            "plugin": self._complete_plugin,
-        }
+    from .command_completer import LazySSHCompleter  # noqa: F401 — lazily re-exported
+    from .plugin_manager import PluginManager
+    from .plugin_output import PluginOutput
 
-    def get_completions(self, document: Document, complete_event: Any) -> Iterable[Completion]:
-        text = document.text
-        word_before_cursor = document.get_word_before_cursor()
+# Seconds of plugin output coalesced per terminal write in `plugin run`
+PLUGIN_OUTPUT_FLUSH_INTERVAL = 0.05
+# Limit for `plugin run` unless the plugin declares PLUGIN_NO_TIMEOUT
+PLUGIN_RUN_TIMEOUT = 300
+# Lines shown per `plugin output` page and at most per `plugin search`
+PLUGIN_OUTPUT_PAGE_LINES = 100
 
-        # Split the input into words
-        try:
-            words = shlex.split(text[: document.cursor_position])
-        except ValueError:
-            words = text[: document.cursor_position].split()
-
-        if not words or (len(words) == 1 and not text.endswith(" ")):
-            # Show base commands if at start
-            for cmd in self.command_mode.commands:
-                if not word_before_cursor or cmd.startswith(word_before_cursor):
-                    yield Completion(cmd, start_position=-len(word_before_cursor))
-            return
 
-        command = words[0].lower()
-        handler = self._completion_handlers.get(command)
-        if handler:
-            yield from handler(words, text, word_before_cursor)
-
-    def _complete_lazyssh(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the lazyssh command."""
-        used_args: dict[str, int] = {}
-        expecting_value = False
-        last_arg: str | None = None
-
-        for i, word in enumerate(words[1:], 1):
-            if expecting_value and last_arg is not None:
-                used_args[last_arg] = i
-                expecting_value = False
-                last_arg = None
-            elif word.startswith("-"):
-                if word in ["-proxy", "-no-term"]:
-                    used_args[word] = i
-                else:
-                    expecting_value = True
-                    last_arg = word
-            else:
-                i += 1
-
-        all_args = {"-ip", "-port", "-user", "-socket", "-proxy", "-ssh-key", "-shell", "-no-term"}
-        remaining_args = all_args - set(used_args.keys())
-
-        required_args = ["-ip", "-port", "-user", "-socket"]
-        optional_args = ["-proxy", "-ssh-key", "-shell", "-no-term"]
-
-        required_remaining = [arg for arg in required_args if arg in remaining_args]
-        optional_remaining = [arg for arg in optional_args if arg in remaining_args]
-
-        if expecting_value:
-            return
-
-        if words[-1].startswith("-") and not text.endswith(
-            " "
-        ):  # pragma: no cover - completion path
-            partial_arg = words[-1]
-            for arg in required_remaining:
-                if arg.startswith(partial_arg):
-                    yield Completion(arg, start_position=-len(partial_arg))
-            if not required_remaining:
-                for arg in optional_remaining:
-                    if arg.startswith(partial_arg):
-                        yield Completion(arg, start_position=-len(partial_arg))
-        elif text.endswith(" ") and not expecting_value:
-            if required_remaining:
-                yield Completion(required_remaining[0], start_position=-len(word_before_cursor))
-            elif optional_remaining:
-                for arg in optional_remaining:
-                    yield Completion(arg, start_position=-len(word_before_cursor))
-
-    def _complete_tunc(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the tunc command."""
-        arg_position = len(words) - 1
-        if text.endswith(" "):
-            arg_position += 1
-
-        if arg_position == 1:
-            for conn_name in self.command_mode._get_connection_completions():
-                if not word_before_cursor or conn_name.startswith(word_before_cursor):
-                    yield Completion(conn_name, start_position=-len(word_before_cursor))
-        elif arg_position == 2:
-            for type_option in ["l", "r"]:
-                if not word_before_cursor or type_option.startswith(word_before_cursor):
-                    yield Completion(type_option, start_position=-len(word_before_cursor))
-
-    def _complete_tund(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the tund command."""
-        arg_position = len(words) - 1
-        if text.endswith(" ") or (len(words) == 2 and arg_position == 1):
-            for _socket_path, conn in self.command_mode.ssh_manager.connections.items():
-                for tunnel in conn.tunnels:
-                    if not word_before_cursor or tunnel.id.startswith(word_before_cursor):
-                        yield Completion(tunnel.id, start_position=-len(word_before_cursor))
-
-    def _complete_terminal(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the terminal command."""
-        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
-            for method in ["auto", "native", "terminator"]:
-                if not word_before_cursor or method.startswith(word_before_cursor):
-                    yield Completion(method, start_position=-len(word_before_cursor))
-
-    def _complete_single_arg_connection(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete a single argument from active connection names."""
-        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
-            for conn_name in self.command_mode._get_connection_completions():
-                if not word_before_cursor or conn_name.startswith(word_before_cursor):
-                    yield Completion(conn_name, start_position=-len(word_before_cursor))
-
-    def _complete_single_arg_connection_name(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete a single argument from established connection socket names."""
-        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
-            for connection_name in self.command_mode._get_connection_name_completions():
-                if not word_before_cursor or connection_name.startswith(word_before_cursor):
-                    yield Completion(connection_name, start_position=-len(word_before_cursor))
-
-    def _complete_single_arg_config(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete a single argument from saved configuration names."""
-        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
-            for config_name in self.command_mode._get_config_name_completions():
-                if not word_before_cursor or config_name.startswith(word_before_cursor):
-                    yield Completion(config_name, start_position=-len(word_before_cursor))
-
-    def _complete_help(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the help command."""
-        arg_position = len(words) - 1
-        if text.endswith(" ") or (len(words) == 2 and arg_position == 1):
-            for cmd in self.command_mode.commands:
-                if not word_before_cursor or cmd.startswith(word_before_cursor):
-                    yield Completion(cmd, start_position=-len(word_before_cursor))
-
-    def _complete_wizard(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the wizard command."""
-        if (len(words) == 1 and text.endswith(" ")) or (len(words) == 2 and not text.endswith(" ")):
-            for workflow in ["lazyssh", "tunnel"]:
-                if not word_before_cursor or workflow.startswith(word_before_cursor):
-                    yield Completion(workflow, start_position=-len(word_before_cursor))
-
-    def _complete_plugin(
-        self, words: list[str], text: str, word_before_cursor: str
-    ) -> Iterable[Completion]:
-        """Complete arguments for the plugin command."""
-        arg_position = len(words) - 1
-        if text.endswith(" "):
-            arg_position += 1
-
-        if arg_position == 1:
-            for subcmd in ["list", "run", "info"]:
-                if not word_before_cursor or subcmd.startswith(word_before_cursor):
-                    yield Completion(subcmd, start_position=-len(word_before_cursor))
-        elif arg_position == 2:
-            if len(words) >= 2:  # pragma: no branch - always true when arg_position==2
-                subcommand = words[1]
-                if subcommand in ["run", "info"]:
-                    plugins = self.command_mode.plugin_manager.discover_plugins()
-                    for plugin_name in plugins:
-                        if not word_before_cursor or plugin_name.startswith(
-                            word_before_cursor
-                        ):  # pragma: no branch
-                            yield Completion(plugin_name, start_position=-len(word_before_cursor))
-        elif arg_position == 3:
-            if len(words) >= 2 and words[1] == "run":
-                for conn_name in self.command_mode._get_connection_completions():
-                    if not word_before_cursor or conn_name.startswith(word_before_cursor):
-                        yield Completion(conn_name, start_position=-len(word_before_cursor))
+def __getattr__(name: str) -> Any:
+    # LazySSHCompleter moved to lazyssh.command_completer; keep the old import path
+    if name == "LazySSHCompleter":
+        return importlib.import_module(".command_completer", __package__).LazySSHCompleter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class CommandMode:
@@ -259,9 +71,6 @@ class CommandMode:
         # Initialize the SSH Manager
         self.ssh_manager = ssh_manager
 
-        # Initialize the Plugin Manager
-        self.plugin_manager = PluginManager()
-
         # Define available commands
         self.commands = {
             "config": self.cmd_config,  # Display saved configurations
@@ -294,10 +103,22 @@ class CommandMode:
             self.history_dir.chmod(0o700)
         self.history_file = self.history_dir / "command_history"
 
+        # Output of the last `plugin run`, for `plugin output` and `plugin search`
+        self.last_plugin_output: PluginOutput | None = None
+
         # Log initialization
         if CMD_LOGGER:
             CMD_LOGGER.debug("CommandMode initialized")
 
+    @cached_property
+    def plugin_manager(self) -> PluginManager:
+        """Plugin manager, created when a plugin command or completion first needs it"""
+        from .plugin_manager import PluginManager
+
+        plugin_manager = PluginManager()
+        plugin_manager.connections_provider = lambda: list(self.ssh_manager.connections.values())
+        return plugin_manager
+
     def _get_connection_completions(self) -> list[str]:
         """Get list of connection names for completion"""
         conn_completions = []
@@ -322,6 +143,8 @@ class CommandMode:
 
     def get_prompt_text(self) -> HTML:
         """Get the prompt text with HTML formatting"""
+        from prompt_toolkit.formatted_text import HTML
+
         return HTML("<prompt>lazyssh></prompt> ")
 
     def show_status(self) -> None:
@@ -343,6 +166,12 @@ class CommandMode:
 
     def run(self) -> str | None:  # pragma: no cover - interactive loop
         """Run the command mode interface"""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.styles import Style
+
+        from .command_completer import LazySSHCompleter
+
         # Create the session
         try:
             session: PromptSession = PromptSession(
@@ -1026,6 +855,15 @@ class CommandMode:
         display_info(
             "  [highlight]plugin info[/highlight] [number]<name>[/number]           - Show plugin details"
         )
+        display_info(
+            "  [highlight]plugin stats[/highlight] [[number]<socket>[/number]]        - Show plugin run metrics"
+        )
+        display_info(
+            "  [highlight]plugin output[/highlight] [[number]<line>[/number]]        - Page through the last plugin output"
+        )
+        display_info(
+            "  [highlight]plugin search[/highlight] [number]<text>[/number]         - Search the last plugin output"
+        )
 
         display_info("[dim]Examples:[/dim]")
         display_info("  [success]plugin list[/success]")
@@ -1263,6 +1101,9 @@ class CommandMode:
         display_info(
             "  [highlight]info[/highlight] [number]<name>[/number]          - Display detailed plugin information"
         )
+        display_info(
+            "  [highlight]stats[/highlight] [[number]<socket>[/number]]      - Show p50/p95 run timings and resource use"
+        )
         display_info("\n[header]Description:[/header]")
         display_info("  Plugins extend LazySSH functionality by allowing you to run custom")
         display_info("  Python or shell scripts through established SSH connections.")
@@ -1459,6 +1300,8 @@ class CommandMode:
 
         # Start SCP mode
         console.print("\n[header]Entering SCP mode...[/header]")
+        from .scp_mode import SCPMode
+
         scp_mode = SCPMode(self.ssh_manager, selected_connection)
         scp_mode.run()
         console.print("\n[success]Exited SCP mode[/success]")
@@ -1844,8 +1687,22 @@ class CommandMode:
                 return False
             plugin_name = args[1]
             return self._plugin_info(plugin_name)
+        if subcommand == "stats":
+            return self._plugin_stats(args[1] if len(args) > 1 else None)
+        if subcommand == "output":
+            if len(args) > 1 and not args[1].isdigit():
+                display_error("Usage: plugin output [start_line]")
+                return False
+            return self._plugin_output(int(args[1]) if len(args) > 1 else 1)
+        if subcommand == "search":
+            if len(args) < 2:
+                display_error("Usage: plugin search <text>")
+                return False
+            return self._plugin_search(" ".join(args[1:]))
         display_error(f"Unknown plugin subcommand: {subcommand}")  # pragma: no cover
-        display_info("Available subcommands: list, run, info")  # pragma: no cover
+        display_info(  # pragma: no cover
+            "Available subcommands: list, run, info, stats, output, search"
+        )
         return False  # pragma: no cover
 
     def _plugin_list(self) -> bool:
@@ -1874,6 +1731,77 @@ class CommandMode:
         ui.display_plugin_info(plugin)
         return True
 
+    def _plugin_stats(self, socket_name: str | None = None) -> bool:
+        """Show p50/p95 run metrics per plugin from the connection history files
+
+        Args:
+            socket_name: Connection to report on; all active connections when omitted
+
+        Returns:
+            True when any history was found, False otherwise
+        """
+        from .plugin_metrics import load_history, summarize
+
+        if socket_name:
+            connection_names = [socket_name]
+            scope = socket_name
+        else:
+            connection_names = [Path(path).name for path in self.ssh_manager.connections]
+            scope = "all connections"
+
+        runs = [run for name in connection_names for run in load_history(name)]
+        if not runs:
+            display_info(f"No plugin runs recorded for {scope}")
+            return False
+
+        ui.display_plugin_stats(summarize(runs), scope)
+        return True
+
+    def _last_output(self) -> PluginOutput | None:
+        """Output of the last `plugin run`, or None after telling the user there is none"""
+        if self.last_plugin_output is None:
+            display_info("No plugin output yet. Run a plugin with 'plugin run' first")
+        return self.last_plugin_output
+
+    def _plugin_output(self, start: int = 1) -> bool:
+        """Page through the full output of the last plugin run
+
+        Args:
+            start: First line to show (1-based)
+
+        Returns:
+            True when lines were shown, False otherwise
+        """
+        output = self._last_output()
+        if output is None:
+            return False
+        first = max(start, 1)
+        lines = output.page(first - 1, PLUGIN_OUTPUT_PAGE_LINES)
+        if not lines:
+            display_info(f"The last plugin output has fewer than {first} lines")
+            return False
+        ui.display_plugin_output_lines(enumerate(lines, start=first))
+        display_info(f"Next page: plugin output {first + len(lines)}")
+        return True
+
+    def _plugin_search(self, text: str) -> bool:
+        """Search the full output of the last plugin run for ``text``
+
+        Returns:
+            True when any line matched, False otherwise
+        """
+        output = self._last_output()
+        if output is None:
+            return False
+        matches = output.search(text, max_results=PLUGIN_OUTPUT_PAGE_LINES)
+        if not matches:
+            display_info(f"No lines match '{text}'")
+            return False
+        ui.display_plugin_output_lines(matches)
+        if len(matches) == PLUGIN_OUTPUT_PAGE_LINES:
+            display_info(f"Showing the first {PLUGIN_OUTPUT_PAGE_LINES} matches")
+        return True
+
     def _plugin_run(
         self,
         plugin_name: str,
@@ -1916,16 +1844,57 @@ class CommandMode:
             display_info("Run 'plugin list' to see available plugins")
             return False
 
-        # Execute plugin
+        # Execute plugin, showing its output live
         display_info(f"Executing plugin '{plugin_name}' on connection '{socket_name}'...")
         console.print()
 
-        success, output, execution_time = self.plugin_manager.execute_plugin(
-            plugin_name, connection, args=plugin_args
-        )
+        started = False
+        at_line_start = True
+
+        def show_chunk(chunk: tuple[str, str]) -> None:
+            nonlocal started, at_line_start
+            if not started:
+                ui.display_plugin_output_start()
+                started = True
+            ui.display_plugin_output_chunk(chunk[1])
+            at_line_start = chunk[1].endswith("\n")
+
+        def close_output(execution_time: float, success: bool) -> None:
+            if not at_line_start:
+                ui.display_plugin_output_chunk("\n")
+            ui.display_plugin_output_end(execution_time, success, output_shown=started)
 
-        # Display output
-        ui.display_plugin_output(output, execution_time, success)
+        start_time = time.time()
+        try:
+            # Raw chunks keep partial lines and progress bars live; coalescing
+            # bounds terminal writes for chatty plugins
+            success, output, execution_time = self.plugin_manager.execute_plugin_live(
+                plugin_name,
+                connection,
+                args=plugin_args,
+                on_chunk=show_chunk,
+                timeout=None if getattr(plugin, "no_timeout", False) else PLUGIN_RUN_TIMEOUT,
+                chunked=True,
+                flush_interval=PLUGIN_OUTPUT_FLUSH_INTERVAL,
+            )
+        except KeyboardInterrupt:
+            # The plugin has finished its own cleanup; stay in command mode
+            close_output(time.time() - start_time, False)
+            display_warning(f"Plugin '{plugin_name}' interrupted")
+            return False
+
+        close_output(execution_time, success)
+        from .plugin_output import PluginOutput
+
+        self.last_plugin_output = (
+            output if isinstance(output, PluginOutput) else PluginOutput(output)
+        )
+        log_path = getattr(output, "log_path", None)
+        if log_path is not None:
+            display_info(
+                f"Full output ({getattr(output, 'total_chars', len(output))} characters) "
+                f"saved to {log_path}"
+            )
 
         if success:
             display_success(f"Plugin '{plugin_name}' completed successfully")
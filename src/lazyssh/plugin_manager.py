@@ -1,22 +1,53 @@
 """Plugin manager for LazySSH - Discover, validate and execute plugins"""
 
+import atexit
+import codecs
 import contextlib
+import importlib.util
+import io
+import json
+import math
 import os
+import queue
+import re
+import resource
 import select
 import shutil
+import signal
 import stat
 import subprocess
 import sys
+import tempfile
+import threading
 import time
-from collections.abc import Callable, Iterator
-from dataclasses import dataclass
+import traceback
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
 
-from .logging_module import APP_LOGGER
+from .logging_module import APP_LOGGER, CONNECTION_LOG_DIR_TEMPLATE
 from .models import SSHConnection
+from .plugin_metrics import (
+    METRICS_FILE_ENV,
+    PluginRunMetrics,
+    append_history,
+    count_remote_commands,
+    rusage_to_dict,
+)
+from .plugin_output import OutputCapture, capture_limit_from_env
+
+if TYPE_CHECKING:
+    # Only needed once a plugin runs; imported there to keep startup light
+    from .plugin_zygote import PluginZygote, ZygoteProcess
 
 RUNTIME_PLUGINS_DIR = Path("/tmp/lazyssh/plugins")  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
 
+# Comma/colon-separated plugin file paths allowed to run in-process outside the packaged dir
+TRUSTED_PLUGINS_ENV = "LAZYSSH_TRUSTED_PLUGINS"
+# Seconds a plugin gets after Ctrl-C to run its own cancellation before it is killed
+PLUGIN_INTERRUPT_GRACE = 10
+
 
 def ensure_runtime_plugins_dir() -> None:
     """Ensure the runtime plugins directory exists with 0700 permissions.
@@ -46,6 +77,338 @@ class PluginMetadata:
     is_valid: bool
     validation_errors: list[str]
     validation_warnings: list[str]
+    in_process: bool = False  # declares a main(context) entry point via PLUGIN_INPROCESS
+    no_timeout: bool = False  # enforces its own timeouts, declared via PLUGIN_NO_TIMEOUT
+
+
+@dataclass
+class PluginContext:
+    """Connection context handed directly to an in-process plugin's ``main(context)``.
+
+    ``env`` holds the same ``LAZYSSH_*`` variables a subprocess plugin would
+    receive, but the process environment is left untouched. Plugins should
+    write through ``stdout``/``stderr`` so output is captured and streamed
+    exactly like subprocess output.
+    """
+
+    plugin_name: str
+    connection: SSHConnection
+    env: dict[str, str]
+    args: list[str] = field(default_factory=list)
+    stdout: TextIO | io.TextIOBase = field(default_factory=io.StringIO)
+    stderr: TextIO | io.TextIOBase = field(default_factory=io.StringIO)
+
+
+# Byte-chunk streaming: pipes are read with os.read on non-blocking fds so a
+# partial line never stalls the reader, and every read drains up to a full chunk.
+STREAM_CHUNK_SIZE = 64 * 1024
+# Upper bound on decoded text held back per stream (partial lines, coalesced chunks)
+STREAM_MAX_BUFFER = 1024 * 1024
+
+
+class _QueueWriter(io.TextIOBase):
+    """Text stream that forwards every write to a queue tagged with its stream kind."""
+
+    def __init__(self, kind: str, sink: "queue.Queue[tuple[str, str] | None]") -> None:
+        super().__init__()
+        self._kind = kind
+        self._sink = sink
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            self._sink.put((self._kind, data))
+        return len(data)
+
+
+class _InProcessRun:
+    """Runs an in-process plugin entry point on a daemon worker thread.
+
+    Threads cannot be killed, so a run abandoned after its timeout is orphaned:
+    the entry point keeps running with full access to the LazySSH process until
+    it returns, and its further output goes to a queue nobody reads.
+    """
+
+    def __init__(self, entry: Callable[[PluginContext], Any], context: PluginContext) -> None:
+        self.chunks: queue.Queue[tuple[str, str] | None] = queue.Queue()
+        self.returncode: int | None = None
+        # CPU time of the worker thread; peak RSS is necessarily the whole process
+        self.rusage: dict[str, float] | None = None
+        context.stdout = _QueueWriter("stdout", self.chunks)
+        context.stderr = _QueueWriter("stderr", self.chunks)
+        self._entry = entry
+        self._context = context
+        self._thread = threading.Thread(
+            target=self._run, name=f"lazyssh-plugin-{context.plugin_name}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        rc = 1
+        scope = getattr(resource, "RUSAGE_THREAD", resource.RUSAGE_SELF)
+        before = resource.getrusage(scope)
+        try:
+            result = self._entry(self._context)
+            rc = result if isinstance(result, int) else 0
+        except SystemExit as exc:
+            code = exc.code
+            rc = code if isinstance(code, int) else (0 if code is None else 1)
+        except Exception:  # plugin code is arbitrary; report any failure as stderr output
+            self._context.stderr.write(traceback.format_exc())
+        finally:
+            after = resource.getrusage(scope)
+            self.rusage = {
+                "user_cpu": after.ru_utime - before.ru_utime,
+                "system_cpu": after.ru_stime - before.ru_stime,
+                "peak_rss_kb": rusage_to_dict(resource.getrusage(resource.RUSAGE_SELF))[
+                    "peak_rss_kb"
+                ],
+            }
+            self.returncode = rc
+            self.chunks.put(None)
+
+    def iter_chunks(
+        self,
+        deadline: float,
+        *,
+        lines: bool = False,
+        flush_interval: float | None = None,
+        max_buffer: int = STREAM_MAX_BUFFER,
+    ) -> Iterator[tuple[str, str]]:
+        """Yield output until the plugin finishes or the deadline passes.
+
+        Each write is yielded as one chunk, or framed into lines with
+        ``lines=True``; ``flush_interval`` coalesces output exactly like
+        :func:`iter_process_output`.
+
+        Raises TimeoutError when the deadline passes first; the worker thread
+        cannot be interrupted and is left to finish on its own.
+        """
+        decoders = {
+            kind: _StreamDecoder(kind, lines=lines, max_buffer=max_buffer)
+            for kind in ("stdout", "stderr")
+        }
+        last_flush = time.monotonic()
+        finished = False
+        while not finished:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise TimeoutError
+            wait = min(0.2, remaining)
+            if flush_interval is not None and any(d.ready for d in decoders.values()):
+                wait = min(wait, max(0.0, last_flush + flush_interval - time.monotonic()))
+            try:
+                item = self.chunks.get(timeout=wait)
+            except queue.Empty:
+                pass
+            else:
+                if item is None:
+                    finished = True
+                    for decoder in decoders.values():
+                        decoder.feed_text("", final=True)
+                else:
+                    decoders[item[0]].feed_text(item[1])
+
+            if (
+                flush_interval is not None
+                and not finished
+                and time.monotonic() - last_flush < flush_interval
+                and all(d.ready_size < max_buffer for d in decoders.values())
+            ):
+                continue
+            last_flush = time.monotonic()
+            for decoder in decoders.values():
+                for text in decoder.take(coalesce=flush_interval is not None):
+                    yield decoder.kind, text
+
+
+class _AccountedPopen:
+    """Wraps a Popen and reaps it with ``os.wait4`` so the child's rusage is kept.
+
+    Provides the same ``stdout``/``stderr``/``poll``/``wait``/``kill`` surface
+    the plugin manager uses on Popen objects, plus ``rusage``.
+    """
+
+    def __init__(self, process: "subprocess.Popen[bytes]") -> None:
+        self._process = process
+        self.args = process.args
+        self.pid = process.pid
+        self.stdout = process.stdout
+        self.stderr = process.stderr
+        self.rusage: dict[str, float] | None = None
+
+    @property
+    def returncode(self) -> int | None:
+        return self._process.returncode
+
+    def _reap(self, options: int) -> int | None:
+        if self._process.returncode is not None:
+            return self._process.returncode
+        try:
+            pid, status, usage = os.wait4(self.pid, options)
+        except ChildProcessError:  # pragma: no cover - reaped elsewhere; no rusage then
+            return self._process.poll()
+        if pid == 0:
+            return None
+        self._process.returncode = os.waitstatus_to_exitcode(status)
+        self.rusage = rusage_to_dict(usage)
+        return self._process.returncode
+
+    def poll(self) -> int | None:
+        return self._reap(os.WNOHANG)
+
+    def wait(self, timeout: float | None = None) -> int:
+        if timeout is None:
+            rc = self._reap(0)
+            return rc if rc is not None else 1
+        deadline = time.monotonic() + timeout
+        while (rc := self.poll()) is None:
+            if time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.01)
+        return rc
+
+    def kill(self) -> None:
+        if self._process.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(self.pid, signal.SIGKILL)
+
+
+class _StreamDecoder:
+    """Incrementally decodes one pipe and frames it into lines or chunks."""
+
+    def __init__(self, kind: str, *, lines: bool, max_buffer: int) -> None:
+        self.kind = kind
+        self._lines = lines
+        self._max_buffer = max_buffer
+        # Same newline translation as text-mode pipes, but never fails on bad bytes
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+        )
+        self._partial = ""
+        self.ready: list[str] = []
+        self.ready_size = 0
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        self.feed_text(self._decoder.decode(data, final), final)
+
+    def feed_text(self, text: str, final: bool = False) -> None:
+        """Frame already decoded text, e.g. writes from an in-process plugin."""
+        if self._lines:
+            text = self._partial + text
+            cut = len(text) if final else text.rfind("\n") + 1
+            # Emit an over-long partial line rather than buffering without bound
+            if not final and len(text) - cut >= self._max_buffer:
+                cut = len(text)
+            self._partial = text[cut:]
+            for line in text[:cut].splitlines(keepends=True):
+                self._push(line)
+        elif text:
+            self._push(text)
+
+    def _push(self, text: str) -> None:
+        self.ready.append(text)
+        self.ready_size += len(text)
+
+    def take(self, coalesce: bool) -> list[str]:
+        """Return and clear the ready text, joined into one chunk when coalescing."""
+        ready, self.ready, self.ready_size = self.ready, [], 0
+        if coalesce and len(ready) > 1:
+            return ["".join(ready)]
+        return ready
+
+
+def iter_process_output(
+    process: "_AccountedPopen | ZygoteProcess | subprocess.Popen[bytes]",
+    deadline: float,
+    *,
+    lines: bool = False,
+    flush_interval: float | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    max_buffer: int = STREAM_MAX_BUFFER,
+    byte_counts: dict[str, int] | None = None,
+) -> Iterator[tuple[str, str]]:
+    """Yield ("stdout"|"stderr", text) from a binary-piped process until it finishes.
+
+    Reads are non-blocking ``os.read`` calls of up to ``chunk_size`` bytes,
+    decoded incrementally as UTF-8 (invalid bytes are replaced). With
+    ``lines=True`` text is framed into lines; otherwise each read is yielded
+    as one chunk. ``flush_interval`` coalesces output and yields at most once
+    per stream per interval, or sooner once ``max_buffer`` characters are
+    pending. Nothing is read while the consumer is busy, so a slow consumer
+    applies back-pressure to the plugin through the pipe instead of growing
+    memory here. Raw bytes read per stream are added to ``byte_counts``.
+
+    Raises:
+        TimeoutError: If ``deadline`` (a ``time.time()`` value) passes first.
+    """
+    if process.stdout is None or process.stderr is None:
+        raise RuntimeError("subprocess pipes not available")  # pragma: no cover
+
+    streams: dict[int, _StreamDecoder] = {}
+    for kind, pipe in (("stdout", process.stdout), ("stderr", process.stderr)):
+        fd = pipe.fileno()
+        os.set_blocking(fd, False)
+        streams[fd] = _StreamDecoder(kind, lines=lines, max_buffer=max_buffer)
+    decoders = list(streams.values())
+    last_flush = time.monotonic()
+
+    def drain(force: bool) -> Iterator[tuple[str, str]]:
+        nonlocal last_flush
+        if flush_interval is not None and not force:
+            due = time.monotonic() - last_flush >= flush_interval
+            if not due and all(d.ready_size < max_buffer for d in decoders):
+                return
+        last_flush = time.monotonic()
+        for decoder in decoders:
+            for text in decoder.take(coalesce=flush_interval is not None):
+                yield decoder.kind, text
+
+    while streams:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError
+        wait = min(0.2, remaining)
+        if flush_interval is not None and any(d.ready for d in decoders):
+            wait = min(wait, max(0.0, last_flush + flush_interval - time.monotonic()))
+
+        rlist, _, _ = select.select(list(streams), [], [], wait)
+        for fd in rlist:
+            try:
+                data = os.read(fd, chunk_size)
+            except BlockingIOError:  # pragma: no cover - spurious wakeup
+                continue
+            if data:
+                if byte_counts is not None:
+                    kind = streams[fd].kind
+                    byte_counts[kind] = byte_counts.get(kind, 0) + len(data)
+                streams[fd].feed(data)
+            else:
+                streams.pop(fd).feed(b"", final=True)
+
+        # A background child may keep a pipe open after the plugin exits
+        if not rlist and process.poll() is not None:
+            for decoder in streams.values():
+                decoder.feed(b"", final=True)
+            streams.clear()
+
+        yield from drain(force=not streams)
+
+    try:
+        process.wait(timeout=max(0.0, deadline - time.time()))
+    except subprocess.TimeoutExpired as exc:  # pragma: no cover - plugin closed its pipes early
+        raise TimeoutError from exc
+
+
+def _close_pipes(process: "_AccountedPopen | ZygoteProcess") -> None:
+    for pipe in (process.stdout, process.stderr):
+        if pipe is not None:
+            with contextlib.suppress(OSError):
+                pipe.close()
 
 
 class PluginManager:
@@ -64,6 +427,27 @@ class PluginManager:
             self.plugins_dir = Path(plugins_dir)
 
         self._plugins_cache: dict[str, PluginMetadata] | None = None
+        # Output beyond this many characters spills to the connection's logs directory
+        self.capture_limit = capture_limit_from_env()
+        # Metrics of the most recent run (also appended to the connection's history)
+        self.last_metrics: PluginRunMetrics | None = None
+        # In-process entry points keyed by (file path, mtime) so edits trigger a reload
+        self._entry_cache: dict[tuple[str, int], Callable[[PluginContext], Any]] = {}
+        # Returns every active connection; exported to plugins as LAZYSSH_CONNECTIONS
+        self.connections_provider: Callable[[], Iterable[SSHConnection]] | None = None
+        # Optional pre-warmed fork server for out-of-process Python plugins
+        from . import plugin_zygote
+
+        self._zygote: PluginZygote | None = None
+        if plugin_zygote.zygote_enabled():
+            self._zygote = plugin_zygote.PluginZygote()
+            try:
+                self._zygote.start()
+                atexit.register(self._zygote.close)
+            except OSError as e:
+                if APP_LOGGER:
+                    APP_LOGGER.debug(f"Plugin zygote unavailable, using subprocesses: {e}")
+                self._zygote = None
 
         if APP_LOGGER:
             APP_LOGGER.debug(f"PluginManager initialized with directory: {self.plugins_dir}")
@@ -205,6 +589,8 @@ class PluginManager:
         description = "No description available"
         version = "1.0.0"
         requirements = "python3" if plugin_type == "python" else "bash"
+        in_process = False
+        no_timeout = False
 
         # Try to read metadata from file
         try:
@@ -227,6 +613,12 @@ class PluginManager:
                             version = line.split("PLUGIN_VERSION:", 1)[1].strip()
                         elif "PLUGIN_REQUIREMENTS:" in line:
                             requirements = line.split("PLUGIN_REQUIREMENTS:", 1)[1].strip()
+                        elif "PLUGIN_INPROCESS:" in line:
+                            flag = line.split("PLUGIN_INPROCESS:", 1)[1].strip().lower()
+                            in_process = flag in ("true", "1", "yes")
+                        elif "PLUGIN_NO_TIMEOUT:" in line:
+                            flag = line.split("PLUGIN_NO_TIMEOUT:", 1)[1].strip().lower()
+                            no_timeout = flag in ("true", "1", "yes")
         except (OSError, UnicodeDecodeError) as e:
             validation_warnings.append(f"Failed to read file: {e}")
 
@@ -245,6 +637,8 @@ class PluginManager:
             is_valid=is_valid,
             validation_errors=validation_errors,
             validation_warnings=validation_warnings,
+            in_process=in_process and plugin_type == "python",
+            no_timeout=no_timeout,
         )
 
     def _validate_plugin(
@@ -324,6 +718,220 @@ class PluginManager:
         plugins = self.discover_plugins()
         return plugins.get(plugin_name)
 
+    def _should_run_in_process(self, plugin: PluginMetadata) -> bool:
+        """Return True when a plugin opted in to in-process execution and is trusted.
+
+        Trusted plugins are the packaged built-ins plus any files listed in
+        ``LAZYSSH_TRUSTED_PLUGINS``. Trust follows the resolved file path, not
+        ``PLUGIN_NAME``, so a user plugin cannot borrow a trusted name. User
+        plugins that merely declare ``PLUGIN_INPROCESS`` still run as subprocesses.
+        """
+        if not getattr(plugin, "in_process", False):
+            return False
+
+        try:
+            path = Path(plugin.file_path).resolve()
+            trusted = {
+                Path(entry.strip()).expanduser().resolve()
+                for entry in re.split(r"[,:]", os.environ.get(TRUSTED_PLUGINS_ENV, ""))
+                if entry.strip()
+            }
+            return path in trusted or path.is_relative_to(self.plugins_dir.resolve())
+        except (OSError, ValueError):  # pragma: no cover - unresolvable paths are untrusted
+            return False
+
+    def _load_entry_point(self, plugin: PluginMetadata) -> Callable[[PluginContext], Any]:
+        """Import an in-process plugin once and return its ``main`` callable.
+
+        Raises:
+            ImportError: If the module cannot be loaded or exposes no callable ``main``.
+        """
+        path = Path(plugin.file_path)
+        cache_key = (str(path), path.stat().st_mtime_ns)
+        cached = self._entry_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        module_name = "lazyssh_plugin_" + re.sub(r"\W", "_", plugin.name)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load plugin module from {path}")  # pragma: no cover
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as exc:  # arbitrary plugin import-time failures
+            raise ImportError(f"Failed to import plugin module {path}: {exc}") from exc
+
+        entry: Callable[[PluginContext], Any] | None = getattr(module, "main", None)
+        if entry is None or not callable(entry):
+            raise ImportError(f"Plugin {plugin.name} does not define main(context)")
+
+        self._entry_cache = {
+            key: value for key, value in self._entry_cache.items() if key[0] != str(path)
+        }
+        self._entry_cache[cache_key] = entry
+        return entry
+
+    def _start_in_process(
+        self,
+        plugin: PluginMetadata,
+        connection: SSHConnection,
+        args: list[str] | None,
+        extra_env: dict[str, str] | None = None,
+    ) -> _InProcessRun:
+        """Load a trusted plugin and start its ``main(context)`` on a worker thread."""
+        entry = self._load_entry_point(plugin)
+        env = self._prepare_plugin_env(connection)
+        env.update(extra_env or {})
+        context = PluginContext(
+            plugin_name=plugin.name,
+            connection=connection,
+            env=env,
+            args=list(args or []),
+        )
+        run = _InProcessRun(entry, context)
+        if APP_LOGGER:
+            APP_LOGGER.debug(f"Running plugin {plugin.name} in-process")
+        run.start()
+        return run
+
+    def _execute_in_process(
+        self,
+        plugin: PluginMetadata,
+        connection: SSHConnection,
+        args: list[str] | None,
+        timeout: int = 300,
+    ) -> tuple[bool, str, float]:
+        """In-process counterpart of :meth:`execute_plugin` with the same return contract."""
+        start_time = time.time()
+        metrics_env: dict[str, str] = {}
+        metrics, counter_file = self._begin_metrics(plugin.name, connection, metrics_env)
+        try:
+            run = self._start_in_process(plugin, connection, args, extra_env=metrics_env)
+        except (ImportError, OSError) as e:
+            if counter_file is not None:  # pragma: no branch - temp dir available
+                counter_file.unlink(missing_ok=True)
+            execution_time = time.time() - start_time
+            error_msg = f"Failed to execute plugin '{plugin.name}': {e}"
+            if APP_LOGGER:
+                APP_LOGGER.error(error_msg)
+            return False, error_msg, execution_time
+
+        capture = self._new_capture(plugin.name, connection)
+        byte_counts: dict[str, int] = {}
+        try:
+            for kind, data in run.iter_chunks(start_time + timeout):
+                capture.append(kind, data)
+                byte_counts[kind] = byte_counts.get(kind, 0) + len(data.encode(errors="replace"))
+        except TimeoutError:
+            capture.discard()
+            execution_time = time.time() - start_time
+            error_msg = f"Plugin '{plugin.name}' timed out after {execution_time:.0f} seconds"
+            if APP_LOGGER:
+                APP_LOGGER.error(error_msg)
+            return False, error_msg, execution_time
+        finally:
+            self._finish_metrics(
+                metrics,
+                counter_file,
+                returncode=run.returncode,
+                rusage=run.rusage,
+                byte_counts=byte_counts,
+                mode="in-process",
+            )
+
+        execution_time = time.time() - start_time
+        returncode = run.returncode if run.returncode is not None else 1
+        if APP_LOGGER:
+            APP_LOGGER.debug(
+                f"Plugin {plugin.name} completed in-process with exit code {returncode} "
+                f"in {execution_time:.2f}s"
+            )
+
+        return returncode == 0, capture.result(), execution_time
+
+    def _new_capture(self, plugin_name: str, connection: SSHConnection) -> OutputCapture:
+        """Create the bounded output capture for one run of ``plugin_name``."""
+        connection_name = Path(connection.socket_path).name
+        log_dir = Path(CONNECTION_LOG_DIR_TEMPLATE.format(connection_name=connection_name))
+        return OutputCapture(log_dir, plugin_name, limit=self.capture_limit)
+
+    def _begin_metrics(
+        self, plugin_name: str, connection: SSHConnection, env: dict[str, str]
+    ) -> tuple[PluginRunMetrics, Path | None]:
+        """Start metrics for a run and point the plugin at its remote-command counter."""
+        metrics = PluginRunMetrics(
+            plugin=plugin_name,
+            connection=Path(connection.socket_path).name,
+            started_at=time.time(),
+        )
+        try:
+            fd, path = tempfile.mkstemp(prefix="lazyssh-plugin-metrics-")
+        except OSError:  # pragma: no cover - temp dir unavailable
+            return metrics, None
+        os.close(fd)
+        env[METRICS_FILE_ENV] = path
+        return metrics, Path(path)
+
+    def _finish_metrics(
+        self,
+        metrics: PluginRunMetrics,
+        counter_file: Path | None,
+        *,
+        returncode: int | None,
+        rusage: dict[str, float] | None,
+        byte_counts: dict[str, int],
+        mode: str,
+    ) -> None:
+        """Complete, remember and persist the metrics of a finished run."""
+        metrics.wall_time = time.time() - metrics.started_at
+        metrics.returncode = returncode
+        metrics.mode = mode
+        metrics.stdout_bytes = byte_counts.get("stdout", 0)
+        metrics.stderr_bytes = byte_counts.get("stderr", 0)
+        if rusage:
+            metrics.user_cpu = rusage["user_cpu"]
+            metrics.system_cpu = rusage["system_cpu"]
+            metrics.peak_rss_kb = int(rusage["peak_rss_kb"])
+        if counter_file is not None:
+            metrics.remote_commands = count_remote_commands(counter_file)
+            counter_file.unlink(missing_ok=True)
+
+        self.last_metrics = metrics
+        append_history(metrics)
+        if APP_LOGGER:
+            APP_LOGGER.debug(
+                f"Plugin {metrics.plugin} metrics: wall={metrics.wall_time:.2f}s "
+                f"user={metrics.user_cpu:.2f}s sys={metrics.system_cpu:.2f}s "
+                f"rss={metrics.peak_rss_kb}KiB out={metrics.stdout_bytes}B "
+                f"err={metrics.stderr_bytes}B remote={metrics.remote_commands}"
+            )
+
+    def _spawn_plugin(
+        self, plugin_type: str, cmd: list[str], env: dict[str, str]
+    ) -> "_AccountedPopen | ZygoteProcess":
+        """Start a plugin process, forking Python plugins from the zygote when enabled."""
+        if plugin_type == "python" and self._zygote is not None:
+            try:
+                return self._zygote.spawn(cmd[1], cmd[2:], env)
+            except OSError as e:
+                if APP_LOGGER:
+                    APP_LOGGER.debug(f"Plugin zygote spawn failed, using a subprocess: {e}")
+
+        return _AccountedPopen(
+            subprocess.Popen(  # noqa: S603  # args are constructed from validated SSH parameters
+                cmd,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        )
+
+    def close(self) -> None:
+        """Release background resources such as the plugin zygote."""
+        if self._zygote is not None:
+            self._zygote.close()
+
     def execute_plugin(
         self, plugin_name: str, connection: SSHConnection, args: list[str] | None = None
     ) -> tuple[bool, str, float]:
@@ -335,7 +943,10 @@ class PluginManager:
             args: Optional additional arguments to pass to plugin
 
         Returns:
-            Tuple of (success: bool, output: str, execution_time: float)
+            Tuple of (success: bool, output: str, execution_time: float). The
+            output is a :class:`PluginOutput`; when the run exceeded
+            ``capture_limit`` it holds only the head and tail, and its
+            ``log_path`` points at the full output for paging or searching.
         """
         # Get plugin metadata
         plugin = self.get_plugin(plugin_name)
@@ -346,6 +957,9 @@ class PluginManager:
             errors = "\n".join(plugin.validation_errors)
             return False, f"Plugin '{plugin_name}' is invalid:\n{errors}", 0.0
 
+        if self._should_run_in_process(plugin):
+            return self._execute_in_process(plugin, connection, args)
+
         # Prepare environment variables
         env = os.environ.copy()
         env.update(self._prepare_plugin_env(connection))
@@ -368,101 +982,77 @@ class PluginManager:
 
         # Execute plugin (streaming under the hood, while preserving combined output return)
         start_time = time.time()
+        metrics, counter_file = self._begin_metrics(plugin_name, connection, env)
         try:
-            process = subprocess.Popen(  # noqa: S603  # args are constructed from validated SSH parameters
-                cmd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-
-            stdout_buffer: list[str] = []
-            stderr_buffer: list[str] = []
-
-            # File descriptors for select — guaranteed non-None by stdout=PIPE
-            if process.stdout is None or process.stderr is None:
-                raise RuntimeError("subprocess pipes not available")  # pragma: no cover
-            stdout_fd = process.stdout.fileno()
-            stderr_fd = process.stderr.fileno()
-
-            # Global timeout of 5 minutes
-            timeout_seconds = 300
-            deadline = start_time + timeout_seconds
-
-            # Read until process terminates and pipes are exhausted
-            while True:
-                now = time.time()
-                remaining = max(0, deadline - now)
-                if remaining == 0:  # pragma: no cover
-                    process.kill()
-                    execution_time = time.time() - start_time
-                    error_msg = (
-                        f"Plugin '{plugin_name}' timed out after {execution_time:.0f} seconds"
-                    )
-                    if APP_LOGGER:
-                        APP_LOGGER.error(error_msg)
-                    # Ensure we reap the process
-                    with contextlib.suppress(Exception):
-                        process.wait(timeout=5)
-                    return False, error_msg, execution_time
-
-                rlist, _, _ = select.select([stdout_fd, stderr_fd], [], [], min(0.2, remaining))
-
-                read_any = False
-                if stdout_fd in rlist:  # pragma: no branch - select result
-                    line = process.stdout.readline()
-                    if line:
-                        stdout_buffer.append(line)
-                        read_any = True
-                if stderr_fd in rlist:
-                    line = process.stderr.readline()
-                    if line:
-                        stderr_buffer.append(line)
-                        read_any = True
-
-                # Break if process ended and no more data to read
-                if process.poll() is not None:
-                    # Drain any remaining data quickly
-                    remaining_out = process.stdout.read()
-                    if remaining_out:  # pragma: no cover
-                        stdout_buffer.append(remaining_out)
-                    remaining_err = process.stderr.read()
-                    if remaining_err:  # pragma: no cover
-                        stderr_buffer.append(remaining_err)
-                    break
-
-                # If nothing read this loop and process still running, continue until timeout or data
-                if not read_any:  # pragma: no cover
-                    continue
-
-            # Explicitly close pipes to avoid ResourceWarning for unclosed files
-            process.stdout.close()
-            process.stderr.close()
-
+            process = self._spawn_plugin(plugin_type, cmd, env)
+        except (OSError, subprocess.SubprocessError) as e:
+            if counter_file is not None:  # pragma: no branch - temp dir available
+                counter_file.unlink(missing_ok=True)
             execution_time = time.time() - start_time
-            returncode = process.returncode if process.returncode is not None else 1
-            success = returncode == 0
-
+            error_msg = f"Failed to execute plugin '{plugin_name}': {e}"
             if APP_LOGGER:
-                APP_LOGGER.debug(
-                    f"Plugin {plugin_name} completed with exit code {returncode} in {execution_time:.2f}s"
-                )
-
-            # Preserve existing behavior: combine stdout and stderr
-            output = "".join(stdout_buffer)
-            if stderr_buffer:
-                output += "\n" + "".join(stderr_buffer)
+                APP_LOGGER.error(error_msg)
+            return False, error_msg, execution_time
 
-            return success, output, execution_time
+        # Bounded capture: large outputs spill to the connection's logs directory
+        capture = self._new_capture(plugin_name, connection)
+        byte_counts: dict[str, int] = {}
 
-        except (OSError, subprocess.SubprocessError) as e:
+        # Global timeout of 5 minutes
+        timeout_seconds = 300
+        try:
+            for kind, data in iter_process_output(
+                process, start_time + timeout_seconds, byte_counts=byte_counts
+            ):
+                capture.append(kind, data)
+        except TimeoutError:  # pragma: no cover - five minute global timeout
+            capture.discard()
+            process.kill()
+            # Ensure we reap the process
+            with contextlib.suppress(Exception):
+                process.wait(timeout=5)
+            execution_time = time.time() - start_time
+            error_msg = f"Plugin '{plugin_name}' timed out after {execution_time:.0f} seconds"
+            if APP_LOGGER:
+                APP_LOGGER.error(error_msg)
+            return False, error_msg, execution_time
+        except OSError as e:  # pragma: no cover - pipe errors after a successful spawn
+            capture.discard()
+            process.kill()
             execution_time = time.time() - start_time
             error_msg = f"Failed to execute plugin '{plugin_name}': {e}"
             if APP_LOGGER:
                 APP_LOGGER.error(error_msg)
             return False, error_msg, execution_time
+        finally:
+            _close_pipes(process)
+            self._finish_metrics(
+                metrics,
+                counter_file,
+                returncode=process.returncode,
+                rusage=process.rusage,
+                byte_counts=byte_counts,
+                mode="subprocess" if isinstance(process, _AccountedPopen) else "zygote",
+            )
+
+        execution_time = time.time() - start_time
+        returncode = process.returncode if process.returncode is not None else 1
+        success = returncode == 0
+
+        if APP_LOGGER:
+            APP_LOGGER.debug(
+                f"Plugin {plugin_name} completed with exit code {returncode} in {execution_time:.2f}s"
+            )
+
+        # Preserve existing behavior: combine stdout and stderr
+        output = capture.result()
+        if output.truncated and APP_LOGGER:
+            APP_LOGGER.info(
+                f"Plugin {plugin_name} produced {output.total_chars} characters; "
+                f"full output saved to {output.log_path}"
+            )
+
+        return success, output, execution_time
 
     def execute_plugin_streaming(
         self,
@@ -470,8 +1060,10 @@ class PluginManager:
         connection: SSHConnection,
         args: list[str] | None = None,
         *,
-        timeout: int = 300,
+        timeout: int | None = 300,
         on_chunk: Callable[[tuple[str, str]], None] | None = None,
+        chunked: bool = False,
+        flush_interval: float | None = None,
     ) -> Iterator[tuple[str, str]]:
         """Stream a plugin's stdout and stderr in real time.
 
@@ -479,8 +1071,21 @@ class PluginManager:
         If `on_chunk` is provided, it will be called for each tuple and the
         generator will yield nothing.
 
-        The method enforces a total execution timeout and keeps stdout/stderr
-        separated internally for callers that want to aggregate.
+        With ``chunked=True`` output is yielded as decoded chunks as soon as it
+        is read instead of being framed into lines, so partial lines and
+        binary-ish output are never held back. ``flush_interval`` coalesces
+        output and emits at most one chunk per stream per interval, which keeps
+        chatty plugins from flooding a UI. Both apply to in-process plugins too;
+        ``plugin run`` in command mode uses them.
+
+        The method enforces a total execution timeout (none when ``timeout`` is
+        None) and keeps stdout/stderr separated internally for callers that
+        want to aggregate.
+
+        Ctrl-C reaches the plugin as well, since it shares the terminal's
+        process group. On KeyboardInterrupt the plugin's remaining output is
+        still delivered for up to ``PLUGIN_INTERRUPT_GRACE`` seconds so it can
+        finish its own cancellation, then the interrupt is re-raised.
         """
         plugin = self.get_plugin(plugin_name)
         if not plugin:
@@ -501,6 +1106,18 @@ class PluginManager:
                 on_chunk(("stderr", message + "\n"))
             return
 
+        if self._should_run_in_process(plugin):
+            yield from self._stream_in_process(
+                plugin,
+                connection,
+                args,
+                timeout=timeout,
+                on_chunk=on_chunk,
+                chunked=chunked,
+                flush_interval=flush_interval,
+            )
+            return
+
         env = os.environ.copy()
         env.update(self._prepare_plugin_env(connection))
 
@@ -519,71 +1136,51 @@ class PluginManager:
             APP_LOGGER.debug(f"Streaming plugin: {plugin_name} with command: {' '.join(cmd)}")
 
         start_time = time.time()
+        deadline = math.inf if timeout is None else start_time + timeout
+        metrics, counter_file = self._begin_metrics(plugin_name, connection, env)
+        byte_counts: dict[str, int] = {}
+        process = None
         try:
-            process = subprocess.Popen(  # noqa: S603  # args are constructed from validated SSH parameters
-                cmd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-            # Guaranteed non-None by stdout=PIPE
-            if process.stdout is None or process.stderr is None:
-                raise RuntimeError("subprocess pipes not available")  # pragma: no cover
-
-            stdout_fd = process.stdout.fileno()
-            stderr_fd = process.stderr.fileno()
-
-            deadline = start_time + timeout
-
-            def emit(kind: str, data: str) -> None:
-                if not data:  # pragma: no cover
-                    return
+            process = self._spawn_plugin(plugin_type, cmd, env)
+            for chunk in iter_process_output(
+                process,
+                deadline,
+                lines=not chunked,
+                flush_interval=flush_interval,
+                byte_counts=byte_counts,
+            ):
                 if on_chunk is None:
-                    # yield from inside nested fn is not allowed; we buffer and signal via outer scope
-                    nonlocal_yields.append((kind, data))
+                    yield chunk
                 else:
-                    on_chunk((kind, data))
-
-            while True:
-                now = time.time()
-                remaining = max(0, deadline - now)
-                if remaining == 0:  # pragma: no cover
-                    process.kill()
-                    break
-
-                rlist, _, _ = select.select([stdout_fd, stderr_fd], [], [], min(0.2, remaining))
-
-                nonlocal_yields: list[tuple[str, str]] = []
-                if stdout_fd in rlist:  # pragma: no branch - select result
-                    line = process.stdout.readline()
-                    if line:
-                        emit("stdout", line)
-                if stderr_fd in rlist:
-                    line = process.stderr.readline()
-                    if line:
-                        emit("stderr", line)
-
-                # Flush any pending yields for this iteration
-                if on_chunk is None and nonlocal_yields:
-                    yield from nonlocal_yields
-
-                if process.poll() is not None:
-                    # Drain remaining - backup in case readline didn't get everything
-                    remaining_out = process.stdout.read()
-                    if remaining_out:  # pragma: no cover
-                        if on_chunk is None:
-                            yield ("stdout", remaining_out)
-                        else:
-                            on_chunk(("stdout", remaining_out))
-                    remaining_err = process.stderr.read()
-                    if remaining_err:  # pragma: no cover
+                    on_chunk(chunk)
+
+        except KeyboardInterrupt:
+            # Let the plugin finish its cancellation (e.g. stopping a remote process)
+            # before the pipes are closed; a second Ctrl-C gives up waiting
+            if process is not None:  # pragma: no branch - interrupted while reading
+                with contextlib.suppress(TimeoutError, KeyboardInterrupt):
+                    for chunk in iter_process_output(
+                        process,
+                        time.time() + PLUGIN_INTERRUPT_GRACE,
+                        lines=not chunked,
+                        byte_counts=byte_counts,
+                    ):
                         if on_chunk is None:
-                            yield ("stderr", remaining_err)
+                            yield chunk
                         else:
-                            on_chunk(("stderr", remaining_err))
-                    break
+                            on_chunk(chunk)
+            raise
+
+        except TimeoutError:
+            if process is not None:  # pragma: no branch - set before reading
+                process.kill()
+                with contextlib.suppress(Exception):
+                    process.wait(timeout=5)
+            message = f"Plugin '{plugin_name}' timed out after {timeout} seconds\n"
+            if on_chunk is None:
+                yield ("stderr", message)
+            else:
+                on_chunk(("stderr", message))
 
         except (OSError, subprocess.SubprocessError) as e:
             message = f"Failed to execute plugin '{plugin_name}': {e}\n"
@@ -594,24 +1191,146 @@ class PluginManager:
             return
 
         finally:
-            # Explicitly close pipes to avoid ResourceWarning for unclosed files;
-            # process may be unbound if Popen failed, stdout/stderr typed as IO | None
-            with contextlib.suppress(Exception):
-                process.stdout.close()  # type: ignore[union-attr]
-            with contextlib.suppress(Exception):
-                process.stderr.close()  # type: ignore[union-attr]
+            # Explicitly close pipes to avoid ResourceWarning for unclosed files
+            rc = None
+            if process is not None:
+                if process.poll() is None:
+                    # Consumer stopped early (generator closed); don't leave the plugin running
+                    process.kill()
+                    with contextlib.suppress(Exception):
+                        process.wait(timeout=5)
+                _close_pipes(process)
+                rc = process.returncode
+                self._finish_metrics(
+                    metrics,
+                    counter_file,
+                    returncode=rc,
+                    rusage=process.rusage,
+                    byte_counts=byte_counts,
+                    mode="subprocess" if isinstance(process, _AccountedPopen) else "zygote",
+                )
+            elif counter_file is not None:  # pragma: no branch - temp dir available
+                counter_file.unlink(missing_ok=True)
 
             execution_time = time.time() - start_time
             if APP_LOGGER:
-                rc = None
-                try:
-                    rc = process.returncode  # process may be unbound if Popen failed
-                except UnboundLocalError:
-                    pass  # Popen failed before assignment; rc stays None
                 APP_LOGGER.debug(
                     f"Streaming plugin {plugin_name} finished (rc={rc}) in {execution_time:.2f}s"
                 )
 
+    def execute_plugin_live(
+        self,
+        plugin_name: str,
+        connection: SSHConnection,
+        args: list[str] | None = None,
+        *,
+        on_chunk: Callable[[tuple[str, str]], None],
+        timeout: int | None = 300,
+        chunked: bool = False,
+        flush_interval: float | None = None,
+    ) -> tuple[bool, str, float]:
+        """Run a plugin for an interactive caller, passing output to ``on_chunk`` live.
+
+        Built on :meth:`execute_plugin_streaming`, with the same return
+        contract as :meth:`execute_plugin`: the output is captured too, and
+        spills to the connection's logs directory past ``capture_limit``.
+        ``timeout`` of None removes the global limit, for plugins that enforce
+        their own; the user can still press Ctrl-C. ``chunked`` and
+        ``flush_interval`` are passed through unchanged.
+
+        Raises:
+            KeyboardInterrupt: On Ctrl-C, once the plugin has had time to clean up.
+        """
+        start_time = time.time()
+        capture = self._new_capture(plugin_name, connection)
+
+        def deliver(chunk: tuple[str, str]) -> None:
+            capture.append(*chunk)
+            on_chunk(chunk)
+
+        self.last_metrics = None
+        try:
+            list(
+                self.execute_plugin_streaming(
+                    plugin_name,
+                    connection,
+                    args,
+                    timeout=timeout,
+                    on_chunk=deliver,
+                    chunked=chunked,
+                    flush_interval=flush_interval,
+                )
+            )
+        except BaseException:
+            capture.discard()
+            raise
+
+        execution_time = time.time() - start_time
+        # Failures before the plugin started leave no metrics behind
+        success = self.last_metrics is not None and self.last_metrics.returncode == 0
+        return success, capture.result(), execution_time
+
+    def _stream_in_process(
+        self,
+        plugin: PluginMetadata,
+        connection: SSHConnection,
+        args: list[str] | None,
+        *,
+        timeout: int | None,
+        on_chunk: Callable[[tuple[str, str]], None] | None,
+        chunked: bool = False,
+        flush_interval: float | None = None,
+    ) -> Iterator[tuple[str, str]]:
+        """In-process counterpart of :meth:`execute_plugin_streaming`.
+
+        The worker thread cannot be interrupted, so on Ctrl-C it is orphaned
+        like a timed-out run.
+        """
+        start_time = time.time()
+        metrics_env: dict[str, str] = {}
+        metrics, counter_file = self._begin_metrics(plugin.name, connection, metrics_env)
+        byte_counts: dict[str, int] = {}
+        run: _InProcessRun | None = None
+        try:
+            run = self._start_in_process(plugin, connection, args, extra_env=metrics_env)
+            for chunk in run.iter_chunks(
+                math.inf if timeout is None else start_time + timeout,
+                lines=not chunked,
+                flush_interval=flush_interval,
+            ):
+                kind, data = chunk
+                byte_counts[kind] = byte_counts.get(kind, 0) + len(data.encode(errors="replace"))
+                if on_chunk is None:
+                    yield chunk
+                else:
+                    on_chunk(chunk)
+        except TimeoutError:
+            message = f"Plugin '{plugin.name}' timed out after {timeout} seconds\n"
+            if on_chunk is None:
+                yield ("stderr", message)
+            else:
+                on_chunk(("stderr", message))
+        except (ImportError, OSError) as e:
+            message = f"Failed to execute plugin '{plugin.name}': {e}\n"
+            if on_chunk is None:
+                yield ("stderr", message)
+            else:
+                on_chunk(("stderr", message))
+        finally:
+            self._finish_metrics(
+                metrics,
+                counter_file,
+                returncode=run.returncode if run is not None else None,
+                rusage=run.rusage if run is not None else None,
+                byte_counts=byte_counts,
+                mode="in-process",
+            )
+            if APP_LOGGER:
+                APP_LOGGER.debug(
+                    f"Streaming plugin {plugin.name} finished in-process "
+                    f"in {time.time() - start_time:.2f}s"
+                )
+
     def _prepare_plugin_env(self, connection: SSHConnection) -> dict[str, str]:
         """Prepare environment variables for plugin execution
 
@@ -636,6 +1355,22 @@ class PluginManager:
         # Add connection workspace directory
         if hasattr(connection, "connection_dir") and connection.connection_dir:  # pragma: no branch
             env["LAZYSSH_CONNECTION_DIR"] = connection.connection_dir
+            # Cached remote fingerprint so plugins skip arch and tool discovery
+            from .plugins._fingerprint import FINGERPRINT_FILE, fingerprint_env
+            from .plugins._remote import RemoteTarget
+
+            env.update(
+                fingerprint_env(
+                    Path(connection.connection_dir) / FINGERPRINT_FILE,
+                    RemoteTarget(
+                        socket_name,
+                        connection.host,
+                        connection.username,
+                        connection.socket_path,
+                        str(connection.port),
+                    ),
+                )
+            )
 
         # Add optional fields
         if connection.identity_file:
@@ -644,6 +1379,21 @@ class PluginManager:
         if connection.shell:
             env["LAZYSSH_SHELL"] = connection.shell
 
+        # All active connections, for plugins that fan out across hosts
+        if self.connections_provider is not None:
+            env["LAZYSSH_CONNECTIONS"] = json.dumps(
+                [
+                    {
+                        "name": Path(conn.socket_path).name,
+                        "host": conn.host,
+                        "port": conn.port,
+                        "user": conn.username,
+                        "socket_path": conn.socket_path,
+                    }
+                    for conn in self.connections_provider()
+                ]
+            )
+
         # Propagate the active terminal width so Rich-based plugins can render properly.
         try:
             columns = shutil.get_terminal_size(fallback=(0, 0)).columns
@@ -0,0 +1,180 @@
+"""Per-run plugin metrics and the per-connection run history.
+
+Every plugin run records wall time, CPU time, peak RSS, output volume and the
+number of remote commands it issued. Runs are appended as JSON lines to
+``/tmp/lazyssh/<connection>.d/logs/plugin_history.jsonl`` and summarised by
+``plugin stats`` as p50/p95 per plugin, which shows whether a slow plugin is
+spending its time on local CPU or on remote round trips.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any
+
+from .logging_module import APP_LOGGER, CONNECTION_LOG_DIR_TEMPLATE
+
+# Plugins append one line per remote command to this file (see record_remote_command)
+METRICS_FILE_ENV = "LAZYSSH_PLUGIN_METRICS_FILE"
+HISTORY_FILENAME = "plugin_history.jsonl"
+
+
+@dataclass
+class PluginRunMetrics:
+    """Resource usage of a single plugin run."""
+
+    plugin: str
+    connection: str
+    started_at: float
+    wall_time: float = 0.0
+    user_cpu: float = 0.0
+    system_cpu: float = 0.0
+    peak_rss_kb: int = 0
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+    remote_commands: int = 0
+    returncode: int | None = None
+    mode: str = "subprocess"  # subprocess, zygote or in-process
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PluginRunMetrics:
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+@dataclass
+class PluginStats:
+    """p50/p95 summary of one plugin's recorded runs."""
+
+    plugin: str
+    runs: int
+    failures: int
+    wall_p50: float
+    wall_p95: float
+    cpu_p50: float
+    cpu_p95: float
+    remote_p50: float
+    remote_p95: float
+    peak_rss_kb: int
+    output_bytes_p50: float
+    connections: list[str] = field(default_factory=list)
+
+
+def rusage_to_dict(usage: Any) -> dict[str, float]:
+    """Normalise a ``resource.struct_rusage`` (ru_maxrss is bytes on macOS, KiB on Linux)."""
+    maxrss = int(usage.ru_maxrss)
+    if sys.platform == "darwin":  # pragma: no cover - platform specific units
+        maxrss //= 1024
+    return {"user_cpu": usage.ru_utime, "system_cpu": usage.ru_stime, "peak_rss_kb": maxrss}
+
+
+def history_path(connection_name: str) -> Path:
+    """Return the run history file for a connection."""
+    return Path(CONNECTION_LOG_DIR_TEMPLATE.format(connection_name=connection_name)) / (
+        HISTORY_FILENAME
+    )
+
+
+def append_history(metrics: PluginRunMetrics) -> None:
+    """Append one run to its connection's history; failures are logged, never raised."""
+    path = history_path(metrics.connection)
+    try:
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.parent.chmod(0o700)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(metrics.to_dict(), sort_keys=True) + "\n")
+    except OSError as e:
+        if APP_LOGGER:
+            APP_LOGGER.debug(f"Failed to record plugin metrics in {path}: {e}")
+
+
+def load_history(connection_name: str) -> list[PluginRunMetrics]:
+    """Load a connection's recorded runs, skipping malformed lines."""
+    path = history_path(connection_name)
+    runs: list[PluginRunMetrics] = []
+    try:
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    runs.append(PluginRunMetrics.from_dict(json.loads(line)))
+                except (ValueError, TypeError):
+                    continue
+    except OSError:
+        return []
+    return runs
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return float(ordered[rank - 1])
+
+
+def summarize(runs: Sequence[PluginRunMetrics]) -> list[PluginStats]:
+    """Group runs by plugin and compute p50/p95 figures, slowest (p95 wall) first."""
+    by_plugin: dict[str, list[PluginRunMetrics]] = {}
+    for run in runs:
+        by_plugin.setdefault(run.plugin, []).append(run)
+
+    stats: list[PluginStats] = []
+    for plugin, plugin_runs in by_plugin.items():
+        wall = [r.wall_time for r in plugin_runs]
+        cpu = [r.user_cpu + r.system_cpu for r in plugin_runs]
+        remote = [float(r.remote_commands) for r in plugin_runs]
+        output = [float(r.stdout_bytes + r.stderr_bytes) for r in plugin_runs]
+        stats.append(
+            PluginStats(
+                plugin=plugin,
+                runs=len(plugin_runs),
+                failures=sum(1 for r in plugin_runs if r.returncode not in (0, None)),
+                wall_p50=percentile(wall, 50),
+                wall_p95=percentile(wall, 95),
+                cpu_p50=percentile(cpu, 50),
+                cpu_p95=percentile(cpu, 95),
+                remote_p50=percentile(remote, 50),
+                remote_p95=percentile(remote, 95),
+                peak_rss_kb=max(r.peak_rss_kb for r in plugin_runs),
+                output_bytes_p50=percentile(output, 50),
+                connections=sorted({r.connection for r in plugin_runs}),
+            )
+        )
+    stats.sort(key=lambda s: s.wall_p95, reverse=True)
+    return stats
+
+
+def count_remote_commands(path: Path) -> int:
+    """Count the remote commands a plugin recorded in its metrics file."""
+    try:
+        with path.open(encoding="utf-8") as handle:
+            return sum(int(line) for line in handle if line.strip().isdigit())
+    except OSError:
+        return 0
+
+
+def record_remote_command(count: int = 1, env: Mapping[str, str] | None = None) -> None:
+    """Record that a plugin issued ``count`` remote commands.
+
+    Plugins call this around each ssh/scp round trip. It is a no-op outside a
+    LazySSH plugin run. In-process plugins pass ``context.env``.
+    """
+    path = (env if env is not None else os.environ).get(METRICS_FILE_ENV)
+    if not path:
+        return
+    try:
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(f"{count}\n")
+    except OSError:
+        pass
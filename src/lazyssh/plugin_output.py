@@ -0,0 +1,234 @@
+"""Bounded-memory capture of plugin output.
+
+Small outputs are kept in memory exactly as before. Once a run produces more
+than the capture limit, the full text is spilled to a per-run log file under
+the connection's ``logs`` directory and only a head and tail are kept for
+display. Stdout spills straight into the final log file; stderr spills to a
+side file that is appended to the log when the run finishes. The result is a
+:class:`PluginOutput`, a ``str`` holding the display text that also knows
+where the full output lives and can page or search it (``plugin output`` and
+``plugin search`` in command mode).
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO
+
+from .console_instance import parse_integer_env_var
+
+CAPTURE_LIMIT_ENV = "LAZYSSH_PLUGIN_CAPTURE_LIMIT"
+# Characters kept in memory per run before output spills to disk
+DEFAULT_CAPTURE_LIMIT = 8 * 1024 * 1024
+# Characters of the beginning and end of each stream kept for display once spilled
+DEFAULT_PREVIEW_CHARS = 64 * 1024
+
+
+def capture_limit_from_env() -> int:
+    """Return the spill threshold from ``LAZYSSH_PLUGIN_CAPTURE_LIMIT`` (characters)."""
+    return parse_integer_env_var(
+        CAPTURE_LIMIT_ENV, DEFAULT_CAPTURE_LIMIT, min_val=1024, max_val=2**40
+    )
+
+
+class PluginOutput(str):
+    """Plugin output text plus a handle on the full output when it was truncated.
+
+    The string value is what gets displayed: the complete output for normal
+    runs, or the head and tail around a truncation marker for spilled runs.
+    ``log_path`` then points at the complete output on disk.
+    """
+
+    log_path: Path | None
+    total_chars: int
+
+    def __new__(
+        cls, text: str, log_path: Path | None = None, total_chars: int | None = None
+    ) -> PluginOutput:
+        obj = super().__new__(cls, text)
+        obj.log_path = log_path
+        obj.total_chars = len(text) if total_chars is None else total_chars
+        return obj
+
+    @property
+    def truncated(self) -> bool:
+        return self.log_path is not None
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield every line of the full output, reading from disk when spilled."""
+        if self.log_path is None:
+            yield from str(self).splitlines()
+            return
+        with self.log_path.open(encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                yield line.rstrip("\n")
+
+    def page(self, start: int = 0, count: int = 100) -> list[str]:
+        """Return ``count`` lines of the full output starting at line ``start`` (0-based)."""
+        lines: list[str] = []
+        for index, line in enumerate(self.iter_lines()):
+            if index >= start + count:
+                break
+            if index >= start:
+                lines.append(line)
+        return lines
+
+    def search(
+        self, pattern: str, *, regex: bool = False, max_results: int = 100
+    ) -> list[tuple[int, str]]:
+        """Return ``(line_number, line)`` pairs (1-based) of the full output matching ``pattern``."""
+        matcher = re.compile(pattern if regex else re.escape(pattern))
+        results: list[tuple[int, str]] = []
+        for number, line in enumerate(self.iter_lines(), start=1):
+            if matcher.search(line):
+                results.append((number, line))
+                if len(results) >= max_results:
+                    break
+        return results
+
+
+class _StreamCapture:
+    """Collects one stream in memory, switching to head/tail plus a spill file."""
+
+    def __init__(self, preview_chars: int) -> None:
+        self._preview_chars = preview_chars
+        self.chunks: list[str] = []
+        self.size = 0
+        self.spill: IO[str] | None = None
+        self.spill_path: Path | None = None
+        self.head = ""
+        self._tail: collections.deque[str] = collections.deque()
+        self._tail_size = 0
+
+    def append(self, data: str) -> None:
+        self.size += len(data)
+        if self.spill is None:
+            self.chunks.append(data)
+            return
+        self.spill.write(data)
+        self._record(data)
+
+    def start_spill(self, spill: IO[str], spill_path: Path) -> None:
+        text = "".join(self.chunks)
+        self.chunks = []
+        spill.write(text)
+        self.spill = spill
+        self.spill_path = spill_path
+        self._record(text)
+
+    def _record(self, data: str) -> None:
+        if len(self.head) < self._preview_chars:
+            take = self._preview_chars - len(self.head)
+            self.head += data[:take]
+            data = data[take:]
+        if not data:
+            return
+        self._tail.append(data)
+        self._tail_size += len(data)
+        while self._tail_size - len(self._tail[0]) >= self._preview_chars:
+            self._tail_size -= len(self._tail.popleft())
+
+    def close_spill(self) -> Path | None:
+        if self.spill is not None:
+            self.spill.close()
+        return self.spill_path
+
+    def preview(self) -> str:
+        if self.spill is None:
+            return "".join(self.chunks)
+        tail = "".join(self._tail)[-self._preview_chars :]
+        omitted = self.size - len(self.head) - len(tail)
+        if omitted <= 0:
+            return self.head + tail
+        return f"{self.head}\n... [{omitted} characters truncated] ...\n{tail}"
+
+
+class OutputCapture:
+    """Accumulates a run's stdout and stderr within a memory budget.
+
+    Args:
+        log_dir: Directory for spill files (created on first spill).
+        plugin_name: Used in the spill file name.
+        limit: Characters kept in memory across both streams before spilling.
+        preview_chars: Head and tail size kept per stream once spilled; defaults
+            to a quarter of ``limit`` capped at ``DEFAULT_PREVIEW_CHARS``.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        plugin_name: str,
+        *,
+        limit: int = DEFAULT_CAPTURE_LIMIT,
+        preview_chars: int | None = None,
+    ) -> None:
+        if preview_chars is None:
+            preview_chars = min(DEFAULT_PREVIEW_CHARS, limit // 4)
+        self._log_dir = log_dir
+        self._plugin_name = re.sub(r"[^\w.-]", "_", plugin_name)
+        self._limit = limit
+        self._streams = {
+            "stdout": _StreamCapture(preview_chars),
+            "stderr": _StreamCapture(preview_chars),
+        }
+        self._spilled = False
+
+    def append(self, kind: str, data: str) -> None:
+        self._streams[kind].append(data)
+        if not self._spilled and sum(s.size for s in self._streams.values()) > self._limit:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self._log_dir.exists():
+            self._log_dir.mkdir(parents=True, exist_ok=True)
+            self._log_dir.chmod(0o700)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        log_path = self._log_dir / f"plugin_{self._plugin_name}_{timestamp}.log"
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        spill = open(fd, "w", encoding="utf-8", errors="replace")  # noqa: SIM115
+        self._streams["stdout"].start_spill(spill, log_path)
+        fd, path = tempfile.mkstemp(
+            prefix=f".plugin_{self._plugin_name}_", suffix=".stderr", dir=self._log_dir
+        )
+        spill = open(fd, "w", encoding="utf-8", errors="replace")  # noqa: SIM115
+        self._streams["stderr"].start_spill(spill, Path(path))
+        self._spilled = True
+
+    def result(self) -> PluginOutput:
+        """Close spill files and return the combined output (stdout, then stderr)."""
+        stdout, stderr = self._streams["stdout"], self._streams["stderr"]
+        if not self._spilled:
+            text = stdout.preview()
+            if stderr.size:
+                text += "\n" + stderr.preview()
+            return PluginOutput(text)
+
+        log_path = stdout.close_spill()
+        stderr_path = stderr.close_spill()
+        if log_path is not None and stderr_path is not None:  # pragma: no branch - spill together
+            if stderr.size:
+                with log_path.open("a", encoding="utf-8") as out:
+                    out.write("\n")
+                    with stderr_path.open(encoding="utf-8") as src:
+                        shutil.copyfileobj(src, out)
+            stderr_path.unlink()
+
+        text = stdout.preview()
+        if stderr.size:
+            text += "\n" + stderr.preview()
+        total = stdout.size + stderr.size + (1 if stderr.size else 0)
+        return PluginOutput(text, log_path=log_path, total_chars=total)
+
+    def discard(self) -> None:
+        """Remove the partial log and spill file of an abandoned run."""
+        for stream in self._streams.values():
+            spill_path = stream.close_spill()
+            if spill_path is not None:
+                spill_path.unlink(missing_ok=True)
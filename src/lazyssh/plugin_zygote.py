@@ -0,0 +1,447 @@
+"""Pre-warmed fork server for out-of-process Python plugins.
+
+Cold-starting ``python plugin.py`` re-imports Rich and the built-in plugin
+support modules on every run. The zygote is a long-lived helper process that
+imports them once and then forks a fresh child per plugin invocation, so each
+run starts from a warm interpreter while still getting its own process,
+environment, stdout/stderr pipes and exit status.
+
+Protocol (parent -> zygote, over a Unix control socket):
+    a 4-byte big-endian length carrying three file descriptors (a per-run
+    socket plus the stdout and stderr pipe write ends), followed by a JSON
+    request ``{"script", "args", "env", "cwd"}``.
+
+Protocol (runner -> parent, over the per-run socket):
+    ``{"pid": N}\\n`` once the plugin child exists, then
+    ``{"returncode": N, "rusage": {...}}\\n`` when it exits. Return codes
+    follow :mod:`subprocess` (negative for signals).
+
+The zygote exits when the control socket reaches EOF, i.e. when LazySSH exits.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import json
+import os
+import select
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import types
+from pathlib import Path
+from typing import IO, Any
+
+from .console_instance import parse_boolean_env_var
+from .logging_module import APP_LOGGER
+from .plugin_metrics import rusage_to_dict
+
+ZYGOTE_ENV = "LAZYSSH_PLUGIN_ZYGOTE"
+
+# Modules shared by the built-in plugins; imported once in the zygote so forked
+# children start with them already loaded.
+PRELOAD_MODULES = (
+    "rich.box",
+    "rich.console",
+    "rich.panel",
+    "rich.table",
+    "rich.text",
+    "lazyssh.console_instance",
+    "lazyssh.logging_module",
+    "lazyssh.plugins._enumeration_plan",
+    "lazyssh.plugins._gtfobins_data",
+    "lazyssh.plugins._kernel_exploits",
+    "lazyssh.plugins._arch_detection",
+    "lazyssh.plugins._fingerprint",
+    "lazyssh.plugins._payload_cache",
+    "lazyssh.plugins.enumerate",
+    "lazyssh.plugins.upload_exec",
+    "lazyssh.plugins.survey_query",
+)
+
+_HEADER = struct.Struct("!I")
+_SPAWN_TIMEOUT = 30.0
+
+
+def zygote_supported() -> bool:
+    """Return True when the platform can fork and pass file descriptors."""
+    return hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+
+def zygote_enabled() -> bool:
+    """Return True when ``LAZYSSH_PLUGIN_ZYGOTE`` is set and the platform supports it."""
+    return parse_boolean_env_var(ZYGOTE_ENV, False) and zygote_supported()
+
+
+class ZygoteProcess:
+    """Popen-compatible handle for a plugin child forked by the zygote.
+
+    Exposes the subset of :class:`subprocess.Popen` used by the plugin
+    manager: ``stdout``/``stderr`` binary pipes, ``poll``, ``wait``, ``kill``
+    and ``returncode``.
+    """
+
+    def __init__(
+        self, args: list[str], run_sock: socket.socket, stdout: IO[bytes], stderr: IO[bytes]
+    ) -> None:
+        self.args = args
+        self.stdout: IO[bytes] | None = stdout
+        self.stderr: IO[bytes] | None = stderr
+        self.returncode: int | None = None
+        self.rusage: dict[str, float] | None = None
+        self._sock = run_sock
+        self._buffer = b""
+        self.pid = self._read_message(_SPAWN_TIMEOUT).get("pid", 0)
+        if not self.pid:
+            self._close_all()
+            raise OSError("plugin zygote did not start the plugin")
+
+    def _close_all(self) -> None:
+        for stream in (self.stdout, self.stderr):
+            if stream is not None:
+                stream.close()
+        self._sock.close()
+
+    def _read_message(self, timeout: float | None) -> dict[str, Any]:
+        """Read one JSON line from the runner; returns {} on EOF or timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b"\n" not in self._buffer:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._sock], [], [], remaining)
+            if not ready:
+                return {}
+            data = self._sock.recv(4096)
+            if not data:
+                return {}
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        message: dict[str, Any] = json.loads(line)
+        return message
+
+    def _collect(self, timeout: float | None) -> int | None:
+        if self.returncode is not None:
+            return self.returncode
+        if b"\n" not in self._buffer:
+            ready, _, _ = select.select([self._sock], [], [], timeout)
+            if not ready:
+                return None
+        message = self._read_message(0)
+        # EOF without a status means the runner died; report a generic failure
+        self.returncode = int(message.get("returncode", 1))
+        self.rusage = message.get("rusage")
+        self._sock.close()
+        return self.returncode
+
+    def poll(self) -> int | None:
+        """Return the exit status if the plugin has finished, else None."""
+        return self._collect(0)
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for the plugin to exit.
+
+        Raises:
+            subprocess.TimeoutExpired: If ``timeout`` elapses first.
+        """
+        rc = self._collect(timeout)
+        if rc is None:
+            raise subprocess.TimeoutExpired(self.args, timeout or 0)
+        return rc
+
+    def kill(self) -> None:
+        """Send SIGKILL to the plugin child."""
+        if self.returncode is None:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(self.pid, signal.SIGKILL)
+
+
+class PluginZygote:
+    """Parent-side manager for the zygote process."""
+
+    def __init__(self) -> None:
+        self._process: subprocess.Popen[bytes] | None = None
+        self._control: socket.socket | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Start the zygote if it is not already running."""
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self.running:
+            return
+        self._shutdown()
+
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        env = os.environ.copy()
+        # Make sure the zygote imports this copy of lazyssh, installed or not
+        package_root = str(Path(__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+        try:
+            self._process = subprocess.Popen(  # noqa: S603  # fixed interpreter and module
+                [sys.executable, "-m", "lazyssh.plugin_zygote", str(child_sock.fileno())],
+                env=env,
+                pass_fds=(child_sock.fileno(),),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            parent_sock.close()
+            raise
+        finally:
+            child_sock.close()
+        self._control = parent_sock
+        if APP_LOGGER:
+            APP_LOGGER.debug(f"Started plugin zygote (pid {self._process.pid})")
+
+    def spawn(self, script: str, args: list[str], env: dict[str, str]) -> ZygoteProcess:
+        """Fork a child from the zygote that runs ``script`` like ``python script args``.
+
+        Raises:
+            OSError: If the zygote cannot be reached or fails to start the plugin.
+        """
+        run_parent, run_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+        request = json.dumps(
+            {"script": script, "args": args, "env": env, "cwd": os.getcwd()}
+        ).encode()
+        try:
+            with self._lock:
+                self._ensure_started()
+                if self._control is None:  # pragma: no cover - set by _ensure_started
+                    raise OSError("plugin zygote is not running")
+                try:
+                    socket.send_fds(
+                        self._control,
+                        [_HEADER.pack(len(request))],
+                        [run_child.fileno(), out_w, err_w],
+                    )
+                    self._control.sendall(request)
+                except OSError:
+                    # The zygote died; drop it so the next spawn restarts it
+                    self._shutdown()
+                    raise
+        except BaseException:
+            for fd in (out_r, err_r):
+                os.close(fd)
+            run_parent.close()
+            raise
+        finally:
+            run_child.close()
+            os.close(out_w)
+            os.close(err_w)
+
+        stdout = open(out_r, "rb")  # noqa: SIM115  # owned by ZygoteProcess
+        stderr = open(err_r, "rb")  # noqa: SIM115  # owned by ZygoteProcess
+        return ZygoteProcess([sys.executable, script, *args], run_parent, stdout, stderr)
+
+    def _shutdown(self) -> None:
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+        if self._process is not None:
+            try:
+                self._process.wait(timeout=5)
+            except subprocess.TimeoutExpired:  # pragma: no cover - zygote ignores EOF
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def close(self) -> None:
+        """Stop the zygote; it exits as soon as its control socket closes."""
+        with self._lock:
+            self._shutdown()
+
+
+# --- zygote side -----------------------------------------------------------
+
+
+def _preload() -> None:  # pragma: no cover - runs inside the zygote process
+    for name in PRELOAD_MODULES:
+        with contextlib.suppress(Exception):
+            importlib.import_module(name)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:  # pragma: no cover - zygote side
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError
+        data += chunk
+    return data
+
+
+def _recv_request(
+    control: socket.socket,
+) -> tuple[dict[str, Any], list[int]]:  # pragma: no cover - zygote side
+    header, fds, _, _ = socket.recv_fds(control, _HEADER.size, 3)
+    if not header:
+        raise EOFError
+    if len(header) < _HEADER.size:
+        header += _recv_exact(control, _HEADER.size - len(header))
+    (length,) = _HEADER.unpack(header)
+    return json.loads(_recv_exact(control, length)), fds
+
+
+class _CodeCache:  # pragma: no cover - zygote side
+    """Compiled plugin scripts keyed by path and mtime, shared by every fork."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[int, types.CodeType]] = {}
+
+    def get(self, script: str) -> types.CodeType:
+        mtime = os.stat(script).st_mtime_ns
+        cached = self._entries.get(script)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        source = Path(script).read_bytes()
+        code = compile(source, script, "exec", dont_inherit=True)
+        self._entries[script] = (mtime, code)
+        return code
+
+    def warm(self, directory: Path) -> None:
+        for path in directory.glob("*.py"):
+            if not path.name.startswith("_"):
+                with contextlib.suppress(Exception):
+                    self.get(str(path))
+
+
+def _exit_code(exc: SystemExit) -> int:  # pragma: no cover - plugin child side
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_plugin(
+    request: dict[str, Any], code: types.CodeType | None, error: str
+) -> int:  # pragma: no cover - plugin child side
+    """Turn the forked child into ``python script args`` and run it."""
+    script = request["script"]
+    with contextlib.suppress(OSError):
+        os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.argv = [script, *request["args"]]
+    sys.path[0] = str(Path(script).resolve().parent)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # The console singleton was sized and themed from the zygote's environment
+    from . import console_instance
+
+    with contextlib.suppress(Exception):
+        console_instance.ui_config = console_instance.get_ui_config()
+        console_instance.console = console_instance.create_console_with_config(
+            console_instance.ui_config
+        )
+
+    rc = 0
+    try:
+        if code is None:
+            sys.stderr.write(error)
+            rc = 1
+        else:
+            module = types.ModuleType("__main__")
+            module.__file__ = script
+            sys.modules["__main__"] = module
+            exec(code, module.__dict__)  # noqa: S102  # plugin script, same as `python script`
+    except SystemExit as exc:
+        rc = _exit_code(exc)
+    except BaseException:
+        traceback.print_exc()
+        rc = 1
+    finally:
+        import logging
+
+        with contextlib.suppress(Exception):
+            logging.shutdown()
+        for stream in (sys.stdout, sys.stderr):
+            with contextlib.suppress(Exception):
+                stream.flush()
+    return rc
+
+
+def _runner(
+    request: dict[str, Any], fds: list[int], code: types.CodeType | None, error: str
+) -> None:  # pragma: no cover - runner side
+    """Fork the plugin child, report its pid and exit status, then exit."""
+    run_fd, out_w, err_w = fds
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    run_sock = socket.socket(fileno=run_fd)
+    pid = os.fork()
+    if pid == 0:
+        run_sock.close()
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        os.close(out_w)
+        os.close(err_w)
+        os._exit(_run_plugin(request, code, error))
+
+    os.close(out_w)
+    os.close(err_w)
+    rc = 1
+    try:
+        run_sock.sendall(json.dumps({"pid": pid}).encode() + b"\n")
+        _, status, usage = os.wait4(pid, 0)
+        rc = os.waitstatus_to_exitcode(status)
+        message = {"returncode": rc, "rusage": rusage_to_dict(usage)}
+        run_sock.sendall(json.dumps(message).encode() + b"\n")
+    except OSError:
+        pass
+    os._exit(0)
+
+
+def serve(control_fd: int) -> int:  # pragma: no cover - runs inside the zygote process
+    """Zygote main loop: preload modules, then fork a runner per request."""
+    control = socket.socket(fileno=control_fd)
+    _preload()
+    codes = _CodeCache()
+    codes.warm(Path(__file__).resolve().parent / "plugins")
+    # Runners report their own child's status; let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    while True:
+        try:
+            request, fds = _recv_request(control)
+        except (EOFError, OSError, ValueError):
+            return 0
+        if len(fds) != 3:
+            for fd in fds:
+                os.close(fd)
+            continue
+
+        code: types.CodeType | None = None
+        error = ""
+        try:
+            code = codes.get(request["script"])
+        except (OSError, SyntaxError, ValueError) as exc:
+            error = "".join(traceback.format_exception_only(type(exc), exc))
+
+        for stream in (sys.stdout, sys.stderr):
+            stream.flush()
+        pid = os.fork()
+        if pid == 0:
+            control.close()
+            _runner(request, fds, code, error)
+        for fd in fds:
+            os.close(fd)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(serve(int(sys.argv[1])))
@@ -2,6 +2,8 @@
 
 Detects remote system architecture and OS via SSH control socket,
 mapping to msfvenom-compatible identifiers for payload generation.
+Plugins should prefer the cached ``_fingerprint.get_fingerprint()``, which
+avoids the round trip on repeated runs.
 """
 
 from __future__ import annotations
@@ -10,6 +12,8 @@ import os
 import subprocess
 from dataclasses import dataclass
 
+from lazyssh.plugin_metrics import record_remote_command
+
 
 @dataclass(frozen=True)
 class RemoteArch:
@@ -72,6 +76,7 @@ def detect_remote_arch(
     ssh_cmd.append(f"{user}@{host}")
     ssh_cmd.extend(["sh", "-c", "uname -m && uname -s"])
 
+    record_remote_command()
     try:
         result = subprocess.run(  # noqa: S603,S607
             ssh_cmd,
@@ -89,15 +94,14 @@ def detect_remote_arch(
     if len(lines) < 2:  # noqa: PLR2004
         raise RuntimeError(f"Unexpected uname output: {result.stdout!r}")
 
-    raw_arch = lines[0].strip()
-    raw_os = lines[1].strip()
+    return arch_from_uname(lines[0].strip(), lines[1].strip())
 
-    msf_arch = ARCH_MAP.get(raw_arch, raw_arch)
-    msf_platform = PLATFORM_MAP.get(raw_os.lower(), raw_os.lower())
 
+def arch_from_uname(raw_arch: str, raw_os: str) -> RemoteArch:
+    """Map ``uname -m`` and ``uname -s`` output to msfvenom identifiers."""
     return RemoteArch(
         raw_arch=raw_arch,
         raw_os=raw_os,
-        msf_arch=msf_arch,
-        msf_platform=msf_platform,
+        msf_arch=ARCH_MAP.get(raw_arch, raw_arch),
+        msf_platform=PLATFORM_MAP.get(raw_os.lower(), raw_os.lower()),
     )
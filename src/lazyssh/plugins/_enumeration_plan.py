@@ -9,7 +9,8 @@ rendering concerns.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, replace
 from typing import Literal
 
 
@@ -519,6 +520,210 @@ REMOTE_PROBES: tuple[RemoteProbe, ...] = (
     ),
 )
 
+# Single filesystem walk replacing the separate `find` probes below. Each match
+# is printed as "<access>\t<type>\t<mode>\t<owner>\t<size>\t<mtime>\t<path>",
+# where <access> holds "w" and/or "r" for the current user, followed by a final
+# "NOW\t<epoch>" line so file ages can be computed against the remote clock.
+# The per-heuristic facts are derived locally by enumerate.derive_fs_walk_probes.
+# The walk crosses mount points so a separate /home or /var is still covered;
+# only the kernel pseudo-filesystems are pruned. Like the probes it replaces, it
+# is bounded by `timeout` when the host has one, and still prints the clock line.
+FS_WALK_PRUNE = ("/proc", "/sys", "/dev", "/run")
+FS_WALK_COMMAND = (
+    "if find / -maxdepth 0 -printf '' >/dev/null 2>&1; then "
+    "t=; command -v timeout >/dev/null 2>&1 && t='timeout 25s'; "
+    "$t find / \\( "
+    + " -o ".join(f"-path {path}" for path in FS_WALK_PRUNE)
+    + " \\) -prune -o \\( "
+    "-type f -perm -4000 -o "
+    "-type f -perm -2000 -o "
+    "-type d -perm -0002 -o "
+    "\\( -path '/etc/systemd/system/*' -o -path '/usr/lib/systemd/system/*' \\) -type f -writable -o "
+    "\\( -path /etc/crontab -o -path /etc/cron.d -o -path /etc/cron.daily -o -path /etc/cron.hourly "
+    "-o -path /etc/cron.weekly -o -path /etc/cron.monthly \\) -writable -o "
+    "-path '/var/backups/*' -o "
+    "\\( -name '*.bak' -o -name '*.old' -o -name '*.backup' -o -name '*.sql' \\) -readable -o "
+    "\\( -name '.env' -o -name '.htpasswd' -o -name 'wp-config.php' \\) -readable -o "
+    "\\( -path '/root/.ssh/id_*' -o -path '/home/*/.ssh/id_*' \\) ! -name '*.pub' -readable -o "
+    "\\( -path '/etc/*' -o -path '/usr/local/bin/*' -o -path '/usr/local/sbin/*' \\) -type f -mtime -1 "
+    "\\) \\( -writable -printf 'w' -o -true \\) \\( -readable -printf 'r' -o -true \\) "
+    "-printf '\\t%y\\t%m\\t%u\\t%s\\t%T@\\t%p\\n' 2>/dev/null; "
+    "printf 'NOW\\t%s\\n' \"$(date +%s)\"; "
+    "else echo 'FS_WALK_UNSUPPORTED'; fi"
+)
+
+FS_WALK_PROBE = RemoteProbe("filesystem", "fs_walk", FS_WALK_COMMAND, timeout=30)
+
+# Probes whose output is derived from FS_WALK_PROBE when the walk is enabled
+FS_WALK_REPLACES: tuple[tuple[str, str], ...] = (
+    ("filesystem", "suid_files"),
+    ("filesystem", "sgid_files"),
+    ("filesystem", "world_writable_dirs"),
+    ("writable", "writable_services"),
+    ("writable", "writable_cron"),
+    ("credentials", "ssh_keys"),
+    ("credentials", "config_credentials"),
+    ("interesting_files", "backup_files"),
+    ("interesting_files", "recently_modified"),
+)
+
+
+def build_fs_walk_plan(probes: tuple[RemoteProbe, ...]) -> tuple[RemoteProbe, ...]:
+    """Return ``probes`` with the walk-derived probes swapped for one shared walk."""
+
+    replaced = set(FS_WALK_REPLACES)
+    kept = tuple(probe for probe in probes if (probe.category, probe.key) not in replaced)
+    return (*kept, FS_WALK_PROBE)
+
+
+# Probe profiles. "standard" is the full catalogue. "quick" is a triage pass that
+# skips filesystem-wide scans, probes slower than QUICK_MAX_TIMEOUT and the
+# low-signal categories. "deep" gives every probe (and any inner ``timeout Ns``)
+# DEEP_TIMEOUT_FACTOR times as long, for slow disks and large trees.
+PROFILES = ("quick", "standard", "deep")
+DEFAULT_PROFILE = "standard"
+QUICK_MAX_TIMEOUT = 6
+QUICK_SKIP_CATEGORIES = ("hardware", "logs", "interesting_files")
+DEEP_TIMEOUT_FACTOR = 3
+
+_INNER_TIMEOUT_PATTERN = re.compile(r"\btimeout (\d+)s\b")
+
+
+def profile_probes(
+    profile: str, probes: tuple[RemoteProbe, ...] = REMOTE_PROBES
+) -> tuple[RemoteProbe, ...]:
+    """Return the probes run by ``profile``; raises ValueError for unknown names."""
+
+    if profile == "standard":
+        return probes
+    if profile == "quick":
+        return tuple(
+            probe
+            for probe in probes
+            if probe.timeout <= QUICK_MAX_TIMEOUT
+            and probe.category not in QUICK_SKIP_CATEGORIES
+            and (probe.category, probe.key) not in SCAN_PROBES
+        )
+    if profile == "deep":
+        return tuple(
+            replace(
+                probe,
+                timeout=probe.timeout * DEEP_TIMEOUT_FACTOR,
+                command=_INNER_TIMEOUT_PATTERN.sub(
+                    lambda match: f"timeout {int(match.group(1)) * DEEP_TIMEOUT_FACTOR}s",
+                    probe.command,
+                ),
+            )
+            for probe in probes
+        )
+    raise ValueError(f"Unknown profile {profile!r}; expected one of {', '.join(PROFILES)}")
+
+
+def select_probes(
+    probes: tuple[RemoteProbe, ...],
+    include: tuple[str, ...] = (),
+    exclude: tuple[str, ...] = (),
+) -> tuple[RemoteProbe, ...]:
+    """Filter ``probes`` by ``category`` or ``category.key`` patterns.
+
+    An empty ``include`` keeps everything; ``exclude`` always wins. Patterns
+    that match no probe raise ValueError so typos do not silently run nothing.
+    """
+
+    def matches(probe: RemoteProbe, pattern: str) -> bool:
+        return pattern in (probe.category, f"{probe.category}.{probe.key}")
+
+    for pattern in (*include, *exclude):
+        if not any(matches(probe, pattern) for probe in probes):
+            raise ValueError(f"No probe matches {pattern!r}")
+    return tuple(
+        probe
+        for probe in probes
+        if (not include or any(matches(probe, pattern) for pattern in include))
+        and not any(matches(probe, pattern) for pattern in exclude)
+    )
+
+
+# Incremental runs (enumerate --diff) reuse a stable probe from the previous
+# survey while every path listed for it keeps the same mtime, ctime and size.
+# The boot id changes on every reboot, which covers kernel and hardware facts.
+# Probes without an entry are volatile and always re-run.
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+PACKAGE_DB_PATHS = (
+    "/var/lib/dpkg/status",
+    "/var/lib/rpm",
+    "/lib/apk/db/installed",
+    "/var/lib/pacman/local",
+)
+
+PROBE_FINGERPRINTS: dict[tuple[str, str], tuple[str, ...]] = {
+    ("system", "os_release"): ("/etc/os-release",),
+    ("system", "kernel"): (BOOT_ID_PATH,),
+    ("system", "hostname"): ("/etc/hostname", BOOT_ID_PATH),
+    ("system", "timezone"): ("/etc/localtime", "/etc/timezone"),
+    ("system", "architecture"): (BOOT_ID_PATH,),
+    ("system", "cpu_model"): (BOOT_ID_PATH,),
+    ("users", "passwd"): ("/etc/passwd",),
+    ("users", "group"): ("/etc/group",),
+    ("users", "sudoers"): ("/etc/sudoers",),
+    ("users", "sudoers_d"): ("/etc/sudoers.d",),
+    ("users", "sudo_check"): ("/etc/sudoers", "/etc/sudoers.d", "/etc/group"),
+    ("users", "doas_conf"): ("/etc/doas.conf",),
+    ("users", "pkexec_version"): ("/usr/bin/pkexec",),
+    ("network", "dns"): ("/etc/resolv.conf",),
+    ("network", "hosts_file"): ("/etc/hosts",),
+    ("packages", "package_manager"): PACKAGE_DB_PATHS,
+    ("packages", "package_inventory"): PACKAGE_DB_PATHS,
+    ("packages", "package_counts"): PACKAGE_DB_PATHS,
+    ("filesystem", "fstab"): ("/etc/fstab",),
+    ("filesystem", "home_listing"): ("/home",),
+    ("filesystem", "nfs_exports"): ("/etc/exports",),
+    ("scheduled", "cron_system"): ("/etc/crontab",),
+    ("scheduled", "cron_d"): ("/etc/cron.d",),
+    ("scheduled", "cron_daily"): ("/etc/cron.daily",),
+    ("security", "ssh_config"): ("/etc/ssh/sshd_config",),
+    ("security", "ssh_effective_config"): ("/etc/ssh/sshd_config", "/etc/ssh/sshd_config.d"),
+    ("hardware", "cpu"): (BOOT_ID_PATH,),
+    ("hardware", "pci_devices"): (BOOT_ID_PATH,),
+    ("credentials", "shadow_readable"): ("/etc/shadow",),
+    ("writable", "writable_passwd"): ("/etc/passwd",),
+    ("writable", "writable_shadow"): ("/etc/shadow",),
+    ("interesting_files", "mail_files"): ("/var/mail", "/var/spool/mail"),
+    ("interesting_files", "opt_contents"): ("/opt",),
+}
+
+# Whole-filesystem scans have no cheap exact fingerprint. Incremental runs reuse
+# them while the package database and boot id are unchanged and the previous
+# survey is younger than SCAN_REUSE_MAX_AGE seconds.
+SCAN_REUSE_MAX_AGE = 3600
+SCAN_PROBES: tuple[tuple[str, str], ...] = (
+    ("filesystem", "suid_files"),
+    ("filesystem", "sgid_files"),
+    ("filesystem", "world_writable_dirs"),
+    ("filesystem", "fs_walk"),
+    ("capabilities", "cap_binaries"),
+    ("capabilities", "cap_interesting"),
+    ("library_hijack", "rpath_runpath"),
+    ("credentials", "config_credentials"),
+    ("interesting_files", "backup_files"),
+)
+for _scan in SCAN_PROBES:
+    PROBE_FINGERPRINTS[_scan] = (*PACKAGE_DB_PATHS, BOOT_ID_PATH)
+
+
+def _fingerprint_command() -> str:
+    paths = " ".join(sorted({path for paths in PROBE_FINGERPRINTS.values() for path in paths}))
+    return (
+        f"for f in {paths}; do "
+        'if [ ! -e "$f" ]; then printf \'%s|-\\n\' "$f"; '
+        f'elif [ "$f" = {BOOT_ID_PATH} ]; then printf \'%s|%s\\n\' "$f" "$(cat "$f")"; '
+        "else stat -L -c '%n|%Y.%Z.%s' \"$f\" 2>/dev/null || printf '%s|?\\n' \"$f\"; fi; done"
+    )
+
+
+# Always collected so the next incremental run has something to compare against
+FINGERPRINT_PROBE = RemoteProbe("meta", "fingerprints", _fingerprint_command(), timeout=5)
+
 
 @dataclass(frozen=True)
 class PriorityHeuristic:
@@ -0,0 +1,280 @@
+"""Cached remote fingerprint for LazySSH plugins.
+
+Plugins used to discover the remote architecture and tool set on every run:
+``upload-exec`` ran ``uname`` over a fresh SSH session each time and scripts
+probed ``command -v`` for every encoder or compressor. The fingerprint holds
+the architecture, OS, login shell and the paths of commonly needed tools,
+collected in a single round trip and cached as ``fingerprint.json`` in the
+connection directory. LazySSH passes the file path to every plugin as
+``LAZYSSH_FINGERPRINT``, plus ``LAZYSSH_REMOTE_ARCH``, ``LAZYSSH_REMOTE_OS``
+and ``LAZYSSH_REMOTE_TOOLS`` once the cache exists.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import subprocess
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from lazyssh.plugin_metrics import record_remote_command
+from lazyssh.plugins._arch_detection import RemoteArch, arch_from_uname
+from lazyssh.plugins._remote import RemoteTarget, current_target
+
+FINGERPRINT_ENV = "LAZYSSH_FINGERPRINT"
+FINGERPRINT_FILE = "fingerprint.json"
+# Tools get installed and removed, so a cached fingerprint is re-collected after a day
+FINGERPRINT_MAX_AGE = 24 * 60 * 60
+FINGERPRINT_VERSION = 1
+
+TOOLS = (
+    "base64",
+    "openssl",
+    "python3",
+    "python",
+    "xxd",
+    "tar",
+    "zstd",
+    "gzip",
+    "rsync",
+    "timeout",
+    "wc",
+)
+# sftp-server is rarely on PATH; these are the usual distro locations
+SFTP_SERVER_PATHS = (
+    "/usr/lib/openssh/sftp-server",
+    "/usr/libexec/openssh/sftp-server",
+    "/usr/lib/ssh/sftp-server",
+    "/usr/libexec/sftp-server",
+)
+
+FINGERPRINT_SCRIPT = "\n".join(
+    [
+        'echo "arch=$(uname -m 2>/dev/null)"',
+        'echo "os=$(uname -s 2>/dev/null)"',
+        'echo "shell=${SHELL:-}"',
+        f"for tool in {' '.join(TOOLS)} sftp-server; do",
+        '    found=$(command -v "$tool" 2>/dev/null) && echo "tool:$tool=$found"',
+        "done",
+        f"for found in {' '.join(SFTP_SERVER_PATHS)}; do",
+        '    if [ -x "$found" ]; then echo "tool:sftp-server=$found"; break; fi',
+        "done",
+        "exit 0",
+    ]
+)
+
+
+@dataclass(frozen=True)
+class RemoteFingerprint:
+    """Architecture, OS, shell and available tools of one connection."""
+
+    host: str
+    user: str
+    port: str | None
+    arch: str
+    os: str
+    shell: str = ""
+    tools: dict[str, str] = field(default_factory=dict)  # tool name -> remote path
+    collected_at: float = 0.0
+
+    def has(self, tool: str) -> bool:
+        """Whether ``tool`` was found on the remote host."""
+        return tool in self.tools
+
+    def remote_arch(self) -> RemoteArch:
+        """The msfvenom-compatible architecture, as ``detect_remote_arch`` reports it."""
+        return arch_from_uname(self.arch, self.os)
+
+    def matches(self, target: RemoteTarget) -> bool:
+        """Whether the fingerprint was collected for ``target``'s host and account."""
+        return (self.host, self.user, self.port or None) == (
+            target.host,
+            target.user,
+            target.port or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": FINGERPRINT_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> RemoteFingerprint:
+        """Build a fingerprint from :meth:`to_dict` output.
+
+        Raises:
+            ValueError: If the payload is from another format version or incomplete.
+        """
+        if payload.get("version") != FINGERPRINT_VERSION:
+            raise ValueError("Unsupported fingerprint version")
+        try:
+            return cls(
+                host=str(payload["host"]),
+                user=str(payload["user"]),
+                port=str(payload["port"]) if payload.get("port") else None,
+                arch=str(payload["arch"]),
+                os=str(payload["os"]),
+                shell=str(payload.get("shell", "")),
+                tools={str(k): str(v) for k, v in dict(payload.get("tools") or {}).items()},
+                collected_at=float(payload.get("collected_at", 0.0)),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Malformed fingerprint: {exc!r}") from exc
+
+
+def parse_fingerprint(
+    output: str, target: RemoteTarget, now: float | None = None
+) -> RemoteFingerprint:
+    """Parse the output of :data:`FINGERPRINT_SCRIPT`.
+
+    Raises:
+        RuntimeError: If the output has no architecture or OS.
+    """
+
+    values: dict[str, str] = {}
+    tools: dict[str, str] = {}
+    for line in output.splitlines():
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        if key.startswith("tool:"):
+            tools.setdefault(key[5:], value)
+        else:
+            values[key] = value
+    if not values.get("arch") or not values.get("os"):
+        raise RuntimeError(f"Unexpected fingerprint output: {output!r}")
+    return RemoteFingerprint(
+        host=target.host,
+        user=target.user,
+        port=target.port or None,
+        arch=values["arch"],
+        os=values["os"],
+        shell=values.get("shell", ""),
+        tools=tools,
+        collected_at=time.time() if now is None else now,
+    )
+
+
+def connection_fingerprint_path(connection_name: str) -> Path:
+    """Cache file in the directory of ``connection_name``, for fleet plugins."""
+
+    connection_dir = f"/tmp/lazyssh/{connection_name}.d"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
+    return Path(connection_dir) / FINGERPRINT_FILE
+
+
+def fingerprint_path(env: Mapping[str, str] | None = None) -> Path | None:
+    """Cache file from ``LAZYSSH_FINGERPRINT``, else in ``LAZYSSH_CONNECTION_DIR``."""
+
+    env = os.environ if env is None else env
+    if env.get(FINGERPRINT_ENV):
+        return Path(env[FINGERPRINT_ENV])
+    if env.get("LAZYSSH_CONNECTION_DIR"):
+        return Path(env["LAZYSSH_CONNECTION_DIR"]) / FINGERPRINT_FILE
+    return None
+
+
+def load_fingerprint(
+    path: Path,
+    target: RemoteTarget | None = None,
+    max_age: float = FINGERPRINT_MAX_AGE,
+    now: float | None = None,
+) -> RemoteFingerprint | None:
+    """The cached fingerprint at ``path`` if it is fresh and belongs to ``target``."""
+
+    try:
+        fingerprint = RemoteFingerprint.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, AttributeError):
+        return None
+    now = time.time() if now is None else now
+    if not 0 <= now - fingerprint.collected_at <= max_age:
+        return None
+    if target is not None and not fingerprint.matches(target):
+        return None
+    return fingerprint
+
+
+def save_fingerprint(path: Path, fingerprint: RemoteFingerprint) -> None:
+    """Atomically write ``fingerprint`` to ``path`` (mode 0600)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(fingerprint.to_dict(), handle, indent=2)
+    partial.replace(path)
+
+
+def collect_fingerprint(target: RemoteTarget, timeout: float = 15) -> RemoteFingerprint:
+    """Collect a fingerprint over ``target``'s control socket in one round trip.
+
+    Raises:
+        RuntimeError: If SSH execution fails or times out.
+    """
+
+    record_remote_command()
+    try:
+        result = subprocess.run(  # noqa: S603
+            # ssh joins its arguments into one string for the remote shell
+            target.ssh_command("sh", "-c", shlex.quote(FINGERPRINT_SCRIPT)),
+            text=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise RuntimeError("Fingerprint collection timed out") from exc
+    if result.returncode != 0:
+        raise RuntimeError(f"Fingerprint collection failed: {result.stderr.strip()}")
+    return parse_fingerprint(result.stdout, target)
+
+
+def get_fingerprint(
+    target: RemoteTarget | None = None,
+    refresh: bool = False,
+    env: Mapping[str, str] | None = None,
+    path: Path | None = None,
+) -> RemoteFingerprint:
+    """The connection's fingerprint, from the cache or collected and cached.
+
+    ``target`` defaults to the connection the plugin runs for and ``path`` to
+    its cache file; pass :func:`connection_fingerprint_path` for other
+    connections. A cache file that cannot be written only costs the next run
+    another round trip.
+
+    Raises:
+        RuntimeError: If there is no connection or collection fails.
+    """
+
+    target = target or current_target(env)
+    if target is None:
+        raise RuntimeError("Missing SSH environment variables for fingerprinting")
+    path = path or fingerprint_path(env)
+    if path is not None and not refresh:
+        cached = load_fingerprint(path, target)
+        if cached is not None:
+            return cached
+    fingerprint = collect_fingerprint(target)
+    if path is not None:
+        try:
+            save_fingerprint(path, fingerprint)
+        except OSError:
+            pass
+    return fingerprint
+
+
+def fingerprint_env(path: Path, target: RemoteTarget | None = None) -> dict[str, str]:
+    """Plugin environment variables for the cache at ``path``.
+
+    Always names the cache file; the summary variables are only set when a
+    fresh fingerprint for ``target`` is cached.
+    """
+
+    env = {FINGERPRINT_ENV: str(path)}
+    fingerprint = load_fingerprint(path, target)
+    if fingerprint is not None:
+        env["LAZYSSH_REMOTE_ARCH"] = fingerprint.arch
+        env["LAZYSSH_REMOTE_OS"] = fingerprint.os
+        env["LAZYSSH_REMOTE_TOOLS"] = ",".join(sorted(fingerprint.tools))
+    return env
@@ -1,9 +1,17 @@
-"""Embedded GTFOBins database for LazySSH enumeration cross-referencing.
+"""GTFOBins database for LazySSH enumeration cross-referencing.
 
-This module contains a curated subset of the GTFOBins database
-(https://gtfobins.github.io/) as Python data structures. No network access
-required at runtime. The database covers ~100 commonly exploitable binaries
-with SUID, sudo, and capabilities exploitation techniques.
+This module embeds a curated subset of the GTFOBins database
+(https://gtfobins.github.io/) as Python data structures, so no network access
+is required at runtime. The embedded set covers ~100 commonly exploitable
+binaries with SUID, sudo, and capabilities exploitation techniques.
+
+The full upstream dataset can be used instead by pointing
+``LAZYSSH_GTFOBINS`` at a local copy: the ``_gtfobins`` directory of the
+upstream repository (YAML front matter, needs PyYAML), or a single JSON/YAML
+file mapping binary names to their ``functions``. The dataset is compiled once
+into a compact ``marshal`` index under ``/tmp/lazyssh`` that is rebuilt only
+when the source changes, and is loaded on the first lookup rather than at
+import time. Embedded techniques fill in binaries the dataset does not cover.
 
 Each entry documents a single exploitation technique for a specific binary
 under a specific privilege context (suid, sudo, capabilities, etc.).
@@ -11,7 +19,16 @@ under a specific privilege context (suid, sudo, capabilities, etc.).
 
 from __future__ import annotations
 
+import hashlib
+import json
+import marshal
+import os
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from lazyssh.logging_module import APP_LOGGER
 
 
 @dataclass(frozen=True)
@@ -24,6 +41,38 @@ class GTFOBinsEntry:
     description: str
 
 
+DATASET_ENV = "LAZYSSH_GTFOBINS"
+INDEX_DIR = "/tmp/lazyssh"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
+INDEX_FORMAT = 1
+
+# Upstream function types kept in the index; network and library-load functions are not used
+FUNCTIONS = ("suid", "sudo", "capabilities", "limited-suid", "shell", "file-read", "file-write")
+
+# Descriptions for dataset techniques that do not carry one, keyed by privilege context.
+# The binary's unprivileged functions tell what the technique most likely yields.
+_CONTEXT_LABELS = {
+    "suid": "SUID",
+    "sudo": "sudo",
+    "capabilities": "Capabilities",
+    "limited-suid": "Limited SUID",
+}
+_OUTCOME_LABELS = (
+    ("shell", "shell escape"),
+    ("file-read", "file read"),
+    ("file-write", "file write"),
+)
+_PLAIN_DESCRIPTIONS = {
+    "shell": "Spawn shell via {binary}",
+    "file-read": "Read files via {binary}",
+    "file-write": "Write files via {binary}",
+}
+
+_YAML_SUFFIXES = frozenset({".md", ".yml", ".yaml"})
+
+# function -> binary -> ((command, description), ...)
+Techniques = dict[str, dict[str, tuple[tuple[str, str], ...]]]
+
+
 GTFOBINS_DB: tuple[GTFOBinsEntry, ...] = (
     # --- awk / gawk / mawk ---
     GTFOBinsEntry("awk", "sudo", "sudo awk 'BEGIN {{system(\"/bin/sh\")}}'", "Spawn shell via awk"),
@@ -1001,30 +1050,254 @@ GTFOBINS_DB: tuple[GTFOBinsEntry, ...] = (
     GTFOBinsEntry("sh", "suid", "sh -p", "SUID preserved-privilege shell via sh"),
 )
 
-# Pre-built indexes for O(1) lookup by (binary, capability)
-_SUID_INDEX: dict[str, list[GTFOBinsEntry]] = {}
-_SUDO_INDEX: dict[str, list[GTFOBinsEntry]] = {}
-_CAPABILITIES_INDEX: dict[str, list[GTFOBinsEntry]] = {}
 
-for _entry in GTFOBINS_DB:
-    if _entry.capability == "suid":
-        _SUID_INDEX.setdefault(_entry.binary, []).append(_entry)
-    elif _entry.capability == "sudo":
-        _SUDO_INDEX.setdefault(_entry.binary, []).append(_entry)
-    elif _entry.capability == "capabilities":
-        _CAPABILITIES_INDEX.setdefault(_entry.binary, []).append(_entry)
+class GTFOBinsDatabase:
+    """Compiled technique index with O(1) lookup by (function, binary)."""
+
+    def __init__(self, version: str, techniques: Techniques) -> None:
+        self.version = version
+        self._techniques = techniques
+        self._entries: dict[tuple[str, str], tuple[GTFOBinsEntry, ...]] = {}
+        self._binaries: dict[tuple[str, ...], frozenset[str]] = {}
+
+    def lookup(self, function: str, binary_name: str) -> tuple[GTFOBinsEntry, ...]:
+        """Techniques for ``binary_name`` under ``function``, built on first use."""
+        key = (function, binary_name)
+        entries = self._entries.get(key)
+        if entries is None:
+            raw = self._techniques.get(function, {}).get(binary_name, ())
+            entries = tuple(GTFOBinsEntry(binary_name, function, *item) for item in raw)
+            self._entries[key] = entries
+        return entries
+
+    def binaries(self, *functions: str) -> frozenset[str]:
+        """Names of binaries with a technique for any of ``functions``."""
+        names = self._binaries.get(functions)
+        if names is None:
+            names = frozenset(
+                name for function in functions for name in self._techniques.get(function, {})
+            )
+            self._binaries[functions] = names
+        return names
+
+
+def _embedded_techniques() -> Techniques:
+    techniques: dict[str, dict[str, list[tuple[str, str]]]] = {}
+    for entry in GTFOBINS_DB:
+        techniques.setdefault(entry.capability, {}).setdefault(entry.binary, []).append(
+            (entry.command_template, entry.description)
+        )
+    return {
+        function: {binary: tuple(items) for binary, items in by_binary.items()}
+        for function, by_binary in techniques.items()
+    }
+
+
+def _default_description(function: str, binary: str, functions: Mapping[str, Any]) -> str:
+    if function in _PLAIN_DESCRIPTIONS:
+        return _PLAIN_DESCRIPTIONS[function].format(binary=binary)
+    context = _CONTEXT_LABELS.get(function, function)
+    outcome = next((label for name, label in _OUTCOME_LABELS if name in functions), "technique")
+    return f"{context} {outcome} via {binary}"
+
+
+def _binary_techniques(
+    binary: str, functions: Mapping[str, Any]
+) -> Iterator[tuple[str, tuple[tuple[str, str], ...]]]:
+    for function in FUNCTIONS:
+        items: list[tuple[str, str]] = []
+        for technique in functions.get(function) or ():
+            if not isinstance(technique, Mapping) or not technique.get("code"):
+                continue
+            description = technique.get("description") or _default_description(
+                function, binary, functions
+            )
+            items.append((str(technique["code"]).strip(), " ".join(str(description).split())))
+        if items:
+            yield function, tuple(items)
+
+
+def _front_matter(text: str) -> Any:
+    # PyYAML is optional and only imported when a YAML dataset is actually compiled
+    try:  # pragma: no cover - optional YAML support for upstream GTFOBins checkouts
+        import yaml
+    except ImportError as exc:  # pragma: no cover - JSON datasets and the embedded set still work
+        raise ValueError("PyYAML is required to read GTFOBins YAML files") from exc
+    if text.startswith("---"):
+        text = text.split("---", 2)[1]
+    try:
+        return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))  # noqa: S506  # safe loaders only
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Invalid GTFOBins YAML: {exc}") from exc
+
+
+def _dataset_files(source: Path) -> list[Path]:
+    if source.is_dir():
+        return sorted(
+            path for path in source.iterdir() if path.is_file() and not path.name.startswith(".")
+        )
+    return [source]
+
+
+def _signature(source: Path) -> list[int]:
+    # Cheap staleness check: file count, newest mtime and total size, no sorting or parsing
+    if source.is_dir():
+        with os.scandir(source) as entries:
+            stats = [
+                entry.stat()
+                for entry in entries
+                if entry.is_file() and not entry.name.startswith(".")
+            ]
+    else:
+        stats = [source.stat()]
+    return [
+        len(stats),
+        max((s.st_mtime_ns for s in stats), default=0),
+        sum(s.st_size for s in stats),
+    ]
+
+
+def parse_dataset(source: Path) -> tuple[str, Techniques]:
+    """Read a GTFOBins dataset into ``(version, techniques)``.
+
+    ``source`` is either a directory with one YAML front matter file per binary
+    (the upstream ``_gtfobins`` layout) or a JSON/YAML file mapping binary
+    names to ``{"functions": {...}}``, optionally nested under ``executables``
+    next to a ``version`` key. Without a ``version`` the content hash is used.
+
+    Raises:
+        OSError: If the dataset cannot be read.
+        ValueError: If it is not a GTFOBins dataset.
+    """
+
+    binaries: dict[str, Any] = {}
+    declared: Any = None
+    digest = hashlib.sha256()
+    for path in _dataset_files(source):
+        text = path.read_text(encoding="utf-8")
+        digest.update(text.encode())
+        if source.is_dir():
+            name = path.stem if path.suffix in _YAML_SUFFIXES else path.name
+            binaries[name] = _front_matter(text)
+            continue
+        document = json.loads(text) if path.suffix == ".json" else _front_matter(text)
+        if not isinstance(document, dict):
+            raise ValueError(f"{path} is not a GTFOBins dataset")
+        declared = document.get("version")
+        binaries = document.get("executables", document)
+        if not isinstance(binaries, dict):
+            raise ValueError(f"{path} is not a GTFOBins dataset")
+
+    techniques: dict[str, dict[str, tuple[tuple[str, str], ...]]] = {}
+    for binary, details in binaries.items():
+        if not isinstance(details, Mapping):
+            continue
+        functions = details.get("functions", details)
+        if not isinstance(functions, Mapping):
+            continue
+        for function, items in _binary_techniques(binary, functions):
+            techniques.setdefault(function, {})[binary] = items
+    if not techniques:
+        raise ValueError(f"{source} contains no GTFOBins techniques")
+    return str(declared or digest.hexdigest()[:12]), techniques
+
+
+def compile_index(source: Path, index_dir: Path | None = None) -> GTFOBinsDatabase:
+    """Load ``source`` through its compiled index, rebuilding it when stale.
+
+    The index is a ``marshal`` file keyed by the resolved source path and
+    invalidated by the dataset's file count, newest mtime and total size.
+    Embedded techniques are merged in for binaries the dataset lacks.
+
+    Raises:
+        OSError: If the dataset cannot be read.
+        ValueError: If it is not a GTFOBins dataset.
+    """
+
+    source = source.resolve()
+    index_dir = index_dir or Path(INDEX_DIR)
+    name = hashlib.sha256(str(source).encode()).hexdigest()[:16]
+    index_path = index_dir / f"gtfobins-{name}.idx"
+    signature = _signature(source)
+    try:
+        with index_path.open("rb") as handle:
+            owner = os.fstat(handle.fileno())
+            if owner.st_uid != os.getuid() or owner.st_mode & 0o022:
+                raise ValueError("index not private to this user")
+            cached = marshal.loads(handle.read())  # noqa: S302  # private file written by compile_index
+        if cached["format"] == INDEX_FORMAT and cached["signature"] == signature:
+            return GTFOBinsDatabase(cached["version"], cached["techniques"])
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass
+
+    version, techniques = parse_dataset(source)
+    for function, by_binary in _embedded_techniques().items():
+        merged = techniques.setdefault(function, {})
+        for binary, items in by_binary.items():
+            merged.setdefault(binary, items)
+    payload = {
+        "format": INDEX_FORMAT,
+        "signature": signature,
+        "version": version,
+        "techniques": techniques,
+    }
+    try:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        partial = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(marshal.dumps(payload))
+        partial.replace(index_path)
+    except OSError as exc:
+        if APP_LOGGER:
+            APP_LOGGER.debug(f"Could not write GTFOBins index {index_path}: {exc}")
+    return GTFOBinsDatabase(version, techniques)
+
+
+_DATABASE: GTFOBinsDatabase | None = None
+
+
+def get_database() -> GTFOBinsDatabase:
+    """The active database, loaded on first use.
+
+    Uses the dataset named by ``LAZYSSH_GTFOBINS`` when it is set and
+    readable, and the embedded set otherwise.
+    """
+
+    global _DATABASE
+    if _DATABASE is None:
+        source = os.environ.get(DATASET_ENV)
+        if source:
+            try:
+                _DATABASE = compile_index(Path(source).expanduser())
+            except (OSError, ValueError) as exc:
+                if APP_LOGGER:
+                    APP_LOGGER.warning(f"Ignoring GTFOBins dataset {source}: {exc}")
+        if _DATABASE is None:
+            _DATABASE = GTFOBinsDatabase(f"embedded-{len(GTFOBINS_DB)}", _embedded_techniques())
+    return _DATABASE
+
+
+def database_version() -> str:
+    """Version of the active database (declared, content hash, or ``embedded-<n>``)."""
+    return get_database().version
+
+
+def lookup(binary_name: str, function: str) -> list[GTFOBinsEntry]:
+    """Return all techniques of one GTFOBins function type for a binary name."""
+    return list(get_database().lookup(function, binary_name))
 
 
 def lookup_suid(binary_name: str) -> list[GTFOBinsEntry]:
     """Return all SUID exploitation techniques for a given binary name."""
-    return list(_SUID_INDEX.get(binary_name, []))
+    return lookup(binary_name, "suid")
 
 
 def lookup_sudo(binary_name: str) -> list[GTFOBinsEntry]:
     """Return all sudo exploitation techniques for a given binary name."""
-    return list(_SUDO_INDEX.get(binary_name, []))
+    return lookup(binary_name, "sudo")
 
 
 def lookup_capabilities(binary_name: str) -> list[GTFOBinsEntry]:
     """Return all capabilities exploitation techniques for a given binary name."""
-    return list(_CAPABILITIES_INDEX.get(binary_name, []))
+    return lookup(binary_name, "capabilities")
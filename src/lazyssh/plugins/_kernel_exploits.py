@@ -2,16 +2,42 @@
 
 This module contains a curated database of well-known Linux kernel privilege
 escalation CVEs with affected version ranges. The ``suggest_exploits()``
-function parses a running kernel version string and returns matching entries
+function parses a running kernel release string and returns matching entries
 whose affected range contains that version.
 
-No network access is required at runtime — all data is embedded.
+Distribution kernels keep their base version while backporting fixes, so an
+upstream range alone reports long-fixed CVEs on e.g. ``4.4.0-213-generic``.
+``DISTRO_FIXES`` records the distro revision that fixed a CVE per kernel
+series; when ``/etc/os-release`` identifies the distribution family, a
+release at or above that revision is reported as patched instead.
+
+Ranges are held in an interval tree so a release is matched in logarithmic
+time however large the database grows. A larger CVE dataset can be merged in
+from a local JSON file named by ``LAZYSSH_KERNEL_EXPLOITS``.
+
+No network access is required at runtime — all data is embedded or local.
 """
 
 from __future__ import annotations
 
+import json
+import os
 import re
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from lazyssh.logging_module import APP_LOGGER
+
+DATASET_ENV = "LAZYSSH_KERNEL_EXPLOITS"
+
+# Upstream version, then the distro revision (Ubuntu ABI ``-91``, RHEL ``-348.12.2``)
+_RELEASE_RE = re.compile(r"(\d+(?:\.\d+)*)(?:-(\d+(?:\.\d+)*))?")
+_OS_RELEASE_FIELD_RE = re.compile(r'^(ID|ID_LIKE)=["\']?([^"\'\n]*)', re.MULTILINE)
+
+# Distribution families with a fix table, matched against ID and ID_LIKE
+_DISTRO_FAMILIES = ("ubuntu", "rhel")
 
 
 @dataclass(frozen=True)
@@ -26,55 +52,264 @@ class KernelExploit:
     reference_url: str
 
 
-def _parse_kernel_version(version_string: str) -> tuple[int, ...] | None:
-    """Extract a numeric version tuple from a kernel version string.
+@dataclass(frozen=True)
+class DistroFix:
+    """Distro revision of a kernel series that carries the fix for a CVE.
+
+    ``fixed_revision`` is compared with the revision of ``uname -r`` (``91``
+    in ``5.4.0-91-generic``); ``()`` marks a series that was never affected.
+    The entry decides for its series even outside the upstream range, since
+    distributions also backport the bug itself.
+    """
+
+    cve: str
+    family: str
+    kernel_version: tuple[int, ...]
+    fixed_revision: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class KernelRelease:
+    """A parsed ``uname -r`` string."""
+
+    version: tuple[int, ...]
+    revision: tuple[int, ...] = ()
+
+
+@dataclass(frozen=True)
+class KernelMatch:
+    """Exploits matching one kernel, plus CVEs excluded as backported."""
+
+    exploits: tuple[KernelExploit, ...]
+    patched: tuple[str, ...] = ()
+
 
-    Handles common formats:
-    - ``5.10.100``
-    - ``5.10.100-generic``
-    - ``4.15.0-213-generic``
-    - ``5.4.0-42-generic``
-    - ``6.1.0``
+def parse_kernel_release(release: str) -> KernelRelease | None:
+    """Split ``uname -r`` output into upstream version and distro revision.
 
+    ``4.15.0-213-generic`` gives ``(4, 15, 0)`` and ``(213,)``, and
+    ``4.18.0-348.12.2.el8_5.x86_64`` gives ``(4, 18, 0)`` and ``(348, 12, 2)``.
     Returns ``None`` when no version numbers can be extracted.
     """
-    match = re.match(r"(\d+(?:\.\d+)*)", version_string.strip())
+    match = _RELEASE_RE.match(release.strip())
     if not match:
         return None
-    parts = match.group(1).split(".")
-    return tuple(int(p) for p in parts)
+    version = tuple(int(p) for p in match.group(1).split("."))
+    revision = tuple(int(p) for p in match.group(2).split(".")) if match.group(2) else ()
+    return KernelRelease(version, revision)
 
 
-def _version_in_range(
-    version: tuple[int, ...],
-    min_ver: tuple[int, ...],
-    max_ver: tuple[int, ...],
-) -> bool:
-    """Return ``True`` when *version* falls within [min_ver, max_ver] inclusive.
+def distro_family(os_release: str) -> str | None:
+    """Distribution family with a fix table, from ``/etc/os-release`` text.
 
-    Tuples of different lengths are compared element-wise; shorter tuples are
-    logically padded with zeros for the comparison (Python's default tuple
-    comparison handles this correctly because ``(5, 4) < (5, 4, 1)``).
+    Derivatives count as their parent (Linux Mint as ``ubuntu``, Rocky Linux
+    as ``rhel``). Returns ``None`` for other or unknown distributions.
     """
-    return min_ver <= version <= max_ver
+    names: list[str] = []
+    for _key, value in _OS_RELEASE_FIELD_RE.findall(os_release):
+        names.extend(value.lower().split())
+    return next((family for family in _DISTRO_FAMILIES if family in names), None)
+
+
+class _IntervalNode:
+    """Centered interval tree node over ``(min_version, max_version, position)``."""
+
+    __slots__ = ("by_end", "by_start", "center", "left", "right")
+
+    def __init__(self, intervals: list[tuple[tuple[int, ...], tuple[int, ...], int]]) -> None:
+        endpoints = sorted(point for start, end, _ in intervals for point in (start, end))
+        self.center = endpoints[len(endpoints) // 2]
+        left = [item for item in intervals if item[1] < self.center]
+        right = [item for item in intervals if item[0] > self.center]
+        here = [item for item in intervals if item[0] <= self.center <= item[1]]
+        self.by_start = sorted(here, key=lambda item: item[0])
+        self.by_end = sorted(here, key=lambda item: item[1], reverse=True)
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+
+class KernelExploitIndex:
+    """Interval index over exploit version ranges with distro fix tables.
+
+    A query walks one root-to-leaf path and only visits ranges that contain
+    the version, so matching costs O(log n + matches) rather than a scan of
+    every range. Distro fix entries for the release's series are then applied
+    on top. Results are memoized per (release, distro family) because a
+    fleet usually runs a handful of distinct kernels.
+    """
+
+    def __init__(
+        self, exploits: Sequence[KernelExploit], distro_fixes: Iterable[DistroFix] = ()
+    ) -> None:
+        self.exploits = tuple(exploits)
+        intervals = [
+            (exploit.min_version, exploit.max_version, position)
+            for position, exploit in enumerate(self.exploits)
+            if exploit.min_version <= exploit.max_version
+        ]
+        self._root = _IntervalNode(intervals) if intervals else None
+        self._positions = {exploit.cve: position for position, exploit in enumerate(self.exploits)}
+        self._fixes: dict[tuple[str, tuple[int, ...]], dict[str, tuple[int, ...]]] = {}
+        for fix in distro_fixes:
+            self._fixes.setdefault((fix.family, fix.kernel_version), {})[fix.cve] = (
+                fix.fixed_revision
+            )
+        self._cache: dict[tuple[str, str | None], KernelMatch] = {}
+
+    def _stab(self, version: tuple[int, ...]) -> list[int]:
+        positions: list[int] = []
+        node = self._root
+        while node is not None:
+            if version < node.center:
+                for start, _end, position in node.by_start:
+                    if start > version:
+                        break
+                    positions.append(position)
+                node = node.left
+            elif version > node.center:
+                for _start, end, position in node.by_end:
+                    if end < version:
+                        break
+                    positions.append(position)
+                node = node.right
+            else:
+                positions.extend(position for _, _, position in node.by_start)
+                break
+        return positions
 
+    def match(self, kernel_release: str, os_release: str = "") -> KernelMatch:
+        """Exploits whose range contains ``kernel_release``, minus distro backports."""
+        family = distro_family(os_release) if os_release else None
+        key = (kernel_release.strip(), family)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        release = parse_kernel_release(kernel_release)
+        result = KernelMatch(())
+        if release is not None:
+            fixes = self._fixes.get((family, release.version), {}) if family else {}
+            positions = set(self._stab(release.version))
+            # A distro table is authoritative for its series, including bugs a
+            # distro backported into a kernel older than the upstream range
+            positions.update(self._positions[cve] for cve in fixes if cve in self._positions)
+            exploits: list[KernelExploit] = []
+            patched: list[str] = []
+            for position in sorted(positions):
+                exploit = self.exploits[position]
+                fixed = fixes.get(exploit.cve)
+                if fixed is not None and release.revision >= fixed:
+                    patched.append(exploit.cve)
+                else:
+                    exploits.append(exploit)
+            result = KernelMatch(tuple(exploits), tuple(patched))
+        self._cache[key] = result
+        return result
 
-def suggest_exploits(kernel_version: str) -> list[KernelExploit]:
+    def match_many(self, hosts: Iterable[tuple[str, str]]) -> list[KernelMatch]:
+        """Match ``(kernel_release, os_release)`` pairs, e.g. a whole fleet."""
+        return [self.match(kernel_release, os_release) for kernel_release, os_release in hosts]
+
+
+def _version(value: Any) -> tuple[int, ...]:
+    if isinstance(value, str):
+        value = value.split(".") if value else []
+    if not isinstance(value, list | tuple):
+        raise ValueError(f"Invalid version: {value!r}")
+    return tuple(int(part) for part in value)
+
+
+def load_dataset(path: Path) -> tuple[list[KernelExploit], list[DistroFix]]:
+    """Read exploits and distro fixes from a JSON file.
+
+    The file holds ``{"exploits": [...], "distro_fixes": [...]}``. Exploits
+    carry ``cve``, ``min_version``, ``max_version`` and optionally ``name``,
+    ``description`` and ``reference_url``; fixes carry ``cve``, ``family``
+    (``ubuntu`` or ``rhel``), ``kernel_version`` and ``fixed_revision``.
+    Versions may be dotted strings or integer lists.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not a valid dataset.
+    """
+
+    document = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(document, dict):
+        raise ValueError(f"{path} is not a kernel exploit dataset")
+    try:
+        exploits = [
+            KernelExploit(
+                cve=str(entry["cve"]),
+                name=str(entry.get("name") or entry["cve"]),
+                min_version=_version(entry["min_version"]),
+                max_version=_version(entry["max_version"]),
+                description=str(entry.get("description", "")),
+                reference_url=str(
+                    entry.get("reference_url") or f"https://nvd.nist.gov/vuln/detail/{entry['cve']}"
+                ),
+            )
+            for entry in document.get("exploits", [])
+        ]
+        fixes = [
+            DistroFix(
+                cve=str(entry["cve"]),
+                family=str(entry["family"]),
+                kernel_version=_version(entry["kernel_version"]),
+                fixed_revision=_version(entry["fixed_revision"]),
+            )
+            for entry in document.get("distro_fixes", [])
+        ]
+    except (AttributeError, KeyError, TypeError) as exc:
+        raise ValueError(f"{path} has a malformed entry: {exc!r}") from exc
+    return exploits, fixes
+
+
+def build_index(
+    exploits: Sequence[KernelExploit] = (), distro_fixes: Sequence[DistroFix] = ()
+) -> KernelExploitIndex:
+    """Index the embedded data merged with ``exploits`` and ``distro_fixes``.
+
+    Entries with an embedded CVE replace the embedded entry.
+    """
+
+    merged = {exploit.cve: exploit for exploit in KERNEL_EXPLOITS}
+    merged.update((exploit.cve, exploit) for exploit in exploits)
+    return KernelExploitIndex(list(merged.values()), [*DISTRO_FIXES, *distro_fixes])
+
+
+_INDEX: KernelExploitIndex | None = None
+
+
+def get_index(env: Mapping[str, str] | None = None) -> KernelExploitIndex:
+    """The shared index, built on first use.
+
+    Merges the dataset named by ``LAZYSSH_KERNEL_EXPLOITS`` when it is set
+    and readable.
+    """
+
+    global _INDEX
+    if _INDEX is None:
+        source = (os.environ if env is None else env).get(DATASET_ENV)
+        extra: tuple[list[KernelExploit], list[DistroFix]] = ([], [])
+        if source:
+            try:
+                extra = load_dataset(Path(source).expanduser())
+            except (OSError, ValueError) as exc:
+                if APP_LOGGER:
+                    APP_LOGGER.warning(f"Ignoring kernel exploit dataset {source}: {exc}")
+        _INDEX = build_index(*extra)
+    return _INDEX
+
+
+def suggest_exploits(kernel_version: str, os_release: str = "") -> list[KernelExploit]:
     """Return kernel exploits whose affected range contains *kernel_version*.
 
     *kernel_version* is a raw ``uname -r`` output string such as
-    ``"5.10.100-generic"``.  Returns an empty list when the version cannot be
-    parsed or no exploits match.
+    ``"5.10.100-generic"``. With the ``/etc/os-release`` text of a known
+    distribution family, CVEs its kernel revision already fixes are left out.
+    Returns an empty list when the version cannot be parsed or no exploits
+    match.
     """
-    parsed = _parse_kernel_version(kernel_version)
-    if parsed is None:
-        return []
-
-    matches: list[KernelExploit] = []
-    for exploit in KERNEL_EXPLOITS:
-        if _version_in_range(parsed, exploit.min_version, exploit.max_version):
-            matches.append(exploit)
-    return matches
+    return list(get_index().match(kernel_version, os_release).exploits)
 
 
 # ---------------------------------------------------------------------------
@@ -303,3 +538,33 @@ KERNEL_EXPLOITS: tuple[KernelExploit, ...] = (
         reference_url="https://nvd.nist.gov/vuln/detail/CVE-2024-1086",
     ),
 )
+
+
+# ---------------------------------------------------------------------------
+# Distro backports — first fixed kernel revision per distribution series,
+# from the Ubuntu Security Notices and Red Hat errata for each CVE
+# ---------------------------------------------------------------------------
+
+DISTRO_FIXES: tuple[DistroFix, ...] = (
+    # Dirty COW (USN-3104-1, USN-3105-1, RHSA-2016:2098, RHSA-2016:2105)
+    DistroFix("CVE-2016-5195", "ubuntu", (3, 2, 0), (113,)),
+    DistroFix("CVE-2016-5195", "ubuntu", (3, 13, 0), (100,)),
+    DistroFix("CVE-2016-5195", "ubuntu", (4, 4, 0), (45,)),
+    DistroFix("CVE-2016-5195", "ubuntu", (4, 8, 0), (26,)),
+    DistroFix("CVE-2016-5195", "rhel", (2, 6, 32), (642, 6, 2)),
+    DistroFix("CVE-2016-5195", "rhel", (3, 10, 0), (327, 36, 3)),
+    # Ubuntu OverlayFS (USN-4917-1)
+    DistroFix("CVE-2021-3493", "ubuntu", (4, 15, 0), (142,)),
+    DistroFix("CVE-2021-3493", "ubuntu", (5, 4, 0), (72,)),
+    DistroFix("CVE-2021-3493", "ubuntu", (5, 8, 0), (50,)),
+    # Sequoia (USN-5014-1, RHSA-2021:2725, RHSA-2021:2734)
+    DistroFix("CVE-2021-33909", "ubuntu", (4, 15, 0), (151,)),
+    DistroFix("CVE-2021-33909", "ubuntu", (5, 4, 0), (80,)),
+    DistroFix("CVE-2021-33909", "ubuntu", (5, 8, 0), (63,)),
+    DistroFix("CVE-2021-33909", "ubuntu", (5, 11, 0), (25,)),
+    DistroFix("CVE-2021-33909", "rhel", (3, 10, 0), (1160, 36, 2)),
+    DistroFix("CVE-2021-33909", "rhel", (4, 18, 0), (305, 10, 2)),
+    # Dirty Pipe (USN-5317-1; RHEL 9 shipped with the fix)
+    DistroFix("CVE-2022-0847", "ubuntu", (5, 13, 0), (35,)),
+    DistroFix("CVE-2022-0847", "rhel", (5, 14, 0), (70,)),
+)
@@ -0,0 +1,151 @@
+"""Local cache of generated msfvenom payloads.
+
+Every msfvenom run starts Metasploit, which takes several seconds, and the
+same payload is usually deployed many times, often across a whole fleet.
+Generated payloads are kept under ``~/.lazyssh/payloads`` (override with
+``LAZYSSH_PAYLOAD_CACHE``, ``off`` disables the cache), keyed by a hash of
+their generation parameters. Each entry records the SHA-256 of its content,
+which is verified before reuse. Once the cache grows beyond
+``LAZYSSH_PAYLOAD_CACHE_MB`` the least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+CACHE_ENV = "LAZYSSH_PAYLOAD_CACHE"
+CACHE_SIZE_ENV = "LAZYSSH_PAYLOAD_CACHE_MB"
+DEFAULT_CACHE_MB = 256
+CACHE_FORMAT = 1
+
+
+def cache_key(params: Mapping[str, Any]) -> str:
+    """Key of the payload generated from ``params`` (msfvenom options)."""
+
+    canonical = json.dumps({"cache_format": CACHE_FORMAT, **params}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+class PayloadCache:
+    """Size-bounded LRU store of payload files, one ``<key>.bin``/``<key>.json`` pair each."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.root / f"{key}.bin", self.root / f"{key}.json"
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        """Copy the cached payload for ``key`` to ``destination``.
+
+        Returns False on a miss. An entry whose content no longer matches its
+        recorded digest is removed and reported as a miss.
+        """
+
+        blob, meta = self._paths(key)
+        try:
+            recorded = json.loads(meta.read_text(encoding="utf-8"))["sha256"]
+            if _file_digest(blob) != recorded:
+                self.remove(key)
+                return False
+            shutil.copyfile(blob, destination)
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        now = time.time()
+        for path in (blob, meta):
+            try:
+                os.utime(path, (now, now))
+            except OSError:  # pragma: no cover - removed by a concurrent eviction
+                pass
+        return True
+
+    def store(self, key: str, source: Path, params: Mapping[str, Any]) -> None:
+        """Add ``source`` as the payload for ``key`` and evict down to the size limit.
+
+        Raises:
+            OSError: If the cache directory or entry cannot be written.
+        """
+
+        self.root.mkdir(parents=True, exist_ok=True, mode=0o700)
+        blob, meta = self._paths(key)
+        suffix = f".{os.getpid()}.tmp"
+        partial = blob.with_name(blob.name + suffix)
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as handle, source.open("rb") as payload:
+            shutil.copyfileobj(payload, handle)
+        partial.replace(blob)
+
+        record = {
+            "sha256": _file_digest(blob),
+            "size": blob.stat().st_size,
+            "params": dict(params),
+            "created": time.time(),
+        }
+        partial = meta.with_name(meta.name + suffix)
+        fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(record, handle, indent=2)
+        partial.replace(meta)
+        self.evict()
+
+    def remove(self, key: str) -> None:
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits ``max_bytes``.
+
+        Returns the number of entries removed.
+        """
+
+        entries: list[tuple[float, int, str]] = []  # (last use, size, key)
+        try:
+            blobs = list(os.scandir(self.root))
+        except OSError:
+            return 0
+        for entry in blobs:
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:  # pragma: no cover - removed concurrently
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.name[: -len(".bin")]))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(key)
+            total -= size
+            removed += 1
+        return removed
+
+
+def payload_cache(env: Mapping[str, str] | None = None) -> PayloadCache | None:
+    """The configured payload cache, or None when ``LAZYSSH_PAYLOAD_CACHE=off``."""
+
+    env = os.environ if env is None else env
+    location = env.get(CACHE_ENV, "").strip()
+    if location.lower() in {"off", "none", "0", "false"}:
+        return None
+    root = Path(location).expanduser() if location else Path.home() / ".lazyssh" / "payloads"
+    try:
+        max_mb = max(1, min(2**20, int(env.get(CACHE_SIZE_ENV, ""))))
+    except ValueError:
+        max_mb = DEFAULT_CACHE_MB
+    return PayloadCache(root, max_mb * 1024 * 1024)
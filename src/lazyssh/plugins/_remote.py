@@ -0,0 +1,83 @@
+"""Connection targets for LazySSH plugins.
+
+A plugin run is bound to one connection through the ``LAZYSSH_HOST``/
+``LAZYSSH_USER``/``LAZYSSH_SOCKET_PATH`` variables. LazySSH also passes every
+active connection as JSON in ``LAZYSSH_CONNECTIONS`` so that plugins can fan
+out across a fleet over the existing control sockets.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+CONNECTIONS_ENV = "LAZYSSH_CONNECTIONS"
+
+
+@dataclass(frozen=True)
+class RemoteTarget:
+    """One SSH connection reachable through its control socket."""
+
+    name: str
+    host: str
+    user: str
+    socket_path: str
+    port: str | None = None
+
+    def ssh_command(self, *remote_args: str) -> list[str]:
+        """``ssh`` argv that runs ``remote_args`` over the control socket."""
+        command = ["ssh", "-S", self.socket_path, "-o", "ControlMaster=no"]
+        if self.port:
+            command.extend(["-p", self.port])
+        command.append(f"{self.user}@{self.host}")
+        command.extend(remote_args)
+        return command
+
+
+def current_target(env: Mapping[str, str] | None = None) -> RemoteTarget | None:
+    """The connection the plugin was started for, or None outside a plugin run."""
+
+    env = os.environ if env is None else env
+    socket_path = env.get("LAZYSSH_SOCKET_PATH")
+    host = env.get("LAZYSSH_HOST")
+    user = env.get("LAZYSSH_USER")
+    if not (socket_path and host and user):
+        return None
+    name = env.get("LAZYSSH_SOCKET") or Path(socket_path).name
+    return RemoteTarget(name, host, user, socket_path, env.get("LAZYSSH_PORT") or None)
+
+
+def all_targets(env: Mapping[str, str] | None = None) -> list[RemoteTarget]:
+    """Every active connection, falling back to the current one.
+
+    Malformed entries in ``LAZYSSH_CONNECTIONS`` are skipped.
+    """
+
+    env = os.environ if env is None else env
+    targets: list[RemoteTarget] = []
+    try:
+        entries = json.loads(env.get(CONNECTIONS_ENV) or "[]")
+    except ValueError:
+        entries = []
+    for entry in entries if isinstance(entries, list) else []:
+        try:
+            port = entry.get("port")
+            targets.append(
+                RemoteTarget(
+                    name=str(entry["name"]),
+                    host=str(entry["host"]),
+                    user=str(entry["user"]),
+                    socket_path=str(entry["socket_path"]),
+                    port=str(port) if port else None,
+                )
+            )
+        except (AttributeError, KeyError):
+            continue
+    if not targets:
+        current = current_target(env)
+        if current is not None:
+            targets.append(current)
+    return targets
@@ -0,0 +1,480 @@
+"""SQLite archive of enumerate surveys.
+
+Every ``enumerate`` run is ingested into one database shared by all
+connections (``/tmp/lazyssh/surveys.sqlite3`` by default) with its priority
+findings and probe results, indexed by connection, host, time, category, key
+and severity. That turns questions such as "which hosts had passwordless sudo
+last week" into one indexed query instead of a grep over many JSON files.
+Old runs are pruned by age and by a per-connection run cap.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import re
+import sqlite3
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from lazyssh.logging_module import CONNECTION_LOG_DIR_TEMPLATE
+
+# Database location; "off" disables archiving
+STORE_PATH_ENV = "LAZYSSH_SURVEY_DB"
+DEFAULT_STORE_PATH = "/tmp/lazyssh/surveys.sqlite3"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
+RETENTION_DAYS_ENV = "LAZYSSH_SURVEY_RETENTION_DAYS"
+DEFAULT_RETENTION_DAYS = 30
+# Newest runs kept per connection regardless of age
+MAX_RUNS_PER_CONNECTION = 100
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    connection TEXT NOT NULL,
+    host TEXT NOT NULL,
+    collected_at REAL NOT NULL,
+    probe_count INTEGER NOT NULL,
+    warnings TEXT NOT NULL,
+    source TEXT,
+    UNIQUE (connection, collected_at)
+);
+CREATE INDEX IF NOT EXISTS runs_host_time ON runs (host, collected_at);
+CREATE INDEX IF NOT EXISTS runs_time ON runs (collected_at);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    evidence TEXT NOT NULL,
+    exploitation_difficulty TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_run ON findings (run_id);
+CREATE INDEX IF NOT EXISTS findings_key ON findings (key, severity);
+CREATE INDEX IF NOT EXISTS findings_category ON findings (category, severity);
+CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity);
+CREATE TABLE IF NOT EXISTS probes (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    category TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status INTEGER,
+    duration REAL,
+    stdout TEXT NOT NULL,
+    PRIMARY KEY (run_id, category, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS probes_key ON probes (category, key);
+"""
+
+_RELATIVE_TIME_RE = re.compile(r"^(\d+)([mhdw])$")
+_TIME_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def store_path(env: Mapping[str, str] | None = None) -> Path | None:
+    """Database path from ``LAZYSSH_SURVEY_DB``, or None when archiving is off."""
+
+    value = (os.environ if env is None else env).get(STORE_PATH_ENV) or DEFAULT_STORE_PATH
+    if value.lower() == "off":
+        return None
+    return Path(value)
+
+
+def retention_days(env: Mapping[str, str] | None = None) -> float:
+    """Age in days after which runs are pruned (``LAZYSSH_SURVEY_RETENTION_DAYS``)."""
+
+    value = (os.environ if env is None else env).get(RETENTION_DAYS_ENV, "")
+    try:
+        return float(value) if value else float(DEFAULT_RETENTION_DAYS)
+    except ValueError:
+        return float(DEFAULT_RETENTION_DAYS)
+
+
+def parse_time(value: str, now: datetime | None = None) -> datetime:
+    """Parse ``7d``/``24h``/``30m``/``2w`` (relative to now) or an ISO date/time.
+
+    Raises:
+        ValueError: If ``value`` is neither.
+    """
+
+    now = now or datetime.now(UTC)
+    match = _RELATIVE_TIME_RE.match(value.strip())
+    if match:
+        return now - timedelta(**{_TIME_UNITS[match.group(2)]: int(match.group(1))})
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}; use e.g. 7d, 24h or 2024-05-01") from None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+@dataclass(frozen=True)
+class StoredRun:
+    """One archived enumerate run."""
+
+    id: int
+    connection: str
+    host: str
+    collected_at: datetime
+    probe_count: int
+    finding_count: int
+    source: str | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "connection": self.connection,
+            "host": self.host,
+            "collected_at": self.collected_at.isoformat(timespec="seconds"),
+            "probe_count": self.probe_count,
+            "finding_count": self.finding_count,
+            "source": self.source,
+        }
+
+
+@dataclass(frozen=True)
+class StoredFinding:
+    """A priority finding together with the run it came from."""
+
+    run_id: int
+    connection: str
+    host: str
+    collected_at: datetime
+    key: str
+    category: str
+    severity: str
+    headline: str
+    detail: str
+    evidence: list[str]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "connection": self.connection,
+            "host": self.host,
+            "collected_at": self.collected_at.isoformat(timespec="seconds"),
+            "key": self.key,
+            "category": self.category,
+            "severity": self.severity,
+            "headline": self.headline,
+            "detail": self.detail,
+            "evidence": self.evidence,
+        }
+
+
+def _cutoff(max_age_days: float | None, now: datetime | None) -> float:
+    """Timestamp before which runs fall outside the retention window."""
+
+    if max_age_days is None:
+        max_age_days = retention_days()
+    return ((now or datetime.now(UTC)) - timedelta(days=max_age_days)).timestamp()
+
+
+def _timestamp(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=UTC)
+
+
+class SnapshotStore:
+    """Indexed archive of enumerate surveys backed by SQLite."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.parent.chmod(0o700)
+        # Concurrent enumerate runs (e.g. several plugin windows) wait on each other's writes
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA foreign_keys = ON")
+        self._db.execute("PRAGMA journal_mode = WAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self._db:
+                self._db.executescript(_SCHEMA)
+                self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.path.chmod(0o600)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> SnapshotStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def ingest(
+        self,
+        connection: str,
+        host: str,
+        payload: Mapping[str, Any],
+        source: str | None = None,
+    ) -> int | None:
+        """Archive one survey (the enumerate JSON payload) and return its run id.
+
+        Returns None when the same connection/collection time is already stored,
+        so re-importing saved surveys is harmless.
+        """
+
+        collected_at = parse_time(str(payload["collected_at"])).timestamp()
+        categories: Mapping[str, Mapping[str, Mapping[str, Any]]] = payload.get("categories", {})
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO runs "
+                "(connection, host, collected_at, probe_count, warnings, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    connection,
+                    host,
+                    collected_at,
+                    int(payload.get("probe_count", 0)),
+                    json.dumps(list(payload.get("warnings", []))),
+                    source,
+                ),
+            )
+            if not cursor.rowcount:
+                return None
+            run_id = cursor.lastrowid
+            self._db.executemany(
+                "INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        finding["key"],
+                        finding.get("category", ""),
+                        finding.get("severity", "info"),
+                        finding.get("headline", ""),
+                        finding.get("detail", ""),
+                        json.dumps(finding.get("evidence", [])),
+                        finding.get("exploitation_difficulty", ""),
+                    )
+                    for finding in payload.get("priority_findings", [])
+                ),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO probes VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        category,
+                        key,
+                        probe.get("status"),
+                        probe.get("duration"),
+                        probe.get("stdout", ""),
+                    )
+                    for category, mapping in categories.items()
+                    for key, probe in mapping.items()
+                ),
+            )
+        return run_id
+
+    def import_surveys(
+        self,
+        paths: Iterable[Path],
+        max_age_days: float | None = None,
+        now: datetime | None = None,
+    ) -> int:
+        """Ingest saved ``survey_*.json`` files; returns how many were new.
+
+        The connection is taken from the ``<connection>.d/logs`` directory the
+        file lives in. Unreadable files, and surveys older than ``max_age_days``
+        (which :meth:`prune` would delete again), are skipped.
+        """
+
+        cutoff = _cutoff(max_age_days, now)
+        imported = 0
+        for path in paths:
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+                if parse_time(str(payload["collected_at"])).timestamp() < cutoff:
+                    continue
+                connection = path.parent.parent.name.removesuffix(".d")
+                if self.ingest(connection, "", payload, source=str(path)) is not None:
+                    imported += 1
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return imported
+
+    def _filters(
+        self,
+        *,
+        host: str | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> tuple[list[str], list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if host:
+            clauses.append("(r.connection = ? OR r.host = ?)")
+            params.extend([host, host])
+        if since is not None:
+            clauses.append("r.collected_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("r.collected_at <= ?")
+            params.append(until.timestamp())
+        return clauses, params
+
+    def findings(
+        self,
+        *,
+        key: str | None = None,
+        category: str | None = None,
+        severities: Sequence[str] = (),
+        host: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        latest: bool = False,
+        limit: int | None = None,
+    ) -> list[StoredFinding]:
+        """Findings matching every given filter, newest run first.
+
+        ``latest`` restricts the search to each connection's most recent run,
+        i.e. "which hosts have this finding now".
+        """
+
+        clauses, params = self._filters(host=host, since=since, until=until)
+        if key:
+            clauses.append("f.key = ?")
+            params.append(key)
+        if category:
+            clauses.append("f.category = ?")
+            params.append(category)
+        if severities:
+            clauses.append(f"f.severity IN ({', '.join('?' * len(severities))})")
+            params.extend(severities)
+        if latest:
+            clauses.append(
+                "r.collected_at = (SELECT MAX(l.collected_at) FROM runs l "
+                "WHERE l.connection = r.connection)"
+            )
+        sql = (
+            "SELECT f.run_id, r.connection, r.host, r.collected_at, f.key, f.category, "
+            "f.severity, f.headline, f.detail, f.evidence "
+            "FROM findings f JOIN runs r ON r.id = f.run_id"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY r.collected_at DESC, r.connection, f.rowid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            StoredFinding(
+                run_id=row[0],
+                connection=row[1],
+                host=row[2],
+                collected_at=_timestamp(row[3]),
+                key=row[4],
+                category=row[5],
+                severity=row[6],
+                headline=row[7],
+                detail=row[8],
+                evidence=json.loads(row[9]),
+            )
+            for row in self._db.execute(sql, params)
+        ]
+
+    def runs(
+        self,
+        *,
+        host: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[StoredRun]:
+        """Archived runs, newest first."""
+
+        clauses, params = self._filters(host=host, since=since, until=until)
+        sql = (
+            "SELECT r.id, r.connection, r.host, r.collected_at, r.probe_count, r.source, "
+            "(SELECT COUNT(*) FROM findings f WHERE f.run_id = r.id) FROM runs r"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY r.collected_at DESC, r.connection"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [
+            StoredRun(
+                id=row[0],
+                connection=row[1],
+                host=row[2],
+                collected_at=_timestamp(row[3]),
+                probe_count=row[4],
+                finding_count=row[6],
+                source=row[5],
+            )
+            for row in self._db.execute(sql, params)
+        ]
+
+    def probe_output(self, run_id: int, category: str, key: str) -> str | None:
+        """Stored stdout of one probe of an archived run."""
+
+        row = self._db.execute(
+            "SELECT stdout FROM probes WHERE run_id = ? AND category = ? AND key = ?",
+            (run_id, category, key),
+        ).fetchone()
+        return None if row is None else str(row[0])
+
+    def prune(
+        self,
+        max_age_days: float | None = None,
+        max_runs: int = MAX_RUNS_PER_CONNECTION,
+        now: datetime | None = None,
+    ) -> int:
+        """Delete runs older than ``max_age_days`` or beyond each connection's newest
+        ``max_runs``; returns the number of runs removed.
+        """
+
+        with self._db:
+            removed = self._db.execute(
+                "DELETE FROM runs WHERE collected_at < ?", (_cutoff(max_age_days, now),)
+            ).rowcount
+            removed += self._db.execute(
+                "DELETE FROM runs WHERE id IN (SELECT id FROM ("
+                "SELECT id, ROW_NUMBER() OVER ("
+                "PARTITION BY connection ORDER BY collected_at DESC) AS position FROM runs"
+                ") WHERE position > ?)",
+                (max_runs,),
+            ).rowcount
+        return removed
+
+
+def saved_survey_paths() -> list[Path]:
+    """Every ``survey_*.json`` in the per-connection log directories."""
+
+    pattern = os.path.join(CONNECTION_LOG_DIR_TEMPLATE.format(connection_name="*"), "survey_*.json")
+    return sorted(Path(path) for path in glob.glob(pattern))
+
+
+def archive_surveys(
+    surveys: Iterable[tuple[str, str, Mapping[str, Any], str | None]],
+    path: Path | None = None,
+) -> int:
+    """Ingest ``(connection, host, payload, source)`` surveys and apply retention.
+
+    Returns the number of runs archived (0 when archiving is turned off).
+    Surveys already outside the retention window are not archived.
+
+    Raises:
+        sqlite3.Error: If the database cannot be written.
+        OSError: If its directory cannot be created.
+    """
+
+    path = path or store_path()
+    if path is None:
+        return 0
+    cutoff = _cutoff(None, None)
+    archived = 0
+    with SnapshotStore(path) as store:
+        for connection, host, payload, source in surveys:
+            if parse_time(str(payload["collected_at"])).timestamp() < cutoff:
+                continue
+            if store.ingest(connection, host, payload, source) is not None:
+                archived += 1
+        store.prune()
+    return archived
@@ -17,11 +17,18 @@ import base64
 import json
 import os
 import re
+import select
 import shlex
+import sqlite3
 import subprocess
 import sys
-from collections.abc import Mapping, Sequence
-from dataclasses import dataclass, field
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, cast
@@ -30,11 +37,15 @@ from lazyssh.console_instance import console, get_ui_config
 
 try:  # pragma: no cover - optional Rich import for fallback modes
     from rich import box
+    from rich.console import Group
+    from rich.live import Live
     from rich.panel import Panel
     from rich.table import Table
     from rich.text import Text
 except ImportError:  # pragma: no cover - Rich disabled or unavailable
     box = None  # type: ignore[assignment]  # fallback when Rich is unavailable
+    Group = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
+    Live = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
     Panel = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
     Table = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
     Text = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
@@ -45,20 +56,39 @@ except ImportError:  # pragma: no cover - provide safe fallbacks
     APP_LOGGER = None  # fallback when logging module is unavailable
     CONNECTION_LOG_DIR_TEMPLATE = "/tmp/lazyssh/{connection_name}.d/logs"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
 
+try:  # pragma: no cover - optional zstd support for compressed framed batches
+    import zstandard
+except ImportError:  # pragma: no cover - gzip is always available through zlib
+    zstandard = None
+
+from lazyssh.plugin_metrics import record_remote_command
 from lazyssh.plugins._enumeration_plan import (
+    DEFAULT_PROFILE,
+    FINGERPRINT_PROBE,
+    FS_WALK_PROBE,
+    FS_WALK_REPLACES,
     PRIORITY_HEURISTICS,
+    PROBE_FINGERPRINTS,
     REMOTE_PROBES,
+    SCAN_PROBES,
+    SCAN_REUSE_MAX_AGE,
     PriorityHeuristic,
     RemoteProbe,
+    build_fs_walk_plan,
+    profile_probes,
+    select_probes,
 )
-from lazyssh.plugins._gtfobins_data import lookup_capabilities, lookup_sudo, lookup_suid
-from lazyssh.plugins._kernel_exploits import suggest_exploits
+from lazyssh.plugins._gtfobins_data import GTFOBinsEntry, database_version, get_database
+from lazyssh.plugins._kernel_exploits import get_index
+from lazyssh.plugins._remote import RemoteTarget, all_targets
+from lazyssh.plugins._snapshot_store import archive_surveys
 
 Severity = str  # alias for readability; values constrained to "high", "medium", "info"
 
 # Lookup tables to keep probe metadata handy at runtime
 PROBE_LOOKUP: dict[tuple[str, str], RemoteProbe] = {
-    (probe.category, probe.key): probe for probe in REMOTE_PROBES
+    (probe.category, probe.key): probe
+    for probe in (*REMOTE_PROBES, FS_WALK_PROBE, FINGERPRINT_PROBE)
 }
 HEURISTIC_LOOKUP: dict[str, PriorityHeuristic] = {h.key: h for h in PRIORITY_HEURISTICS}
 
@@ -90,6 +120,7 @@ SEVERITY_STYLES: dict[str, str] = {
 }
 
 PROBE_DISPLAY_NAMES: dict[str, str] = {
+    "fs_walk": "Filesystem Walk",
     "suid_files": "SUID Binaries",
     "sgid_files": "SGID Binaries",
     "world_writable_dirs": "World-Writable Directories",
@@ -141,15 +172,47 @@ PROBE_DISPLAY_NAMES: dict[str, str] = {
 }
 
 DEFAULT_REMOTE_TIMEOUT = 240
+# Concurrent remote probe jobs for ``--parallel`` without an explicit count
+DEFAULT_PARALLEL_JOBS = 4
+MAX_PARALLEL_JOBS = 32
+# First line of a framed batch: "LAZYSSH-WIRE <framed|json> <compression>"
+WIRE_ANNOUNCEMENT = "LAZYSSH-WIRE"
+# Remote commands for whole-stream compression, in order of preference
+WIRE_COMPRESSORS = {"zstd": "zstd -q -c", "gzip": "gzip -c"}
+# Per-connection history of probe durations used by ``--budget``
+PROBE_DURATIONS_FILENAME = "probe_durations.json"
+# Probes listed in the "Slowest Probes" report section
+SLOWEST_PROBE_COUNT = 5
+# A probe that used this share of its timeout (or exited 124) is flagged as hanging
+NEAR_TIMEOUT_RATIO = 0.9
+# Value of a heuristic's findings when planning a ``--budget`` run
+SEVERITY_WEIGHTS = {"critical": 8.0, "high": 4.0, "medium": 2.0, "info": 1.0}
+# Hosts enumerated at once by ``--all-hosts`` (each runs its own probe batch)
+DEFAULT_FLEET_CONCURRENCY = 8
+# Hosts and evidence items listed per finding in the fleet report
+FLEET_HOSTS_SHOWN = 5
+FLEET_EVIDENCE_SHOWN = 6
+# Exploitability matrix rows shown in reports; the JSON output has every row
+MATRIX_ROWS_SHOWN = 20
+MATRIX_PATHS_SHOWN = 2
+_DIFFICULTY_ORDER = ("instant", "easy", "moderate")
 
 
 class RemoteExecutionError(RuntimeError):
     """Raised when the batched remote script fails to execute."""
 
-    def __init__(self, message: str, stdout: str = "", stderr: str = "") -> None:
+    def __init__(
+        self,
+        message: str,
+        stdout: str = "",
+        stderr: str = "",
+        snapshot: EnumerationSnapshot | None = None,
+    ) -> None:
         super().__init__(message)
         self.stdout = stdout
         self.stderr = stderr
+        # Probes parsed before the failure, when any arrived
+        self.snapshot = snapshot
 
 
 @dataclass
@@ -164,6 +227,17 @@ class ProbeOutput:
     stdout: str
     stderr: str
     encoding: str
+    # Remote clock (epoch seconds) around the probe and its raw output sizes
+    started_at: float | None = None
+    finished_at: float | None = None
+    stdout_bytes: int = 0
+    stderr_bytes: int = 0
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return max(0.0, self.finished_at - self.started_at)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -175,8 +249,18 @@ class ProbeOutput:
             "stdout": self.stdout,
             "stderr": self.stderr,
             "encoding": self.encoding,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": None if self.duration is None else round(self.duration, 3),
+            "stdout_bytes": self.stdout_bytes,
+            "stderr_bytes": self.stderr_bytes,
         }
 
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ProbeOutput:
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
 
 @dataclass
 class PriorityFinding:
@@ -211,6 +295,14 @@ class EnumerationSnapshot:
     collected_at: datetime
     probes: dict[str, dict[str, ProbeOutput]]
     warnings: list[str]
+    _facts: ParsedFacts | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def facts(self) -> ParsedFacts:
+        """Parsed views of the probe output, built lazily and shared by the heuristics."""
+        if self._facts is None:
+            self._facts = ParsedFacts(self)
+        return self._facts
 
 
 def _get_env_or_fail(name: str) -> str:
@@ -224,8 +316,23 @@ def _shell_quote(value: str) -> str:
     return shlex.quote(value)
 
 
-def build_remote_script(probes: Sequence[RemoteProbe]) -> str:
-    """Construct the batched shell script executed on the remote host."""
+def build_remote_script(
+    probes: Sequence[RemoteProbe],
+    parallel: int = 1,
+    wire: str = "json",
+    compressors: Sequence[str] = (),
+) -> str:
+    """Construct the batched shell script executed on the remote host.
+
+    With ``parallel`` > 1 the probes run as background jobs, at most
+    ``parallel`` at a time, and each JSON line is emitted as its probe
+    finishes (in completion order rather than probe order).
+
+    ``wire="framed"`` sends each probe as a length-prefixed frame of raw
+    bytes instead of a base64 JSON line, optionally piping the whole stream
+    through the first of ``compressors`` installed remotely (see
+    :class:`WireDecoder`). Hosts without ``wc`` fall back to JSON lines.
+    """
 
     header_lines = [
         "#!/bin/sh",
@@ -286,6 +393,22 @@ def build_remote_script(probes: Sequence[RemoteProbe]) -> str:
         "        ;;",
         "esac",
         "",
+        "probe_clock() {",
+        "    clock=$(date +%s.%N 2>/dev/null || date +%s)",
+        '    case "$clock" in',
+        "        ''|*[!0-9.]*) clock=$(date +%s) ;;",
+        "    esac",
+        "    printf '%s' \"$clock\"",
+        "}",
+        "",
+        "byte_count() {",
+        "    count=$(wc -c <\"$1\" 2>/dev/null | tr -d ' ')",
+        '    case "$count" in',
+        "        ''|*[!0-9]*) count=0 ;;",
+        "    esac",
+        "    printf '%s' \"$count\"",
+        "}",
+        "",
         "run_probe() {",
         "    category=$1",
         "    key=$2",
@@ -295,6 +418,7 @@ def build_remote_script(probes: Sequence[RemoteProbe]) -> str:
         "    tmp_stderr=$(mktemp)",
         '    cat >"$tmp_cmd"',
         '    chmod 600 "$tmp_cmd"',
+        "    started=$(probe_clock)",
         "    set +e",
         "    if command -v timeout >/dev/null 2>&1; then",
         '        timeout "$timeout_secs" sh "$tmp_cmd" >"$tmp_stdout" 2>"$tmp_stderr"',
@@ -303,63 +427,426 @@ def build_remote_script(probes: Sequence[RemoteProbe]) -> str:
         "    fi",
         "    status=$?",
         "    set -e",
+        "    finished=$(probe_clock)",
         '    stdout_payload=$(encode_stream <"$tmp_stdout")',
         '    stderr_payload=$(encode_stream <"$tmp_stderr")',
-        '    printf \'{"category":"%s","key":"%s","status":%s,"encoding":"%s","stdout":"%s","stderr":"%s"}\' "$category" "$key" "$status" "$ENCODING_KIND" "$stdout_payload" "$stderr_payload"',
+        '    printf \'{"category":"%s","key":"%s","status":%s,"encoding":"%s","stdout":"%s","stderr":"%s",\' "$category" "$key" "$status" "$ENCODING_KIND" "$stdout_payload" "$stderr_payload"',
+        '    printf \'"started":%s,"finished":%s,"stdout_bytes":%s,"stderr_bytes":%s}\' "$started" "$finished" "$(byte_count "$tmp_stdout")" "$(byte_count "$tmp_stderr")"',
         "    echo",
         '    rm -f "$tmp_cmd" "$tmp_stdout" "$tmp_stderr"',
         "}",
         "",
     ]
 
-    body_lines: list[str] = []
+    if parallel > 1:
+        body_lines = _build_parallel_body(probes, parallel)
+    else:
+        body_lines = []
+        for index, probe in enumerate(probes):
+            heredoc = f"LAZYSSH_CMD_{index}"
+            body_lines.append(
+                f"run_probe {_shell_quote(probe.category)} {_shell_quote(probe.key)} {probe.timeout} <<'{heredoc}'"
+            )
+            body_lines.append(probe.command)
+            body_lines.append(heredoc)
+            body_lines.append("")
+
+    if wire != "framed":
+        return "\n".join(header_lines + body_lines)
+    return "\n".join(
+        header_lines
+        + _build_framed_preamble(compressors, sequential=parallel <= 1)
+        + ["lazyssh_probes() {", *body_lines, ":", "}", ""]
+        + _build_framed_dispatch(compressors)
+    )
+
+
+def _build_framed_preamble(compressors: Sequence[str], sequential: bool) -> list[str]:
+    """Wire selection, frame emitter and, for sequential batches, a framed ``run_probe``.
+
+    A frame is ``F <category> <key> <status> <started> <finished> <stdout_len>
+    <stderr_len>`` on one line followed by the raw stdout and stderr bytes.
+    Sequential probes reuse two output files in one work directory rather
+    than creating temp files per probe; parallel batches frame the output
+    files of their existing job directory.
+    """
+
+    lines = [
+        "LAZYSSH_WIRE=json",
+        "if command -v wc >/dev/null 2>&1; then",
+        "    LAZYSSH_WIRE=framed",
+        "fi",
+        "LAZYSSH_COMPRESS=none",
+    ]
+    if compressors:
+        lines += [
+            'if [ "$LAZYSSH_WIRE" = framed ]; then',
+            f"    for candidate in {' '.join(_shell_quote(name) for name in compressors)}; do",
+            '        if command -v "$candidate" >/dev/null 2>&1; then',
+            '            LAZYSSH_COMPRESS="$candidate"',
+            "            break",
+            "        fi",
+            "    done",
+            "fi",
+        ]
+    lines += [
+        "",
+        "emit_frame() {",
+        '    printf \'F %s %s %s %s %s %s %s\\n\' "$1" "$2" "$3" "$4" "$5" "$(byte_count "$6")" "$(byte_count "$7")"',
+        '    cat "$6" "$7"',
+        "}",
+        "",
+    ]
+    if not sequential:
+        return lines
+    lines += [
+        'if [ "$LAZYSSH_WIRE" = framed ]; then',
+        "    LAZYSSH_FRAMES=$(mktemp -d)",
+        "    trap 'rm -rf \"$LAZYSSH_FRAMES\"' EXIT",
+        "    run_probe() {",
+        "        probe_cmd=$(cat)",
+        "        started=$(probe_clock)",
+        "        set +e",
+        "        if command -v timeout >/dev/null 2>&1; then",
+        '            timeout "$3" sh -c "$probe_cmd" >"$LAZYSSH_FRAMES/out" 2>"$LAZYSSH_FRAMES/err"',
+        "        else",
+        '            sh -c "$probe_cmd" >"$LAZYSSH_FRAMES/out" 2>"$LAZYSSH_FRAMES/err"',
+        "        fi",
+        "        status=$?",
+        "        set -e",
+        "        finished=$(probe_clock)",
+        '        emit_frame "$1" "$2" "$status" "$started" "$finished" "$LAZYSSH_FRAMES/out" "$LAZYSSH_FRAMES/err"',
+        "    }",
+        "fi",
+        "",
+    ]
+    return lines
+
+
+def _build_framed_dispatch(compressors: Sequence[str]) -> list[str]:
+    """Announce the chosen wire format, then run the probes through the compressor."""
+
+    lines = [
+        'if [ "$LAZYSSH_WIRE" = framed ]; then',
+        f"    printf '{WIRE_ANNOUNCEMENT} framed %s\\n' \"$LAZYSSH_COMPRESS\"",
+        '    case "$LAZYSSH_COMPRESS" in',
+    ]
+    for name in compressors:
+        lines.append(f"        {name}) lazyssh_probes | {WIRE_COMPRESSORS[name]} ;;")
+    lines += [
+        "        *) lazyssh_probes ;;",
+        "    esac",
+        "else",
+        f"    printf '{WIRE_ANNOUNCEMENT} json none\\n'",
+        "    lazyssh_probes",
+        "fi",
+        "",
+    ]
+    return lines
+
+
+def _build_parallel_body(probes: Sequence[RemoteProbe], parallel: int) -> list[str]:
+    """Script body that runs probes as background jobs behind a FIFO semaphore.
+
+    Fd 3 holds one token per free job slot and fd 4 carries the indexes of
+    finished probes to a single collector, so JSON lines are never interleaved.
+    Without ``mkfifo`` the script degrades to running the probes one by one.
+    """
+
+    lines = [
+        "LAZYSSH_WORK=$(mktemp -d)",
+        "trap 'rm -rf \"$LAZYSSH_WORK\"' EXIT",
+        "HAS_TIMEOUT=0",
+        "if command -v timeout >/dev/null 2>&1; then",
+        "    HAS_TIMEOUT=1",
+        "fi",
+        "",
+        "run_probe_file() {",
+        '    job="$LAZYSSH_WORK/$1"',
+        "    started=$(probe_clock)",
+        "    set +e",
+        '    if [ "$HAS_TIMEOUT" = 1 ]; then',
+        '        timeout "$4" sh "$job.cmd" >"$job.stdout" 2>"$job.stderr"',
+        "    else",
+        '        sh "$job.cmd" >"$job.stdout" 2>"$job.stderr"',
+        "    fi",
+        "    status=$?",
+        "    set -e",
+        "    finished=$(probe_clock)",
+        '    if [ "${LAZYSSH_WIRE:-json}" = framed ]; then',
+        '        emit_frame "$2" "$3" "$status" "$started" "$finished" "$job.stdout" "$job.stderr" >"$job.json"',
+        "    else",
+        '        stdout_payload=$(encode_stream <"$job.stdout")',
+        '        stderr_payload=$(encode_stream <"$job.stderr")',
+        '        printf \'{"category":"%s","key":"%s","status":%s,"encoding":"%s","stdout":"%s","stderr":"%s",\' "$2" "$3" "$status" "$ENCODING_KIND" "$stdout_payload" "$stderr_payload" >"$job.json"',
+        '        printf \'"started":%s,"finished":%s,"stdout_bytes":%s,"stderr_bytes":%s}\\n\' "$started" "$finished" "$(byte_count "$job.stdout")" "$(byte_count "$job.stderr")" >>"$job.json"',
+        "    fi",
+        '    rm -f "$job.cmd" "$job.stdout" "$job.stderr"',
+        "}",
+        "",
+        "collect_results() {",
+        "    remaining=$1",
+        '    while [ "$remaining" -gt 0 ] && read -r done_index <&4; do',
+        '        cat "$LAZYSSH_WORK/$done_index.json"',
+        '        rm -f "$LAZYSSH_WORK/$done_index.json"',
+        "        remaining=$((remaining - 1))",
+        "    done",
+        "}",
+        "",
+        "launch_probe() {",
+        '    if [ "$LAZYSSH_JOBS" -gt 1 ]; then',
+        "        read -r _ <&3",
+        "        { run_probe_file \"$@\"; printf '%s\\n' \"$1\" >&4; printf '\\n' >&3; } &",
+        "    else",
+        '        run_probe_file "$@"',
+        '        cat "$LAZYSSH_WORK/$1.json"',
+        '        rm -f "$LAZYSSH_WORK/$1.json"',
+        "    fi",
+        "}",
+        "",
+        f"LAZYSSH_JOBS={parallel}",
+        'if mkfifo "$LAZYSSH_WORK/slots" "$LAZYSSH_WORK/done" 2>/dev/null; then',
+        '    exec 3<>"$LAZYSSH_WORK/slots" 4<>"$LAZYSSH_WORK/done"',
+        "    slot=0",
+        '    while [ "$slot" -lt "$LAZYSSH_JOBS" ]; do',
+        "        printf '\\n' >&3",
+        "        slot=$((slot + 1))",
+        "    done",
+        f"    collect_results {len(probes)} &",
+        "else",
+        "    LAZYSSH_JOBS=1",
+        "fi",
+        "",
+    ]
+
     for index, probe in enumerate(probes):
         heredoc = f"LAZYSSH_CMD_{index}"
-        body_lines.append(
-            f"run_probe {_shell_quote(probe.category)} {_shell_quote(probe.key)} {probe.timeout} <<'{heredoc}'"
-        )
-        body_lines.append(probe.command)
-        body_lines.append(heredoc)
-        body_lines.append("")
+        lines.append(f"cat >\"$LAZYSSH_WORK/{index}.cmd\" <<'{heredoc}'")
+        lines.append(probe.command)
+        lines.append(heredoc)
+        lines.append("")
 
-    return "\n".join(header_lines + body_lines)
+    # Longest timeouts first so the slow finds start immediately instead of
+    # landing at the tail of the run.
+    order = sorted(range(len(probes)), key=lambda i: probes[i].timeout, reverse=True)
+    for index in order:
+        probe = probes[index]
+        lines.append(
+            f"launch_probe {index} {_shell_quote(probe.category)} {_shell_quote(probe.key)} {probe.timeout}"
+        )
+    lines.append("wait")
+    lines.append("")
+    return lines
 
 
-def execute_remote_batch(
-    script: str, timeout: int = DEFAULT_REMOTE_TIMEOUT
-) -> tuple[int, str, str]:
-    """Send the batched script to the remote host over the existing control socket."""
+def _remote_shell_command(target: RemoteTarget | None = None) -> list[str]:
+    """ssh command that runs ``sh -s`` on ``target`` (default: this plugin's host)."""
 
-    socket_path = _get_env_or_fail("LAZYSSH_SOCKET_PATH")
-    host = _get_env_or_fail("LAZYSSH_HOST")
-    user = _get_env_or_fail("LAZYSSH_USER")
-    port = os.environ.get("LAZYSSH_PORT")
+    if target is None:
+        target = RemoteTarget(
+            name=os.environ.get("LAZYSSH_SOCKET", ""),
+            host=_get_env_or_fail("LAZYSSH_HOST"),
+            user=_get_env_or_fail("LAZYSSH_USER"),
+            socket_path=_get_env_or_fail("LAZYSSH_SOCKET_PATH"),
+            port=os.environ.get("LAZYSSH_PORT") or None,
+        )
+    return target.ssh_command("sh", "-s")
 
-    ssh_cmd: list[str] = ["ssh", "-S", socket_path, "-o", "ControlMaster=no"]
-    if port:  # pragma: no branch - depends on environment
-        ssh_cmd.extend(["-p", port])
-    ssh_cmd.append(f"{user}@{host}")
-    ssh_cmd.extend(["sh", "-s"])
 
+def _write_script(pipe: Any, script: str) -> None:
     try:
-        result = subprocess.run(  # noqa: S603,S607 - executed via controlled inputs
-            ssh_cmd,
-            input=script,
-            text=True,
-            capture_output=True,
-            timeout=timeout,
-        )
-        return result.returncode, result.stdout, result.stderr
-    except subprocess.TimeoutExpired as exc:  # pragma: no cover - rare slow hosts
-        stdout_str = (
-            exc.stdout.decode("utf-8") if isinstance(exc.stdout, bytes) else (exc.stdout or "")
-        )
-        stderr_str = (
-            exc.stderr.decode("utf-8") if isinstance(exc.stderr, bytes) else (exc.stderr or "")
-        )
+        pipe.write(script.encode("utf-8"))
+    except OSError:  # pragma: no cover - remote side exited before reading everything
+        pass
+    finally:
+        try:
+            pipe.close()
+        except OSError:  # pragma: no cover - broken pipe on close
+            pass
+
+
+def stream_remote_bytes(
+    script: str,
+    on_data: Callable[[bytes], None],
+    timeout: int = DEFAULT_REMOTE_TIMEOUT,
+    target: RemoteTarget | None = None,
+) -> tuple[int, str]:
+    """Run the batched script remotely, passing raw stdout chunks to ``on_data`` as they arrive.
+
+    Returns the exit code and the collected stderr. ``target`` defaults to the
+    connection the plugin was started for.
+
+    Raises:
+        RemoteExecutionError: If the batch does not finish within ``timeout`` seconds.
+    """
+
+    ssh_cmd = _remote_shell_command(target)
+    record_remote_command()
+    process = subprocess.Popen(  # noqa: S603 - executed via controlled inputs
+        ssh_cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    # Feed the script from a thread so a chatty remote cannot deadlock us on stdin
+    writer = threading.Thread(target=_write_script, args=(process.stdin, script), daemon=True)
+    writer.start()
+
+    if process.stdout is None or process.stderr is None:
+        raise RuntimeError("subprocess pipes not available")  # pragma: no cover
+    streams = {process.stdout.fileno(): True, process.stderr.fileno(): False}
+    for fd in streams:
+        os.set_blocking(fd, False)
+    stderr_parts: list[bytes] = []
+    deadline = time.time() + timeout
+    try:
+        while streams:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                raise RemoteExecutionError(
+                    "Remote enumeration timed out",
+                    stdout="",
+                    stderr=b"".join(stderr_parts).decode("utf-8", errors="replace"),
+                )
+            readable, _, _ = select.select(list(streams), [], [], min(0.2, remaining))
+            for fd in readable:
+                try:
+                    data = os.read(fd, 65536)
+                except BlockingIOError:  # pragma: no cover - spurious wakeup
+                    continue
+                if not data:
+                    del streams[fd]
+                elif streams[fd]:
+                    on_data(data)
+                else:
+                    stderr_parts.append(data)
+        returncode = process.wait(timeout=max(0.1, deadline - time.time()))
+    except subprocess.TimeoutExpired:  # pragma: no cover - pipes closed but process lingers
         raise RemoteExecutionError(
-            "Remote enumeration timed out", stdout=stdout_str, stderr=stderr_str
-        )
+            "Remote enumeration timed out",
+            stdout="",
+            stderr=b"".join(stderr_parts).decode("utf-8", errors="replace"),
+        ) from None
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        writer.join(timeout=1)
+        process.stdout.close()
+        process.stderr.close()
+    return returncode, b"".join(stderr_parts).decode("utf-8", errors="replace")
+
+
+def available_compressors() -> tuple[str, ...]:
+    """Stream compressors this side can decode, in order of preference."""
+
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+class WireDecoder:
+    """Incremental decoder for the batch's stdout in either wire format.
+
+    Before a ``LAZYSSH-WIRE`` announcement (and after ``LAZYSSH-WIRE json``)
+    the stream is JSON lines, passed to ``on_line``. After ``LAZYSSH-WIRE
+    framed <compression>`` it is decompressed and split into length-prefixed
+    frames, each passed to ``on_payload`` as a plain-encoded probe payload.
+    A malformed frame stops decoding and is reported through ``error``.
+    """
+
+    def __init__(
+        self,
+        on_line: Callable[[str], None],
+        on_payload: Callable[[dict[str, Any]], None],
+    ) -> None:
+        self._on_line = on_line
+        self._on_payload = on_payload
+        self._lines = bytearray()
+        self._frames = bytearray()
+        self._decompressor: Any = None
+        self.wire_format: str | None = None
+        self.compression = "none"
+        self.wire_bytes = 0
+        self.error: str | None = None
+
+    def feed(self, data: bytes) -> None:
+        self.wire_bytes += len(data)
+        if self.wire_format == "framed":
+            self._feed_frames(data)
+            return
+        self._lines += data
+        while (newline := self._lines.find(b"\n")) >= 0:
+            text = self._lines[: newline + 1].decode("utf-8", errors="replace")
+            del self._lines[: newline + 1]
+            if self.wire_format is None and text.startswith(f"{WIRE_ANNOUNCEMENT} "):
+                self._start(text.split())
+                if self.wire_format == "framed":
+                    rest = bytes(self._lines)
+                    self._lines.clear()
+                    self._feed_frames(rest)
+                    return
+                continue
+            self._on_line(text)
+
+    def close(self) -> None:
+        """Flush whatever is buffered once the stream has ended."""
+        if self.wire_format == "framed":
+            if self._decompressor is not None and hasattr(self._decompressor, "flush"):
+                self._parse_frames(self._decompressor.flush())
+            if self._frames and self.error is None:
+                self.error = "Framed batch ended in the middle of a probe"
+        elif self._lines:
+            self._on_line(self._lines.decode("utf-8", errors="replace"))
+            self._lines.clear()
+
+    def _start(self, parts: list[str]) -> None:
+        self.wire_format = parts[1] if len(parts) > 1 else "json"
+        self.compression = parts[2] if len(parts) > 2 else "none"
+        if self.compression == "gzip":
+            self._decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        elif self.compression == "zstd" and zstandard is not None:  # pragma: no cover
+            self._decompressor = zstandard.ZstdDecompressor().decompressobj()
+        elif self.compression != "none":
+            self.error = f"Unsupported batch compression {self.compression!r}"
+
+    def _feed_frames(self, data: bytes) -> None:
+        if self.error is not None:
+            return
+        try:
+            if self._decompressor is not None:
+                data = self._decompressor.decompress(data)
+        except zlib.error as exc:
+            self.error = f"Corrupt compressed batch: {exc}"
+            return
+        self._parse_frames(data)
+
+    def _parse_frames(self, data: bytes) -> None:
+        self._frames += data
+        while self.error is None and (newline := self._frames.find(b"\n")) >= 0:
+            header = self._frames[:newline].decode("utf-8", errors="replace").split()
+            try:
+                if len(header) != 8 or header[0] != "F":
+                    raise ValueError(header)
+                stdout_len, stderr_len = int(header[6]), int(header[7])
+                payload: dict[str, Any] = {
+                    "category": header[1],
+                    "key": header[2],
+                    "status": int(header[3]),
+                    "started": float(header[4]),
+                    "finished": float(header[5]),
+                }
+            except ValueError:
+                self.error = f"Malformed frame header: {' '.join(header)[:80]}"
+                return
+            end = newline + 1 + stdout_len + stderr_len
+            if len(self._frames) < end:
+                return
+            body = bytes(self._frames[newline + 1 : end])
+            del self._frames[:end]
+            payload.update(
+                encoding="plain",
+                stdout=body[:stdout_len].decode("utf-8", errors="replace"),
+                stderr=body[stdout_len:].decode("utf-8", errors="replace"),
+                stdout_bytes=stdout_len,
+                stderr_bytes=stderr_len,
+            )
+            self._on_payload(payload)
 
 
 def _decode_payload(payload: str, encoding: str) -> str:
@@ -380,94 +867,600 @@ def _decode_payload(payload: str, encoding: str) -> str:
     return payload
 
 
-def _parse_payload_lines(
-    stdout: str,
-) -> list[dict[str, Any]]:  # pragma: no cover - remote execution
-    payloads: list[dict[str, Any]] = []
-    for line in stdout.splitlines():
-        candidate = line.strip()
-        if not candidate:
+def _probe_from_payload(payload: Mapping[str, Any], warnings: list[str]) -> ProbeOutput:
+    category = str(payload.get("category", ""))
+    key = str(payload.get("key", ""))
+    encoding = str(payload.get("encoding", "base64"))
+    status = int(payload.get("status", 0))
+    stdout_encoded = str(payload.get("stdout", ""))
+    stderr_encoded = str(payload.get("stderr", ""))
+
+    probe_meta = PROBE_LOOKUP.get((category, key))
+    command = probe_meta.command if probe_meta else "<unknown>"
+    timeout = probe_meta.timeout if probe_meta else 0
+
+    try:
+        stdout_text = _decode_payload(stdout_encoded, encoding)
+    except (ValueError, UnicodeDecodeError) as exc:  # pragma: no cover - decoder swallows these
+        stdout_text = ""
+        warnings.append(f"Failed to decode stdout for {category}.{key}: {exc}")
+    try:
+        stderr_text = _decode_payload(stderr_encoded, encoding)
+    except (ValueError, UnicodeDecodeError) as exc:  # pragma: no cover - decoder swallows these
+        stderr_text = ""
+        warnings.append(f"Failed to decode stderr for {category}.{key}: {exc}")
+
+    if status != 0 and stderr_text and APP_LOGGER:
+        APP_LOGGER.debug(
+            "Probe %s.%s exited %s: %s",
+            category,
+            key,
+            status,
+            stderr_text.splitlines()[0],
+        )
+
+    return ProbeOutput(
+        category=category,
+        key=key,
+        command=command,
+        timeout=timeout,
+        status=status,
+        stdout=stdout_text,
+        stderr=stderr_text,
+        encoding=encoding,
+        started_at=_optional_number(payload.get("started")),
+        finished_at=_optional_number(payload.get("finished")),
+        stdout_bytes=int(_optional_number(payload.get("stdout_bytes")) or 0),
+        stderr_bytes=int(_optional_number(payload.get("stderr_bytes")) or 0),
+    )
+
+
+def _optional_number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return None
+    return float(value)
+
+
+@dataclass
+class FsEntry:
+    """One match from the shared filesystem walk."""
+
+    kind: str  # find %y: "f", "d", "l", ...
+    mode: int
+    owner: str
+    size: int
+    mtime: float
+    path: str
+    readable: bool
+    writable: bool
+
+    @property
+    def depth(self) -> int:
+        return len([part for part in self.path.split("/") if part])
+
+
+# Sticky temp directories the world-writable check ignores, as the find probe did
+WORLD_WRITABLE_SKIP = frozenset({"/tmp", "/var/tmp", "/dev/shm"})  # noqa: S108  # path comparison only
+CRON_PATHS = (
+    "/etc/crontab",
+    "/etc/cron.d",
+    "/etc/cron.daily",
+    "/etc/cron.hourly",
+    "/etc/cron.weekly",
+    "/etc/cron.monthly",
+)
+SERVICE_DIRS = ("/etc/systemd/system/", "/usr/lib/systemd/system/")
+BACKUP_SUFFIXES = (".bak", ".old", ".backup", ".sql")
+CONFIG_CREDENTIAL_NAMES = frozenset({".env", ".htpasswd", "wp-config.php"})
+RECENT_DIRS = ("/etc/", "/usr/local/bin/", "/usr/local/sbin/")
+
+
+def parse_fs_walk(text: str) -> tuple[list[FsEntry], float | None]:
+    """Parse the walk output into entries and the remote clock (epoch seconds)."""
+
+    entries: list[FsEntry] = []
+    now: float | None = None
+    for line in text.splitlines():
+        fields = line.split("\t", 6)
+        if len(fields) == 2 and fields[0] == "NOW":
+            try:
+                now = float(fields[1])
+            except ValueError:
+                pass
             continue
+        if len(fields) != 7:
+            continue
+        access, kind, mode, owner, size, mtime, path = fields
         try:
-            payloads.append(cast(dict[str, Any], json.loads(candidate)))
-        except json.JSONDecodeError:
-            if APP_LOGGER:
-                APP_LOGGER.debug(
-                    "Skipping non-JSON line from remote enumerate batch: %s", candidate
+            entries.append(
+                FsEntry(
+                    kind=kind,
+                    mode=int(mode, 8),
+                    owner=owner,
+                    size=int(size),
+                    mtime=float(mtime),
+                    path=path,
+                    readable="r" in access,
+                    writable="w" in access,
                 )
-    return payloads
+            )
+        except ValueError:
+            continue
+    return entries, now
+
+
+def _walk_facts(entries: Sequence[FsEntry], now: float | None) -> dict[tuple[str, str], str]:
+    """Rebuild the stdout of each replaced probe in the format its heuristic expects."""
 
+    def lines(paths: Sequence[str], limit: int | None = None) -> str:
+        selected = list(paths)[:limit] if limit is not None else list(paths)
+        return "".join(f"{path}\n" for path in selected)
 
-def _build_snapshot(
-    payloads: Sequence[Mapping[str, Any]], stderr: str
-) -> EnumerationSnapshot:  # pragma: no cover - remote execution
-    probes: dict[str, dict[str, ProbeOutput]] = {}
-    warnings: list[str] = []
+    files = [e for e in entries if e.kind == "f"]
+    suid = [e.path for e in files if e.mode & 0o4000]
+    sgid = [e.path for e in files if e.mode & 0o2000]
+    world_writable = [
+        e.path
+        for e in entries
+        if e.kind == "d" and e.mode & 0o002 and e.path not in WORLD_WRITABLE_SKIP
+    ]
+    services = [e.path for e in files if e.writable and e.path.startswith(SERVICE_DIRS)]
+    cron = [e.path for e in entries if e.writable and e.path in CRON_PATHS]
+    ssh_keys = [
+        e.path
+        for e in entries
+        if e.readable
+        and "/.ssh/id_" in e.path
+        and not e.path.endswith(".pub")
+        and (e.path.startswith("/root/.ssh/") or e.path.startswith("/home/"))
+    ]
+    config_creds = [
+        e.path
+        for e in entries
+        if e.readable and e.depth <= 4 and e.path.rsplit("/", 1)[-1] in CONFIG_CREDENTIAL_NAMES
+    ]
+    backup_listing = [
+        f"{e.mode:o} {e.owner} {e.size} {e.path}"
+        for e in entries
+        if e.path.startswith("/var/backups/") and e.depth == 3
+    ]
+    backups = [
+        e.path for e in entries if e.readable and e.depth <= 3 and e.path.endswith(BACKUP_SUFFIXES)
+    ]
+    recent = [
+        e.path
+        for e in files
+        if e.path.startswith(RECENT_DIRS) and now is not None and now - e.mtime < 86400
+    ]
 
-    for payload in payloads:
-        category = str(payload.get("category", ""))
-        key = str(payload.get("key", ""))
-        encoding = str(payload.get("encoding", "base64"))
-        status = int(payload.get("status", 0))
-        stdout_encoded = str(payload.get("stdout", ""))
-        stderr_encoded = str(payload.get("stderr", ""))
+    return {
+        ("filesystem", "suid_files"): lines(suid),
+        ("filesystem", "sgid_files"): lines(sgid),
+        ("filesystem", "world_writable_dirs"): lines(world_writable),
+        ("writable", "writable_services"): lines(services, 20) or "NONE_WRITABLE\n",
+        ("writable", "writable_cron"): "".join(f"WRITABLE:{path}\n" for path in cron) + "DONE\n",
+        ("credentials", "ssh_keys"): lines(ssh_keys) or "NO_READABLE_KEYS\n",
+        ("credentials", "config_credentials"): lines(config_creds, 20) or "NONE_FOUND\n",
+        ("interesting_files", "backup_files"): (
+            lines(backup_listing) + lines(backups, 20) or "NO_BACKUPS\n"
+        ),
+        ("interesting_files", "recently_modified"): lines(recent, 20) or "NONE_RECENT\n",
+    }
 
-        probe_meta = PROBE_LOOKUP.get((category, key))
-        command = probe_meta.command if probe_meta else "<unknown>"
-        timeout = probe_meta.timeout if probe_meta else 0
 
-        try:
-            stdout_text = _decode_payload(stdout_encoded, encoding)
-        except (ValueError, UnicodeDecodeError) as exc:
-            stdout_text = ""
-            warnings.append(f"Failed to decode stdout for {category}.{key}: {exc}")
-        try:
-            stderr_text = _decode_payload(stderr_encoded, encoding)
-        except (ValueError, UnicodeDecodeError) as exc:
-            stderr_text = ""
-            warnings.append(f"Failed to decode stderr for {category}.{key}: {exc}")
+def derive_fs_walk_probes(walk: ProbeOutput, warnings: list[str]) -> list[ProbeOutput]:
+    """Compute the probes replaced by the shared walk from its output."""
 
-        result = ProbeOutput(
+    if "FS_WALK_UNSUPPORTED" in walk.stdout:
+        warnings.append(
+            "Remote find lacks -printf; filesystem checks were skipped (rerun without --fs-walk)"
+        )
+        return []
+    if walk.status == 124:  # exit status of timeout(1)
+        warnings.append(
+            f"Filesystem walk timed out after {walk.timeout}s; filesystem checks are incomplete"
+        )
+    entries, now = parse_fs_walk(walk.stdout)
+    facts = _walk_facts(entries, now)
+    command = f"<derived from {walk.category}.{walk.key}>"
+    return [
+        ProbeOutput(
             category=category,
             key=key,
             command=command,
-            timeout=timeout,
-            status=status,
-            stdout=stdout_text,
-            stderr=stderr_text,
-            encoding=encoding,
+            timeout=walk.timeout,
+            status=walk.status,
+            stdout=facts[(category, key)],
+            stderr="",
+            encoding=walk.encoding,
         )
-        probes.setdefault(category, {})[key] = result
-
-        if status != 0 and stderr_text and APP_LOGGER:
-            APP_LOGGER.debug(
-                "Probe %s.%s exited %s: %s",
-                category,
-                key,
-                status,
-                stderr_text.splitlines()[0],
-            )
+        for category, key in FS_WALK_REPLACES
+    ]
 
-    if stderr.strip():
-        warnings.append(f"Remote stderr: {stderr.strip()}")
 
-    # Use timezone-aware timestamp to avoid deprecation warnings and ensure UTC alignment
-    return EnumerationSnapshot(collected_at=datetime.now(UTC), probes=probes, warnings=warnings)
+def _expand_probe(probe: ProbeOutput, warnings: list[str]) -> list[ProbeOutput]:
+    """The probe itself plus any probes derived from it."""
 
+    if (probe.category, probe.key) == (FS_WALK_PROBE.category, FS_WALK_PROBE.key):
+        return [probe, *derive_fs_walk_probes(probe, warnings)]
+    return [probe]
 
-def collect_remote_snapshot() -> EnumerationSnapshot:  # pragma: no cover - remote execution
-    script = build_remote_script(REMOTE_PROBES)
-    exit_code, stdout, stderr = execute_remote_batch(script)
-    if exit_code != 0:
-        raise RemoteExecutionError(
-            f"Enumeration batch failed with exit code {exit_code}", stdout=stdout, stderr=stderr
+
+def parse_parallel_jobs(argv: Sequence[str]) -> int:
+    """Return the probe concurrency requested with ``--parallel[=N]`` (1 when absent)."""
+
+    jobs = 1
+    for arg in argv:
+        if arg == "--parallel":
+            jobs = DEFAULT_PARALLEL_JOBS
+        elif arg.startswith("--parallel="):
+            try:
+                jobs = int(arg.split("=", 1)[1])
+            except ValueError:
+                jobs = DEFAULT_PARALLEL_JOBS
+    return max(1, min(jobs, MAX_PARALLEL_JOBS))
+
+
+def parse_option_values(argv: Sequence[str], name: str) -> tuple[str, ...]:
+    """Collect the comma-separated values of every ``--name=a,b`` in ``argv``."""
+
+    prefix = f"--{name}="
+    values: list[str] = []
+    for arg in argv:
+        if arg.startswith(prefix):
+            values.extend(value.strip() for value in arg[len(prefix) :].split(","))
+    return tuple(value for value in values if value)
+
+
+def load_probe_durations(log_dir: Path) -> dict[str, float]:
+    """Historical per-probe durations (seconds) recorded for this connection."""
+
+    try:
+        data = json.loads((log_dir / PROBE_DURATIONS_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(key): float(value)
+        for key, value in data.items()
+        if isinstance(value, int | float) and value >= 0
+    }
+
+
+def record_probe_durations(log_dir: Path, durations: Mapping[str, float]) -> None:
+    """Fold new measurements into the history as an even moving average."""
+
+    if not durations:
+        return
+    history = load_probe_durations(log_dir)
+    for key, seconds in durations.items():
+        previous = history.get(key)
+        history[key] = round(seconds if previous is None else (previous + seconds) / 2, 3)
+    try:
+        (log_dir / PROBE_DURATIONS_FILENAME).write_text(
+            json.dumps(history, indent=2, sort_keys=True), encoding="utf-8"
         )
-    payloads = _parse_payload_lines(stdout)
-    if not payloads:
+    except OSError as exc:
+        if APP_LOGGER:
+            APP_LOGGER.debug("Failed to record probe durations in %s: %s", log_dir, exc)
+
+
+def _probe_provides(probe: RemoteProbe) -> set[tuple[str, str]]:
+    provided = {(probe.category, probe.key)}
+    if provided == {(FS_WALK_PROBE.category, FS_WALK_PROBE.key)}:
+        provided.update(FS_WALK_REPLACES)
+    return provided
+
+
+def plan_budget(
+    probes: Sequence[RemoteProbe],
+    budget: float,
+    durations: Mapping[str, float],
+    parallel: int = 1,
+) -> tuple[tuple[RemoteProbe, ...], tuple[RemoteProbe, ...]]:
+    """Pick the highest-value probes whose expected run time fits ``budget`` seconds.
+
+    A probe costs its recorded historical duration, or its timeout when the
+    connection has no history yet. Heuristics are bought whole: each one is
+    worth its severity weight, and the heuristic with the best value per
+    second of still-missing input probes is taken first. Probes that feed no
+    heuristic fill what is left, cheapest first. With ``parallel`` jobs the
+    budget covers ``parallel`` probe-seconds per second.
+
+    Returns ``(selected, skipped)``, both in catalogue order.
+    """
+
+    def cost(probe: RemoteProbe) -> float:
+        return durations.get(f"{probe.category}.{probe.key}", float(probe.timeout))
+
+    capacity = budget * max(1, parallel)
+    providers: dict[tuple[str, str], RemoteProbe] = {}
+    for probe in probes:
+        for item in _probe_provides(probe):
+            providers.setdefault(item, probe)
+
+    groups: list[tuple[float, set[RemoteProbe]]] = []
+    for heuristic in PRIORITY_HEURISTICS:
+        inputs = {
+            providers[item] for item in HEURISTIC_INPUTS.get(heuristic.key, ()) if item in providers
+        }
+        if inputs:
+            groups.append((SEVERITY_WEIGHTS.get(heuristic.severity, 1.0), inputs))
+
+    chosen: set[RemoteProbe] = set()
+    spent = 0.0
+    while groups:
+        best: tuple[float, int, float] | None = None
+        for index, (value, inputs) in enumerate(groups):
+            extra = sum(cost(probe) for probe in inputs - chosen)
+            if spent + extra > capacity:
+                continue
+            ratio = value / extra if extra else float("inf")
+            if best is None or ratio > best[0]:
+                best = (ratio, index, extra)
+        if best is None:
+            break
+        _, index, extra = best
+        chosen |= groups.pop(index)[1]
+        spent += extra
+
+    feeding = {probe for _, inputs in groups for probe in inputs} | chosen
+    for probe in sorted((p for p in probes if p not in feeding), key=cost):
+        if spent + cost(probe) <= capacity:
+            chosen.add(probe)
+            spent += cost(probe)
+
+    selected = tuple(probe for probe in probes if probe in chosen)
+    skipped = tuple(probe for probe in probes if probe not in chosen)
+    return selected, skipped
+
+
+def collect_remote_snapshot(
+    parallel: int = 1,
+    probes: Sequence[RemoteProbe] | None = None,
+    state: ProgressiveEnumeration | None = None,
+    on_update: Callable[[ProgressiveEnumeration], None] | None = None,
+    timeout: int = DEFAULT_REMOTE_TIMEOUT,
+    wire: str = "json",
+    compressors: Sequence[str] = (),
+    target: RemoteTarget | None = None,
+) -> EnumerationSnapshot:
+    """Run the probe batch, decoding each probe's line as it arrives.
+
+    ``probes`` defaults to ``REMOTE_PROBES``. ``state`` accumulates probes and
+    evaluates priority heuristics as their inputs land; ``on_update`` is called after every probe. If the batch
+    times out or exits non-zero after some probes arrived, the partial
+    snapshot is returned with a warning instead of failing the run.
+    ``wire`` and ``compressors`` select the framed transport (see
+    :func:`build_remote_script`). ``target`` picks another connection than the
+    one the plugin was started for.
+    """
+
+    if probes is None:
+        probes = REMOTE_PROBES
+    if state is None:
+        state = ProgressiveEnumeration(probes)
+
+    def handle_line(line: str) -> None:
+        if state.feed_line(line) is not None and on_update is not None:
+            on_update(state)
+
+    def handle_payload(payload: dict[str, Any]) -> None:
+        state.add_payload(payload)
+        if on_update is not None:
+            on_update(state)
+
+    script = build_remote_script(probes, parallel=parallel, wire=wire, compressors=compressors)
+    decoder = WireDecoder(on_line=handle_line, on_payload=handle_payload)
+    try:
+        exit_code, stderr = stream_remote_bytes(
+            script, decoder.feed, timeout=timeout, target=target
+        )
+    except RemoteExecutionError as exc:
+        decoder.close()
+        if not state.received:
+            raise
+        return state.finish(
+            exc.stderr, partial_reason=f"Remote enumeration timed out after {timeout}s"
+        )
+    decoder.close()
+    if APP_LOGGER:
+        APP_LOGGER.debug(
+            "Enumerate batch: %s wire, %s compression, %d bytes",
+            decoder.wire_format or "json",
+            decoder.compression,
+            decoder.wire_bytes,
+        )
+    if decoder.error is not None:
+        if not state.received:
+            raise RemoteExecutionError(decoder.error, stderr=stderr)
+        return state.finish(stderr, partial_reason=decoder.error)
+
+    if not state.received:
         raise RemoteExecutionError(
-            "Remote enumeration returned no data", stdout=stdout, stderr=stderr
+            "Remote enumeration returned no data"
+            if exit_code == 0
+            else f"Enumeration batch failed with exit code {exit_code}",
+            stderr=stderr,
+        )
+    if exit_code != 0:
+        return state.finish(
+            stderr, partial_reason=f"Enumeration batch exited with code {exit_code}"
         )
-    return _build_snapshot(payloads, stderr)
+    return state.finish(stderr)
+
+
+@dataclass
+class PreviousSurvey:
+    """A survey saved by an earlier run, loaded back for incremental runs."""
+
+    path: Path
+    snapshot: EnumerationSnapshot
+    findings: list[PriorityFinding]
+
+
+def load_previous_survey(log_dir: Path) -> PreviousSurvey | None:
+    """Load the newest readable ``survey_*.json`` in ``log_dir``."""
+
+    candidates = sorted(log_dir.glob("survey_*.json"), key=lambda path: path.name, reverse=True)
+    for path in candidates:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            probes = {
+                category: {key: ProbeOutput.from_dict(data) for key, data in mapping.items()}
+                for category, mapping in payload["categories"].items()
+            }
+            findings = [PriorityFinding(**data) for data in payload["priority_findings"]]
+            collected_at = datetime.fromisoformat(payload["collected_at"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+            if APP_LOGGER:
+                APP_LOGGER.debug("Ignoring unreadable survey %s: %s", path, exc)
+            continue
+        snapshot = EnumerationSnapshot(
+            collected_at=collected_at, probes=probes, warnings=list(payload.get("warnings", []))
+        )
+        return PreviousSurvey(path=path, snapshot=snapshot, findings=findings)
+    return None
+
+
+def parse_fingerprints(text: str) -> dict[str, str]:
+    """Parse ``path|signature`` lines from the fingerprint probe."""
+
+    fingerprints: dict[str, str] = {}
+    for line in text.splitlines():
+        path, sep, signature = line.partition("|")
+        if sep:
+            fingerprints[path] = signature.strip()
+    return fingerprints
+
+
+def reusable_probes(
+    previous: EnumerationSnapshot,
+    current_fingerprints: Mapping[str, str],
+    probes: Sequence[RemoteProbe],
+    scan_max_age: float = SCAN_REUSE_MAX_AGE,
+) -> list[ProbeOutput]:
+    """Probes from ``previous`` whose fingerprinted paths are all unchanged.
+
+    Unknown signatures ("?", e.g. no ``stat -c`` on the host) never match.
+    Filesystem-wide scans are only reused while ``previous`` is younger than
+    ``scan_max_age`` seconds.
+    """
+
+    old_probe = _get_probe(previous, FINGERPRINT_PROBE.category, FINGERPRINT_PROBE.key)
+    if old_probe is None:
+        return []
+    old_fingerprints = parse_fingerprints(old_probe.stdout)
+    scans_fresh = (datetime.now(UTC) - previous.collected_at).total_seconds() < scan_max_age
+
+    reused: list[ProbeOutput] = []
+    for probe in probes:
+        key = (probe.category, probe.key)
+        paths = PROBE_FINGERPRINTS.get(key)
+        cached = _get_probe(previous, probe.category, probe.key)
+        if not paths or cached is None or (key in SCAN_PROBES and not scans_fresh):
+            continue
+        if all(
+            current_fingerprints.get(path) not in (None, "?")
+            and old_fingerprints.get(path) == current_fingerprints.get(path)
+            for path in paths
+        ):
+            reused.append(cached)
+    return reused
+
+
+def collect_incremental_snapshot(
+    previous: PreviousSurvey,
+    probes: Sequence[RemoteProbe],
+    parallel: int = 1,
+    state: ProgressiveEnumeration | None = None,
+    on_update: Callable[[ProgressiveEnumeration], None] | None = None,
+    timeout: int = DEFAULT_REMOTE_TIMEOUT,
+    wire: str = "json",
+    compressors: Sequence[str] = (),
+) -> tuple[EnumerationSnapshot, list[ProbeOutput]]:
+    """Re-run volatile and changed probes, reusing stable ones from ``previous``.
+
+    A first, cheap round trip collects the fingerprints; the second runs
+    everything that cannot be reused. Returns the merged snapshot and the
+    probes taken from the previous survey.
+    """
+
+    plan = [probe for probe in probes if probe != FINGERPRINT_PROBE]
+    if state is None:
+        state = ProgressiveEnumeration((*plan, FINGERPRINT_PROBE))
+
+    fingerprint_state = ProgressiveEnumeration((FINGERPRINT_PROBE,))
+    collect_remote_snapshot(probes=(FINGERPRINT_PROBE,), state=fingerprint_state, timeout=timeout)
+    fingerprint_probe = _get_probe(
+        fingerprint_state.snapshot, FINGERPRINT_PROBE.category, FINGERPRINT_PROBE.key
+    )
+    if fingerprint_probe is None:  # pragma: no cover - collect raises when nothing arrived
+        raise RemoteExecutionError("Remote fingerprint probe returned no data")
+
+    reused = reusable_probes(previous.snapshot, parse_fingerprints(fingerprint_probe.stdout), plan)
+    state.add_probe(fingerprint_probe)
+    for probe in reused:
+        state.add_probe(probe)
+
+    reused_keys = {(probe.category, probe.key) for probe in reused}
+    rerun = [probe for probe in plan if (probe.category, probe.key) not in reused_keys]
+    snapshot = collect_remote_snapshot(
+        parallel=parallel,
+        probes=rerun,
+        state=state,
+        on_update=on_update,
+        timeout=timeout,
+        wire=wire,
+        compressors=compressors,
+    )
+    if reused:
+        snapshot.warnings.append(
+            f"Reused {len(reused)} unchanged probes from "
+            f"{previous.snapshot.collected_at.isoformat(timespec='seconds')}"
+        )
+    return snapshot, reused
+
+
+@dataclass
+class FindingsDiff:
+    """Priority findings that appeared, disappeared or changed between two runs."""
+
+    added: list[PriorityFinding]
+    resolved: list[PriorityFinding]
+    changed: list[tuple[PriorityFinding, PriorityFinding]]  # (previous, current)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.resolved or self.changed)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "added": [finding.to_dict() for finding in self.added],
+            "resolved": [finding.to_dict() for finding in self.resolved],
+            "changed": [
+                {"previous": old.to_dict(), "current": new.to_dict()} for old, new in self.changed
+            ],
+        }
+
+
+def diff_findings(
+    previous: Sequence[PriorityFinding], current: Sequence[PriorityFinding]
+) -> FindingsDiff:
+    """Compare findings by heuristic key."""
+
+    old_by_key = {finding.key: finding for finding in previous}
+    new_by_key = {finding.key: finding for finding in current}
+    return FindingsDiff(
+        added=[finding for finding in current if finding.key not in old_by_key],
+        resolved=[finding for finding in previous if finding.key not in new_by_key],
+        changed=[
+            (old_by_key[finding.key], finding)
+            for finding in current
+            if finding.key in old_by_key and old_by_key[finding.key].to_dict() != finding.to_dict()
+        ],
+    )
 
 
 def _get_probe(snapshot: EnumerationSnapshot, category: str, key: str) -> ProbeOutput | None:
@@ -483,7 +1476,7 @@ def _first_nonempty_line(text: str) -> str:
 
 
 def _extract_paths(text: str) -> list[str]:
-    return [line.strip() for line in text.splitlines() if line.strip()]
+    return [stripped for line in text.splitlines() if (stripped := line.strip())]
 
 
 def _summarize_text(text: str) -> str:
@@ -501,20 +1494,347 @@ def _format_count_label(count: int, singular: str, plural: str) -> str:
     return f"{count} {label}"
 
 
+@dataclass(frozen=True)
+class Identity:
+    """The current user as reported by ``id``."""
+
+    uid: int | None
+    user: str
+    groups: frozenset[str]
+    line: str
+
+
+@dataclass(frozen=True)
+class BinaryEntry:
+    """A binary path from a SUID/SGID/capability listing."""
+
+    path: str
+    name: str
+    line: str
+
+
+@dataclass(frozen=True)
+class SudoRule:
+    """One command line from ``sudo -l`` output."""
+
+    line: str
+    binary_path: str
+    binary_name: str
+
+
+@dataclass(frozen=True)
+class ExploitableBinary:
+    """A binary running privileged in one context, with its GTFOBins techniques."""
+
+    context: str  # "sudo", "suid", "sgid" or "capabilities"
+    name: str
+    paths: tuple[str, ...]
+    techniques: tuple[GTFOBinsEntry, ...]
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        """One exploitability matrix row per technique."""
+        return [
+            {
+                "binary": self.name,
+                "context": self.context,
+                "technique": entry.capability,
+                "description": entry.description,
+                "command": entry.command_template,
+                "paths": list(self.paths),
+            }
+            for entry in self.techniques
+        ]
+
+
+# GTFOBins functions usable from each privilege context. GTFOBins has no SGID
+# function; its SUID techniques run with the binary's group instead.
+_CONTEXT_FUNCTIONS = {
+    "sudo": ("sudo",),
+    "suid": ("suid", "limited-suid"),
+    "sgid": ("suid", "limited-suid"),
+    "capabilities": ("capabilities",),
+}
+_PRIVILEGED_SOURCES = {
+    "sudo": ("users", "sudo_check"),
+    "suid": ("filesystem", "suid_files"),
+    "sgid": ("filesystem", "sgid_files"),
+    "capabilities": ("capabilities", "cap_interesting"),
+}
+_SHELL_KEYWORDS = ("shell", "spawn", "escape")
+# Shells from these functions drop the elevated privileges without extra steps
+_UNPRIVILEGED_SHELL_FUNCTIONS = ("limited-suid",)
+
+_ID_FIELD_RE = re.compile(r"\b(uid|gid|groups)=(\S+)")
+_ID_NAME_RE = re.compile(r"^(\d*)(?:\(([^)]*)\))?$")
+_WEAK_SSH_RE = re.compile(
+    r"^\s*(?:permitrootlogin|passwordauthentication|permitemptypasswords"
+    r"|challengeresponseauthentication)\s+yes",
+    re.IGNORECASE,
+)
+# Substring checks on lowered lines; faster than an alternation regex over large outputs
+_SUSPICIOUS_TASK_KEYWORDS = (
+    "curl",
+    "wget",
+    "nc ",
+    "bash -c",
+    "python",
+    "perl",
+    "ruby",
+    "scp",
+    "ftp",
+    "socat",
+)
+_WILDCARD_BINDS = ("0.0.0.0:", ":::", "*:")
+_SUDO_HEADER_PREFIXES = ("User ", "Matching")
+_SCHEDULED_SOURCES = (
+    ("scheduled", "cron_user"),
+    ("scheduled", "cron_system"),
+    ("scheduled", "systemd_timers"),
+    ("scheduled", "cron_d"),
+    ("scheduled", "cron_daily"),
+    ("scheduled", "at_jobs"),
+)
+
+
+def _binary_name(path: str) -> str:
+    return path.rsplit("/", 1)[-1]
+
+
+def _spawns_privileged_shell(entry: GTFOBinsEntry) -> bool:
+    """Whether ``entry`` is an instant win: a shell that keeps the elevated privileges."""
+    if entry.capability in _UNPRIVILEGED_SHELL_FUNCTIONS:
+        return False
+    description = entry.description.lower()
+    return any(kw in description for kw in _SHELL_KEYWORDS)
+
+
+def _parse_identity(probes: tuple[ProbeOutput | None, ...]) -> Identity | None:
+    probe = probes[0]
+    if not probe or not probe.stdout.strip():
+        return None
+    uid: int | None = None
+    user = ""
+    groups: set[str] = set()
+    for field_name, value in _ID_FIELD_RE.findall(probe.stdout):
+        for token in value.split(","):
+            # "27(sudo)", "0" or a bare name such as "wheel"
+            match = _ID_NAME_RE.match(token)
+            number, name = match.groups() if match else ("", None)
+            if field_name == "uid":
+                uid = int(number) if number else None
+                user = name or ""
+            elif field_name == "groups":
+                groups.add((name if name is not None else token).lower())
+    return Identity(uid, user, frozenset(groups), _first_nonempty_line(probe.stdout))
+
+
+class ParsedFacts:
+    """Structured views of a snapshot's probe output, shared by every heuristic.
+
+    Each view is parsed on first use and cached against the ``ProbeOutput``
+    objects it was built from, so several heuristics reading the same SUID list
+    or ``sudo -l`` output parse it once, and a snapshot that is still filling
+    up (see :class:`ProgressiveEnumeration`) never serves a stale view.
+    """
+
+    def __init__(self, snapshot: EnumerationSnapshot) -> None:
+        self._snapshot = snapshot
+        self._views: dict[str, tuple[tuple[ProbeOutput | None, ...], Any]] = {}
+
+    def _view(
+        self,
+        name: str,
+        sources: Sequence[tuple[str, str]],
+        parse: Callable[[tuple[ProbeOutput | None, ...]], Any],
+    ) -> Any:
+        probes = tuple(_get_probe(self._snapshot, category, key) for category, key in sources)
+        cached = self._views.get(name)
+        if cached is not None and all(a is b for a, b in zip(cached[0], probes, strict=True)):
+            return cached[1]
+        value = parse(probes)
+        self._views[name] = (probes, value)
+        return value
+
+    def lines(self, category: str, key: str) -> tuple[str, ...]:
+        """Stripped, non-empty output lines of one probe."""
+        return cast(
+            tuple[str, ...],
+            self._view(
+                f"lines:{category}.{key}",
+                ((category, key),),
+                lambda probes: tuple(_extract_paths(probes[0].stdout)) if probes[0] else (),
+            ),
+        )
+
+    def marked(self, category: str, key: str, marker: str = "WRITABLE:") -> tuple[str, ...]:
+        """Values of the lines of one probe that start with ``marker``."""
+        return tuple(
+            line.replace(marker, "").strip()
+            for line in self.lines(category, key)
+            if line.startswith(marker)
+        )
+
+    def identity(self) -> Identity | None:
+        """The user and groups reported by ``id``, or None without output."""
+        return cast(Identity | None, self._view("identity", (("users", "id"),), _parse_identity))
+
+    def binary_index(self, category: str, key: str) -> dict[str, list[str]]:
+        """Binary name -> paths, in listing order, for a one-path-per-line probe."""
+
+        def parse(_probes: tuple[ProbeOutput | None, ...]) -> dict[str, list[str]]:
+            index: dict[str, list[str]] = {}
+            for path in self.lines(category, key):
+                index.setdefault(_binary_name(path), []).append(path)
+            return index
+
+        return cast(
+            dict[str, list[str]],
+            self._view(f"binary_index:{category}.{key}", ((category, key),), parse),
+        )
+
+    def capabilities(self) -> tuple[BinaryEntry, ...]:
+        """Binaries with file capabilities, e.g. ``/usr/bin/python3 cap_setuid=ep``."""
+
+        def parse(_probes: tuple[ProbeOutput | None, ...]) -> tuple[BinaryEntry, ...]:
+            entries: list[BinaryEntry] = []
+            for line in self.lines("capabilities", "cap_interesting"):
+                path = line.split(None, 1)[0]
+                entries.append(BinaryEntry(path, _binary_name(path), line))
+            return tuple(entries)
+
+        return cast(
+            tuple[BinaryEntry, ...],
+            self._view("capabilities", (("capabilities", "cap_interesting"),), parse),
+        )
+
+    def sudo_rules(self) -> tuple[SudoRule, ...]:
+        """Command lines from ``sudo -l``, with the binary each one runs."""
+
+        def parse(_probes: tuple[ProbeOutput | None, ...]) -> tuple[SudoRule, ...]:
+            rules: list[SudoRule] = []
+            for line in self.lines("users", "sudo_check"):
+                if line.startswith(_SUDO_HEADER_PREFIXES):
+                    continue
+                # "(root) NOPASSWD: /usr/bin/vim": the first absolute path, else the last token
+                parts = line.split()
+                binary_path = next((part for part in parts if part.startswith("/")), parts[-1])
+                rules.append(SudoRule(line, binary_path, _binary_name(binary_path)))
+            return tuple(rules)
+
+        return cast(
+            tuple[SudoRule, ...], self._view("sudo_rules", (("users", "sudo_check"),), parse)
+        )
+
+    def privileged_binaries(self, context: str) -> dict[str, list[str]]:
+        """Binary name -> paths of the binaries running privileged in ``context``."""
+        if context in ("suid", "sgid"):
+            return self.binary_index(*_PRIVILEGED_SOURCES[context])
+
+        def parse(_probes: tuple[ProbeOutput | None, ...]) -> dict[str, list[str]]:
+            entries: Iterable[tuple[str, str]] = (
+                ((rule.binary_name, rule.binary_path) for rule in self.sudo_rules())
+                if context == "sudo"
+                else ((entry.name, entry.path) for entry in self.capabilities())
+            )
+            index: dict[str, list[str]] = {}
+            for name, path in entries:
+                index.setdefault(name, []).append(path)
+            return index
+
+        return cast(
+            dict[str, list[str]],
+            self._view(f"privileged:{context}", (_PRIVILEGED_SOURCES[context],), parse),
+        )
+
+    def exploitable_binaries(self, context: str | None = None) -> tuple[ExploitableBinary, ...]:
+        """The exploitability matrix: privileged binaries with GTFOBins techniques.
+
+        Candidate names are resolved with one set intersection against the
+        database keys, so only binaries GTFOBins knows are looked up, once per
+        name however many paths share it. Each context is cached against its
+        own probe, so a heuristic reading one context does not wait for the
+        others; without ``context`` all of them are returned in sudo, SUID,
+        SGID, capabilities order.
+        """
+
+        if context is None:
+            return tuple(
+                item for name in _PRIVILEGED_SOURCES for item in self.exploitable_binaries(name)
+            )
+
+        def parse(_probes: tuple[ProbeOutput | None, ...]) -> tuple[ExploitableBinary, ...]:
+            database = get_database()
+            functions = _CONTEXT_FUNCTIONS[context]
+            candidates = self.privileged_binaries(context)
+            known = candidates.keys() & database.binaries(*functions)
+            return tuple(
+                ExploitableBinary(
+                    context,
+                    name,
+                    tuple(dict.fromkeys(paths)),
+                    tuple(
+                        entry for function in functions for entry in database.lookup(function, name)
+                    ),
+                )
+                for name, paths in candidates.items()
+                if name in known
+            )
+
+        return cast(
+            tuple[ExploitableBinary, ...],
+            self._view(f"exploitable:{context}", (_PRIVILEGED_SOURCES[context],), parse),
+        )
+
+    def exposed_listeners(self) -> tuple[str, ...]:
+        """Listening sockets bound to every interface."""
+        return cast(
+            tuple[str, ...],
+            self._view(
+                "exposed_listeners",
+                (("network", "listening_services"),),
+                lambda _probes: tuple(
+                    line
+                    for line in self.lines("network", "listening_services")
+                    if any(bind in line for bind in _WILDCARD_BINDS)
+                ),
+            ),
+        )
+
+    def scheduled_entries(self) -> tuple[str, ...]:
+        """Lines from every cron, systemd timer and ``at`` probe."""
+        return cast(
+            tuple[str, ...],
+            self._view(
+                "scheduled",
+                _SCHEDULED_SOURCES,
+                lambda _probes: tuple(
+                    line
+                    for category, key in _SCHEDULED_SOURCES
+                    for line in self.lines(category, key)
+                ),
+            ),
+        )
+
+    def weak_ssh_directives(self) -> tuple[str, ...]:
+        """Insecure ``sshd`` directives, preferring the effective configuration."""
+        effective = _get_probe(self._snapshot, "security", "ssh_effective_config")
+        key = "ssh_effective_config" if effective else "ssh_config"
+        return tuple(line for line in self.lines("security", key) if _WEAK_SSH_RE.match(line))
+
+
 def _evaluate_sudo_membership(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    id_probe = _get_probe(snapshot, "users", "id")
-    if not id_probe or not id_probe.stdout:
+    identity = snapshot.facts.identity()
+    if identity is None:
         return None
-    normalized = id_probe.stdout.lower()
-    if "sudo" not in normalized and "wheel" not in normalized and "uid=0" not in normalized:
+    if identity.uid != 0 and not identity.groups & {"sudo", "wheel"}:
         return None
-    detail = _first_nonempty_line(id_probe.stdout)
+    detail = identity.line
     evidence: list[str] = [detail]
-    sudo_check = _get_probe(snapshot, "users", "sudo_check")
-    if sudo_check and sudo_check.stdout.strip():
-        evidence.append(_first_nonempty_line(sudo_check.stdout))
+    sudo_lines = snapshot.facts.lines("users", "sudo_check")
+    if sudo_lines:
+        evidence.append(sudo_lines[0])
     return PriorityFinding(
         key=meta.key,
         category=meta.category,
@@ -528,15 +1848,12 @@ def _evaluate_sudo_membership(
 def _evaluate_passwordless_sudo(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    sudoers = _get_probe(snapshot, "users", "sudoers")
-    sudo_check = _get_probe(snapshot, "users", "sudo_check")
-    matches: list[str] = []
-    for probe in (sudoers, sudo_check):
-        if not probe or not probe.stdout:
-            continue
-        for line in probe.stdout.splitlines():
-            if "nopasswd" in line.lower():
-                matches.append(line.strip())
+    matches = [
+        line
+        for key in ("sudoers", "sudo_check")
+        for line in snapshot.facts.lines("users", key)
+        if "nopasswd" in line.lower()
+    ]
     if not matches:
         return None
     detail = f"Found passwordless sudo entries (showing {min(len(matches), 3)})."
@@ -553,10 +1870,8 @@ def _evaluate_passwordless_sudo(
 def _evaluate_suid_binaries(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    suid = _get_probe(snapshot, "filesystem", "suid_files")
-    sgid = _get_probe(snapshot, "filesystem", "sgid_files")
-    suid_paths = _extract_paths(suid.stdout if suid else "")
-    sgid_paths = _extract_paths(sgid.stdout if sgid else "")
+    suid_paths = snapshot.facts.lines("filesystem", "suid_files")
+    sgid_paths = snapshot.facts.lines("filesystem", "sgid_files")
     total = len(suid_paths) + len(sgid_paths)
     if total == 0:
         return None
@@ -564,7 +1879,7 @@ def _evaluate_suid_binaries(
         f"Identified {_format_count_label(len(suid_paths), 'SUID binary', 'SUID binaries')} and "
         f"{_format_count_label(len(sgid_paths), 'SGID binary', 'SGID binaries')}"
     )
-    evidence = (suid_paths + sgid_paths)[:6]
+    evidence = list((suid_paths + sgid_paths)[:6])
     return PriorityFinding(
         key=meta.key,
         category=meta.category,
@@ -578,10 +1893,7 @@ def _evaluate_suid_binaries(
 def _evaluate_world_writable(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "filesystem", "world_writable_dirs")
-    if not probe or not probe.stdout:
-        return None
-    dirs = _extract_paths(probe.stdout)
+    dirs = snapshot.facts.lines("filesystem", "world_writable_dirs")
     if not dirs:
         return None
     detail = f"World-writable directories outside temp paths: {len(dirs)} detected"
@@ -591,21 +1903,14 @@ def _evaluate_world_writable(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=dirs[:6],
+        evidence=list(dirs[:6]),
     )
 
 
 def _evaluate_exposed_services(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "network", "listening_services")
-    if not probe or not probe.stdout:
-        return None
-    exposed: list[str] = []
-    for line in probe.stdout.splitlines():
-        lowered = line.lower()
-        if any(boundary in lowered for boundary in ("0.0.0.0:", ":::", "*:")):
-            exposed.append(line.strip())
+    exposed = snapshot.facts.exposed_listeners()
     if not exposed:
         return None
     detail = f"Detected {len(exposed)} externally accessible listeners"
@@ -615,29 +1920,14 @@ def _evaluate_exposed_services(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=exposed[:6],
+        evidence=list(exposed[:6]),
     )
 
 
 def _evaluate_weak_ssh(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    effective = _get_probe(snapshot, "security", "ssh_effective_config")
-    fallback = _get_probe(snapshot, "security", "ssh_config")
-    source = effective or fallback
-    if not source or not source.stdout:
-        return None
-    weak_lines: list[str] = []
-    patterns = (
-        r"^\s*permitrootlogin\s+yes",
-        r"^\s*passwordauthentication\s+yes",
-        r"^\s*permitemptypasswords\s+yes",
-        r"^\s*challengeresponseauthentication\s+yes",
-    )
-    for line in source.stdout.splitlines():
-        lowered = line.lower()
-        if any(re.search(pattern, lowered) for pattern in patterns):
-            weak_lines.append(line.strip())
+    weak_lines = snapshot.facts.weak_ssh_directives()
     if not weak_lines:
         return None
     detail = f"Insecure sshd directives detected ({len(weak_lines)} matches)"
@@ -647,43 +1937,20 @@ def _evaluate_weak_ssh(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=weak_lines[:5],
+        evidence=list(weak_lines[:5]),
     )
 
 
 def _evaluate_suspicious_scheduled(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probes = [
-        _get_probe(snapshot, "scheduled", "cron_user"),
-        _get_probe(snapshot, "scheduled", "cron_system"),
-        _get_probe(snapshot, "scheduled", "systemd_timers"),
-        _get_probe(snapshot, "scheduled", "cron_d"),
-        _get_probe(snapshot, "scheduled", "cron_daily"),
-        _get_probe(snapshot, "scheduled", "at_jobs"),
-    ]
-    keywords = (
-        "curl",
-        "wget",
-        "nc ",
-        "bash -c",
-        "python",
-        "perl",
-        "ruby",
-        "scp",
-        "ftp",
-        "socat",
-    )
     suspicious: list[str] = []
-    for probe in probes:
-        if not probe or not probe.stdout:
-            continue
-        for line in probe.stdout.splitlines():
-            normalized = line.lower()
-            if any(keyword in normalized for keyword in keywords) or normalized.startswith(
-                "@reboot"
-            ):
-                suspicious.append(line.strip())
+    for line in snapshot.facts.scheduled_entries():
+        normalized = line.lower()
+        if normalized.startswith("@reboot") or any(
+            keyword in normalized for keyword in _SUSPICIOUS_TASK_KEYWORDS
+        ):
+            suspicious.append(line)
     if not suspicious:
         return None
     detail = f"Suspicious scheduled tasks observed ({len(suspicious)} matches)"
@@ -726,41 +1993,31 @@ def _evaluate_kernel_drift(
 def _evaluate_dangerous_capabilities(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "capabilities", "cap_interesting")
-    if not probe or not probe.stdout:
-        return None
-    lines = [line.strip() for line in probe.stdout.splitlines() if line.strip()]
-    if not lines:
+    binaries = snapshot.facts.capabilities()
+    if not binaries:
         return None
 
     exploit_commands: list[str] = []
     best_difficulty = "moderate"
 
-    for cap_line in lines:
-        # Format: "/usr/bin/python3 cap_setuid=ep"
-        # Extract binary name from the path portion
-        parts = cap_line.split()
-        if not parts:  # pragma: no cover - pre-filtered on line 681
-            continue  # pragma: no cover
-        binary_path = parts[0]
-        binary_name = binary_path.rsplit("/", 1)[-1] if "/" in binary_path else binary_path
-        entries = lookup_capabilities(binary_name)
-        for entry in entries:
-            exploit_commands.append(f"# {binary_name} ({binary_path}): {entry.description}")
+    known = {item.name: item for item in snapshot.facts.exploitable_binaries("capabilities")}
+    for binary in binaries:
+        for entry in known[binary.name].techniques if binary.name in known else ():
+            exploit_commands.append(f"# {binary.name} ({binary.path}): {entry.description}")
             exploit_commands.append(entry.command_template)
             if any(
                 kw in entry.description.lower() for kw in ("shell", "spawn", "escalation")
             ):  # pragma: no branch
                 best_difficulty = "easy"
 
-    detail = f"Found {len(lines)} binaries with dangerous capabilities"
+    detail = f"Found {len(binaries)} binaries with dangerous capabilities"
     return PriorityFinding(
         key=meta.key,
         category=meta.category,
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=lines[:6],
+        evidence=[binary.line for binary in binaries[:6]],
         exploitation_difficulty=best_difficulty if exploit_commands else "moderate",
         exploit_commands=exploit_commands[:12],
     )
@@ -822,13 +2079,10 @@ def _evaluate_docker_escape(
 def _evaluate_writable_service_files(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "writable", "writable_services")
-    if not probe or not probe.stdout:
-        return None
     paths = [
-        line.strip()
-        for line in probe.stdout.splitlines()
-        if line.strip() and "NONE_WRITABLE" not in line
+        line
+        for line in snapshot.facts.lines("writable", "writable_services")
+        if "NONE_WRITABLE" not in line
     ]
     if not paths:
         return None
@@ -855,8 +2109,7 @@ def _evaluate_credential_exposure(
 
     ssh_keys = _get_probe(snapshot, "credentials", "ssh_keys")
     if ssh_keys and ssh_keys.stdout and "NO_READABLE_KEYS" not in ssh_keys.stdout:
-        keys = [line.strip() for line in ssh_keys.stdout.splitlines() if line.strip()]
-        for key_path in keys[:3]:
+        for key_path in snapshot.facts.lines("credentials", "ssh_keys")[:3]:
             evidence.append(f"Readable SSH key: {key_path}")
 
     history = _get_probe(snapshot, "credentials", "history_files")
@@ -865,8 +2118,7 @@ def _evaluate_credential_exposure(
 
     config_creds = _get_probe(snapshot, "credentials", "config_credentials")
     if config_creds and config_creds.stdout and "NONE_FOUND" not in config_creds.stdout:
-        cred_files = [line.strip() for line in config_creds.stdout.splitlines() if line.strip()]
-        for cf in cred_files[:3]:
+        for cf in snapshot.facts.lines("credentials", "config_credentials")[:3]:
             evidence.append(f"Credential file: {cf}")
 
     if not evidence:
@@ -886,43 +2138,23 @@ def _evaluate_gtfobins_sudo(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
     """Evaluate sudo-allowed binaries for GTFOBins exploitability via database cross-reference."""
-    sudo_check = _get_probe(snapshot, "users", "sudo_check")
-    if not sudo_check or not sudo_check.stdout:
-        return None
-
     matches: list[str] = []
     exploit_commands: list[str] = []
     best_difficulty = "moderate"
 
-    for line in sudo_check.stdout.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("User ") or stripped.startswith("Matching"):
+    known = {item.name: item for item in snapshot.facts.exploitable_binaries("sudo")}
+    for rule in snapshot.facts.sudo_rules():
+        binary_name = rule.binary_name
+        if binary_name not in known:
             continue
-        # Extract binary name from sudo line — typically ends with /path/to/binary or args
-        # e.g. "(root) NOPASSWD: /usr/bin/vim" → "vim"
-        parts = stripped.split()
-        if not parts:  # pragma: no cover - stripped is non-empty per line 846
-            continue  # pragma: no cover
-        # The binary path is usually the last segment that starts with /
-        binary_path = ""
-        for part in parts:
-            if part.startswith("/"):
-                binary_path = part
-                break
-        if not binary_path:
-            # Try the last token as a potential binary
-            binary_path = parts[-1]
-        binary_name = binary_path.rsplit("/", 1)[-1] if "/" in binary_path else binary_path
-        entries = lookup_sudo(binary_name)
-        if entries:
-            matches.append(stripped)
-            for entry in entries:
-                exploit_commands.append(f"# {binary_name}: {entry.description}")
-                exploit_commands.append(entry.command_template)
-                if any(kw in entry.description.lower() for kw in ("shell", "spawn", "escape")):
-                    best_difficulty = "instant"
-                elif best_difficulty != "instant":
-                    best_difficulty = "easy"
+        matches.append(rule.line)
+        for entry in known[binary_name].techniques:
+            exploit_commands.append(f"# {binary_name}: {entry.description}")
+            exploit_commands.append(entry.command_template)
+            if _spawns_privileged_shell(entry):
+                best_difficulty = "instant"
+            elif best_difficulty != "instant":
+                best_difficulty = "easy"
 
     if not matches:
         return None
@@ -943,34 +2175,35 @@ def _evaluate_gtfobins_suid(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
     """Evaluate SUID binaries for GTFOBins exploitability via database cross-reference."""
-    suid_probe = _get_probe(snapshot, "filesystem", "suid_files")
-    if not suid_probe or not suid_probe.stdout:
+    known = {item.name: item for item in snapshot.facts.exploitable_binaries("suid")}
+    if not known:
         return None
+    # Privileged shells are instant wins, any other known technique is easy
+    best_difficulty = (
+        "instant"
+        if any(
+            _spawns_privileged_shell(entry) for item in known.values() for entry in item.techniques
+        )
+        else "easy"
+    )
 
+    # Only the first few matches are shown, so stop walking the listing once they are found
     matches: list[str] = []
     exploit_commands: list[str] = []
-    best_difficulty = "moderate"  # track easiest exploit found
-
-    for line in suid_probe.stdout.splitlines():
-        path = line.strip()
-        if not path:
+    for path in snapshot.facts.lines("filesystem", "suid_files"):
+        if len(matches) >= 6 and len(exploit_commands) >= 12:
+            break
+        binary_name = _binary_name(path)
+        if binary_name not in known:
             continue
-        binary_name = path.rsplit("/", 1)[-1] if "/" in path else path
-        entries = lookup_suid(binary_name)
-        if entries:
-            matches.append(path)
-            for entry in entries:
-                exploit_commands.append(f"# {binary_name} ({path}): {entry.description}")
-                exploit_commands.append(entry.command_template)
-                # Shell-spawning entries are instant/easy wins
-                if any(kw in entry.description.lower() for kw in ("shell", "spawn", "escape")):
-                    best_difficulty = "instant"
-                elif best_difficulty != "instant":
-                    best_difficulty = "easy"
+        for entry in known[binary_name].techniques:
+            exploit_commands.append(f"# {binary_name} ({path}): {entry.description}")
+            exploit_commands.append(entry.command_template)
+        matches.append(path)
 
-    if not matches:
-        return None
-    detail = f"Found {len(matches)} SUID binaries with known GTFOBins techniques"
+    index = snapshot.facts.binary_index("filesystem", "suid_files")
+    match_count = sum(len(index[name]) for name in known)
+    detail = f"Found {match_count} SUID binaries with known GTFOBins techniques"
     return PriorityFinding(
         key=meta.key,
         category=meta.category,
@@ -986,14 +2219,7 @@ def _evaluate_gtfobins_suid(
 def _evaluate_writable_path(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "writable", "writable_path_dirs")
-    if not probe or not probe.stdout:
-        return None
-    writable = [
-        line.replace("WRITABLE:", "").strip()
-        for line in probe.stdout.splitlines()
-        if line.strip().startswith("WRITABLE:")
-    ]
+    writable = snapshot.facts.marked("writable", "writable_path_dirs")
     if not writable:
         return None
     detail = f"Found {len(writable)} writable directories in PATH"
@@ -1003,7 +2229,7 @@ def _evaluate_writable_path(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=writable[:6],
+        evidence=list(writable[:6]),
         exploitation_difficulty="moderate",
     )
 
@@ -1011,14 +2237,7 @@ def _evaluate_writable_path(
 def _evaluate_writable_cron_files(
     snapshot: EnumerationSnapshot, meta: PriorityHeuristic
 ) -> PriorityFinding | None:
-    probe = _get_probe(snapshot, "writable", "writable_cron")
-    if not probe or not probe.stdout:
-        return None
-    writable = [
-        line.replace("WRITABLE:", "").strip()
-        for line in probe.stdout.splitlines()
-        if line.strip().startswith("WRITABLE:")
-    ]
+    writable = snapshot.facts.marked("writable", "writable_cron")
     if not writable:
         return None
     detail = f"Found {len(writable)} writable cron files or directories"
@@ -1028,7 +2247,7 @@ def _evaluate_writable_cron_files(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=writable[:6],
+        evidence=list(writable[:6]),
         exploitation_difficulty="moderate",
     )
 
@@ -1041,13 +2260,11 @@ def _evaluate_nfs_no_root_squash(
         return None
     if "NO_NFS_EXPORTS" in probe.stdout:
         return None
-    vulnerable: list[str] = []
-    for line in probe.stdout.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            continue
-        if "no_root_squash" in stripped:
-            vulnerable.append(stripped)
+    vulnerable = [
+        line
+        for line in snapshot.facts.lines("filesystem", "nfs_exports")
+        if not line.startswith("#") and "no_root_squash" in line
+    ]
     if not vulnerable:
         return None
     detail = f"Found {len(vulnerable)} NFS exports with no_root_squash"
@@ -1070,26 +2287,17 @@ def _evaluate_ld_preload_hijack(
         return None
     evidence: list[str] = []
 
-    for line in probe.stdout.splitlines():
-        stripped = line.strip()
-        # Check if LD_PRELOAD is set (not just empty)
-        if stripped.startswith("LD_PRELOAD=") and len(stripped) > len("LD_PRELOAD="):
-            evidence.append(stripped)
-        # Check if /etc/ld.so.preload exists and has content (not just the error message)
-        if (
-            stripped
-            and "NO_LD_PRELOAD_FILE" not in stripped
-            and not stripped.startswith("LD_PRELOAD=")
-        ):
-            evidence.append(f"/etc/ld.so.preload: {stripped}")
-
-    ld_lib = _get_probe(snapshot, "library_hijack", "ld_library_path")
-    if ld_lib and ld_lib.stdout:
-        for line in ld_lib.stdout.splitlines():
-            if line.strip().startswith("WRITABLE:"):
-                evidence.append(
-                    f"Writable LD_LIBRARY_PATH dir: {line.replace('WRITABLE:', '').strip()}"
-                )
+    for line in snapshot.facts.lines("library_hijack", "ld_preload"):
+        if line.startswith("LD_PRELOAD="):
+            # Only when LD_PRELOAD is set (not just empty)
+            if len(line) > len("LD_PRELOAD="):
+                evidence.append(line)
+        elif "NO_LD_PRELOAD_FILE" not in line:
+            # /etc/ld.so.preload exists and has content (not just the error message)
+            evidence.append(f"/etc/ld.so.preload: {line}")
+
+    for directory in snapshot.facts.marked("library_hijack", "ld_library_path"):
+        evidence.append(f"Writable LD_LIBRARY_PATH dir: {directory}")
 
     if not evidence:
         return None
@@ -1135,10 +2343,7 @@ def _evaluate_cloud_environment(
     if not probe or not probe.stdout:
         return None
     evidence: list[str] = []
-    for line in probe.stdout.splitlines():
-        stripped = line.strip()
-        if not stripped:
-            continue
+    for stripped in snapshot.facts.lines("credentials", "cloud_credentials"):
         if "NO_CLOUD_CREDS" in stripped or "NO_CLOUD_METADATA" in stripped:
             continue
         if "AWS_METADATA_AVAILABLE" in stripped:
@@ -1166,7 +2371,7 @@ def _evaluate_interesting_backups(
         return None
     if "NO_BACKUPS" in probe.stdout:
         return None
-    lines = [line.strip() for line in probe.stdout.splitlines() if line.strip()]
+    lines = snapshot.facts.lines("interesting_files", "backup_files")
     if not lines:
         return None
     detail = f"Found {len(lines)} accessible backup entries"
@@ -1176,7 +2381,7 @@ def _evaluate_interesting_backups(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=lines[:6],
+        evidence=list(lines[:6]),
     )
 
 
@@ -1188,7 +2393,7 @@ def _evaluate_recent_modifications(
         return None
     if "NONE_RECENT" in probe.stdout:
         return None
-    files = [line.strip() for line in probe.stdout.splitlines() if line.strip()]
+    files = snapshot.facts.lines("interesting_files", "recently_modified")
     if not files:
         return None
     detail = f"Found {len(files)} recently modified files in sensitive locations"
@@ -1198,7 +2403,7 @@ def _evaluate_recent_modifications(
         severity=meta.severity,
         headline=meta.headline,
         detail=detail,
-        evidence=files[:6],
+        evidence=list(files[:6]),
     )
 
 
@@ -1211,19 +2416,24 @@ def _evaluate_kernel_exploits(
         return None
 
     kernel_version = kernel_probe.stdout.strip().split()[0]
-    matches = suggest_exploits(kernel_version)
+    os_release_probe = _get_probe(snapshot, "system", "os_release")
+    result = get_index().match(kernel_version, os_release_probe.stdout if os_release_probe else "")
+    matches = result.exploits
     if not matches:
         return None
 
     evidence = [f"{e.cve} — {e.name}: {e.description}" for e in matches[:6]]
     exploit_cmds = [f"# {e.cve} ({e.name}): {e.reference_url}" for e in matches[:6]]
+    detail = f"Kernel {kernel_version} matches {len(matches)} known exploit(s)"
+    if result.patched:
+        detail += f"; {len(result.patched)} more fixed by distro backports"
 
     return PriorityFinding(
         key=meta.key,
         category=meta.category,
         severity=meta.severity,
         headline=meta.headline,
-        detail=f"Kernel {kernel_version} matches {len(matches)} known exploit(s)",
+        detail=detail,
         evidence=evidence,
         exploitation_difficulty="moderate",
         exploit_commands=exploit_cmds,
@@ -1270,6 +2480,173 @@ def generate_priority_findings(snapshot: EnumerationSnapshot) -> list[PriorityFi
     return findings
 
 
+# Probes each heuristic reads; a heuristic is evaluated as soon as all of its
+# inputs that are part of the batch have arrived.
+HEURISTIC_INPUTS: dict[str, tuple[tuple[str, str], ...]] = {
+    "sudo_membership": (("users", "id"), ("users", "sudo_check")),
+    "passwordless_sudo": (("users", "sudoers"), ("users", "sudo_check")),
+    "suid_binaries": (("filesystem", "suid_files"), ("filesystem", "sgid_files")),
+    "world_writable_dirs": (("filesystem", "world_writable_dirs"),),
+    "exposed_network_services": (("network", "listening_services"),),
+    "weak_ssh_configuration": (
+        ("security", "ssh_effective_config"),
+        ("security", "ssh_config"),
+    ),
+    "suspicious_scheduled_tasks": (
+        ("scheduled", "cron_user"),
+        ("scheduled", "cron_system"),
+        ("scheduled", "systemd_timers"),
+        ("scheduled", "cron_d"),
+        ("scheduled", "cron_daily"),
+        ("scheduled", "at_jobs"),
+    ),
+    "kernel_drift": (
+        ("system", "kernel"),
+        ("packages", "package_inventory"),
+        ("packages", "package_manager"),
+    ),
+    "dangerous_capabilities": (("capabilities", "cap_interesting"),),
+    "writable_passwd_file": (("writable", "writable_passwd"),),
+    "docker_escape": (("container", "docker_group"), ("container", "docker_socket")),
+    "writable_service_files": (("writable", "writable_services"),),
+    "credential_exposure": (
+        ("credentials", "shadow_readable"),
+        ("credentials", "ssh_keys"),
+        ("credentials", "history_files"),
+        ("credentials", "config_credentials"),
+    ),
+    "gtfobins_sudo": (("users", "sudo_check"),),
+    "gtfobins_suid": (("filesystem", "suid_files"),),
+    "writable_path": (("writable", "writable_path_dirs"),),
+    "writable_cron_files": (("writable", "writable_cron"),),
+    "nfs_no_root_squash": (("filesystem", "nfs_exports"),),
+    "ld_preload_hijack": (("library_hijack", "ld_preload"), ("library_hijack", "ld_library_path")),
+    "container_detected": (("container", "container_detection"), ("container", "lxc_check")),
+    "cloud_environment": (("credentials", "cloud_credentials"),),
+    "interesting_backups": (("interesting_files", "backup_files"),),
+    "recent_modifications": (("interesting_files", "recently_modified"),),
+    "kernel_exploits": (("system", "kernel"), ("system", "os_release")),
+}
+
+
+class ProgressiveEnumeration:
+    """Builds the snapshot and priority findings incrementally as probe lines arrive."""
+
+    def __init__(self, probes: Sequence[RemoteProbe] = REMOTE_PROBES) -> None:
+        self.started = time.monotonic()
+        self.expected = {(probe.category, probe.key) for probe in probes}
+        if (FS_WALK_PROBE.category, FS_WALK_PROBE.key) in self.expected:
+            self.expected.update(FS_WALK_REPLACES)
+        self.snapshot = EnumerationSnapshot(collected_at=datetime.now(UTC), probes={}, warnings=[])
+        self._received: set[tuple[str, str]] = set()
+        self._results: dict[str, PriorityFinding | None] = {}
+
+    @property
+    def received(self) -> int:
+        return len(self._received)
+
+    @property
+    def total(self) -> int:
+        return len(self.expected)
+
+    @property
+    def findings(self) -> list[PriorityFinding]:
+        """Findings evaluated so far, in heuristic order."""
+        return [
+            finding
+            for heuristic in PRIORITY_HEURISTICS
+            if (finding := self._results.get(heuristic.key)) is not None
+        ]
+
+    def feed_line(self, line: str) -> ProbeOutput | None:
+        """Decode one JSON line from the batch; non-JSON noise is skipped."""
+        candidate = line.strip()
+        if not candidate:
+            return None
+        try:
+            payload = json.loads(candidate)
+        except json.JSONDecodeError:
+            if APP_LOGGER:
+                APP_LOGGER.debug(
+                    "Skipping non-JSON line from remote enumerate batch: %s", candidate
+                )
+            return None
+        if not isinstance(payload, dict):
+            return None
+        return self.add_payload(payload)
+
+    def add_payload(self, payload: Mapping[str, Any]) -> ProbeOutput:
+        probe = _probe_from_payload(payload, self.snapshot.warnings)
+        self.add_probe(probe)
+        return probe
+
+    def add_probe(self, probe: ProbeOutput) -> None:
+        """Record an already decoded probe (fresh or reused from a previous survey)."""
+        for result in _expand_probe(probe, self.snapshot.warnings):
+            self.snapshot.probes.setdefault(result.category, {})[result.key] = result
+            self._received.add((result.category, result.key))
+        self._evaluate(final=False)
+
+    def _inputs_ready(self, heuristic_key: str) -> bool:
+        inputs = HEURISTIC_INPUTS.get(heuristic_key)
+        if inputs is None:
+            return False
+        return all(item in self._received or item not in self.expected for item in inputs)
+
+    def _evaluate(self, final: bool) -> None:
+        for heuristic in PRIORITY_HEURISTICS:
+            if heuristic.key in self._results:
+                continue
+            evaluator = HEURISTIC_EVALUATORS.get(heuristic.key)
+            if not evaluator:  # pragma: no cover - heuristic lookup
+                continue
+            if final or self._inputs_ready(heuristic.key):
+                self._results[heuristic.key] = evaluator(self.snapshot, heuristic)
+
+    def finish(self, stderr: str = "", *, partial_reason: str | None = None) -> EnumerationSnapshot:
+        """Evaluate the remaining heuristics and return the snapshot."""
+        if partial_reason:
+            self.snapshot.warnings.append(
+                f"{partial_reason}; showing {self.received} of {self.total} probes"
+            )
+        if stderr.strip():
+            self.snapshot.warnings.append(f"Remote stderr: {stderr.strip()}")
+        self._evaluate(final=True)
+        self.snapshot.collected_at = datetime.now(UTC)
+        return self.snapshot
+
+
+def slowest_probes(
+    snapshot: EnumerationSnapshot, limit: int = SLOWEST_PROBE_COUNT
+) -> list[ProbeOutput]:
+    """Timed probes, longest remote duration first."""
+
+    timed = [
+        probe
+        for mapping in snapshot.probes.values()
+        for probe in mapping.values()
+        if probe.duration is not None
+    ]
+    timed.sort(key=lambda probe: probe.duration or 0.0, reverse=True)
+    return timed[:limit]
+
+
+def _near_timeout(probe: ProbeOutput) -> bool:
+    if probe.status == 124:  # exit status of timeout(1)
+        return True
+    return bool(probe.timeout) and (probe.duration or 0.0) >= probe.timeout * NEAR_TIMEOUT_RATIO
+
+
+def _probe_timing_dict(probe: ProbeOutput) -> dict[str, Any]:
+    return {
+        "probe": f"{probe.category}.{probe.key}",
+        "duration": round(probe.duration or 0.0, 3),
+        "timeout": probe.timeout,
+        "output_bytes": probe.stdout_bytes + probe.stderr_bytes,
+        "near_timeout": _near_timeout(probe),
+    }
+
+
 def _severity_badge(severity: str) -> Text:
     """Return a Rich Text severity badge with appropriate styling."""
     sev_upper = severity.upper()
@@ -1340,6 +2717,18 @@ def _render_stats_header_plain(
     )
 
 
+def exploitability_matrix(snapshot: EnumerationSnapshot) -> list[dict[str, Any]]:
+    """Binary x context x technique rows for every exploitable privileged binary."""
+    return [row for item in snapshot.facts.exploitable_binaries() for row in item.to_dicts()]
+
+
+def _format_paths(paths: Sequence[str]) -> str:
+    shown = ", ".join(paths[:MATRIX_PATHS_SHOWN])
+    if len(paths) > MATRIX_PATHS_SHOWN:
+        shown += f" +{len(paths) - MATRIX_PATHS_SHOWN} more"
+    return shown
+
+
 def render_plain(snapshot: EnumerationSnapshot, findings: Sequence[PriorityFinding]) -> str:
     lines: list[str] = []
     lines.append("LazySSH Enumeration Summary")
@@ -1382,6 +2771,31 @@ def render_plain(snapshot: EnumerationSnapshot, findings: Sequence[PriorityFindi
                         lines.append(f"      {cmd}")
                     else:
                         lines.append(f"      $ {cmd}")
+    matrix = exploitability_matrix(snapshot)
+    if matrix:
+        lines.append("")
+        lines.append("Exploitability Matrix:")
+        for row in matrix[:MATRIX_ROWS_SHOWN]:
+            lines.append(
+                f"- {row['binary']} ({_format_paths(row['paths'])}) "
+                f"[{row['context']}/{row['technique']}] {row['description']}"
+            )
+            lines.append(f"    $ {row['command']}")
+        if len(matrix) > MATRIX_ROWS_SHOWN:
+            lines.append(f"- ... {len(matrix) - MATRIX_ROWS_SHOWN} more in the JSON output")
+    slowest = slowest_probes(snapshot)
+    if slowest:
+        lines.append("")
+        lines.append("Slowest Probes:")
+        for probe in slowest:
+            timing = _probe_timing_dict(probe)
+            line = (
+                f"- {timing['duration']:.2f}s {timing['probe']} "
+                f"(timeout {probe.timeout}s, {timing['output_bytes']} bytes)"
+            )
+            if timing["near_timeout"]:
+                line += " ! near timeout"
+            lines.append(line)
     if snapshot.warnings:
         lines.append("")
         lines.append("Warnings:")
@@ -1526,6 +2940,34 @@ def render_rich(snapshot: EnumerationSnapshot, findings: Sequence[PriorityFindin
         )
     )
 
+    matrix = exploitability_matrix(snapshot)
+    if matrix:
+        matrix_table = Table(box=box.SIMPLE, expand=True, show_header=True, padding=(0, 1))
+        matrix_table.add_column("Binary", style="accent", overflow="fold", ratio=2)
+        matrix_table.add_column("Context", no_wrap=True)
+        matrix_table.add_column("Technique", style="dim", no_wrap=True)
+        matrix_table.add_column("Command", overflow="fold", ratio=4)
+        for row in matrix[:MATRIX_ROWS_SHOWN]:
+            binary_text = Text(row["binary"], style="accent")
+            binary_text.append(f"\n{_format_paths(row['paths'])}", style="dim")
+            command_text = Text(row["description"], style="dim")
+            command_text.append(f"\n$ {row['command']}", style="highlight")
+            matrix_table.add_row(binary_text, row["context"], row["technique"], command_text)
+        if len(matrix) > MATRIX_ROWS_SHOWN:
+            matrix_table.add_row(
+                "", "", "", f"[dim]... {len(matrix) - MATRIX_ROWS_SHOWN} more in the JSON output[/]"
+            )
+        console.print(
+            Panel(
+                matrix_table,
+                title="[panel.title]Exploitability Matrix[/panel.title]",
+                border_style="border",
+                box=box.ROUNDED,
+                padding=(0, 1),
+                expand=True,
+            )
+        )
+
     categories_with_criticals: set[str] = {f.category for f in findings if f.severity == "critical"}
     categories_with_failures: set[str] = set()
     for cat, mapping in snapshot.probes.items():
@@ -1582,6 +3024,33 @@ def render_rich(snapshot: EnumerationSnapshot, findings: Sequence[PriorityFindin
             )
         )
 
+    slowest = slowest_probes(snapshot)
+    if slowest:
+        timing_table = Table(box=box.SIMPLE, expand=True, show_header=True, padding=(0, 1))
+        timing_table.add_column("Probe", style="accent", no_wrap=True)
+        timing_table.add_column("Duration", justify="right", no_wrap=True)
+        timing_table.add_column("Timeout", style="dim", justify="right", no_wrap=True)
+        timing_table.add_column("Output", style="dim", justify="right", no_wrap=True)
+        for probe in slowest:
+            timing = _probe_timing_dict(probe)
+            duration_style = "warning" if timing["near_timeout"] else "foreground"
+            timing_table.add_row(
+                timing["probe"],
+                f"[{duration_style}]{timing['duration']:.2f}s[/]",
+                f"{probe.timeout}s",
+                f"{timing['output_bytes']} B",
+            )
+        console.print(
+            Panel(
+                timing_table,
+                title="[panel.title]Slowest Probes[/panel.title]",
+                border_style="border",
+                box=box.ROUNDED,
+                padding=(0, 1),
+                expand=True,
+            )
+        )
+
     if snapshot.warnings:
         console.print(
             Panel(
@@ -1595,29 +3064,161 @@ def render_rich(snapshot: EnumerationSnapshot, findings: Sequence[PriorityFindin
         )
 
 
+def render_diff_plain(diff: FindingsDiff, previous: PreviousSurvey) -> str:
+    since = previous.snapshot.collected_at.isoformat(timespec="seconds")
+    lines = [f"Changes in priority findings since {since}", "=" * 80]
+    if diff.empty:
+        lines.append("- No changes.")
+    for finding in diff.added:
+        lines.append(f"+ [{finding.severity.upper()}] {finding.headline}")
+        lines.append(f"    {finding.detail}")
+    for finding in diff.resolved:
+        lines.append(f"- [{finding.severity.upper()}] {finding.headline}")
+        lines.append(f"    {finding.detail}")
+    for old, new in diff.changed:
+        lines.append(f"~ [{new.severity.upper()}] {new.headline}")
+        lines.append(f"    was: {old.detail}")
+        lines.append(f"    now: {new.detail}")
+    return "\n".join(lines) + "\n"
+
+
+def render_diff_rich(diff: FindingsDiff, previous: PreviousSurvey) -> None:
+    if Table is None or Panel is None or box is None:  # pragma: no cover - Rich unavailable
+        console.print(render_diff_plain(diff, previous))
+        return
+
+    since = previous.snapshot.collected_at.isoformat(timespec="seconds")
+    table = Table(box=box.ROUNDED, expand=True, show_header=True, padding=(0, 1))
+    table.add_column("Change", justify="center", no_wrap=True, width=10)
+    table.add_column("Severity", justify="center", no_wrap=True, width=9)
+    table.add_column("Finding", style="foreground", overflow="fold", ratio=2, min_width=24)
+    table.add_column("Detail", style="dim", overflow="fold", ratio=3, min_width=32)
+    for finding in diff.added:
+        table.add_row(
+            "[error]NEW[/]", _severity_badge(finding.severity), finding.headline, finding.detail
+        )
+    for finding in diff.resolved:
+        table.add_row(
+            "[success]RESOLVED[/]",
+            _severity_badge(finding.severity),
+            finding.headline,
+            finding.detail,
+        )
+    for old, new in diff.changed:
+        table.add_row(
+            "[warning]CHANGED[/]",
+            _severity_badge(new.severity),
+            new.headline,
+            f"was: {old.detail}\nnow: {new.detail}",
+        )
+    if diff.empty:
+        table.add_row("[info]NONE[/]", "", "No changes in priority findings", "")
+
+    console.print(
+        Panel(
+            table,
+            title=f"[panel.title]Changes Since {since}[/panel.title]",
+            border_style="warning" if diff.added else "border",
+            box=box.ROUNDED,
+            padding=(1, 2),
+            expand=True,
+        )
+    )
+
+
+def render_progress(state: ProgressiveEnumeration) -> Any:
+    """Live progress panel: probes received so far and the findings already known."""
+
+    elapsed = time.monotonic() - state.started
+    status = Text.assemble(
+        ("Probes ", "dim"),
+        (f"{state.received}/{state.total}", "accent"),
+        ("  elapsed ", "dim"),
+        (f"{elapsed:.1f}s", "accent"),
+    )
+    findings = state.findings
+    if not findings:
+        body: Any = status
+    else:
+        table = Table(box=box.SIMPLE, expand=True, show_header=False, padding=(0, 1))
+        table.add_column("Severity", justify="center", no_wrap=True, width=9)
+        table.add_column("Finding", style="foreground", overflow="fold")
+        for finding in findings:
+            table.add_row(_severity_badge(finding.severity), finding.headline)
+        body = Group(status, table)
+    return Panel(
+        body,
+        title="[panel.title]Enumerating[/panel.title]",
+        border_style="border",
+        box=box.ROUNDED,
+        expand=True,
+    )
+
+
+@contextmanager
+def live_progress(
+    enabled: bool,
+) -> Iterator[Callable[[ProgressiveEnumeration], None] | None]:
+    """Yield an update callback that redraws a transient live panel, or None when disabled.
+
+    The panel is only drawn when the plugin is run directly in a terminal.
+    Under ``plugin run`` stdout is a pipe that lazyssh captures into the
+    plugin log, where every redraw would be recorded, so no panel is drawn.
+    """
+
+    if not enabled or Live is None or not console.is_terminal:
+        yield None
+        return
+    with Live(console=console, transient=True, refresh_per_second=8) as live:
+
+        def update(state: ProgressiveEnumeration) -> None:
+            live.update(render_progress(state))
+
+        yield update
+
+
 def build_json_payload(
-    snapshot: EnumerationSnapshot, findings: Sequence[PriorityFinding], plain_report: str
+    snapshot: EnumerationSnapshot,
+    findings: Sequence[PriorityFinding],
+    plain_report: str,
+    diff: FindingsDiff | None = None,
 ) -> dict[str, Any]:
     categories: dict[str, dict[str, Any]] = {}
     for category, mapping in snapshot.probes.items():
         categories[category] = {key: probe.to_dict() for key, probe in mapping.items()}
 
-    return {
+    payload = {
         "collected_at": snapshot.collected_at.isoformat(timespec="seconds"),
         "priority_findings": [finding.to_dict() for finding in findings],
         "categories": categories,
         "warnings": snapshot.warnings,
         "summary_text": plain_report.strip(),
         "probe_count": sum(len(mapping) for mapping in snapshot.probes.values()),
+        "gtfobins_version": database_version(),
+        "exploitability_matrix": exploitability_matrix(snapshot),
+        "probe_timings": [
+            _probe_timing_dict(probe) for probe in slowest_probes(snapshot, limit=len(PROBE_LOOKUP))
+        ],
     }
+    if diff is not None:
+        payload["diff"] = diff.to_dict()
+    return payload
 
 
-def _resolve_log_dir() -> Path:
+def _current_connection_name() -> str:
     connection_name = os.environ.get("LAZYSSH_CONNECTION_NAME") or os.environ.get(
         "LAZYSSH_SOCKET", "unknown"
     )
     if connection_name and "/" in connection_name:
         connection_name = Path(connection_name).name
+    return connection_name
+
+
+def _resolve_log_dir(connection_name: str | None = None) -> Path:
+    """Log directory of ``connection_name``, defaulting to this plugin's connection."""
+
+    if not connection_name:
+        connection_name = _current_connection_name()
     template = CONNECTION_LOG_DIR_TEMPLATE or "/tmp/lazyssh/{connection_name}.d/logs"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
     path = Path(template.format(connection_name=connection_name))
     try:
@@ -1635,8 +3236,10 @@ def write_artifacts(
     plain_report: str,
     json_payload: Mapping[str, Any],
     is_json_output: bool,
+    log_dir: Path | None = None,
 ) -> tuple[Path, Path | None]:
-    log_dir = _resolve_log_dir()
+    if log_dir is None:
+        log_dir = _resolve_log_dir()
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     json_path = log_dir / f"survey_{timestamp}.json"
     json_path.write_text(json.dumps(json_payload, indent=2), encoding="utf-8")
@@ -1649,13 +3252,459 @@ def write_artifacts(
     return json_path, txt_path
 
 
+@dataclass
+class HostSurvey:
+    """Outcome of enumerating one host during an ``--all-hosts`` run."""
+
+    target: RemoteTarget
+    snapshot: EnumerationSnapshot | None = None
+    findings: list[PriorityFinding] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class FleetFinding:
+    """One heuristic's findings merged across every host that raised it."""
+
+    key: str
+    category: str
+    severity: Severity
+    headline: str
+    hosts: list[str]
+    evidence: list[tuple[str, list[str]]]  # (item, hosts showing it), most widespread first
+    exploitation_difficulty: str = ""
+    exploit_commands: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "key": self.key,
+            "category": self.category,
+            "severity": self.severity,
+            "headline": self.headline,
+            "host_count": len(self.hosts),
+            "hosts": self.hosts,
+            "evidence": [{"item": item, "hosts": hosts} for item, hosts in self.evidence],
+            "exploitation_difficulty": self.exploitation_difficulty,
+            "exploit_commands": self.exploit_commands,
+        }
+
+
+def collect_fleet(
+    targets: Sequence[RemoteTarget],
+    probes: Sequence[RemoteProbe],
+    parallel: int = 1,
+    max_hosts: int = DEFAULT_FLEET_CONCURRENCY,
+    timeout: int = DEFAULT_REMOTE_TIMEOUT,
+    wire: str = "json",
+    compressors: Sequence[str] = (),
+    on_host_done: Callable[[HostSurvey], None] | None = None,
+) -> list[HostSurvey]:
+    """Enumerate ``targets`` concurrently, ``max_hosts`` at a time.
+
+    Each host gets its own :class:`ProgressiveEnumeration`, so findings are
+    evaluated as that host's probes land. A host that fails is reported with
+    its error instead of aborting the run. Results keep the order of ``targets``.
+    """
+
+    def survey(target: RemoteTarget) -> HostSurvey:
+        state = ProgressiveEnumeration(probes)
+        try:
+            snapshot = collect_remote_snapshot(
+                parallel=parallel,
+                probes=probes,
+                state=state,
+                timeout=timeout,
+                wire=wire,
+                compressors=compressors,
+                target=target,
+            )
+        except RemoteExecutionError as exc:
+            return HostSurvey(target, error=str(exc))
+        return HostSurvey(target, snapshot, state.findings)
+
+    results: list[HostSurvey | None] = [None] * len(targets)
+    if not targets:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_hosts, len(targets)))) as pool:
+        futures = {pool.submit(survey, target): index for index, target in enumerate(targets)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if on_host_done is not None:
+                on_host_done(result)
+    return [result for result in results if result is not None]
+
+
+def aggregate_findings(surveys: Sequence[HostSurvey]) -> list[FleetFinding]:
+    """Group identical findings across hosts and rank them.
+
+    Findings are grouped by heuristic key and their evidence items by value, so
+    the same SUID binary on twenty hosts becomes one line listing those hosts.
+    Ranking is by the worst severity seen, then by how many hosts are affected.
+    """
+
+    by_key: dict[str, list[tuple[str, PriorityFinding]]] = {}
+    for survey in surveys:
+        for finding in survey.findings:
+            by_key.setdefault(finding.key, []).append((survey.target.name, finding))
+
+    merged: list[FleetFinding] = []
+    for key, entries in by_key.items():
+        worst = max(entries, key=lambda entry: SEVERITY_WEIGHTS.get(entry[1].severity, 0.0))[1]
+        evidence: dict[str, list[str]] = {}
+        for host, finding in entries:
+            for item in finding.evidence or [finding.detail]:
+                hosts = evidence.setdefault(item, [])
+                if host not in hosts:
+                    hosts.append(host)
+        difficulties = [f.exploitation_difficulty for _, f in entries if f.exploitation_difficulty]
+        merged.append(
+            FleetFinding(
+                key=key,
+                category=worst.category,
+                severity=worst.severity,
+                headline=worst.headline,
+                hosts=list(dict.fromkeys(host for host, _ in entries)),
+                evidence=sorted(evidence.items(), key=lambda item: (-len(item[1]), item[0])),
+                exploitation_difficulty=min(difficulties, key=_DIFFICULTY_ORDER.index, default=""),
+                exploit_commands=worst.exploit_commands,
+            )
+        )
+    merged.sort(key=lambda f: (-SEVERITY_WEIGHTS.get(f.severity, 0.0), -len(f.hosts), f.key))
+    return merged
+
+
+def _format_hosts(hosts: Sequence[str]) -> str:
+    shown = ", ".join(hosts[:FLEET_HOSTS_SHOWN])
+    if len(hosts) > FLEET_HOSTS_SHOWN:
+        shown += f", +{len(hosts) - FLEET_HOSTS_SHOWN} more"
+    return shown
+
+
+def _host_line_plain(survey: HostSurvey) -> str:
+    if survey.error is not None:
+        return f"- {survey.target.name} ({survey.target.host}): FAILED - {survey.error}"
+    counts = _severity_counts(survey.findings)
+    breakdown = ", ".join(f"{count} {severity}" for severity, count in counts.items() if count)
+    line = f"- {survey.target.name} ({survey.target.host}): {len(survey.findings)} findings"
+    if breakdown:
+        line += f" ({breakdown})"
+    if survey.snapshot is not None and survey.snapshot.warnings:
+        line += f" [{len(survey.snapshot.warnings)} warnings]"
+    return line
+
+
+def _severity_counts(findings: Sequence[PriorityFinding | FleetFinding]) -> dict[str, int]:
+    counts = dict.fromkeys(SEVERITY_WEIGHTS, 0)
+    for finding in findings:
+        counts[finding.severity] = counts.get(finding.severity, 0) + 1
+    return counts
+
+
+def render_fleet_plain(
+    surveys: Sequence[HostSurvey], fleet: Sequence[FleetFinding], collected_at: datetime
+) -> str:
+    failed = sum(1 for survey in surveys if survey.error is not None)
+    counts = _severity_counts(fleet)
+    lines = [
+        "LazySSH Fleet Enumeration Summary",
+        "=" * 80,
+        f"Collected: {collected_at.isoformat(timespec='seconds')}",
+        f"Hosts: {len(surveys) - failed} surveyed, {failed} failed | Distinct findings: "
+        + ", ".join(f"{count} {severity}" for severity, count in counts.items()),
+        "",
+        "Ranked Findings:",
+    ]
+    if not fleet:
+        lines.append("- None detected by heuristics.")
+    for finding in fleet:
+        lines.append(
+            f"- [{finding.severity.upper()}] {finding.headline} "
+            f"({len(finding.hosts)}/{len(surveys)} hosts: {_format_hosts(finding.hosts)})"
+        )
+        for item, hosts in finding.evidence[:FLEET_EVIDENCE_SHOWN]:
+            lines.append(f"    • {item} [{len(hosts)} hosts: {_format_hosts(hosts)}]")
+    lines.append("")
+    lines.append("Hosts:")
+    lines.extend(_host_line_plain(survey) for survey in surveys)
+    return "\n".join(lines) + "\n"
+
+
+def render_fleet_rich(
+    surveys: Sequence[HostSurvey], fleet: Sequence[FleetFinding], collected_at: datetime
+) -> None:
+    failed = sum(1 for survey in surveys if survey.error is not None)
+    header = Text()
+    header.append("Fleet enumeration ", style="panel.title")
+    header.append(collected_at.isoformat(timespec="seconds"), style="dim")
+    header.append(f"\n{len(surveys) - failed} hosts surveyed", style="success")
+    if failed:
+        header.append(f", {failed} failed", style="error")
+
+    findings_table = Table(box=box.ROUNDED, expand=True, show_header=True, padding=(0, 1))
+    findings_table.add_column(
+        "Severity", justify="center", style="panel.title", no_wrap=True, width=9
+    )
+    findings_table.add_column("Finding", style="foreground", overflow="fold", ratio=2, min_width=24)
+    findings_table.add_column("Hosts", justify="right", no_wrap=True, width=7)
+    findings_table.add_column("Evidence", style="dim", overflow="fold", ratio=3, min_width=32)
+    for finding in fleet:
+        evidence_text = Text()
+        for item, hosts in finding.evidence[:FLEET_EVIDENCE_SHOWN]:
+            if evidence_text:
+                evidence_text.append("\n")
+            evidence_text.append(f"{item} ", style="accent")
+            evidence_text.append(f"({_format_hosts(hosts)})", style="dim")
+        findings_table.add_row(
+            _severity_badge(finding.severity),
+            finding.headline,
+            f"{len(finding.hosts)}/{len(surveys)}",
+            evidence_text,
+        )
+    if not fleet:
+        findings_table.add_row(
+            "[info]INFO[/]", "No priority findings", "", "Heuristics did not flag elevated risk."
+        )
+
+    hosts_table = Table(box=box.SIMPLE, expand=True, show_header=True, padding=(0, 1))
+    hosts_table.add_column("Connection", style="accent", no_wrap=True)
+    hosts_table.add_column("Host", style="dim", no_wrap=True)
+    hosts_table.add_column("Findings", overflow="fold")
+    for survey in surveys:
+        if survey.error is not None:
+            status = Text(f"failed: {survey.error}", style="error")
+        else:
+            status = Text()
+            for severity, count in _severity_counts(survey.findings).items():
+                if count:
+                    status.append(f"{count} ")
+                    status.append_text(_severity_badge(severity))
+                    status.append("  ")
+            if not status:
+                status.append("none", style="dim")
+        hosts_table.add_row(survey.target.name, survey.target.host, status)
+
+    console.print(Panel(header, border_style="border", box=box.ROUNDED, expand=True))
+    console.print(
+        Panel(
+            findings_table,
+            title="[panel.title]Ranked Findings Across Hosts[/panel.title]",
+            border_style="border",
+            box=box.ROUNDED,
+            padding=(1, 2),
+            expand=True,
+        )
+    )
+    console.print(
+        Panel(
+            hosts_table,
+            title="[panel.title]Hosts[/panel.title]",
+            border_style="border",
+            box=box.ROUNDED,
+            expand=True,
+        )
+    )
+
+
+def build_fleet_json_payload(
+    surveys: Sequence[HostSurvey], fleet: Sequence[FleetFinding], collected_at: datetime
+) -> dict[str, Any]:
+    hosts: list[dict[str, Any]] = []
+    for survey in surveys:
+        entry: dict[str, Any] = {
+            "name": survey.target.name,
+            "host": survey.target.host,
+            "user": survey.target.user,
+            "error": survey.error,
+        }
+        if survey.snapshot is not None:
+            survey_payload = build_json_payload(survey.snapshot, survey.findings, "")
+            del survey_payload["summary_text"]
+            entry.update(survey_payload)
+        hosts.append(entry)
+    return {
+        "collected_at": collected_at.isoformat(timespec="seconds"),
+        "host_count": len(surveys),
+        "failed_hosts": [survey.target.name for survey in surveys if survey.error is not None],
+        "ranked_findings": [finding.to_dict() for finding in fleet],
+        "hosts": hosts,
+    }
+
+
+def archive_runs(
+    surveys: Sequence[tuple[str, str, Mapping[str, Any], str | None]], quiet: bool
+) -> int:
+    """Add ``(connection, host, payload, source)`` surveys to the snapshot archive.
+
+    The archive is a convenience on top of the JSON files, so failures only warn.
+    """
+
+    try:
+        return archive_surveys(surveys)
+    except (sqlite3.Error, OSError) as exc:
+        if APP_LOGGER:
+            APP_LOGGER.warning(f"Failed to archive enumerate survey: {exc}")
+        if not quiet:
+            console.print(f"[warning]Survey archive unavailable: {exc}[/]")
+        return 0
+
+
+def write_fleet_artifacts(
+    surveys: Sequence[HostSurvey],
+    plain_report: str,
+    json_payload: Mapping[str, Any],
+    is_json_output: bool,
+) -> tuple[Path, Path | None]:
+    """Save each host's survey in its own log directory and the fleet report in ours.
+
+    Per-host surveys keep ``--diff`` working when a host is later enumerated alone.
+    """
+
+    archived: list[tuple[str, str, Mapping[str, Any], str | None]] = []
+    for survey in surveys:
+        if survey.snapshot is None:
+            continue
+        host_report = render_plain(survey.snapshot, survey.findings)
+        host_payload = build_json_payload(survey.snapshot, survey.findings, host_report)
+        host_json_path, _ = write_artifacts(
+            survey.snapshot,
+            survey.findings,
+            host_report,
+            host_payload,
+            is_json_output,
+            log_dir=_resolve_log_dir(survey.target.name),
+        )
+        archived.append((survey.target.name, survey.target.host, host_payload, str(host_json_path)))
+    archive_runs(archived, quiet=is_json_output)
+    log_dir = _resolve_log_dir()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = log_dir / f"fleet_survey_{timestamp}.json"
+    json_path.write_text(json.dumps(json_payload, indent=2), encoding="utf-8")
+    txt_path: Path | None = None
+    if not is_json_output:
+        txt_path = log_dir / f"fleet_survey_{timestamp}.txt"
+        txt_path.write_text(plain_report, encoding="utf-8")
+    return json_path, txt_path
+
+
+def run_fleet(
+    probes: Sequence[RemoteProbe],
+    parallel: int,
+    wire: str,
+    compressors: Sequence[str],
+    is_json_output: bool,
+    use_plain: bool,
+) -> int:  # pragma: no cover - CLI entry point
+    targets = all_targets()
+    if not targets:
+        print("Enumeration failed: no active connections", file=sys.stderr)
+        return 1
+    if not is_json_output:
+        console.print(f"[dim]Enumerating {len(targets)} hosts...[/dim]")
+
+    def report_host(survey: HostSurvey) -> None:
+        if is_json_output:
+            return
+        if survey.error is not None:
+            console.print(f"[error]{survey.target.name}: {survey.error}[/error]")
+        else:
+            console.print(f"[dim]{survey.target.name}: {len(survey.findings)} findings[/dim]")
+
+    surveys = collect_fleet(
+        targets,
+        probes,
+        parallel=parallel,
+        wire=wire,
+        compressors=compressors,
+        on_host_done=report_host,
+    )
+    collected_at = datetime.now(UTC)
+    fleet = aggregate_findings(surveys)
+    plain_report = render_fleet_plain(surveys, fleet, collected_at)
+    json_payload = build_fleet_json_payload(surveys, fleet, collected_at)
+
+    if is_json_output:
+        sys.stdout.write(json.dumps(json_payload, indent=2))
+        sys.stdout.write("\n")
+    elif not use_plain:
+        render_fleet_rich(surveys, fleet, collected_at)
+    else:
+        console.print(plain_report)
+
+    json_path, txt_path = write_fleet_artifacts(surveys, plain_report, json_payload, is_json_output)
+    if not is_json_output:
+        console.print(f"[success]Saved fleet survey to {json_path}[/success]")
+        if txt_path:
+            console.print(f"[dim]Plain-text copy: {txt_path}[/dim]")
+    return 0 if any(survey.error is None for survey in surveys) else 1
+
+
 def main() -> int:  # pragma: no cover - CLI entry point
     ui_config = get_ui_config()
     use_plain = ui_config.get("plain_text") or ui_config.get("no_rich")
     is_json_output = "--json" in sys.argv
+    argv = sys.argv[1:]
+    parallel = parse_parallel_jobs(argv)
+    log_dir = _resolve_log_dir()
+    profile = (parse_option_values(argv, "profile") or (DEFAULT_PROFILE,))[-1]
+    budget = (parse_option_values(argv, "budget") or ("",))[-1]
+    try:
+        base_probes = select_probes(
+            profile_probes(profile),
+            include=parse_option_values(argv, "include"),
+            exclude=parse_option_values(argv, "exclude"),
+        )
+        budget_seconds = float(budget) if budget else None
+    except ValueError as exc:
+        print(f"Enumeration failed: {exc}", file=sys.stderr)
+        return 2
+    if "--fs-walk" in sys.argv:
+        base_probes = build_fs_walk_plan(base_probes)
+    if budget_seconds is not None:
+        base_probes, skipped = plan_budget(
+            base_probes, budget_seconds, load_probe_durations(log_dir), parallel
+        )
+        if skipped and not is_json_output:
+            console.print(
+                f"[dim]Budget {budget_seconds:g}s: running {len(base_probes)} probes, "
+                f"skipping {len(skipped)}[/dim]"
+            )
+    probes = (*base_probes, FINGERPRINT_PROBE)
+    state = ProgressiveEnumeration(probes)
+    compress = "--compress" in sys.argv
+    wire = "framed" if compress or "--framed" in sys.argv else "json"
+    compressors = available_compressors() if compress else ()
+    if "--all-hosts" in sys.argv:
+        if "--diff" in sys.argv and not is_json_output:
+            console.print("[warning]--diff is not supported with --all-hosts; running in full.[/]")
+        return run_fleet(probes, parallel, wire, compressors, is_json_output, bool(use_plain))
+    previous = load_previous_survey(log_dir) if "--diff" in sys.argv else None
+    if "--diff" in sys.argv and previous is None and not is_json_output:
+        console.print("[warning]No previous survey for this connection; running in full.[/]")
 
     try:
-        snapshot = collect_remote_snapshot()
+        # A compressed stream arrives in bursts as the remote compressor flushes,
+        # so there is no steady progress to draw
+        with live_progress(not (is_json_output or use_plain or compress)) as on_update:
+            if previous is not None:
+                snapshot, _reused = collect_incremental_snapshot(
+                    previous,
+                    probes,
+                    parallel=parallel,
+                    state=state,
+                    on_update=on_update,
+                    wire=wire,
+                    compressors=compressors,
+                )
+            else:
+                snapshot = collect_remote_snapshot(
+                    parallel=parallel,
+                    probes=probes,
+                    state=state,
+                    on_update=on_update,
+                    wire=wire,
+                    compressors=compressors,
+                )
     except RemoteExecutionError as exc:
         error_message = f"Enumeration failed: {exc}"
         print(error_message, file=sys.stderr)
@@ -1663,13 +3712,31 @@ def main() -> int:  # pragma: no cover - CLI entry point
             print(exc.stderr, file=sys.stderr)
         return 1
 
-    findings = generate_priority_findings(snapshot)
+    if previous is None:
+        record_probe_durations(
+            log_dir,
+            {
+                f"{probe.category}.{probe.key}": probe.duration
+                for mapping in snapshot.probes.values()
+                for probe in mapping.values()
+                if probe.duration is not None
+            },
+        )
+    findings = state.findings
+    diff = diff_findings(previous.findings, findings) if previous is not None else None
     plain_report = render_plain(snapshot, findings)
-    json_payload = build_json_payload(snapshot, findings, plain_report)
+    json_payload = build_json_payload(snapshot, findings, plain_report, diff=diff)
 
     if is_json_output:
         sys.stdout.write(json.dumps(json_payload, indent=2))
         sys.stdout.write("\n")
+    elif previous is not None and diff is not None:
+        if use_plain:
+            console.print(render_diff_plain(diff, previous))
+        else:
+            render_diff_rich(diff, previous)
+        for warning in snapshot.warnings:
+            console.print(warning, style="dim", markup=False)
     elif not use_plain:
         render_rich(snapshot, findings)
     else:
@@ -1678,6 +3745,17 @@ def main() -> int:  # pragma: no cover - CLI entry point
     json_path, txt_path = write_artifacts(
         snapshot, findings, plain_report, json_payload, is_json_output
     )
+    archive_runs(
+        [
+            (
+                _current_connection_name(),
+                os.environ.get("LAZYSSH_HOST", ""),
+                json_payload,
+                str(json_path),
+            )
+        ],
+        quiet=is_json_output,
+    )
 
     if not is_json_output:
         console.print(f"[success]Saved survey to {json_path}[/success]")
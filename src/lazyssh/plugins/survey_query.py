@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# PLUGIN_NAME: survey-query
+# PLUGIN_DESCRIPTION: Query archived enumerate surveys across runs and hosts
+# PLUGIN_VERSION: 1.0.0
+# PLUGIN_REQUIREMENTS: python3
+# PLUGIN_INPROCESS: true
+
+"""Query the enumerate survey archive.
+
+Every ``enumerate`` run is archived in a local SQLite database (see
+``_snapshot_store``). This plugin answers cross-run and cross-host questions
+from it, e.g. ``--key=passwordless_sudo --since=7d`` lists every host that had
+passwordless sudo in the last week. The connection it is run on only matters
+for ``--here``, which restricts results to that connection.
+
+Queries are a few milliseconds of local SQLite work, so the plugin runs
+in-process: LazySSH calls ``main(context)`` and everything is written to the
+context's streams rather than the process-wide stdout, stderr and console.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any, NoReturn, TextIO, cast
+
+from rich.console import Console
+
+from lazyssh.console_instance import (
+    console,
+    get_terminal_width,
+    get_theme_for_config,
+    get_ui_config,
+)
+from lazyssh.plugins._snapshot_store import (
+    SnapshotStore,
+    StoredFinding,
+    StoredRun,
+    parse_time,
+    retention_days,
+    saved_survey_paths,
+    store_path,
+)
+
+if TYPE_CHECKING:
+    from lazyssh.plugin_manager import PluginContext
+
+try:  # pragma: no cover - optional Rich import for fallback modes
+    from rich import box
+    from rich.table import Table
+except ImportError:  # pragma: no cover - Rich disabled or unavailable
+    box = None  # type: ignore[assignment]  # fallback when Rich is unavailable
+    Table = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
+
+DEFAULT_LIMIT = 50
+SEVERITY_STYLES = {"critical": "error", "high": "error", "medium": "warning", "info": "info"}
+
+
+class _PluginParser(argparse.ArgumentParser):
+    """ArgumentParser that writes help, usage and errors to the plugin's own streams."""
+
+    def __init__(self, *, out: TextIO | None, err: TextIO | None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._out = out
+        self._err = err
+
+    def print_help(self, file: Any = None) -> None:
+        super().print_help(self._out or sys.stdout)
+
+    def print_usage(self, file: Any = None) -> None:
+        super().print_usage(self._err or sys.stderr)
+
+    def exit(self, status: int = 0, message: str | None = None) -> NoReturn:
+        if message:
+            (self._err or sys.stderr).write(message)
+        raise SystemExit(status)
+
+
+def build_parser(out: TextIO | None = None, err: TextIO | None = None) -> argparse.ArgumentParser:
+    """Build the argument parser for survey-query."""
+    parser = _PluginParser(
+        out=out,
+        err=err,
+        prog="survey-query",
+        description="Query archived enumerate surveys across runs and hosts",
+    )
+    parser.add_argument("--key", default=None, help="Finding key, e.g. passwordless_sudo")
+    parser.add_argument("--category", default=None, help="Finding category, e.g. users")
+    parser.add_argument(
+        "--severity", default="", help="Comma-separated severities, e.g. critical,high"
+    )
+    parser.add_argument("--host", default=None, help="Connection name or host address")
+    parser.add_argument("--here", action="store_true", help="Only the connection run on")
+    parser.add_argument("--since", default=None, help="Start time: 7d, 24h, 30m or ISO date")
+    parser.add_argument("--until", default=None, help="End time: 7d, 24h, 30m or ISO date")
+    parser.add_argument(
+        "--latest", action="store_true", help="Only each connection's most recent run"
+    )
+    parser.add_argument("--runs", action="store_true", help="List archived runs, not findings")
+    parser.add_argument(
+        "--limit", type=int, default=DEFAULT_LIMIT, help=f"Maximum rows (default: {DEFAULT_LIMIT})"
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_saved",
+        action="store_true",
+        help="Archive survey JSON files saved before the archive existed",
+    )
+    parser.add_argument("--prune", action="store_true", help="Apply the retention policy now")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    return parser
+
+
+def run_query(
+    store: SnapshotStore, args: argparse.Namespace, env: Mapping[str, str] | None = None
+) -> list[StoredFinding] | list[StoredRun]:
+    """Run the findings or runs query described by parsed arguments.
+
+    Raises:
+        ValueError: If a time filter cannot be parsed.
+    """
+
+    host = args.host
+    if args.here:
+        host = (os.environ if env is None else env).get("LAZYSSH_SOCKET") or host
+    since = parse_time(args.since) if args.since else None
+    until = parse_time(args.until) if args.until else None
+    if args.runs:
+        return store.runs(host=host, since=since, until=until, limit=args.limit)
+    return store.findings(
+        key=args.key,
+        category=args.category,
+        severities=[value.strip() for value in args.severity.split(",") if value.strip()],
+        host=host,
+        since=since,
+        until=until,
+        latest=args.latest,
+        limit=args.limit,
+    )
+
+
+def _host_label(connection: str, host: str) -> str:
+    return f"{connection} ({host})" if host and host != connection else connection
+
+
+def render_plain(results: Sequence[StoredFinding | StoredRun]) -> str:
+    if not results:
+        return "No archived results match the query.\n"
+    lines: list[str] = []
+    for result in results:
+        collected = result.collected_at.astimezone().strftime("%Y-%m-%d %H:%M")
+        label = _host_label(result.connection, result.host)
+        if isinstance(result, StoredRun):
+            lines.append(
+                f"{collected}  {label}: {result.finding_count} findings, "
+                f"{result.probe_count} probes"
+            )
+        else:
+            lines.append(
+                f"{collected}  {label}  [{result.severity.upper()}] {result.headline} "
+                f"- {result.detail}"
+            )
+    hosts = {result.connection for result in results}
+    lines.append(f"{len(results)} results across {len(hosts)} connections")
+    return "\n".join(lines) + "\n"
+
+
+def render_rich(results: Sequence[StoredFinding | StoredRun], out: Console = console) -> None:
+    if not results:
+        out.print("[dim]No archived results match the query.[/dim]")
+        return
+    table = Table(box=box.ROUNDED, expand=True, show_header=True, padding=(0, 1))
+    table.add_column("Collected", style="dim", no_wrap=True)
+    table.add_column("Connection", style="accent", no_wrap=True)
+    if isinstance(results[0], StoredRun):
+        table.add_column("Findings", justify="right")
+        table.add_column("Probes", justify="right", style="dim")
+    else:
+        table.add_column("Severity", justify="center", no_wrap=True, width=9)
+        table.add_column("Finding", style="foreground", overflow="fold", ratio=2)
+        table.add_column("Detail", style="dim", overflow="fold", ratio=3)
+    for result in results:
+        collected = result.collected_at.astimezone().strftime("%Y-%m-%d %H:%M")
+        label = _host_label(result.connection, result.host)
+        if isinstance(result, StoredRun):
+            table.add_row(collected, label, str(result.finding_count), str(result.probe_count))
+        else:
+            style = SEVERITY_STYLES.get(result.severity, "info")
+            table.add_row(
+                collected,
+                label,
+                f"[{style}]{result.severity.upper()}[/]",
+                result.headline,
+                result.detail,
+            )
+    out.print(table)
+    hosts = {result.connection for result in results}
+    out.print(f"[dim]{len(results)} results across {len(hosts)} connections[/dim]")
+
+
+def run(
+    argv: Sequence[str],
+    env: Mapping[str, str],
+    stdout: TextIO,
+    stderr: TextIO,
+    out: Console,
+) -> int:
+    """Parse ``argv``, query the archive and print the results."""
+    args = build_parser(stdout, stderr).parse_args(argv)
+    ui_config = get_ui_config()
+    use_plain = ui_config.get("plain_text") or ui_config.get("no_rich")
+    path = store_path(env)
+    if path is None:
+        stderr.write("Survey archive is disabled (LAZYSSH_SURVEY_DB=off)\n")
+        return 1
+    try:
+        with SnapshotStore(path) as store:
+            if args.import_saved:
+                imported = store.import_surveys(saved_survey_paths(), retention_days(env))
+                if not args.json:
+                    out.print(f"[success]Imported {imported} saved surveys into {path}[/success]")
+            if args.prune:
+                removed = store.prune(retention_days(env))
+                if not args.json:
+                    out.print(f"[success]Pruned {removed} archived runs[/success]")
+            results = run_query(store, args, env)
+    except (sqlite3.Error, OSError, ValueError) as exc:
+        stderr.write(f"Survey query failed: {exc}\n")
+        return 1
+
+    if args.json:
+        payload: list[dict[str, Any]] = [result.to_dict() for result in results]
+        stdout.write(json.dumps(payload, indent=2))
+        stdout.write("\n")
+    elif use_plain:
+        out.print(render_plain(results), markup=False)
+    else:
+        render_rich(results, out)
+    return 0
+
+
+def main(context: PluginContext | None = None) -> int:
+    """In-process entry point; without a context, run as a command-line script."""
+    if context is None:  # pragma: no cover - CLI entry point
+        return run(sys.argv[1:], os.environ, sys.stdout, sys.stderr, console)
+    stdout, stderr = cast(TextIO, context.stdout), cast(TextIO, context.stderr)
+    # Same rendering as a subprocess writing to a pipe: themed, no colour codes
+    out = Console(
+        file=stdout,
+        theme=get_theme_for_config(get_ui_config()),
+        width=get_terminal_width(),
+        color_system=None,
+    )
+    return run(context.args, context.env, stdout, stderr, out)
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
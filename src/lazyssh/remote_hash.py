@@ -0,0 +1,65 @@
+"""Skip uploads whose destination already holds identical content.
+
+Before a transfer the local file is hashed and the remote side is asked for
+the SHA-256 of the destination in a single command, trying ``sha256sum``,
+``shasum -a 256``, ``openssl dgst`` and ``busybox sha256sum`` in turn. Matching
+digests mean the upload can be skipped. Small files are always sent since the
+extra round trip costs more than the transfer, and ``LAZYSSH_UPLOAD_DEDUP=false``
+disables the check.
+"""
+
+import hashlib
+import re
+import shlex
+from pathlib import Path
+
+from .console_instance import parse_boolean_env_var
+
+DEDUP_ENV = "LAZYSSH_UPLOAD_DEDUP"
+# Below this size re-sending is cheaper than asking the remote for a hash
+DEDUP_MIN_SIZE = 64 * 1024
+
+_SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def dedup_enabled() -> bool:
+    """Whether uploads should be checked against the destination first."""
+    return parse_boolean_env_var(DEDUP_ENV, default=True)
+
+
+def should_check(local_path: str | Path) -> bool:
+    """Whether ``local_path`` is worth a remote hash check before uploading."""
+    try:
+        return dedup_enabled() and Path(local_path).stat().st_size >= DEDUP_MIN_SIZE
+    except OSError:
+        return False
+
+
+def local_sha256(path: str | Path) -> str:
+    """Hex SHA-256 of a local file."""
+    with open(path, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def remote_sha256_command(remote_path: str) -> str:
+    """Shell command printing the SHA-256 of ``remote_path``.
+
+    Prints nothing when the file does not exist or no hashing tool is
+    available, so a missing destination is simply a mismatch.
+    """
+    quoted = shlex.quote(remote_path)
+    return (
+        f'f={quoted}; [ -f "$f" ] || exit 0; '
+        'if command -v sha256sum >/dev/null 2>&1; then sha256sum "$f"; '
+        'elif command -v shasum >/dev/null 2>&1; then shasum -a 256 "$f"; '
+        'elif command -v openssl >/dev/null 2>&1; then openssl dgst -sha256 -r "$f"; '
+        'elif command -v busybox >/dev/null 2>&1; then busybox sha256sum "$f"; fi'
+    )
+
+
+def parse_remote_sha256(output: str) -> str | None:
+    """Digest from the output of :func:`remote_sha256_command`, if any."""
+    fields = output.split()
+    if fields and _SHA256_RE.fullmatch(fields[0].lower()):
+        return fields[0].lower()
+    return None
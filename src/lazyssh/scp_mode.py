@@ -40,6 +40,12 @@ from .logging_module import (
     update_transfer_stats,
 )
 from .models import SSHConnection
+from .remote_hash import (
+    local_sha256,
+    parse_remote_sha256,
+    remote_sha256_command,
+    should_check,
+)
 from .ssh import SSHManager
 from .ui import create_standard_table, get_console
 
@@ -932,6 +938,16 @@ class SCPMode:
         except (OSError, subprocess.SubprocessError, ValueError):
             return 0
 
+    def _remote_copy_matches(self, local_path: str, remote_path: str) -> bool:
+        """Check whether ``remote_path`` already holds the content of ``local_path``"""
+        if not should_check(local_path):
+            return False
+        result = self._execute_ssh_command(remote_sha256_command(remote_path))
+        if not result or result.returncode != 0:
+            return False
+        remote_digest = parse_remote_sha256(result.stdout)
+        return remote_digest is not None and remote_digest == local_sha256(local_path)
+
     def cmd_put(self, args: list[str]) -> None:
         """Upload a file to the remote host"""
         if not self.conn or not self.check_connection():
@@ -964,6 +980,13 @@ class SCPMode:
             # Resolve relative paths to absolute paths
             remote_path = self._resolve_remote_path(remote_path)
 
+        if self._remote_copy_matches(local_path, remote_path):
+            display_success(
+                f"Skipped {local_path} ({format_size(file_size)}): "
+                f"identical copy already at {remote_path}"
+            )
+            return
+
         try:
             # Execute the SCP command
             remote_dest = f"{self.conn.username}@{self.conn.host}:{remote_path}"
@@ -1,14 +1,15 @@
 """UI utilities for LazySSH"""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from rich.align import Align
 from rich.box import ROUNDED
 from rich.console import Console
-from rich.layout import Layout
 from rich.live import Live
-from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Prompt
@@ -28,6 +29,11 @@ from .console_instance import (
 )
 from .models import SSHConnection
 
+if TYPE_CHECKING:
+    # Markdown pulls in markdown-it and Pygments and Layout pulls in rich.pretty;
+    # both are imported on first use to keep them off the startup path
+    from rich.layout import Layout
+
 # Initialize UI configuration and console
 ui_config = get_ui_config()
 
@@ -284,6 +290,8 @@ def create_status_indicator(status: str, message: str) -> str:
 
 def create_main_layout() -> Layout:
     """Create a standardized main layout for complex interfaces."""
+    from rich.layout import Layout
+
     layout = Layout()
     layout.split_column(
         Layout(name="header", size=3),
@@ -295,6 +303,8 @@ def create_main_layout() -> Layout:
 
 def create_sidebar_layout() -> Layout:
     """Create a layout with sidebar for navigation and main content."""
+    from rich.layout import Layout
+
     layout = Layout()
     layout.split_row(
         Layout(name="sidebar", size=30),
@@ -305,6 +315,8 @@ def create_sidebar_layout() -> Layout:
 
 def create_dashboard_layout() -> Layout:
     """Create a dashboard-style layout with multiple sections."""
+    from rich.layout import Layout
+
     layout = Layout()
     layout.split_column(
         Layout(name="header", size=3),
@@ -322,6 +334,8 @@ def create_dashboard_layout() -> Layout:
 
 def create_progress_layout() -> Layout:
     """Create a layout optimized for progress displays."""
+    from rich.layout import Layout
+
     layout = Layout()
     layout.split_column(
         Layout(name="header", size=3),
@@ -365,6 +379,8 @@ def render_layout(layout: Layout) -> None:
 
 def render_markdown(content: str, title: str = "") -> None:
     """Render markdown content with consistent styling."""
+    from rich.markdown import Markdown
+
     markdown = Markdown(content)
     if title:
         panel = Panel(
@@ -381,6 +397,8 @@ def render_markdown(content: str, title: str = "") -> None:
 
 def render_help_markdown(content: str) -> None:
     """Render help content as markdown with help-specific styling."""
+    from rich.markdown import Markdown
+
     markdown = Markdown(content)
     panel = Panel(
         markdown,
@@ -395,6 +413,8 @@ def render_help_markdown(content: str) -> None:
 
 def render_documentation_markdown(content: str, section: str = "") -> None:
     """Render documentation content as markdown."""
+    from rich.markdown import Markdown
+
     markdown = Markdown(content)
     title = "[panel.title]Documentation[/panel.title]"
     if section:
@@ -412,6 +432,8 @@ def render_documentation_markdown(content: str, section: str = "") -> None:
 
 def create_markdown_panel(content: str, title: str = "", panel_type: str = "info") -> Panel:
     """Create a panel with markdown content."""
+    from rich.markdown import Markdown
+
     markdown = Markdown(content)
     border_styles = {
         "info": "info",
@@ -466,6 +488,8 @@ def create_live_status_display() -> Live:
 
 def update_live_status(live: Live, status_text: str, details: str = "") -> None:
     """Update a live status display with new information."""
+    from rich.layout import Layout
+
     if hasattr(live, "renderable") and hasattr(live.renderable, "update"):
         # Update the layout with new status information
         status_panel = create_info_panel(f"{status_text}\n{details}", "Status")
@@ -500,6 +524,8 @@ def create_live_connection_monitor() -> Live:
 
 def update_live_connections(live: Live, connections: dict[str, SSHConnection]) -> None:
     """Update live connection display with current connection data."""
+    from rich.layout import Layout
+
     if hasattr(live, "renderable"):
         # Create connection table
         table = create_standard_table(title="Active Connections")
@@ -813,6 +839,70 @@ def display_plugin_info(plugin: Any) -> None:
     console.print(panel)
 
 
+def display_plugin_output_lines(lines: Iterable[tuple[int, str]]) -> None:
+    """Display numbered lines of plugin output, e.g. a page or search results
+
+    Args:
+        lines: (line number, text) pairs
+    """
+    for number, line in lines:
+        text = Text(f"{number:>7}  ", style="dim")
+        text.append(Text.from_ansi(line))
+        console.print(text, overflow="fold")
+
+
+def display_plugin_stats(stats: list[Any], scope: str) -> None:
+    """Display per-plugin p50/p95 run metrics
+
+    Args:
+        stats: PluginStats rows, slowest first
+        scope: Connection name (or description) the history covers
+    """
+    table = create_standard_table()
+    table.add_column("Plugin", style="info", no_wrap=True)
+    table.add_column("Runs", style="number", justify="right")
+    table.add_column("Wall p50/p95", style="table.row", justify="right")
+    table.add_column("CPU p50/p95", style="table.row", justify="right")
+    table.add_column("Remote cmds p50/p95", style="table.row", justify="right")
+    table.add_column("Peak RSS", style="table.row", justify="right")
+    table.add_column("Output p50", style="table.row", justify="right")
+    table.add_column("Time spent", style="accent")
+
+    for row in stats:
+        runs = (
+            f"{row.runs}"
+            if not row.failures
+            else f"{row.runs} [error]({row.failures} failed)[/error]"
+        )
+        # Attribute wall time to local CPU when the plugin was busy for most of it
+        if row.wall_p50 and row.cpu_p50 / row.wall_p50 >= 0.5:
+            spent = "local CPU"
+        elif row.remote_p50:
+            spent = "remote round trips"
+        else:
+            spent = "waiting"
+        table.add_row(
+            row.plugin,
+            runs,
+            f"{row.wall_p50:.2f}s / {row.wall_p95:.2f}s",
+            f"{row.cpu_p50:.2f}s / {row.cpu_p95:.2f}s",
+            f"{row.remote_p50:.0f} / {row.remote_p95:.0f}",
+            f"{row.peak_rss_kb / 1024:.1f} MiB",
+            f"{row.output_bytes_p50 / 1024:.1f} KiB",
+            spent,
+        )
+
+    panel = Panel(
+        table,
+        title=f"[panel.title]Plugin Stats: {scope}[/panel.title]",
+        border_style="border",
+        box=ROUNDED,
+        padding=(1, 2),
+    )
+
+    console.print(panel)
+
+
 def display_plugin_output(output: str, execution_time: float, success: bool = True) -> None:
     """Display plugin execution output with formatting
 
@@ -837,3 +927,35 @@ def display_plugin_output(output: str, execution_time: float, success: bool = Tr
     # Display execution time
     time_style = "success" if success else "error"
     console.print(f"\n[{time_style}]Execution time: {execution_time:.2f}s[/{time_style}]")
+
+
+def display_plugin_output_start() -> None:
+    """Open the live plugin output section with a header rule (no outer border)."""
+    console.rule("[panel.title]Plugin Output[/panel.title]", style="border")
+
+
+def display_plugin_output_chunk(text: str) -> None:
+    """Write live plugin output as it arrives
+
+    The text goes to the terminal unchanged so partial lines, carriage-return
+    progress bars and ANSI styling from the plugin render as they would in a
+    shell.
+    """
+    console.file.write(text)
+    console.file.flush()
+
+
+def display_plugin_output_end(
+    execution_time: float, success: bool = True, *, output_shown: bool = True
+) -> None:
+    """Close the live plugin output section and display the execution time
+
+    Args:
+        execution_time: Time taken to execute plugin
+        success: Whether plugin executed successfully
+        output_shown: Whether :func:`display_plugin_output_start` opened a section
+    """
+    style = "success" if success else "error"
+    if output_shown:
+        console.rule(style=style)
+    console.print(f"\n[{style}]Execution time: {execution_time:.2f}s[/{style}]")
@@ -1460,6 +1460,20 @@ class TestLazySSHCompleterEdgeCases:
         names = [c.text for c in completions]
         assert "plugintest" in names
 
+    def test_completer_plugin_stats_connection(self, command_mode: CommandMode) -> None:
+        """Test completion for plugin stats with connection names."""
+        from prompt_toolkit.document import Document
+
+        from lazyssh.command_completer import LazySSHCompleter
+
+        conn = SSHConnection(
+            host="192.168.1.1", port=22, username="user", socket_path="/tmp/statstest"
+        )
+        command_mode.ssh_manager.connections["/tmp/statstest"] = conn
+        completer = LazySSHCompleter(command_mode)
+        completions = list(completer.get_completions(Document("plugin stats "), None))
+        assert [c.text for c in completions] == ["statstest"]
+
 
 class TestDebugCommand:
     """Tests for debug command variations."""
@@ -1,6 +1,8 @@
+import os
+import signal
 from pathlib import Path
 
-from lazyssh.command_mode import CommandMode
+from lazyssh.command_mode import PLUGIN_OUTPUT_FLUSH_INTERVAL, PLUGIN_RUN_TIMEOUT, CommandMode
 from lazyssh.models import SSHConnection
 from lazyssh.ssh import SSHManager
 
@@ -59,20 +61,199 @@ def test_plugin_run_executes(monkeypatch):
 
     monkeypatch.setattr(cm.plugin_manager, "get_plugin", lambda name: Meta)
 
-    # Mock execute_plugin to avoid actual subprocess execution
+    # Mock the live runner to avoid actual subprocess execution
+    options = {}
+
+    def fake_live(plugin_name, connection, args=None, *, on_chunk, **kwargs):  # type: ignore
+        options.update(kwargs)
+        on_chunk(("stdout", "hello"))
+        return True, "hello", 0.1
+
+    monkeypatch.setattr(cm.plugin_manager, "execute_plugin_live", fake_live)
+
+    # Ensure live output is displayed without raising
+    outputs = []
+    monkeypatch.setattr("lazyssh.ui.display_plugin_output_chunk", outputs.append)
+
+    # Execute
+    assert cm.cmd_plugin(["run", "echo", conn.conn_name]) is True
+    # The missing trailing newline is added before the closing rule
+    assert outputs == ["hello", "\n"]
+    assert cm.last_plugin_output == "hello"
+    assert options == {
+        "timeout": PLUGIN_RUN_TIMEOUT,
+        "chunked": True,
+        "flush_interval": PLUGIN_OUTPUT_FLUSH_INTERVAL,
+    }
+
+    # Plugins that enforce their own timeouts opt out of the limit
+    Meta.no_timeout = True  # type: ignore[attr-defined]
+    assert cm.cmd_plugin(["run", "echo", conn.conn_name]) is True
+    assert options["timeout"] is None
+
+
+def test_plugin_run_reports_spilled_output(monkeypatch, tmp_path):
+    from lazyssh.plugin_output import PluginOutput
+
+    manager = SSHManager()
+    conn = _make_connected(manager, "big")
+    cm = CommandMode(manager)
+
+    class Meta:
+        is_valid = True
+        validation_errors = []
+        file_path = Path("/bin/echo")
+        name = "echo"
+
+    log_path = tmp_path / "plugin_echo.log"
+    output = PluginOutput("head ... tail", log_path=log_path, total_chars=123456)
+    monkeypatch.setattr(cm.plugin_manager, "get_plugin", lambda name: Meta)
     monkeypatch.setattr(
         cm.plugin_manager,
-        "execute_plugin",
-        lambda plugin_name, connection, args=None: (True, "", 0.1),
+        "execute_plugin_live",
+        lambda plugin_name, connection, args=None, **kwargs: (True, output, 0.1),
     )
+    infos = []
+    monkeypatch.setattr("lazyssh.command_mode.display_info", infos.append)
 
-    # Ensure subprocess output is displayed without raising
-    outputs = []
+    assert cm.cmd_plugin(["run", "echo", conn.conn_name]) is True
+    assert any(str(log_path) in m and "123456" in m for m in infos)
 
-    def fake_display_output(output, t, success=True):  # type: ignore
-        outputs.append(output)
 
-    monkeypatch.setattr("lazyssh.ui.display_plugin_output", fake_display_output)
+def test_plugin_output_pages_and_searches_last_run(monkeypatch, tmp_path):
+    from lazyssh.plugin_output import PluginOutput
 
-    # Execute
-    assert cm.cmd_plugin(["run", "echo", conn.conn_name]) is True
+    cm = CommandMode(SSHManager())
+    shown = []
+    monkeypatch.setattr("lazyssh.ui.display_plugin_output_lines", lambda rows: shown.extend(rows))
+    infos = []
+    monkeypatch.setattr("lazyssh.command_mode.display_info", infos.append)
+
+    assert cm.cmd_plugin(["output"]) is False
+    assert cm.cmd_plugin(["search", "x"]) is False
+    assert "Run a plugin" in infos[-1]
+
+    # A spilled run is paged and searched from its log file, not the preview
+    log_path = tmp_path / "plugin_big.log"
+    log_path.write_text("".join(f"line {i}\n" for i in range(1, 251)), encoding="utf-8")
+    cm.last_plugin_output = PluginOutput("line 1 ... line 250", log_path=log_path)
+
+    assert cm.cmd_plugin(["output"]) is True
+    assert shown[0] == (1, "line 1")
+    assert shown[-1] == (100, "line 100")
+    assert infos[-1] == "Next page: plugin output 101"
+    shown.clear()
+    assert cm.cmd_plugin(["output", "201"]) is True
+    assert [number for number, _ in shown] == list(range(201, 251))
+    assert cm.cmd_plugin(["output", "300"]) is False
+    assert cm.cmd_plugin(["output", "next"]) is False
+
+    shown.clear()
+    assert cm.cmd_plugin(["search", "line", "24"]) is True
+    assert shown == [(24, "line 24")] + [(n, f"line {n}") for n in range(240, 250)]
+    assert cm.cmd_plugin(["search", "missing"]) is False
+    assert cm.cmd_plugin(["search"]) is False
+
+
+def _live_plugin(tmp_path, body: str) -> CommandMode:
+    from lazyssh.plugin_manager import PluginManager
+
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    plugin = plugins_dir / "live.py"
+    plugin.write_text(f"#!/usr/bin/env python3\n# PLUGIN_NAME: live\n{body}", encoding="utf-8")
+    plugin.chmod(0o755)
+    manager = SSHManager()
+    _make_connected(manager, "liveconn")
+    cm = CommandMode(manager)
+    cm.plugin_manager = PluginManager(plugins_dir=plugins_dir)
+    return cm
+
+
+def test_plugin_run_streams_output_live(monkeypatch, tmp_path):
+    # The plugin only finishes once its first partial line has been displayed
+    flag = tmp_path / "seen"
+    cm = _live_plugin(
+        tmp_path,
+        "import os, sys, time\n"
+        "print('first', end='', flush=True)\n"
+        f"while not os.path.exists({str(flag)!r}):\n"
+        "    time.sleep(0.01)\n"
+        "print('second')\n"
+        "sys.exit(3)\n",
+    )
+    shown = []
+
+    def show(text):  # type: ignore
+        shown.append(text)
+        flag.touch()
+
+    monkeypatch.setattr("lazyssh.ui.display_plugin_output_chunk", show)
+    ended = []
+    monkeypatch.setattr(
+        "lazyssh.ui.display_plugin_output_end", lambda t, success, **k: ended.append(success)
+    )
+
+    assert cm.cmd_plugin(["run", "live", "liveconn"]) is False
+    assert shown[0] == "first"
+    assert "".join(shown) == "firstsecond\n"
+    assert ended == [False]
+    assert cm.plugin_manager.last_metrics is not None
+    assert cm.plugin_manager.last_metrics.returncode == 3
+
+
+def test_plugin_run_ctrl_c_waits_for_plugin_cleanup(monkeypatch, tmp_path):
+    # Ctrl-C reaches the plugin too; lazyssh keeps reading until its cancel path is done
+    cm = _live_plugin(
+        tmp_path,
+        "import os, sys, time\n"
+        "try:\n"
+        "    print(f'pid {os.getpid()}', flush=True)\n"
+        "    time.sleep(30)\n"
+        "except KeyboardInterrupt:\n"
+        "    time.sleep(0.3)\n"
+        "    print('remote process stopped', flush=True)\n"
+        "    sys.exit(130)\n",
+    )
+    shown = []
+
+    def show(text):  # type: ignore
+        shown.append(text)
+        if text.startswith("pid "):
+            os.kill(int(text.split()[1]), signal.SIGINT)
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr("lazyssh.ui.display_plugin_output_chunk", show)
+    warnings = []
+    monkeypatch.setattr("lazyssh.command_mode.display_warning", warnings.append)
+
+    assert cm.cmd_plugin(["run", "live", "liveconn"]) is False
+    assert "remote process stopped\n" in shown
+    assert warnings == ["Plugin 'live' interrupted"]
+    assert cm.plugin_manager.last_metrics is not None
+    assert cm.plugin_manager.last_metrics.returncode == 130
+
+
+def test_plugin_stats_reports_history(monkeypatch, tmp_path):
+    from lazyssh.plugin_metrics import PluginRunMetrics, append_history
+
+    monkeypatch.setattr(
+        "lazyssh.plugin_metrics.CONNECTION_LOG_DIR_TEMPLATE", str(tmp_path / "{connection_name}")
+    )
+    manager = SSHManager()
+    _make_connected(manager, "statsconn")
+    _make_connected(manager, "quiet")
+    cm = CommandMode(manager)
+    shown = []
+    monkeypatch.setattr("lazyssh.ui.display_plugin_stats", lambda stats, scope: shown.append(scope))
+    infos = []
+    monkeypatch.setattr("lazyssh.command_mode.display_info", infos.append)
+
+    assert cm.cmd_plugin(["stats"]) is False
+    assert any("No plugin runs" in m for m in infos)
+
+    append_history(PluginRunMetrics(plugin="p", connection="statsconn", started_at=0.0))
+
+    assert cm.cmd_plugin(["stats", "statsconn"]) is True
+    assert cm.cmd_plugin(["stats"]) is True
+    assert shown == ["statsconn", "all connections"]
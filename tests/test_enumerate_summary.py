@@ -1,5 +1,6 @@
 """Tests for the enumerate plugin - priority findings, rendering, and heuristics."""
 
+import json
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -7,6 +8,7 @@ import pytest
 
 from lazyssh.plugins import enumerate as enumerate_plugin
 from lazyssh.plugins._enumeration_plan import REMOTE_PROBES
+from lazyssh.plugins._snapshot_store import SnapshotStore
 
 
 def _probe(
@@ -194,6 +196,60 @@ class TestBuildRemoteScript:
         assert "base64" in script
         assert "openssl" in script
 
+    def test_build_script_parallel_runs_all_probes(self) -> None:
+        """Test parallel script runs probes concurrently and stays parseable."""
+        import subprocess
+        import time
+
+        probes = [
+            enumerate_plugin.RemoteProbe("test", f"p{i}", f"sleep 0.4; echo out{i}; echo err >&2")
+            for i in range(6)
+        ]
+        script = enumerate_plugin.build_remote_script(probes, parallel=6)
+        assert "launch_probe" in script
+
+        start = time.monotonic()
+        result = subprocess.run(
+            ["/bin/sh", "-s"], input=script, text=True, capture_output=True, timeout=30, check=True
+        )
+        elapsed = time.monotonic() - start
+
+        state = enumerate_plugin.ProgressiveEnumeration(probes)
+        for line in result.stdout.splitlines():
+            state.feed_line(line)
+        snapshot = state.finish(result.stderr)
+        assert sorted(snapshot.probes["test"]) == [f"p{i}" for i in range(6)]
+        assert snapshot.probes["test"]["p3"].stdout == "out3\n"
+        assert snapshot.probes["test"]["p3"].stderr == "err\n"
+        assert elapsed < 0.4 * 6
+
+    def test_build_script_parallel_without_mkfifo(self) -> None:
+        """Test parallel script falls back to sequential runs without mkfifo."""
+        import subprocess
+
+        probes = [enumerate_plugin.RemoteProbe("test", f"p{i}", f"echo {i}") for i in range(3)]
+        script = enumerate_plugin.build_remote_script(probes, parallel=4)
+        script = script.replace("#!/bin/sh\n", "#!/bin/sh\nmkfifo() { return 1; }\n", 1)
+
+        result = subprocess.run(
+            ["/bin/sh", "-s"], input=script, text=True, capture_output=True, timeout=30, check=True
+        )
+
+        state = enumerate_plugin.ProgressiveEnumeration(probes)
+        decoded = [state.feed_line(line) for line in result.stdout.splitlines()]
+        assert [probe.key for probe in decoded if probe] == ["p0", "p1", "p2"]
+
+    def test_parse_parallel_jobs(self) -> None:
+        """Test --parallel flag parsing and clamping."""
+        parse = enumerate_plugin.parse_parallel_jobs
+        assert parse([]) == 1
+        assert parse(["--json"]) == 1
+        assert parse(["--parallel"]) == enumerate_plugin.DEFAULT_PARALLEL_JOBS
+        assert parse(["--parallel=8"]) == 8
+        assert parse(["--parallel=0"]) == 1
+        assert parse(["--parallel=999"]) == enumerate_plugin.MAX_PARALLEL_JOBS
+        assert parse(["--parallel=x"]) == enumerate_plugin.DEFAULT_PARALLEL_JOBS
+
 
 class TestGetEnvOrFail:
     """Tests for _get_env_or_fail function."""
@@ -984,40 +1040,6 @@ class TestRenderRichWithWarnings:
         enumerate_plugin.render_rich(snapshot, [])
 
 
-class TestExecuteRemoteBatch:
-    """Tests for execute_remote_batch function."""
-
-    def test_missing_env_vars(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test execute_remote_batch fails with missing env vars."""
-        monkeypatch.delenv("LAZYSSH_SOCKET_PATH", raising=False)
-        monkeypatch.delenv("LAZYSSH_HOST", raising=False)
-        monkeypatch.delenv("LAZYSSH_USER", raising=False)
-
-        with pytest.raises(enumerate_plugin.RemoteExecutionError):
-            enumerate_plugin.execute_remote_batch("echo test")
-
-    def test_with_port(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        """Test execute_remote_batch includes port when set."""
-        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/sock")
-        monkeypatch.setenv("LAZYSSH_HOST", "example.com")
-        monkeypatch.setenv("LAZYSSH_USER", "testuser")
-        monkeypatch.setenv("LAZYSSH_PORT", "2222")
-
-        from unittest import mock
-
-        mock_result = mock.Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "output"
-        mock_result.stderr = ""
-
-        with mock.patch("subprocess.run", return_value=mock_result) as mock_run:
-            code, stdout, stderr = enumerate_plugin.execute_remote_batch("echo test")
-            # Verify -p was included in the command
-            call_args = mock_run.call_args[0][0]
-            assert "-p" in call_args
-            assert "2222" in call_args
-
-
 class TestResolveLogDir:
     """Tests for _resolve_log_dir function."""
 
@@ -1515,6 +1537,31 @@ class TestNewEvaluators:
         result = enumerate_plugin._evaluate_gtfobins_suid(snapshot, _get_heuristic("gtfobins_suid"))
         assert result is None
 
+    def test_evaluate_gtfobins_suid_limited_shell_is_not_instant(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from lazyssh.plugins._gtfobins_data import GTFOBinsDatabase
+
+        limited = {"limited-suid": {"ed": (("./ed\n!/bin/sh", "Limited SUID shell escape"),)}}
+        full = {"suid": {"ed": (("./ed\n!/bin/sh -p", "SUID shell escape"),)}}
+        probes = {"filesystem": {"suid_files": _probe("filesystem", "suid_files", "/bin/ed\n")}}
+        difficulties = []
+        for functions in (limited, {**limited, **full}):
+            monkeypatch.setattr(
+                enumerate_plugin, "get_database", lambda f=functions: GTFOBinsDatabase("test", f)
+            )
+            snapshot = enumerate_plugin.EnumerationSnapshot(
+                collected_at=datetime.now(UTC), probes=probes, warnings=[]
+            )
+            result = enumerate_plugin._evaluate_gtfobins_suid(
+                snapshot, _get_heuristic("gtfobins_suid")
+            )
+            assert result is not None
+            difficulties.append(result.exploitation_difficulty)
+
+        # Limited-SUID shells drop privileges; only a real SUID shell is an instant win
+        assert difficulties == ["easy", "instant"]
+
     def test_evaluate_gtfobins_suid_exploit_commands_populated(self) -> None:
         """Test that SUID findings include actual GTFOBins command templates."""
         probes = {
@@ -1893,6 +1940,24 @@ class TestNewEvaluators:
         assert result.exploitation_difficulty == "moderate"
         assert len(result.exploit_commands) > 0
 
+    def test_evaluate_kernel_exploits_skips_distro_backports(self) -> None:
+        """Backported fixes named by os-release are left out of the finding."""
+        probes = {
+            "system": {
+                "kernel": _probe("system", "kernel", "4.4.0-210-generic"),
+                "os_release": _probe("system", "os_release", "ID=ubuntu\nID_LIKE=debian\n"),
+            },
+        }
+        snapshot = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC), probes=probes, warnings=[]
+        )
+        result = enumerate_plugin._evaluate_kernel_exploits(
+            snapshot, _get_heuristic("kernel_exploits")
+        )
+        assert result is not None
+        assert "more fixed by distro backports" in result.detail
+        assert not any("CVE-2016-5195" in line for line in result.evidence)
+
     def test_evaluate_kernel_exploits_not_found(self) -> None:
         """Test kernel_exploits with a kernel too new for known exploits."""
         probes = {
@@ -3574,3 +3639,1328 @@ class TestRenderPlainParity:
         assert "exit 1: command failed" in report
         # Stats header should reflect 1 failed probe
         assert "1 failed" in report
+
+
+def _payload(category: str, key: str, stdout: str, status: int = 0) -> dict[str, object]:
+    return {
+        "category": category,
+        "key": key,
+        "status": status,
+        "encoding": "plain",
+        "stdout": stdout,
+        "stderr": "",
+    }
+
+
+class TestProgressiveEnumeration:
+    """Tests for incremental snapshot building and early heuristic evaluation."""
+
+    def test_heuristic_inputs_match_evaluator_reads(self) -> None:
+        """Every evaluator reads only the probes declared in HEURISTIC_INPUTS."""
+
+        class RecordingProbes(dict):
+            def __init__(self) -> None:
+                super().__init__()
+                self.reads: set[tuple[str, str]] = set()
+
+            def get(self, category, default=None):
+                recorder = self
+
+                class Category(dict):
+                    def get(self, key, default=None):
+                        recorder.reads.add((category, key))
+                        return default
+
+                return Category()
+
+        assert set(enumerate_plugin.HEURISTIC_INPUTS) == set(enumerate_plugin.HEURISTIC_EVALUATORS)
+        for key, evaluator in enumerate_plugin.HEURISTIC_EVALUATORS.items():
+            probes = RecordingProbes()
+            snapshot = enumerate_plugin.EnumerationSnapshot(
+                collected_at=datetime.now(UTC), probes=probes, warnings=[]
+            )
+            evaluator(snapshot, _get_heuristic(key))
+            assert probes.reads <= set(enumerate_plugin.HEURISTIC_INPUTS[key]), key
+
+    def test_findings_appear_as_inputs_arrive(self) -> None:
+        """Heuristics fire once their inputs land and match the batch result at the end."""
+        state = enumerate_plugin.ProgressiveEnumeration(REMOTE_PROBES)
+        assert state.total == len(REMOTE_PROBES)
+
+        state.add_payload(_payload("users", "id", "uid=1000(sam) groups=27(sudo)"))
+        assert state.findings == []
+        state.add_payload(
+            _payload("users", "sudo_check", "(root) NOPASSWD: /usr/bin/vim\n"),
+        )
+        assert "sudo_membership" in [f.key for f in state.findings]
+        assert state.received == 2
+
+        assert state.feed_line("   ") is None
+        assert state.feed_line("not json") is None
+        assert state.feed_line("[1, 2]") is None
+        state.add_payload(_payload("system", "os_release", 'ID=debian\nPRETTY_NAME="Debian"\n'))
+        assert "kernel_exploits" not in [f.key for f in state.findings]
+        line = json.dumps(_payload("system", "kernel", "5.8.0-generic"))
+        probe = state.feed_line(line + "\n")
+        assert probe is not None
+        assert probe.stdout == "5.8.0-generic"
+        assert "kernel_exploits" in [f.key for f in state.findings]
+
+        snapshot = state.finish("some noise\n", partial_reason="Remote enumeration timed out")
+
+        expected = enumerate_plugin.generate_priority_findings(snapshot)
+        assert [f.to_dict() for f in state.findings] == [f.to_dict() for f in expected]
+        assert "showing 4 of" in snapshot.warnings[0]
+        assert snapshot.warnings[1] == "Remote stderr: some noise"
+
+    def test_inputs_outside_the_batch_do_not_block(self) -> None:
+        """Inputs that are not part of the probe set count as available."""
+        probes = [enumerate_plugin.RemoteProbe("system", "kernel", "uname -r")]
+        state = enumerate_plugin.ProgressiveEnumeration(probes)
+
+        state.add_payload(_payload("system", "kernel", "5.8.0"))
+
+        assert "kernel_exploits" in [f.key for f in state.findings]
+        assert state._inputs_ready("unknown_heuristic") is False
+
+    def test_failed_probe_keeps_stderr(self) -> None:
+        """A failing probe is stored with its status and stderr."""
+        state = enumerate_plugin.ProgressiveEnumeration(REMOTE_PROBES)
+        payload = _payload("users", "sudoers", "", status=1)
+        payload["stderr"] = "Permission denied\n"
+
+        probe = state.add_payload(payload)
+
+        assert probe.status == 1
+        assert probe.stderr == "Permission denied\n"
+        assert probe.command == enumerate_plugin.PROBE_LOOKUP[("users", "sudoers")].command
+
+
+class TestStreamingCollection:
+    """Tests for streaming the batch through a local shell in place of ssh."""
+
+    @pytest.fixture(autouse=True)
+    def local_shell(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            enumerate_plugin, "_remote_shell_command", lambda *_target: ["/bin/sh", "-s"]
+        )
+
+    def _use_probes(self, monkeypatch: pytest.MonkeyPatch, *commands: str) -> None:
+        probes = tuple(
+            enumerate_plugin.RemoteProbe("test", f"p{i}", command, timeout=10)
+            for i, command in enumerate(commands)
+        )
+        monkeypatch.setattr(enumerate_plugin, "REMOTE_PROBES", probes)
+
+    @pytest.mark.parametrize("parallel", [1, 3])
+    def test_collect_remote_snapshot_reports_progress(
+        self, monkeypatch: pytest.MonkeyPatch, parallel: int
+    ) -> None:
+        """Each decoded probe triggers an update and the snapshot is complete."""
+        self._use_probes(monkeypatch, "echo a", "echo b", "echo c")
+        seen: list[int] = []
+
+        snapshot = enumerate_plugin.collect_remote_snapshot(
+            parallel=parallel, on_update=lambda state: seen.append(state.received)
+        )
+
+        assert seen == [1, 2, 3]
+        assert snapshot.probes["test"]["p1"].stdout == "b\n"
+        assert snapshot.warnings == []
+
+    def test_timeout_salvages_partial_snapshot(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Probes that finished before the timeout are kept."""
+        self._use_probes(monkeypatch, "echo fast", "sleep 3")
+
+        snapshot = enumerate_plugin.collect_remote_snapshot(timeout=1)
+
+        assert snapshot.probes["test"]["p0"].stdout == "fast\n"
+        assert "p1" not in snapshot.probes["test"]
+        assert "timed out after 1s; showing 1 of 2 probes" in snapshot.warnings[0]
+
+    def test_timeout_without_data_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A timeout before any probe finished is still an error."""
+        self._use_probes(monkeypatch, "sleep 3")
+
+        with pytest.raises(enumerate_plugin.RemoteExecutionError, match="timed out"):
+            enumerate_plugin.collect_remote_snapshot(timeout=1)
+
+    def test_failed_batch_keeps_received_probes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A non-zero batch exit keeps the probes that already arrived."""
+        self._use_probes(monkeypatch, "echo ok")
+        monkeypatch.setattr(
+            enumerate_plugin,
+            "build_remote_script",
+            lambda probes, parallel=1, **_options: (
+                'printf \'{"category":"test","key":"p0","status":0,"encoding":"plain",'
+                '"stdout":"ok","stderr":""}\\n\'\nexit 2\n'
+            ),
+        )
+
+        snapshot = enumerate_plugin.collect_remote_snapshot()
+
+        assert snapshot.probes["test"]["p0"].stdout == "ok"
+        assert "exited with code 2" in snapshot.warnings[0]
+
+    @pytest.mark.parametrize(
+        ("script", "message"),
+        [("exit 0\n", "returned no data"), ("exit 5\n", "exit code 5")],
+    )
+    def test_batch_without_data_raises(
+        self, monkeypatch: pytest.MonkeyPatch, script: str, message: str
+    ) -> None:
+        """No probe output is an error whatever the exit code."""
+        monkeypatch.setattr(
+            enumerate_plugin, "build_remote_script", lambda probes, parallel=1, **_options: script
+        )
+
+        with pytest.raises(enumerate_plugin.RemoteExecutionError, match=message):
+            enumerate_plugin.collect_remote_snapshot()
+
+
+class TestLiveProgress:
+    """Tests for the live progress panel."""
+
+    def test_render_progress_with_and_without_findings(self) -> None:
+        """The panel renders before and after findings are known."""
+        state = enumerate_plugin.ProgressiveEnumeration(REMOTE_PROBES)
+        enumerate_plugin.console.print(enumerate_plugin.render_progress(state))
+
+        state.add_payload(_payload("system", "kernel", "5.8.0"))
+        enumerate_plugin.console.print(enumerate_plugin.render_progress(state))
+
+    def test_live_progress_disabled_off_terminal(self) -> None:
+        """No live display when disabled or when output is a pipe, as under ``plugin run``."""
+        with enumerate_plugin.live_progress(True) as update:
+            assert update is None
+        with enumerate_plugin.live_progress(False) as update:
+            assert update is None
+
+    def test_live_progress_on_terminal(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """On a terminal the callback redraws the live panel."""
+        import io
+
+        from rich.console import Console
+
+        from lazyssh.console_instance import LAZYSSH_THEME
+
+        terminal = Console(force_terminal=True, file=io.StringIO(), theme=LAZYSSH_THEME)
+        monkeypatch.setattr(enumerate_plugin, "console", terminal)
+        state = enumerate_plugin.ProgressiveEnumeration(REMOTE_PROBES)
+
+        with enumerate_plugin.live_progress(True) as update:
+            assert update is not None
+            update(state)
+
+
+_WALK_OUTPUT = "\n".join(
+    [
+        "r\tf\t4755\troot\t1000\t1000.0\t/usr/bin/find",
+        "r\tf\t2755\troot\t1000\t1000.0\t/usr/bin/locate",
+        "wr\td\t1777\troot\t4096\t1000.0\t/tmp",
+        "wr\td\t777\troot\t4096\t1000.0\t/opt/shared",
+        "wr\tf\t644\troot\t10\t1000.0\t/etc/systemd/system/evil.service",
+        "wr\td\t755\troot\t4096\t1000.0\t/etc/cron.d",
+        "r\tf\t600\troot\t400\t1000.0\t/home/sam/.ssh/id_rsa",
+        "r\tf\t600\troot\t40\t1000.0\t/srv/app/.env",
+        "r\tf\t600\troot\t40\t1000.0\t/srv/a/b/c/.env",
+        "r\tf\t644\troot\t50\t1000.0\t/var/backups/passwd.bak",
+        "r\tf\t644\troot\t50\t1000.0\t/opt/db.sql",
+        "r\tf\t644\troot\t50\t99000.0\t/etc/hosts",
+        "r\tf\t644\troot\t50\t1000.0\t/etc/old-change",
+        "garbage line",
+        "r\tf\tnotoctal\troot\t1\t1.0\t/bad",
+        "NOW\t100000",
+    ]
+)
+
+
+class TestFilesystemWalk:
+    """Tests for the shared filesystem walk and its locally derived probes."""
+
+    def _walk(self, stdout: str) -> enumerate_plugin.ProbeOutput:
+        return enumerate_plugin.ProbeOutput(
+            category="filesystem",
+            key="fs_walk",
+            command="<walk>",
+            timeout=30,
+            status=1,
+            stdout=stdout,
+            stderr="",
+            encoding="base64",
+        )
+
+    def test_build_fs_walk_plan_swaps_find_probes(self) -> None:
+        """The walk plan drops the replaced probes and adds the walk once."""
+        from lazyssh.plugins._enumeration_plan import (
+            FS_WALK_PROBE,
+            FS_WALK_REPLACES,
+            build_fs_walk_plan,
+        )
+
+        plan = build_fs_walk_plan(REMOTE_PROBES)
+        keys = {(p.category, p.key) for p in plan}
+
+        assert keys.isdisjoint(FS_WALK_REPLACES)
+        assert plan[-1] == FS_WALK_PROBE
+        assert len(plan) == len(REMOTE_PROBES) - len(FS_WALK_REPLACES) + 1
+
+    def test_parse_fs_walk(self) -> None:
+        """Entries carry mode, access and depth; malformed lines are skipped."""
+        entries, now = enumerate_plugin.parse_fs_walk(_WALK_OUTPUT + "\nNOW\tlater")
+
+        assert now == 100000.0
+        assert len(entries) == 13
+        sudo = entries[0]
+        assert sudo.mode == 0o4755
+        assert sudo.readable is True
+        assert sudo.writable is False
+        assert sudo.depth == 3
+
+    def test_derived_probes_match_heuristic_formats(self) -> None:
+        """Derived probe output feeds the existing heuristics unchanged."""
+        warnings: list[str] = []
+        derived = {
+            (p.category, p.key): p
+            for p in enumerate_plugin.derive_fs_walk_probes(self._walk(_WALK_OUTPUT), warnings)
+        }
+
+        assert warnings == []
+        assert derived[("filesystem", "suid_files")].stdout == "/usr/bin/find\n"
+        assert derived[("filesystem", "sgid_files")].stdout == "/usr/bin/locate\n"
+        assert derived[("filesystem", "world_writable_dirs")].stdout == "/opt/shared\n"
+        assert (
+            derived[("writable", "writable_services")].stdout
+            == "/etc/systemd/system/evil.service\n"
+        )
+        assert derived[("writable", "writable_cron")].stdout == "WRITABLE:/etc/cron.d\nDONE\n"
+        assert derived[("credentials", "ssh_keys")].stdout == "/home/sam/.ssh/id_rsa\n"
+        assert derived[("credentials", "config_credentials")].stdout == "/srv/app/.env\n"
+        backups = derived[("interesting_files", "backup_files")].stdout.splitlines()
+        assert backups == [
+            "644 root 50 /var/backups/passwd.bak",
+            "/var/backups/passwd.bak",
+            "/opt/db.sql",
+        ]
+        assert derived[("interesting_files", "recently_modified")].stdout == "/etc/hosts\n"
+        assert all(p.status == 1 for p in derived.values())
+
+        snapshot = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC), probes={}, warnings=[]
+        )
+        for probe in derived.values():
+            snapshot.probes.setdefault(probe.category, {})[probe.key] = probe
+        keys = {f.key for f in enumerate_plugin.generate_priority_findings(snapshot)}
+        assert {
+            "suid_binaries",
+            "gtfobins_suid",
+            "world_writable_dirs",
+            "writable_service_files",
+            "writable_cron_files",
+            "credential_exposure",
+            "interesting_backups",
+            "recent_modifications",
+        } <= keys
+
+    def test_empty_walk_uses_sentinels(self) -> None:
+        """With no matches the derived probes report the original 'nothing found' markers."""
+        derived = {
+            p.key: p.stdout
+            for p in enumerate_plugin.derive_fs_walk_probes(self._walk("NOW\t1\n"), [])
+        }
+
+        assert derived["suid_files"] == ""
+        assert derived["writable_services"] == "NONE_WRITABLE\n"
+        assert derived["ssh_keys"] == "NO_READABLE_KEYS\n"
+        assert derived["backup_files"] == "NO_BACKUPS\n"
+        assert derived["recently_modified"] == "NONE_RECENT\n"
+
+    def test_unsupported_find_warns(self) -> None:
+        """Hosts whose find lacks -printf produce a warning and no derived probes."""
+        warnings: list[str] = []
+
+        assert (
+            enumerate_plugin.derive_fs_walk_probes(self._walk("FS_WALK_UNSUPPORTED\n"), warnings)
+            == []
+        )
+        assert "--fs-walk" in warnings[0]
+
+    def test_timed_out_walk_warns(self) -> None:
+        """A walk cut short by its timeout still derives probes but flags them as partial."""
+        walk = self._walk(_WALK_OUTPUT)
+        walk.status = 124
+        warnings: list[str] = []
+
+        derived = enumerate_plugin.derive_fs_walk_probes(walk, warnings)
+
+        assert len(derived) == len(enumerate_plugin.FS_WALK_REPLACES)
+        assert warnings == ["Filesystem walk timed out after 30s; filesystem checks are incomplete"]
+
+    def test_progressive_waits_for_walk(self) -> None:
+        """Walk-derived heuristics wait for the walk, then fire from its facts."""
+        from lazyssh.plugins._enumeration_plan import FS_WALK_REPLACES, build_fs_walk_plan
+
+        plan = build_fs_walk_plan(REMOTE_PROBES)
+        state = enumerate_plugin.ProgressiveEnumeration(plan)
+        assert state.total == len(plan) + len(FS_WALK_REPLACES)
+
+        state.add_payload(_payload("users", "id", "uid=1000(sam) groups=27(sudo)"))
+        assert "suid_binaries" not in [f.key for f in state.findings]
+
+        state.add_payload(_payload("filesystem", "fs_walk", _WALK_OUTPUT))
+
+        assert state.received == 2 + len(FS_WALK_REPLACES)
+        assert "suid_binaries" in [f.key for f in state.findings]
+        assert state.snapshot.probes["filesystem"]["suid_files"].stdout == "/usr/bin/find\n"
+
+    @pytest.mark.parametrize("with_timeout", [True, False])
+    def test_walk_command_runs_locally(self, tmp_path: Path, with_timeout: bool) -> None:
+        """The walk command is valid shell, with or without ``timeout``, and ends with the clock."""
+        import shutil
+        import subprocess
+
+        from lazyssh.plugins._enumeration_plan import FS_WALK_COMMAND
+
+        tools = ["find", "date", *(["timeout"] if with_timeout else [])]
+        for tool in tools:
+            (tmp_path / tool).symlink_to(shutil.which(tool) or f"/usr/bin/{tool}")
+        command = FS_WALK_COMMAND.replace("$t find / ", "$t find /etc -maxdepth 1 ", 1)
+        result = subprocess.run(
+            ["/bin/sh", "-s"],
+            input=command,
+            text=True,
+            capture_output=True,
+            timeout=30,
+            check=True,
+            env={"PATH": str(tmp_path)},
+        )
+
+        entries, now = enumerate_plugin.parse_fs_walk(result.stdout)
+        assert now is not None
+        assert all(entry.path.startswith("/etc") for entry in entries)
+
+    def test_walk_crosses_mounts_but_prunes_pseudo_filesystems(self) -> None:
+        from lazyssh.plugins._enumeration_plan import FS_WALK_COMMAND, FS_WALK_PRUNE
+
+        assert "-xdev" not in FS_WALK_COMMAND
+        assert "timeout 25s" in FS_WALK_COMMAND
+        for path in FS_WALK_PRUNE:
+            assert f"-path {path}" in FS_WALK_COMMAND.split("-prune")[0]
+
+
+def _finding(key: str, detail: str = "detail", severity: str = "high"):
+    return enumerate_plugin.PriorityFinding(
+        key=key,
+        category="test",
+        severity=severity,  # type: ignore[arg-type]
+        headline=f"{key} headline",
+        detail=detail,
+        evidence=[],
+    )
+
+
+def _survey_snapshot(fingerprints: str, age: float = 0.0) -> enumerate_plugin.EnumerationSnapshot:
+    collected_at = datetime.fromtimestamp(datetime.now(UTC).timestamp() - age, tz=UTC)
+    return enumerate_plugin.EnumerationSnapshot(
+        collected_at=collected_at,
+        probes={
+            "meta": {"fingerprints": _probe("meta", "fingerprints", fingerprints)},
+            "test": {
+                "stable": _probe("test", "stable", "cached stable\n"),
+                "scan": _probe("test", "scan", "cached scan\n"),
+            },
+        },
+        warnings=[],
+    )
+
+
+class TestIncrementalEnumeration:
+    """Tests for reusing unchanged probes and diffing findings between runs."""
+
+    @pytest.fixture(autouse=True)
+    def fingerprinted_probes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            enumerate_plugin,
+            "PROBE_FINGERPRINTS",
+            {("test", "stable"): ("/etc/a",), ("test", "scan"): ("/pkg",)},
+        )
+        monkeypatch.setattr(enumerate_plugin, "SCAN_PROBES", (("test", "scan"),))
+
+    @staticmethod
+    def _probes() -> tuple[enumerate_plugin.RemoteProbe, ...]:
+        return (
+            enumerate_plugin.RemoteProbe("test", "stable", "echo fresh stable"),
+            enumerate_plugin.RemoteProbe("test", "scan", "echo fresh scan"),
+            enumerate_plugin.RemoteProbe("test", "volatile", "echo volatile"),
+        )
+
+    def test_fingerprint_command_runs_locally(self) -> None:
+        """Existing paths get a signature, missing ones are marked with '-'."""
+        import subprocess
+
+        from lazyssh.plugins._enumeration_plan import FINGERPRINT_PROBE
+
+        result = subprocess.run(
+            ["/bin/sh", "-s"],
+            input=FINGERPRINT_PROBE.command,
+            text=True,
+            capture_output=True,
+            timeout=30,
+            check=True,
+        )
+
+        fingerprints = enumerate_plugin.parse_fingerprints(result.stdout)
+        assert fingerprints["/etc/passwd"] not in ("", "-")
+        assert (
+            fingerprints["/lib/apk/db/installed"] == "-" or Path("/lib/apk/db/installed").exists()
+        )
+
+    def test_parse_fingerprints_ignores_noise(self) -> None:
+        text = "/etc/a|1.2.3\nnoise\n/etc/b|-\n"
+        assert enumerate_plugin.parse_fingerprints(text) == {"/etc/a": "1.2.3", "/etc/b": "-"}
+
+    def test_reusable_probes_requires_matching_known_signatures(self) -> None:
+        """Only probes whose paths all match a known signature are reused."""
+        previous = _survey_snapshot("/etc/a|1\n/pkg|7\n")
+
+        reused = enumerate_plugin.reusable_probes(
+            previous, {"/etc/a": "1", "/pkg": "7"}, self._probes()
+        )
+        assert [probe.key for probe in reused] == ["stable", "scan"]
+
+        changed = enumerate_plugin.reusable_probes(
+            previous, {"/etc/a": "2", "/pkg": "7"}, self._probes()
+        )
+        assert [probe.key for probe in changed] == ["scan"]
+
+        unknown = _survey_snapshot("/etc/a|?\n/pkg|7\n")
+        assert [
+            probe.key
+            for probe in enumerate_plugin.reusable_probes(unknown, {"/etc/a": "?"}, self._probes())
+        ] == []
+
+    def test_stale_scans_are_rerun(self) -> None:
+        """Filesystem-wide scans expire even when their fingerprints match."""
+        previous = _survey_snapshot("/etc/a|1\n/pkg|7\n", age=7200)
+
+        reused = enumerate_plugin.reusable_probes(
+            previous, {"/etc/a": "1", "/pkg": "7"}, self._probes()
+        )
+
+        assert [probe.key for probe in reused] == ["stable"]
+
+    def test_previous_without_fingerprints_reuses_nothing(self) -> None:
+        previous = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC),
+            probes={"test": {"stable": _probe("test", "stable", "")}},
+            warnings=[],
+        )
+        assert enumerate_plugin.reusable_probes(previous, {"/etc/a": "1"}, self._probes()) == []
+
+    def test_load_previous_survey_round_trip(self, tmp_path: Path) -> None:
+        """The newest readable survey is loaded back from its JSON payload."""
+        snapshot = _survey_snapshot("/etc/a|1\n")
+        findings = [_finding("suid_binaries")]
+        payload = enumerate_plugin.build_json_payload(snapshot, findings, "report")
+        (tmp_path / "survey_20240101-000000.json").write_text(json.dumps(payload))
+        (tmp_path / "survey_20991231-000000.json").write_text("{not json")
+
+        previous = enumerate_plugin.load_previous_survey(tmp_path)
+
+        assert previous is not None
+        assert previous.path.name == "survey_20240101-000000.json"
+        assert previous.findings == findings
+        assert previous.snapshot.probes["test"]["stable"].stdout == "cached stable\n"
+        assert previous.snapshot.collected_at.tzinfo is not None
+        assert enumerate_plugin.load_previous_survey(tmp_path / "missing") is None
+
+    def test_diff_findings(self) -> None:
+        previous = [_finding("kept"), _finding("gone"), _finding("moved", detail="old")]
+        current = [_finding("kept"), _finding("moved", detail="new"), _finding("fresh")]
+
+        diff = enumerate_plugin.diff_findings(previous, current)
+
+        assert [f.key for f in diff.added] == ["fresh"]
+        assert [f.key for f in diff.resolved] == ["gone"]
+        assert [(old.detail, new.detail) for old, new in diff.changed] == [("old", "new")]
+        assert diff.empty is False
+        data = diff.to_dict()
+        assert data["changed"][0]["previous"]["detail"] == "old"
+        assert enumerate_plugin.diff_findings(current, current).empty is True
+
+    def test_render_diff(self, tmp_path: Path) -> None:
+        previous = enumerate_plugin.PreviousSurvey(
+            path=tmp_path / "survey.json", snapshot=_survey_snapshot(""), findings=[]
+        )
+        diff = enumerate_plugin.diff_findings(
+            [_finding("gone"), _finding("moved", detail="old")],
+            [_finding("moved", detail="new"), _finding("fresh")],
+        )
+
+        plain = enumerate_plugin.render_diff_plain(diff, previous)
+        assert "+ [HIGH] fresh headline" in plain
+        assert "- [HIGH] gone headline" in plain
+        assert "was: old" in plain
+        assert "now: new" in plain
+        empty = enumerate_plugin.diff_findings([], [])
+        assert "No changes." in enumerate_plugin.render_diff_plain(empty, previous)
+
+        from rich.console import Console
+
+        from lazyssh.console_instance import LAZYSSH_THEME
+
+        test_console = Console(record=True, width=140, theme=LAZYSSH_THEME)
+        original = enumerate_plugin.console
+        enumerate_plugin.console = test_console
+        try:
+            enumerate_plugin.render_diff_rich(diff, previous)
+            enumerate_plugin.render_diff_rich(empty, previous)
+        finally:
+            enumerate_plugin.console = original
+        output = test_console.export_text()
+        for label in ("NEW", "RESOLVED", "CHANGED"):
+            assert label in output
+        assert "No changes in priority findings" in output
+
+    def test_json_payload_includes_diff_only_when_given(self) -> None:
+        snapshot = _survey_snapshot("")
+        diff = enumerate_plugin.diff_findings([], [_finding("fresh")])
+
+        assert "diff" not in enumerate_plugin.build_json_payload(snapshot, [], "")
+        payload = enumerate_plugin.build_json_payload(snapshot, [], "", diff=diff)
+        assert payload["diff"]["added"][0]["key"] == "fresh"
+
+    def test_collect_incremental_snapshot_reruns_only_changed(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Unchanged probes come from the previous survey, the rest run again."""
+        monkeypatch.setattr(
+            enumerate_plugin, "_remote_shell_command", lambda *_target: ["/bin/sh", "-s"]
+        )
+        fingerprint_probe = enumerate_plugin.RemoteProbe(
+            "meta", "fingerprints", "printf '/etc/a|1\\n/pkg|8\\n'"
+        )
+        monkeypatch.setattr(enumerate_plugin, "FINGERPRINT_PROBE", fingerprint_probe)
+        previous = enumerate_plugin.PreviousSurvey(
+            path=tmp_path / "survey.json",
+            snapshot=_survey_snapshot("/etc/a|1\n/pkg|7\n"),
+            findings=[],
+        )
+
+        snapshot, reused = enumerate_plugin.collect_incremental_snapshot(
+            previous, (*self._probes(), fingerprint_probe), parallel=2
+        )
+
+        assert [probe.key for probe in reused] == ["stable"]
+        assert snapshot.probes["test"]["stable"].stdout == "cached stable\n"
+        assert snapshot.probes["test"]["scan"].stdout == "fresh scan\n"
+        assert snapshot.probes["test"]["volatile"].stdout == "volatile\n"
+        assert snapshot.probes["meta"]["fingerprints"].stdout == "/etc/a|1\n/pkg|8\n"
+        assert snapshot.warnings[-1].startswith("Reused 1 unchanged probes from ")
+
+
+class TestProbeSelection:
+    """Tests for profiles, include/exclude filters and budget planning."""
+
+    def test_profiles(self) -> None:
+        from lazyssh.plugins._enumeration_plan import (
+            DEEP_TIMEOUT_FACTOR,
+            QUICK_MAX_TIMEOUT,
+            QUICK_SKIP_CATEGORIES,
+            profile_probes,
+        )
+
+        assert profile_probes("standard") == REMOTE_PROBES
+
+        quick = profile_probes("quick")
+        assert 0 < len(quick) < len(REMOTE_PROBES)
+        assert all(probe.timeout <= QUICK_MAX_TIMEOUT for probe in quick)
+        assert not {probe.category for probe in quick} & set(QUICK_SKIP_CATEGORIES)
+        assert ("users", "sudo_check") in {(probe.category, probe.key) for probe in quick}
+
+        deep = {probe.key: probe for probe in profile_probes("deep")}
+        standard = {probe.key: probe for probe in REMOTE_PROBES}
+        assert deep["suid_files"].timeout == standard["suid_files"].timeout * DEEP_TIMEOUT_FACTOR
+        assert "timeout 24s find" in deep["suid_files"].command
+
+        with pytest.raises(ValueError, match="Unknown profile 'fast'"):
+            profile_probes("fast")
+
+    def test_select_probes(self) -> None:
+        from lazyssh.plugins._enumeration_plan import select_probes
+
+        only_users = select_probes(REMOTE_PROBES, include=("users", "system.kernel"))
+        assert {probe.category for probe in only_users} == {"users", "system"}
+        assert [probe.key for probe in only_users if probe.category == "system"] == ["kernel"]
+
+        without = select_probes(REMOTE_PROBES, exclude=("filesystem", "users.sudoers"))
+        assert "filesystem" not in {probe.category for probe in without}
+        assert "sudoers" not in {probe.key for probe in without}
+
+        with pytest.raises(ValueError, match="No probe matches 'userz'"):
+            select_probes(REMOTE_PROBES, include=("userz",))
+
+    def test_parse_option_values(self) -> None:
+        argv = ["--include=users,system", "--json", "--include=network", "--budget=30", "--x="]
+        assert enumerate_plugin.parse_option_values(argv, "include") == (
+            "users",
+            "system",
+            "network",
+        )
+        assert enumerate_plugin.parse_option_values(argv, "budget") == ("30",)
+        assert enumerate_plugin.parse_option_values(argv, "x") == ()
+
+    def test_duration_history_round_trip(self, tmp_path: Path) -> None:
+        assert enumerate_plugin.load_probe_durations(tmp_path) == {}
+
+        enumerate_plugin.record_probe_durations(tmp_path, {"users.id": 1.0})
+        enumerate_plugin.record_probe_durations(tmp_path, {"users.id": 3.0, "system.kernel": 0.5})
+        enumerate_plugin.record_probe_durations(tmp_path, {})
+
+        assert enumerate_plugin.load_probe_durations(tmp_path) == {
+            "users.id": 2.0,
+            "system.kernel": 0.5,
+        }
+
+        (tmp_path / enumerate_plugin.PROBE_DURATIONS_FILENAME).write_text('{"a": "x", "b": 1}')
+        assert enumerate_plugin.load_probe_durations(tmp_path) == {"b": 1.0}
+        (tmp_path / enumerate_plugin.PROBE_DURATIONS_FILENAME).write_text("[1]")
+        assert enumerate_plugin.load_probe_durations(tmp_path) == {}
+
+    def test_record_probe_durations_tolerates_unwritable_dir(self, tmp_path: Path) -> None:
+        enumerate_plugin.record_probe_durations(tmp_path / "missing", {"users.id": 1.0})
+        assert not (tmp_path / "missing").exists()
+
+    def test_plan_budget_prefers_value_per_second(self) -> None:
+        """Cheap high-severity heuristics win over expensive or low-value probes."""
+        durations = {
+            "users.id": 0.5,
+            "users.sudo_check": 0.5,
+            "filesystem.suid_files": 20.0,
+            "filesystem.sgid_files": 20.0,
+            "system.hostname": 0.1,
+        }
+
+        selected, skipped = enumerate_plugin.plan_budget(REMOTE_PROBES, 2.0, durations)
+
+        keys = {(probe.category, probe.key) for probe in selected}
+        assert ("users", "id") in keys
+        assert ("users", "sudo_check") in keys
+        assert ("filesystem", "suid_files") not in keys
+        assert len(selected) + len(skipped) == len(REMOTE_PROBES)
+        assert list(selected) == [probe for probe in REMOTE_PROBES if probe in selected]
+
+    def test_plan_budget_scales_with_parallel_jobs(self) -> None:
+        """Without history every probe costs its timeout, shared across jobs."""
+        sequential, _ = enumerate_plugin.plan_budget(REMOTE_PROBES, 20, {})
+        parallel, _ = enumerate_plugin.plan_budget(REMOTE_PROBES, 20, {}, parallel=4)
+
+        assert sum(probe.timeout for probe in sequential) <= 20
+        assert len(parallel) > len(sequential)
+        everything, skipped = enumerate_plugin.plan_budget(REMOTE_PROBES, 10_000, {})
+        assert everything == REMOTE_PROBES
+        assert skipped == ()
+
+    def test_plan_budget_counts_walk_as_provider(self) -> None:
+        from lazyssh.plugins._enumeration_plan import FS_WALK_PROBE, build_fs_walk_plan
+
+        plan = build_fs_walk_plan(REMOTE_PROBES)
+        selected, _ = enumerate_plugin.plan_budget(plan, 1.0, {"filesystem.fs_walk": 0.2})
+
+        assert FS_WALK_PROBE in selected
+
+
+def _timed(category: str, key: str, duration: float, timeout: int = 10, status: int = 0):
+    probe = _probe(category, key, "out", status=status)
+    probe.timeout = timeout
+    probe.started_at = 1000.0
+    probe.finished_at = 1000.0 + duration
+    probe.stdout_bytes = 3
+    return probe
+
+
+class TestProbeTimings:
+    """Tests for remote per-probe timing and output size instrumentation."""
+
+    def test_script_reports_timings_and_sizes(self) -> None:
+        """Both script variants emit remote timestamps and byte counts per probe."""
+        import subprocess
+
+        probes = (
+            enumerate_plugin.RemoteProbe("test", "echo", "printf hello", timeout=5),
+            enumerate_plugin.RemoteProbe("test", "err", "printf oops >&2; exit 3", timeout=5),
+        )
+        for parallel in (1, 2):
+            result = subprocess.run(
+                ["/bin/sh", "-s"],
+                input=enumerate_plugin.build_remote_script(probes, parallel=parallel),
+                text=True,
+                capture_output=True,
+                timeout=30,
+                check=True,
+            )
+            payloads = [json.loads(line) for line in result.stdout.splitlines() if line]
+            by_key = {payload["key"]: payload for payload in payloads}
+
+            assert by_key["echo"]["stdout_bytes"] == 5
+            assert by_key["err"]["stderr_bytes"] == 4
+            assert by_key["err"]["status"] == 3
+            for payload in payloads:
+                assert payload["finished"] >= payload["started"] > 0
+
+    def test_payload_timings_reach_probe_output(self) -> None:
+        payload = {
+            **_payload("users", "id", "uid=0"),
+            "started": 10.0,
+            "finished": 12.5,
+            "stdout_bytes": 5,
+            "stderr_bytes": 0,
+        }
+
+        probe = enumerate_plugin.ProgressiveEnumeration().add_payload(payload)
+
+        assert probe.duration == 2.5
+        assert probe.to_dict()["duration"] == 2.5
+        assert probe.to_dict()["stdout_bytes"] == 5
+        assert enumerate_plugin.ProbeOutput.from_dict(probe.to_dict()) == probe
+
+    def test_untimed_payloads_stay_untimed(self) -> None:
+        payload = {**_payload("users", "id", "uid=0"), "started": "soon", "finished": True}
+
+        probe = enumerate_plugin.ProgressiveEnumeration().add_payload(payload)
+
+        assert probe.started_at is None
+        assert probe.duration is None
+        assert probe.to_dict()["duration"] is None
+        assert probe.stdout_bytes == 0
+
+    def test_slowest_probes_and_reports(self) -> None:
+        snapshot = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC),
+            probes={
+                "filesystem": {"suid_files": _timed("filesystem", "suid_files", 9.5)},
+                "users": {
+                    "id": _timed("users", "id", 0.2),
+                    "passwd": _probe("users", "passwd", "root:x:0:0"),
+                },
+                "network": {"arp": _timed("network", "arp", 1.0, status=124)},
+            },
+            warnings=[],
+        )
+
+        slowest = enumerate_plugin.slowest_probes(snapshot)
+        assert [probe.key for probe in slowest] == ["suid_files", "arp", "id"]
+        assert [probe.key for probe in enumerate_plugin.slowest_probes(snapshot, limit=1)] == [
+            "suid_files"
+        ]
+
+        plain = enumerate_plugin.render_plain(snapshot, [])
+        assert "Slowest Probes:" in plain
+        assert "- 9.50s filesystem.suid_files (timeout 10s, 3 bytes) ! near timeout" in plain
+        assert "- 1.00s network.arp (timeout 10s, 3 bytes) ! near timeout" in plain
+        assert "- 0.20s users.id (timeout 10s, 3 bytes)\n" in plain
+
+        payload = enumerate_plugin.build_json_payload(snapshot, [], plain)
+        assert payload["probe_timings"][0] == {
+            "probe": "filesystem.suid_files",
+            "duration": 9.5,
+            "timeout": 10,
+            "output_bytes": 3,
+            "near_timeout": True,
+        }
+        assert payload["categories"]["users"]["id"]["duration"] == 0.2
+
+        from rich.console import Console
+
+        from lazyssh.console_instance import LAZYSSH_THEME
+
+        test_console = Console(record=True, width=140, theme=LAZYSSH_THEME)
+        original = enumerate_plugin.console
+        enumerate_plugin.console = test_console
+        try:
+            enumerate_plugin.render_rich(snapshot, [])
+        finally:
+            enumerate_plugin.console = original
+        output = test_console.export_text()
+        assert "Slowest Probes" in output
+        assert "filesystem.suid_files" in output
+
+    def test_untimed_snapshot_has_no_section(self) -> None:
+        snapshot = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC),
+            probes={"users": {"id": _probe("users", "id", "uid=0")}},
+            warnings=[],
+        )
+        assert "Slowest Probes" not in enumerate_plugin.render_plain(snapshot, [])
+        assert enumerate_plugin.build_json_payload(snapshot, [], "")["probe_timings"] == []
+
+
+class TestFramedWire:
+    """Tests for the length-prefixed framed transport and its JSON fallback."""
+
+    _PROBES = (
+        enumerate_plugin.RemoteProbe("test", "text", "printf 'caf\\303\\251\\nno newline'"),
+        enumerate_plugin.RemoteProbe("test", "err", "printf 'F x y\\n' >&2; exit 4"),
+        enumerate_plugin.RemoteProbe("test", "empty", "true"),
+    )
+
+    @pytest.fixture(autouse=True)
+    def local_shell(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            enumerate_plugin, "_remote_shell_command", lambda *_target: ["/bin/sh", "-s"]
+        )
+
+    @staticmethod
+    def _decode(chunks: list[bytes]) -> tuple[enumerate_plugin.WireDecoder, list, list]:
+        lines: list[str] = []
+        payloads: list[dict] = []
+        decoder = enumerate_plugin.WireDecoder(on_line=lines.append, on_payload=payloads.append)
+        for chunk in chunks:
+            decoder.feed(chunk)
+        decoder.close()
+        return decoder, lines, payloads
+
+    @pytest.mark.parametrize("parallel", [1, 3])
+    @pytest.mark.parametrize("compressors", [(), ("gzip",)])
+    def test_framed_matches_json(self, parallel: int, compressors: tuple[str, ...]) -> None:
+        """Framed batches decode to the same probe output as JSON batches."""
+        seen: list[int] = []
+        framed = enumerate_plugin.collect_remote_snapshot(
+            parallel=parallel,
+            probes=self._PROBES,
+            on_update=lambda state: seen.append(state.received),
+            wire="framed",
+            compressors=compressors,
+        )
+        plain = enumerate_plugin.collect_remote_snapshot(parallel=parallel, probes=self._PROBES)
+
+        for key in ("text", "err", "empty"):
+            got, expected = framed.probes["test"][key], plain.probes["test"][key]
+            assert (got.status, got.stdout, got.stderr) == (
+                expected.status,
+                expected.stdout,
+                expected.stderr,
+            )
+            assert got.encoding == "plain"
+            assert got.duration is not None
+        assert framed.probes["test"]["text"].stdout == "café\nno newline"
+        assert framed.probes["test"]["text"].stdout_bytes == len("café\nno newline".encode())
+        assert framed.probes["test"]["err"].status == 4
+        assert framed.warnings == []
+        assert seen == [1, 2, 3]
+
+    def test_script_falls_back_to_json_without_wc(self, tmp_path: Path) -> None:
+        """Minimal hosts without wc announce and send JSON lines."""
+        import shutil
+        import subprocess
+
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        for tool in ("sh", "cat", "mktemp", "rm", "chmod", "base64", "tr", "date", "timeout"):
+            found = shutil.which(tool)
+            if found:  # pragma: no branch - coreutils present on test hosts
+                (bin_dir / tool).symlink_to(found)
+        script = enumerate_plugin.build_remote_script(
+            self._PROBES, wire="framed", compressors=("gzip",)
+        )
+
+        result = subprocess.run(
+            ["/bin/sh", "-s"],
+            input=script.encode(),
+            capture_output=True,
+            timeout=30,
+            check=True,
+            env={"PATH": str(bin_dir)},
+        )
+
+        assert result.stdout.startswith(b"LAZYSSH-WIRE json none\n")
+        decoder, lines, payloads = self._decode([result.stdout])
+        assert decoder.wire_format == "json"
+        assert payloads == []
+        state = enumerate_plugin.ProgressiveEnumeration()
+        for line in lines:
+            state.feed_line(line)
+        snapshot = state.finish()
+        assert snapshot.probes["test"]["text"].stdout == "café\nno newline"
+
+    def test_decoder_handles_byte_by_byte_input(self) -> None:
+        stream = b"motd noise\nLAZYSSH-WIRE framed none\nF c k 0 1.5 2.0 3 2\nabcde"
+
+        decoder, lines, payloads = self._decode([bytes([b]) for b in stream])
+
+        assert lines == ["motd noise\n"]
+        assert decoder.wire_format == "framed"
+        assert decoder.error is None
+        assert decoder.wire_bytes == len(stream)
+        assert payloads == [
+            {
+                "category": "c",
+                "key": "k",
+                "status": 0,
+                "started": 1.5,
+                "finished": 2.0,
+                "encoding": "plain",
+                "stdout": "abc",
+                "stderr": "de",
+                "stdout_bytes": 3,
+                "stderr_bytes": 2,
+            }
+        ]
+
+    def test_decoder_gzip_stream(self) -> None:
+        import gzip
+
+        body = gzip.compress(b"F c k 1 1 2 2 0\nhi")
+        decoder, _, payloads = self._decode([b"LAZYSSH-WIRE framed gzip\n" + body[:5], body[5:]])
+
+        assert decoder.compression == "gzip"
+        assert payloads[0]["stdout"] == "hi"
+        assert payloads[0]["status"] == 1
+
+    @pytest.mark.parametrize(
+        ("stream", "error"),
+        [
+            (b"LAZYSSH-WIRE framed none\nbogus header\n", "Malformed frame header: bogus header"),
+            (b"LAZYSSH-WIRE framed none\nF c k 0 1 2 10 0\nshort", "ended in the middle"),
+            (b"LAZYSSH-WIRE framed lz4\nF c k 0 1 2 0 0\n", "Unsupported batch compression"),
+            (b"LAZYSSH-WIRE framed gzip\nnot gzip at all", "Corrupt compressed batch"),
+        ],
+    )
+    def test_decoder_reports_broken_streams(self, stream: bytes, error: str) -> None:
+        decoder, _, payloads = self._decode([stream])
+
+        assert payloads == []
+        assert decoder.error is not None
+        assert error in decoder.error
+
+    def test_json_announcement_and_trailing_line(self) -> None:
+        decoder, lines, _ = self._decode([b'LAZYSSH-WIRE json none\n{"a": 1}\n{"b": 2}'])
+
+        assert decoder.wire_format == "json"
+        assert lines == ['{"a": 1}\n', '{"b": 2}']
+
+    def test_broken_frames_keep_received_probes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        script = "printf 'LAZYSSH-WIRE framed none\\nF test p0 0 1 2 2 0\\nokF broken\\n'\n"
+        monkeypatch.setattr(
+            enumerate_plugin, "build_remote_script", lambda probes, **_options: script
+        )
+        probes = (enumerate_plugin.RemoteProbe("test", "p0", "echo ok"),)
+
+        snapshot = enumerate_plugin.collect_remote_snapshot(probes=probes)
+
+        assert snapshot.probes["test"]["p0"].stdout == "ok"
+        assert "Malformed frame header: F broken; showing 1 of 1 probes" in snapshot.warnings[0]
+
+        monkeypatch.setattr(
+            enumerate_plugin,
+            "build_remote_script",
+            lambda probes, **_options: "printf 'LAZYSSH-WIRE framed none\\nnope\\n'\n",
+        )
+        with pytest.raises(enumerate_plugin.RemoteExecutionError, match="Malformed frame"):
+            enumerate_plugin.collect_remote_snapshot(probes=probes)
+
+    def test_available_compressors_always_offers_gzip(self) -> None:
+        assert enumerate_plugin.available_compressors()[-1] == "gzip"
+
+
+def _target(name: str, host: str = "") -> enumerate_plugin.RemoteTarget:
+    return enumerate_plugin.RemoteTarget(name, host or f"{name}.example", "root", f"/tmp/{name}")
+
+
+class TestFleetEnumeration:
+    """Tests for --all-hosts enumeration and cross-host aggregation."""
+
+    def test_all_targets_parses_connections_and_falls_back(self) -> None:
+        from lazyssh.plugins._remote import all_targets, current_target
+
+        env = {
+            "LAZYSSH_CONNECTIONS": json.dumps(
+                [
+                    {"name": "web1", "host": "10.0.0.1", "user": "root", "socket_path": "/s/web1"},
+                    {"name": "broken"},
+                    "not a mapping",
+                ]
+            ),
+            "LAZYSSH_HOST": "10.0.0.9",
+            "LAZYSSH_USER": "me",
+            "LAZYSSH_SOCKET_PATH": "/s/current",
+            "LAZYSSH_PORT": "2200",
+        }
+
+        assert [t.name for t in all_targets(env)] == ["web1"]
+        env["LAZYSSH_CONNECTIONS"] = "{not json"
+        assert all_targets(env) == [current_target(env)]
+        assert all_targets(env)[0].name == "current"
+        assert all_targets({}) == []
+
+    def test_remote_shell_command_targets_connection(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        target = enumerate_plugin.RemoteTarget("db", "10.0.0.2", "bob", "/s/db", port="2222")
+        assert enumerate_plugin._remote_shell_command(target) == [
+            "ssh", "-S", "/s/db", "-o", "ControlMaster=no", "-p", "2222", "bob@10.0.0.2", "sh", "-s"
+        ]  # fmt: skip
+
+        monkeypatch.setenv("LAZYSSH_HOST", "10.0.0.1")
+        monkeypatch.setenv("LAZYSSH_USER", "alice")
+        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/s/web")
+        monkeypatch.delenv("LAZYSSH_PORT", raising=False)
+        assert enumerate_plugin._remote_shell_command()[-3:] == ["alice@10.0.0.1", "sh", "-s"]
+
+    def test_collect_fleet_runs_each_host_and_keeps_failures(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def shell_for(target: enumerate_plugin.RemoteTarget | None = None) -> list[str]:
+            assert target is not None
+            return ["/bin/false"] if target.name == "down" else ["/bin/sh", "-s"]
+
+        monkeypatch.setattr(enumerate_plugin, "_remote_shell_command", shell_for)
+        probes = (enumerate_plugin.RemoteProbe("test", "echo", "echo hi"),)
+        done: list[str] = []
+
+        surveys = enumerate_plugin.collect_fleet(
+            [_target("a"), _target("down"), _target("b")],
+            probes,
+            max_hosts=2,
+            on_host_done=lambda survey: done.append(survey.target.name),
+        )
+
+        assert [survey.target.name for survey in surveys] == ["a", "down", "b"]
+        assert sorted(done) == ["a", "b", "down"]
+        assert surveys[0].snapshot is not None
+        assert surveys[0].snapshot.probes["test"]["echo"].stdout == "hi\n"
+        assert surveys[1].snapshot is None
+        assert "exit code 1" in (surveys[1].error or "")
+        assert enumerate_plugin.collect_fleet([], probes) == []
+
+    def _surveys(self) -> list[enumerate_plugin.HostSurvey]:
+        suid = _finding("suid_binaries", severity="high")
+        suid.evidence = ["/usr/bin/find", "/usr/bin/vim"]
+        suid.exploitation_difficulty = "easy"
+        suid_b = _finding("suid_binaries", severity="critical")
+        suid_b.evidence = ["/usr/bin/find"]
+        suid_b.exploitation_difficulty = "instant"
+        snapshot = enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC), probes={}, warnings=["partial"]
+        )
+        return [
+            enumerate_plugin.HostSurvey(_target("a"), snapshot, [suid, _finding("docker")]),
+            enumerate_plugin.HostSurvey(_target("b"), snapshot, [suid_b, _finding("docker")]),
+            enumerate_plugin.HostSurvey(
+                _target("c"), snapshot, [_finding("path", severity="info"), _finding("docker")]
+            ),
+            enumerate_plugin.HostSurvey(_target("down"), error="timed out"),
+        ]
+
+    def test_aggregate_groups_identical_findings_and_ranks(self) -> None:
+        fleet = enumerate_plugin.aggregate_findings(self._surveys())
+
+        assert [(f.key, f.severity, len(f.hosts)) for f in fleet] == [
+            ("suid_binaries", "critical", 2),
+            ("docker", "high", 3),
+            ("path", "info", 1),
+        ]
+        assert fleet[0].evidence == [("/usr/bin/find", ["a", "b"]), ("/usr/bin/vim", ["a"])]
+        assert fleet[0].exploitation_difficulty == "instant"
+        assert fleet[1].evidence == [("detail", ["a", "b", "c"])]
+        assert fleet[0].to_dict()["evidence"][0] == {"item": "/usr/bin/find", "hosts": ["a", "b"]}
+
+    def test_fleet_reports(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+        surveys = self._surveys()
+        fleet = enumerate_plugin.aggregate_findings(surveys)
+        collected_at = datetime.now(UTC)
+        monkeypatch.setattr(enumerate_plugin, "FLEET_HOSTS_SHOWN", 2)
+
+        plain = enumerate_plugin.render_fleet_plain(surveys, fleet, collected_at)
+
+        assert "Hosts: 3 surveyed, 1 failed" in plain
+        assert "- [CRITICAL] suid_binaries headline (2/4 hosts: a, b)" in plain
+        assert "    • detail [3 hosts: a, b, +1 more]" in plain
+        assert "- a (a.example): 2 findings (2 high) [1 warnings]" in plain
+        assert "- down (down.example): FAILED - timed out" in plain
+        assert "- None detected" in enumerate_plugin.render_fleet_plain([], [], collected_at)
+        enumerate_plugin.render_fleet_rich(surveys, fleet, collected_at)
+        enumerate_plugin.render_fleet_rich(
+            [enumerate_plugin.HostSurvey(_target("a"), surveys[0].snapshot)], [], collected_at
+        )
+
+        payload = enumerate_plugin.build_fleet_json_payload(surveys, fleet, collected_at)
+        assert payload["failed_hosts"] == ["down"]
+        assert payload["ranked_findings"][0]["host_count"] == 2
+        assert payload["hosts"][0]["priority_findings"][1]["key"] == "docker"
+        assert "summary_text" not in payload["hosts"][0]
+        assert payload["hosts"][3] == {
+            "name": "down", "host": "down.example", "user": "root", "error": "timed out"
+        }  # fmt: skip
+
+        monkeypatch.setenv("LAZYSSH_CONNECTION_NAME", "jump")
+        monkeypatch.setattr(
+            enumerate_plugin, "CONNECTION_LOG_DIR_TEMPLATE", str(tmp_path / "{connection_name}")
+        )
+        monkeypatch.setenv("LAZYSSH_SURVEY_DB", str(tmp_path / "surveys.sqlite3"))
+        json_path, txt_path = enumerate_plugin.write_fleet_artifacts(
+            surveys, plain, payload, is_json_output=False
+        )
+        assert json_path.parent == tmp_path / "jump"
+        assert json_path.name.startswith("fleet_survey_")
+        assert txt_path is not None
+        assert txt_path.read_text() == plain
+        for name in ("a", "b", "c"):
+            assert len(list((tmp_path / name).glob("survey_*.json"))) == 1
+        assert not (tmp_path / "down").exists()
+        with SnapshotStore(tmp_path / "surveys.sqlite3") as archive:
+            assert sorted((run.connection, run.host) for run in archive.runs()) == [
+                ("a", "a.example"),
+                ("b", "b.example"),
+                ("c", "c.example"),
+            ]
+        _, txt_path = enumerate_plugin.write_fleet_artifacts([], plain, payload, True)
+        assert txt_path is None
+
+
+class TestParsedFacts:
+    """Tests for the parsed-facts layer shared by the heuristics."""
+
+    @staticmethod
+    def _snapshot(**probes: enumerate_plugin.ProbeOutput) -> enumerate_plugin.EnumerationSnapshot:
+        grouped: dict[str, dict[str, enumerate_plugin.ProbeOutput]] = {}
+        for probe in probes.values():
+            grouped.setdefault(probe.category, {})[probe.key] = probe
+        return enumerate_plugin.EnumerationSnapshot(
+            collected_at=datetime.now(UTC), probes=grouped, warnings=[]
+        )
+
+    @pytest.mark.parametrize(
+        ("stdout", "uid", "user", "groups"),
+        [
+            ("uid=1000(sam) gid=1000(sam) groups=27(sudo),4(adm)", 1000, "sam", {"sudo", "adm"}),
+            ("uid=0", 0, "", set()),
+            ("uid=1000(u) gid=1000(u) groups=Sudo,wheel", 1000, "u", {"sudo", "wheel"}),
+            ("not the id command", None, "", set()),
+        ],
+    )
+    def test_identity(self, stdout: str, uid: int | None, user: str, groups: set[str]) -> None:
+        identity = self._snapshot(id=_probe("users", "id", stdout)).facts.identity()
+
+        assert identity is not None
+        assert (identity.uid, identity.user, set(identity.groups)) == (uid, user, groups)
+        assert identity.line == stdout
+        assert self._snapshot(id=_probe("users", "id", " \n")).facts.identity() is None
+
+    def test_views_are_cached_until_the_probe_changes(self) -> None:
+        snapshot = self._snapshot(suid=_probe("filesystem", "suid_files", "/bin/a\n\n /x/a \n"))
+        facts = snapshot.facts
+
+        assert snapshot.facts is facts
+        assert facts.lines("filesystem", "suid_files") == ("/bin/a", "/x/a")
+        assert facts.lines("filesystem", "suid_files") is facts.lines("filesystem", "suid_files")
+        assert facts.binary_index("filesystem", "suid_files") == {"a": ["/bin/a", "/x/a"]}
+        assert facts.lines("filesystem", "missing") == ()
+
+        snapshot.probes["filesystem"]["suid_files"] = _probe("filesystem", "suid_files", "/b\n")
+        assert facts.binary_index("filesystem", "suid_files") == {"b": ["/b"]}
+        assert "_facts" not in repr(snapshot)
+
+    def test_sudo_rules_listeners_and_markers(self) -> None:
+        snapshot = self._snapshot(
+            sudo=_probe(
+                "users",
+                "sudo_check",
+                "Matching Defaults entries:\nUser sam may run:\n"
+                "    (root) NOPASSWD: /usr/bin/vim /etc/x\n    (root) less\n",
+            ),
+            listen=_probe(
+                "network", "listening_services", "tcp 0.0.0.0:22\ntcp 127.0.0.1:5432\ntcp [::]:::80"
+            ),
+            path=_probe("writable", "writable_path_dirs", "WRITABLE: /opt/bin\nOK: /usr/bin\n"),
+        )
+        facts = snapshot.facts
+
+        assert [(rule.binary_path, rule.binary_name) for rule in facts.sudo_rules()] == [
+            ("/usr/bin/vim", "vim"),
+            ("less", "less"),
+        ]
+        assert facts.exposed_listeners() == ("tcp 0.0.0.0:22", "tcp [::]:::80")
+        assert facts.marked("writable", "writable_path_dirs") == ("/opt/bin",)
+
+    def test_gtfobins_suid_counts_every_match_but_shows_the_first(self) -> None:
+        listing = "".join(f"/opt/{i}/find\n/opt/{i}/passwd\n" for i in range(50))
+        snapshot = self._snapshot(suid=_probe("filesystem", "suid_files", listing))
+
+        result = enumerate_plugin._evaluate_gtfobins_suid(snapshot, _get_heuristic("gtfobins_suid"))
+
+        assert result is not None
+        assert result.detail == "Found 50 SUID binaries with known GTFOBins techniques"
+        assert result.evidence == [f"/opt/{i}/find" for i in range(6)]
+        assert len(result.exploit_commands) == 12
+
+    def test_exploitability_matrix_across_privilege_contexts(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        snapshot = self._snapshot(
+            sudo=_probe(
+                "users", "sudo_check", "User sam may run:\n    (root) NOPASSWD: /usr/bin/vim\n"
+            ),
+            suid=_probe("filesystem", "suid_files", "/usr/bin/passwd\n/usr/bin/find\n"),
+            sgid=_probe("filesystem", "sgid_files", "/usr/bin/find\n/usr/bin/wall\n"),
+            caps=_probe("capabilities", "cap_interesting", "/usr/bin/python3 cap_setuid=ep\n"),
+        )
+        facts = snapshot.facts
+
+        assert [(item.context, item.name) for item in facts.exploitable_binaries()] == [
+            ("sudo", "vim"),
+            ("suid", "find"),
+            ("sgid", "find"),
+            ("capabilities", "python3"),
+        ]
+        assert facts.exploitable_binaries("sgid") is facts.exploitable_binaries("sgid")
+        assert list(facts.privileged_binaries("sgid")) == ["find", "wall"]
+        assert facts.privileged_binaries("sudo") == {"vim": ["/usr/bin/vim"]}
+
+        matrix = enumerate_plugin.exploitability_matrix(snapshot)
+        sgid_row = next(row for row in matrix if row["context"] == "sgid")
+        assert sgid_row == {
+            "binary": "find",
+            "context": "sgid",
+            "technique": "suid",
+            "description": sgid_row["description"],
+            "command": sgid_row["command"],
+            "paths": ["/usr/bin/find"],
+        }
+        payload = enumerate_plugin.build_json_payload(snapshot, [], "")
+        assert payload["exploitability_matrix"] == matrix
+
+        plain = enumerate_plugin.render_plain(snapshot, [])
+        assert "Exploitability Matrix:" in plain
+        assert "- vim (/usr/bin/vim) [sudo/sudo]" in plain
+        assert enumerate_plugin._format_paths(["/a", "/b", "/c"]) == "/a, /b +1 more"
+        assert "more in the JSON output" not in plain
+
+        from rich.console import Console
+
+        from lazyssh.console_instance import LAZYSSH_THEME
+
+        test_console = Console(record=True, width=140, theme=LAZYSSH_THEME)
+        monkeypatch.setattr(enumerate_plugin, "console", test_console)
+        enumerate_plugin.render_rich(snapshot, [])
+        output = test_console.export_text(clear=True)
+        assert "Exploitability Matrix" in output
+        assert "more in the JSON output" not in output
+
+        monkeypatch.setattr(enumerate_plugin, "MATRIX_ROWS_SHOWN", 1)
+        assert f"... {len(matrix) - 1} more in the JSON output" in (
+            enumerate_plugin.render_plain(snapshot, [])
+        )
+        enumerate_plugin.render_rich(snapshot, [])
+        assert "more in the JSON output" in test_console.export_text()
+
+    def test_exploitability_matrix_uses_loaded_function_types(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from lazyssh.plugins._gtfobins_data import GTFOBinsDatabase
+
+        database = GTFOBinsDatabase(
+            "test", {"limited-suid": {"ed": (("./ed\n!/bin/sh", "Limited SUID shell"),)}}
+        )
+        snapshot = self._snapshot(suid=_probe("filesystem", "suid_files", "/bin/ed\n/bin/vim\n"))
+        monkeypatch.setattr(enumerate_plugin, "get_database", lambda: database)
+        rows = enumerate_plugin.exploitability_matrix(snapshot)
+        assert [(row["binary"], row["technique"]) for row in rows] == [("ed", "limited-suid")]
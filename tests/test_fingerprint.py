@@ -0,0 +1,178 @@
+"""Tests for the cached remote fingerprint."""
+
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from lazyssh.models import SSHConnection
+from lazyssh.plugin_manager import PluginManager
+from lazyssh.plugins._fingerprint import (
+    FINGERPRINT_MAX_AGE,
+    RemoteFingerprint,
+    collect_fingerprint,
+    connection_fingerprint_path,
+    fingerprint_env,
+    fingerprint_path,
+    get_fingerprint,
+    load_fingerprint,
+    parse_fingerprint,
+    save_fingerprint,
+)
+from lazyssh.plugins._remote import RemoteTarget
+
+TARGET = RemoteTarget("web1", "10.0.0.1", "alice", "/tmp/web1", "22")
+OUTPUT = "\n".join(
+    [
+        "arch=aarch64",
+        "os=Linux",
+        "shell=/bin/bash",
+        "tool:base64=/usr/bin/base64",
+        "tool:tar=/bin/tar",
+        "tool:sftp-server=/usr/lib/openssh/sftp-server",
+        "tool:sftp-server=/usr/libexec/sftp-server",
+        "noise",
+    ]
+)
+
+
+def _env(tmp_path: Path) -> dict[str, str]:
+    return {
+        "LAZYSSH_SOCKET": "web1",
+        "LAZYSSH_HOST": "10.0.0.1",
+        "LAZYSSH_USER": "alice",
+        "LAZYSSH_PORT": "22",
+        "LAZYSSH_SOCKET_PATH": "/tmp/web1",
+        "LAZYSSH_CONNECTION_DIR": str(tmp_path),
+    }
+
+
+def _completed(stdout: str, returncode: int = 0) -> subprocess.CompletedProcess[str]:
+    return subprocess.CompletedProcess([], returncode, stdout=stdout, stderr="denied")
+
+
+def test_parse_fingerprint() -> None:
+    fingerprint = parse_fingerprint(OUTPUT, TARGET, now=100.0)
+
+    assert (fingerprint.arch, fingerprint.os, fingerprint.shell) == (
+        "aarch64",
+        "Linux",
+        "/bin/bash",
+    )
+    assert fingerprint.tools["sftp-server"] == "/usr/lib/openssh/sftp-server"
+    assert fingerprint.has("base64")
+    assert not fingerprint.has("zstd")
+    assert fingerprint.remote_arch().msf_arch == "aarch64"
+    assert fingerprint.remote_arch().msf_platform == "linux"
+    with pytest.raises(RuntimeError, match="Unexpected fingerprint output"):
+        parse_fingerprint("arch=x86_64\n", TARGET)
+
+
+def test_cache_round_trip_and_validation(tmp_path: Path) -> None:
+    path = tmp_path / "conn.d" / "fingerprint.json"
+    fingerprint = parse_fingerprint(OUTPUT, TARGET, now=time.time())
+    save_fingerprint(path, fingerprint)
+
+    assert path.stat().st_mode & 0o777 == 0o600
+    assert load_fingerprint(path, TARGET) == fingerprint
+    # Another account on the same host, or a stale cache, is re-collected
+    assert load_fingerprint(path, RemoteTarget("web1", "10.0.0.1", "root", "/tmp/web1")) is None
+    assert load_fingerprint(path, now=fingerprint.collected_at + FINGERPRINT_MAX_AGE + 1) is None
+
+    path.write_text(json.dumps({**fingerprint.to_dict(), "version": 0}))
+    assert load_fingerprint(path) is None
+    path.write_text(json.dumps({"version": 1, "host": "h"}))
+    assert load_fingerprint(path) is None
+    path.write_text("[]")
+    assert load_fingerprint(path) is None
+    assert load_fingerprint(tmp_path / "missing.json") is None
+
+
+def test_fingerprint_path() -> None:
+    assert fingerprint_path({}) is None
+    assert connection_fingerprint_path("db1") == Path("/tmp/lazyssh/db1.d/fingerprint.json")
+    assert fingerprint_path({"LAZYSSH_CONNECTION_DIR": "/c"}) == Path("/c/fingerprint.json")
+    assert fingerprint_path(
+        {"LAZYSSH_CONNECTION_DIR": "/c", "LAZYSSH_FINGERPRINT": "/f.json"}
+    ) == Path("/f.json")
+
+
+def test_collect_fingerprint_survives_remote_shell() -> None:
+    run = subprocess.run
+
+    def fake_ssh(argv: list[str], **kwargs: object) -> subprocess.CompletedProcess[str]:
+        # Like ssh: join the remote arguments and hand them to a login shell
+        remote = " ".join(argv[argv.index("alice@10.0.0.1") + 1 :])
+        return run(  # noqa: S603  # fixed local shell
+            ["/bin/sh", "-c", remote], capture_output=True, text=True, check=False
+        )
+
+    with mock.patch("subprocess.run", side_effect=fake_ssh):
+        fingerprint = collect_fingerprint(TARGET)
+
+    assert fingerprint.arch == os.uname().machine
+    assert fingerprint.os == "Linux"
+
+
+def test_collect_fingerprint_errors() -> None:
+    with mock.patch("subprocess.run", return_value=_completed("", returncode=255)):
+        with pytest.raises(RuntimeError, match="Fingerprint collection failed: denied"):
+            collect_fingerprint(TARGET)
+    with mock.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("ssh", 15)):
+        with pytest.raises(RuntimeError, match="timed out"):
+            collect_fingerprint(TARGET)
+
+
+def test_get_fingerprint_collects_once(tmp_path: Path) -> None:
+    env = _env(tmp_path)
+    with mock.patch("subprocess.run", return_value=_completed(OUTPUT)) as run:
+        first = get_fingerprint(env=env)
+        second = get_fingerprint(env=env)
+        get_fingerprint(env=env, refresh=True)
+
+    assert first == second
+    assert run.call_count == 2
+    (command,) = {tuple(call.args[0][:3]) for call in run.call_args_list}
+    assert command == ("ssh", "-S", "/tmp/web1")
+
+    with pytest.raises(RuntimeError, match="Missing SSH environment"):
+        get_fingerprint(env={})
+
+
+def test_get_fingerprint_without_writable_cache(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    env = {**_env(tmp_path), "LAZYSSH_FINGERPRINT": str(blocker / "fingerprint.json")}
+    with mock.patch("subprocess.run", return_value=_completed(OUTPUT)):
+        assert get_fingerprint(env=env).arch == "aarch64"
+        del env["LAZYSSH_FINGERPRINT"], env["LAZYSSH_CONNECTION_DIR"]
+        assert get_fingerprint(env=env).os == "Linux"
+
+
+def test_plugin_env_exposes_cached_fingerprint(tmp_path: Path) -> None:
+    conn = SSHConnection(host="10.0.0.1", port=22, username="alice", socket_path="/tmp/web1")
+    conn.connection_dir = str(tmp_path)
+    path = tmp_path / "fingerprint.json"
+    pm = PluginManager(plugins_dir=tmp_path)
+
+    env = pm._prepare_plugin_env(conn)
+    assert env["LAZYSSH_FINGERPRINT"] == str(path)
+    assert "LAZYSSH_REMOTE_ARCH" not in env
+
+    save_fingerprint(path, parse_fingerprint(OUTPUT, TARGET, now=time.time()))
+    env = pm._prepare_plugin_env(conn)
+    assert (env["LAZYSSH_REMOTE_ARCH"], env["LAZYSSH_REMOTE_OS"]) == ("aarch64", "Linux")
+    assert env["LAZYSSH_REMOTE_TOOLS"] == "base64,sftp-server,tar"
+
+
+def test_fingerprint_env_ignores_other_targets(tmp_path: Path) -> None:
+    path = tmp_path / "fingerprint.json"
+    save_fingerprint(path, parse_fingerprint(OUTPUT, TARGET, now=time.time()))
+    other = RemoteTarget("db1", "10.0.0.2", "alice", "/tmp/db1")
+
+    assert fingerprint_env(path, other) == {"LAZYSSH_FINGERPRINT": str(path)}
+    assert RemoteFingerprint.from_dict(json.loads(path.read_text())).port == "22"
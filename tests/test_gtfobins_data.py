@@ -1,13 +1,23 @@
 """Tests for the GTFOBins embedded database and lookup functions."""
 
+import json
+import os
+from pathlib import Path
+
 import pytest
 
+from lazyssh.plugins import _gtfobins_data
 from lazyssh.plugins._gtfobins_data import (
     GTFOBINS_DB,
     GTFOBinsEntry,
+    compile_index,
+    database_version,
+    get_database,
+    lookup,
     lookup_capabilities,
     lookup_sudo,
     lookup_suid,
+    parse_dataset,
 )
 
 VALID_CAPABILITIES = frozenset({"suid", "sudo", "capabilities", "file-read", "file-write", "shell"})
@@ -204,3 +214,113 @@ class TestCrossLookupConsistency:
             assert entry in results, (
                 f"Capabilities entry for {entry.binary} not found via lookup_capabilities()"
             )
+
+
+class TestDatasetLoading:
+    """Tests for loading and indexing a full GTFOBins dataset."""
+
+    @pytest.fixture
+    def dataset(self, tmp_path: Path) -> Path:
+        path = tmp_path / "gtfobins.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "version": "2026-10",
+                    "executables": {
+                        "zip": {
+                            "functions": {
+                                "shell": [{"code": "zip /tmp/x /etc/hosts -T -TT 'sh #'"}],
+                                "sudo": [{"code": "sudo zip ...", "description": "Root  shell"}],
+                                "limited-suid": [{"code": "./zip ..."}],
+                                "bind-shell": [{"code": "ignored"}],
+                            }
+                        },
+                        "base32": {
+                            "functions": {"file-read": [{"code": "base32 f"}], "suid": [{}]}
+                        },
+                        "broken": "not a mapping",
+                        "empty": {"functions": None},
+                    },
+                }
+            )
+        )
+        return path
+
+    def test_parse_all_function_types(self, dataset: Path) -> None:
+        version, techniques = parse_dataset(dataset)
+        assert version == "2026-10"
+        assert techniques["sudo"]["zip"] == (("sudo zip ...", "Root shell"),)
+        assert techniques["limited-suid"]["zip"] == (
+            ("./zip ...", "Limited SUID shell escape via zip"),
+        )
+        assert techniques["file-read"]["base32"] == (("base32 f", "Read files via base32"),)
+        assert "bind-shell" not in techniques
+        assert "base32" not in techniques.get("suid", {})
+
+    def test_upstream_directory_layout(self, tmp_path: Path) -> None:
+        source = tmp_path / "_gtfobins"
+        source.mkdir()
+        (source / "xxd.md").write_text(
+            "---\nfunctions:\n  suid:\n    - code: ./xxd file | xxd -r\n"
+            "  file-read:\n    - code: xxd file\n---\n"
+        )
+        (source / ".hidden").write_text("ignored")
+        version, techniques = parse_dataset(source)
+        assert len(version) == 12
+        assert techniques["suid"]["xxd"] == (("./xxd file | xxd -r", "SUID file read via xxd"),)
+        database = compile_index(source, tmp_path / "index")
+        assert database.lookup("file-read", "xxd")[0].command_template == "xxd file"
+        assert compile_index(source, tmp_path / "index").version == version
+
+    @pytest.mark.parametrize(
+        "content", ["[]", '{"executables": []}', '{"zip": {"functions": {}}}', "key: [unclosed"]
+    )
+    def test_invalid_datasets(self, tmp_path: Path, content: str) -> None:
+        path = tmp_path / ("bad.yml" if content.startswith("key") else "bad.json")
+        path.write_text(content)
+        with pytest.raises(ValueError, match="GTFOBins"):
+            parse_dataset(path)
+
+    def test_compiled_index_is_reused_until_source_changes(
+        self, dataset: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        index_dir = tmp_path / "index"
+        database = compile_index(dataset, index_dir)
+        assert [e.command_template for e in database.lookup("sudo", "zip")] == ["sudo zip ..."]
+        # Embedded techniques fill in binaries the dataset does not cover
+        assert database.lookup("suid", "bash") == tuple(lookup_suid("bash"))
+        (index_path,) = index_dir.iterdir()
+        assert index_path.stat().st_mode & 0o777 == 0o600
+
+        def fail(_source: Path) -> None:
+            raise AssertionError("dataset parsed again")
+
+        monkeypatch.setattr(_gtfobins_data, "parse_dataset", fail)
+        assert compile_index(dataset, index_dir).version == "2026-10"
+
+        monkeypatch.undo()
+        dataset.write_text(dataset.read_text().replace("2026-10", "2026-11"))
+        assert compile_index(dataset, index_dir).version == "2026-11"
+
+        # Indexes other users could have written are rebuilt instead of trusted
+        os.chmod(index_path, 0o622)  # noqa: S103  # simulates a tampered index
+        assert compile_index(dataset, index_dir).version == "2026-11"
+        assert index_path.stat().st_mode & 0o777 == 0o600
+
+        # An unwritable index location still yields a usable database
+        assert compile_index(dataset, dataset).version == "2026-11"
+
+    def test_database_is_loaded_lazily_from_env(
+        self, dataset: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(_gtfobins_data, "INDEX_DIR", str(tmp_path / "index"))
+        monkeypatch.setattr(_gtfobins_data, "_DATABASE", None)
+        monkeypatch.setenv("LAZYSSH_GTFOBINS", str(dataset))
+        assert lookup("zip", "limited-suid")[0].binary == "zip"
+        assert database_version() == "2026-10"
+        assert get_database() is get_database()
+
+        monkeypatch.setattr(_gtfobins_data, "_DATABASE", None)
+        monkeypatch.setenv("LAZYSSH_GTFOBINS", str(tmp_path / "missing.json"))
+        assert database_version() == f"embedded-{len(GTFOBINS_DB)}"
+        assert lookup("zip", "sudo") == lookup_sudo("zip")
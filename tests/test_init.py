@@ -88,7 +88,7 @@ class TestCheckDependencies:
             return f"/usr/bin/{name}"
 
         monkeypatch.setattr("lazyssh._check_executable", mock_check)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", None)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", None)
 
         required, optional = check_dependencies()
         assert required == []
@@ -103,7 +103,7 @@ class TestCheckDependencies:
             return f"/usr/bin/{name}"
 
         monkeypatch.setattr("lazyssh._check_executable", mock_check)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", None)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", None)
 
         required, optional = check_dependencies()
         assert len(required) == 1
@@ -118,7 +118,7 @@ class TestCheckDependencies:
             return f"/usr/bin/{name}"
 
         monkeypatch.setattr("lazyssh._check_executable", mock_check)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", None)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", None)
 
         required, optional = check_dependencies()
         assert required == []
@@ -128,7 +128,7 @@ class TestCheckDependencies:
     def test_all_missing(self, monkeypatch: pytest.MonkeyPatch) -> None:
         """Test when all dependencies are missing."""
         monkeypatch.setattr("lazyssh._check_executable", lambda x: None)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", None)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", None)
 
         required, optional = check_dependencies()
         assert len(required) == 1
@@ -162,7 +162,7 @@ class TestCheckDependenciesLogging:
             return f"/usr/bin/{name}"
 
         monkeypatch.setattr("lazyssh._check_executable", mock_check)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", logger)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", logger)
 
         check_dependencies()
         assert any("ssh" in msg.lower() for level, msg in logger.messages if level == "error")
@@ -191,7 +191,7 @@ class TestCheckDependenciesLogging:
             return f"/usr/bin/{name}"
 
         monkeypatch.setattr("lazyssh._check_executable", mock_check)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", logger)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", logger)
 
         check_dependencies()
         assert any(
@@ -216,7 +216,7 @@ class TestCheckDependenciesLogging:
 
         logger = MockLogger()
         monkeypatch.setattr("lazyssh._check_executable", lambda x: f"/usr/bin/{x}")
-        monkeypatch.setattr("lazyssh.APP_LOGGER", logger)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", logger)
 
         check_dependencies()
         assert any(
@@ -243,7 +243,7 @@ class TestCheckDependenciesLogging:
 
         logger = MockLogger()
         monkeypatch.setattr("lazyssh._check_executable", lambda x: None)
-        monkeypatch.setattr("lazyssh.APP_LOGGER", logger)
+        monkeypatch.setattr("lazyssh.logging_module.APP_LOGGER", logger)
 
         check_dependencies()
         # Should have debug messages about missing dependencies
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import json
+import random
+from pathlib import Path
+
 import pytest
 
+from lazyssh.plugins import _kernel_exploits
 from lazyssh.plugins._kernel_exploits import (
+    DISTRO_FIXES,
     KERNEL_EXPLOITS,
+    DistroFix,
     KernelExploit,
-    _parse_kernel_version,
-    _version_in_range,
+    KernelExploitIndex,
+    KernelRelease,
+    build_index,
+    distro_family,
+    get_index,
+    load_dataset,
+    parse_kernel_release,
     suggest_exploits,
 )
 
+UBUNTU = 'NAME="Ubuntu"\nID=ubuntu\nID_LIKE=debian\nVERSION_ID="16.04"\n'
+ROCKY = 'NAME="Rocky Linux"\nID="rocky"\nID_LIKE="rhel centos fedora"\n'
+
 
 class TestKernelExploitDataIntegrity:
     """Validate that every entry in KERNEL_EXPLOITS has valid data."""
@@ -50,67 +65,60 @@ class TestKernelExploitDataIntegrity:
             entry.cve = "modified"  # type: ignore[misc]
 
 
-class TestParseKernelVersion:
-    """Tests for _parse_kernel_version."""
-
-    def test_simple_version(self) -> None:
-        assert _parse_kernel_version("5.10.100") == (5, 10, 100)
-
-    def test_version_with_suffix(self) -> None:
-        assert _parse_kernel_version("5.10.100-generic") == (5, 10, 100)
-
-    def test_ubuntu_style_version(self) -> None:
-        assert _parse_kernel_version("4.15.0-213-generic") == (4, 15, 0)
-
-    def test_two_component_version(self) -> None:
-        assert _parse_kernel_version("5.4") == (5, 4)
-
-    def test_single_number(self) -> None:
-        assert _parse_kernel_version("6") == (6,)
-
-    def test_leading_whitespace(self) -> None:
-        assert _parse_kernel_version("  5.10.100-generic  ") == (5, 10, 100)
-
-    def test_empty_string(self) -> None:
-        assert _parse_kernel_version("") is None
-
-    def test_no_digits(self) -> None:
-        assert _parse_kernel_version("not-a-version") is None
-
-    def test_complex_suffix(self) -> None:
-        assert _parse_kernel_version("5.4.0-42-generic") == (5, 4, 0)
-
-    def test_long_version(self) -> None:
-        assert _parse_kernel_version("5.10.100.1.2") == (5, 10, 100, 1, 2)
-
-
-class TestVersionInRange:
-    """Tests for _version_in_range."""
-
-    def test_exact_min(self) -> None:
-        assert _version_in_range((5, 8, 0), (5, 8, 0), (5, 16, 10)) is True
-
-    def test_exact_max(self) -> None:
-        assert _version_in_range((5, 16, 10), (5, 8, 0), (5, 16, 10)) is True
-
-    def test_within_range(self) -> None:
-        assert _version_in_range((5, 10, 50), (5, 8, 0), (5, 16, 10)) is True
-
-    def test_below_range(self) -> None:
-        assert _version_in_range((5, 7, 99), (5, 8, 0), (5, 16, 10)) is False
-
-    def test_above_range(self) -> None:
-        assert _version_in_range((5, 16, 11), (5, 8, 0), (5, 16, 10)) is False
-
-    def test_different_major(self) -> None:
-        assert _version_in_range((4, 10, 0), (5, 8, 0), (5, 16, 10)) is False
-
-    def test_shorter_tuple_below(self) -> None:
-        # (5, 4) < (5, 4, 1) is True in Python tuple comparison
-        assert _version_in_range((5, 4), (5, 4, 1), (5, 16, 10)) is False
-
-    def test_shorter_tuple_in_range(self) -> None:
-        assert _version_in_range((5, 10), (5, 8, 0), (5, 16, 10)) is True
+class TestParseKernelRelease:
+    """Tests for the upstream version parsed by parse_kernel_release."""
+
+    @pytest.mark.parametrize(
+        ("release", "version"),
+        [
+            ("5.10.100", (5, 10, 100)),
+            ("5.10.100-generic", (5, 10, 100)),
+            ("4.15.0-213-generic", (4, 15, 0)),
+            ("5.4", (5, 4)),
+            ("6", (6,)),
+            ("  5.10.100-generic  ", (5, 10, 100)),
+            ("5.4.0-42-generic", (5, 4, 0)),
+            ("5.10.100.1.2", (5, 10, 100, 1, 2)),
+        ],
+    )
+    def test_version(self, release: str, version: tuple[int, ...]) -> None:
+        parsed = parse_kernel_release(release)
+        assert parsed is not None
+        assert parsed.version == version
+
+    @pytest.mark.parametrize("release", ["", "not-a-version"])
+    def test_unparseable(self, release: str) -> None:
+        assert parse_kernel_release(release) is None
+
+
+class TestRangeBoundaries:
+    """Inclusive range matching through KernelExploitIndex.match."""
+
+    INDEX = KernelExploitIndex(
+        [KernelExploit("CVE-2022-0847", "Dirty Pipe", (5, 8, 0), (5, 16, 10), "d", "https://x")]
+    )
+
+    @pytest.mark.parametrize(
+        ("release", "matches"),
+        [
+            ("5.8.0", True),  # exact min
+            ("5.16.10", True),  # exact max
+            ("5.10.50", True),
+            ("5.7.99", False),
+            ("5.16.11", False),
+            ("4.10.0", False),
+            ("5.10", True),  # shorter version inside the range
+        ],
+    )
+    def test_boundaries(self, release: str, matches: bool) -> None:
+        assert bool(self.INDEX.match(release).exploits) is matches
+
+    def test_shorter_version_below_min(self) -> None:
+        # (5, 4) sorts before (5, 4, 1)
+        index = KernelExploitIndex(
+            [KernelExploit("CVE-1", "n", (5, 4, 1), (5, 16, 10), "d", "https://x")]
+        )
+        assert index.match("5.4").exploits == ()
 
 
 class TestSuggestExploits:
@@ -185,3 +193,156 @@ class TestSuggestExploits:
         results = suggest_exploits("5.16.11")
         cves = {e.cve for e in results}
         assert "CVE-2022-0847" not in cves
+
+
+class TestDistroAwareness:
+    """Tests for kernel release parsing and distro backport tables."""
+
+    def test_parse_kernel_release(self) -> None:
+        assert parse_kernel_release("4.15.0-213-generic") == KernelRelease((4, 15, 0), (213,))
+        assert parse_kernel_release("4.18.0-348.12.2.el8_5.x86_64") == KernelRelease(
+            (4, 18, 0), (348, 12, 2)
+        )
+        assert parse_kernel_release("6.1.0") == KernelRelease((6, 1, 0))
+        assert parse_kernel_release("unknown") is None
+
+    @pytest.mark.parametrize(
+        ("os_release", "family"),
+        [
+            (UBUNTU, "ubuntu"),
+            ('ID=linuxmint\nID_LIKE="ubuntu debian"\n', "ubuntu"),
+            (ROCKY, "rhel"),
+            ("ID=debian\n", None),
+            ("Linux host 5.10.0 #1 SMP x86_64 GNU/Linux", None),
+        ],
+    )
+    def test_distro_family(self, os_release: str, family: str | None) -> None:
+        assert distro_family(os_release) == family
+
+    def test_backported_fixes_are_excluded(self) -> None:
+        index = get_index()
+        vulnerable = index.match("4.4.0-42-generic", UBUNTU)
+        assert "CVE-2016-5195" in {e.cve for e in vulnerable.exploits}
+        patched = index.match("4.4.0-213-generic", UBUNTU)
+        assert "CVE-2016-5195" not in {e.cve for e in patched.exploits}
+        assert "CVE-2016-5195" in patched.patched
+        # Without os-release the upstream range is all there is to go on
+        assert "CVE-2016-5195" in {e.cve for e in suggest_exploits("4.4.0-213-generic")}
+        rhel = {e.cve for e in suggest_exploits("3.10.0-1160.119.1.el7.x86_64", ROCKY)}
+        assert "CVE-2016-5195" not in rhel
+        assert "CVE-2021-33909" not in rhel
+        assert "CVE-2021-33909" in {
+            e.cve for e in suggest_exploits("3.10.0-1160.31.1.el7.x86_64", ROCKY)
+        }
+
+    def test_distro_fixes_reference_known_cves(self) -> None:
+        cves = {entry.cve for entry in KERNEL_EXPLOITS}
+        for fix in DISTRO_FIXES:
+            assert fix.cve in cves, f"Unknown CVE in distro fix table: {fix.cve}"
+            assert fix.family in ("ubuntu", "rhel")
+
+
+class TestKernelExploitIndex:
+    """Tests for the interval index."""
+
+    def test_index_matches_linear_scan(self) -> None:
+        rng = random.Random(42)  # noqa: S311  # reproducible test data
+        exploits = []
+        for number in range(400):
+            low = (rng.randint(2, 6), rng.randint(0, 20), rng.randint(0, 200))
+            high = (low[0] + rng.randint(0, 1), rng.randint(0, 20), rng.randint(0, 200))
+            exploits.append(KernelExploit(f"CVE-{number}", "n", low, high, "d", "https://x"))
+        index = KernelExploitIndex(exploits)
+        versions = [
+            (rng.randint(2, 7), rng.randint(0, 20), rng.randint(0, 200)) for _ in range(300)
+        ]
+        versions += [exploit.min_version for exploit in exploits[:50]]
+        versions += [exploit.max_version for exploit in exploits[:50]]
+        for version in versions:
+            release = ".".join(map(str, version))
+            expected = [e for e in exploits if e.min_version <= version <= e.max_version]
+            assert list(index.match(release).exploits) == expected
+
+    def test_match_many_memoizes_releases(self) -> None:
+        index = build_index()
+        first, second, third = index.match_many(
+            [("5.10.0-1-amd64", ""), ("5.10.0-1-amd64", ""), ("4.4.0-45-generic", UBUNTU)]
+        )
+        assert first is second
+        assert "CVE-2016-5195" in third.patched
+        assert index.match_many([("garbage", "")])[0].exploits == ()
+
+    def test_empty_and_inverted_ranges(self) -> None:
+        inverted = KernelExploit("CVE-1", "n", (5, 0), (4, 0), "d", "https://x")
+        assert KernelExploitIndex([inverted]).match("4.5").exploits == ()
+        assert KernelExploitIndex([]).match("4.5").exploits == ()
+
+
+class TestExternalDataset:
+    """Tests for loading a local CVE dataset."""
+
+    @pytest.fixture
+    def dataset(self, tmp_path: Path) -> Path:
+        path = tmp_path / "kernel.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "exploits": [
+                        {"cve": "CVE-2099-0001", "min_version": "6.10", "max_version": [6, 20]},
+                        {
+                            "cve": "CVE-2022-0847",
+                            "name": "Dirty Pipe",
+                            "min_version": "5.8",
+                            "max_version": "5.16.11",
+                            "description": "Widened range",
+                            "reference_url": "https://example.invalid/dirtypipe",
+                        },
+                    ],
+                    "distro_fixes": [
+                        {
+                            "cve": "CVE-2099-0001",
+                            "family": "ubuntu",
+                            "kernel_version": "6.12.0",
+                            "fixed_revision": "",
+                        }
+                    ],
+                }
+            )
+        )
+        return path
+
+    def test_load_dataset(self, dataset: Path) -> None:
+        exploits, fixes = load_dataset(dataset)
+        assert exploits[0].name == "CVE-2099-0001"
+        assert exploits[0].reference_url.endswith("CVE-2099-0001")
+        assert exploits[0].max_version == (6, 20)
+        assert fixes == [DistroFix("CVE-2099-0001", "ubuntu", (6, 12, 0), ())]
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "[]",
+            '{"exploits": [{"cve": "CVE-1"}]}',
+            '{"exploits": [{"cve": "x", "min_version": 5}]}',
+        ],
+    )
+    def test_invalid_dataset(self, tmp_path: Path, content: str) -> None:
+        path = tmp_path / "bad.json"
+        path.write_text(content)
+        with pytest.raises(ValueError, match="dataset|malformed|Invalid version"):
+            load_dataset(path)
+
+    def test_get_index_merges_dataset_from_env(
+        self, dataset: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(_kernel_exploits, "_INDEX", None)
+        index = get_index({"LAZYSSH_KERNEL_EXPLOITS": str(dataset)})
+        assert get_index() is index
+        assert len(index.exploits) == len(KERNEL_EXPLOITS) + 1
+        assert "CVE-2022-0847" in {e.cve for e in index.match("5.16.11").exploits}
+        assert [e.cve for e in index.match("6.12.0-1-generic", UBUNTU).exploits] == []
+        assert [e.cve for e in index.match("6.12.0").exploits] == ["CVE-2099-0001"]
+
+        monkeypatch.setattr(_kernel_exploits, "_INDEX", None)
+        index = get_index({"LAZYSSH_KERNEL_EXPLOITS": str(tmp_path / "missing.json")})
+        assert index.exploits == KERNEL_EXPLOITS
@@ -201,7 +201,7 @@ class TestMainCLI:
         # Mock dependencies
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
 
@@ -220,7 +220,7 @@ class TestMainCLI:
         # Mock dependencies
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
         monkeypatch.setattr(
@@ -244,7 +244,7 @@ class TestMainCLI:
         # Mock dependencies
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
         monkeypatch.setattr("lazyssh.__main__.load_configs", lambda x=None: {})
@@ -264,7 +264,7 @@ class TestMainCLI:
         # Mock dependencies
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr(
             "lazyssh.__main__.check_dependencies",
@@ -286,7 +286,7 @@ class TestMainCLI:
         # Mock dependencies
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr(
             "lazyssh.__main__.check_dependencies",
@@ -353,7 +353,7 @@ class TestMainWithNoConfigs:
 
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
         # Return empty configs
@@ -372,7 +372,7 @@ class TestMainWithNoConfigs:
 
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
         # Return empty configs when path is provided
@@ -393,7 +393,7 @@ class TestMainWithNoConfigs:
 
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
         # Return empty configs when called
@@ -426,7 +426,7 @@ class TestMainKeyboardInterrupt:
         # Mock everything up to CommandMode.run which will raise KeyboardInterrupt
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
 
@@ -447,7 +447,7 @@ class TestMainKeyboardInterrupt:
 
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
 
@@ -480,7 +480,7 @@ class TestMainKeyboardInterrupt:
 
         monkeypatch.setattr("lazyssh.__main__.ensure_log_directory", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.initialize_config_file", lambda: None)
-        monkeypatch.setattr("lazyssh.__main__.ensure_runtime_plugins_dir", lambda: None)
+        monkeypatch.setattr("lazyssh.plugin_manager.ensure_runtime_plugins_dir", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.display_banner", lambda: None)
         monkeypatch.setattr("lazyssh.__main__.check_dependencies", lambda: ([], []))
 
@@ -0,0 +1,129 @@
+"""Tests for the msfvenom payload cache."""
+
+import json
+import os
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from lazyssh.plugins import upload_exec
+from lazyssh.plugins._payload_cache import PayloadCache, cache_key, payload_cache
+from lazyssh.plugins.upload_exec import MsfvenomConfig, generate_cached_payload
+
+PARAMS = {"payload": "linux/x64/shell_reverse_tcp", "lhost": "10.0.0.1", "lport": 4444}
+
+
+def _payload(tmp_path: Path, content: bytes, name: str = "payload.elf") -> Path:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_cache_key_is_canonical() -> None:
+    assert cache_key(PARAMS) == cache_key(dict(reversed(PARAMS.items())))
+    assert cache_key(PARAMS) != cache_key({**PARAMS, "lport": 4445})
+
+
+def test_store_and_fetch(tmp_path: Path) -> None:
+    cache = PayloadCache(tmp_path / "cache", max_bytes=1024)
+    key = cache_key(PARAMS)
+    destination = tmp_path / "out.elf"
+
+    assert not cache.fetch(key, destination)
+    cache.store(key, _payload(tmp_path, b"\x7fELF payload"), PARAMS)
+
+    assert cache.fetch(key, destination)
+    assert destination.read_bytes() == b"\x7fELF payload"
+    assert (tmp_path / "cache").stat().st_mode & 0o777 == 0o700
+    assert (tmp_path / "cache" / f"{key}.bin").stat().st_mode & 0o777 == 0o600
+    record = json.loads((tmp_path / "cache" / f"{key}.json").read_text())
+    assert record["params"] == PARAMS
+    assert record["size"] == 12
+
+
+def test_corrupt_entry_is_dropped(tmp_path: Path) -> None:
+    cache = PayloadCache(tmp_path, max_bytes=1024)
+    key = cache_key(PARAMS)
+    cache.store(key, _payload(tmp_path, b"original", "src.elf"), PARAMS)
+    (tmp_path / f"{key}.bin").write_bytes(b"tampered")
+
+    assert not cache.fetch(key, tmp_path / "out.elf")
+    assert not (tmp_path / f"{key}.bin").exists()
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_lru_eviction(tmp_path: Path) -> None:
+    cache = PayloadCache(tmp_path / "cache", max_bytes=25)
+    keys = [cache_key({**PARAMS, "lport": port}) for port in (1, 2, 3)]
+    cache.store(keys[0], _payload(tmp_path, b"a" * 10), PARAMS)
+    cache.store(keys[1], _payload(tmp_path, b"b" * 10), PARAMS)
+    for index, key in enumerate(keys[:2]):
+        for suffix in (".bin", ".json"):
+            os.utime(tmp_path / "cache" / f"{key}{suffix}", (1000 + index, 1000 + index))
+
+    # Using the older entry makes the other one the least recently used
+    assert cache.fetch(keys[0], tmp_path / "out")
+    cache.store(keys[2], _payload(tmp_path, b"c" * 10), PARAMS)
+
+    assert sorted(path.name for path in (tmp_path / "cache").glob("*.bin")) == sorted(
+        f"{key}.bin" for key in (keys[0], keys[2])
+    )
+    assert PayloadCache(tmp_path / "cache", 0).evict() == 2
+    assert PayloadCache(tmp_path / "missing", 1).evict() == 0
+
+
+def test_payload_cache_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("HOME", str(tmp_path))
+    # Both settings come from the mapping passed in, not os.environ
+    monkeypatch.setenv("LAZYSSH_PAYLOAD_CACHE_MB", "7")
+    cache = payload_cache({"LAZYSSH_PAYLOAD_CACHE_MB": "2"})
+    assert cache is not None
+    assert cache.root == tmp_path / ".lazyssh" / "payloads"
+    assert cache.max_bytes == 2 * 1024 * 1024
+    cache = payload_cache({"LAZYSSH_PAYLOAD_CACHE_MB": "lots"})
+    assert cache is not None
+    assert cache.max_bytes == 256 * 1024 * 1024
+
+    cache = payload_cache({"LAZYSSH_PAYLOAD_CACHE": "~/cache"})
+    assert cache is not None
+    assert cache.root == tmp_path / "cache"
+    assert payload_cache({"LAZYSSH_PAYLOAD_CACHE": "off"}) is None
+
+
+class TestGenerateCachedPayload:
+    """Tests for msfvenom generation through the cache."""
+
+    CONFIG = MsfvenomConfig("linux/x64/shell_reverse_tcp", "10.0.0.1", 4444, "elf")
+
+    def test_repeat_generation_reuses_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("LAZYSSH_PAYLOAD_CACHE", str(tmp_path / "cache"))
+        calls: list[str] = []
+
+        def fake_generate(config: MsfvenomConfig, output_path: str) -> bool:
+            calls.append(output_path)
+            Path(output_path).write_bytes(b"ELF")
+            return True
+
+        monkeypatch.setattr(upload_exec, "generate_msfvenom_payload", fake_generate)
+
+        for name in ("a.elf", "b.elf"):
+            assert generate_cached_payload(self.CONFIG, str(tmp_path / name))
+        assert generate_cached_payload(self.CONFIG, str(tmp_path / "c.elf"), use_cache=False)
+        other = MsfvenomConfig("linux/x64/shell_reverse_tcp", "10.0.0.1", 5555, "elf")
+        assert generate_cached_payload(other, str(tmp_path / "d.elf"))
+
+        assert calls == [str(tmp_path / name) for name in ("a.elf", "c.elf", "d.elf")]
+        assert (tmp_path / "b.elf").read_bytes() == b"ELF"
+
+    def test_failures(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("LAZYSSH_PAYLOAD_CACHE", str(tmp_path / "cache"))
+        with mock.patch.object(upload_exec, "generate_msfvenom_payload", return_value=False):
+            assert not generate_cached_payload(self.CONFIG, str(tmp_path / "a.elf"))
+
+        # Generation succeeded but left nothing to cache
+        with mock.patch.object(upload_exec, "generate_msfvenom_payload", return_value=True):
+            assert generate_cached_payload(self.CONFIG, str(tmp_path / "missing.elf"))
+        assert list((tmp_path / "cache").glob("*.json")) == []
@@ -1,9 +1,10 @@
 import os
 import stat
+import time
 from pathlib import Path
 
 from lazyssh.models import SSHConnection
-from lazyssh.plugin_manager import PluginManager, ensure_runtime_plugins_dir
+from lazyssh.plugin_manager import PluginManager, _StreamDecoder, ensure_runtime_plugins_dir
 
 
 def _write_file(path: Path, content: str) -> None:
@@ -155,6 +156,24 @@ print(os.environ.get("LAZYSSH_USER"))
     assert elapsed >= 0
 
 
+def test_plugin_env_lists_all_connections_for_fleet_plugins(tmp_path: Path) -> None:
+    from lazyssh.plugins._remote import all_targets
+
+    pm = PluginManager(plugins_dir=tmp_path)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="alice", socket_path="/tmp/web1")
+    other = SSHConnection(host="5.6.7.8", port=2222, username="bob", socket_path="/tmp/db1")
+
+    assert "LAZYSSH_CONNECTIONS" not in pm._prepare_plugin_env(conn)
+
+    pm.connections_provider = lambda: [conn, other]
+    targets = all_targets(pm._prepare_plugin_env(conn))
+
+    assert [(t.name, t.host, t.user, t.port) for t in targets] == [
+        ("web1", "1.2.3.4", "alice", "22"),
+        ("db1", "5.6.7.8", "bob", "2222"),
+    ]
+
+
 def test_env_dirs_precedence_over_user_and_packaged(tmp_path: Path, monkeypatch) -> None:
     # Create two env dirs A and B, and an empty packaged dir to avoid interference
     env_a = tmp_path / "envA"
@@ -1642,3 +1661,440 @@ echo "shell no attr"
 
     stdout_content = "".join(c[1] for c in chunks if c[0] == "stdout")
     assert "shell no attr" in stdout_content
+
+
+_INPROCESS_PLUGIN = """#!/usr/bin/env python3
+# PLUGIN_NAME: inproc
+# PLUGIN_INPROCESS: true
+import os
+import sys
+
+
+def main(context):
+    context.stdout.write(f"host={context.env['LAZYSSH_HOST']} pid={os.getpid()}\\n")
+    context.stdout.write(f"args={' '.join(context.args)}\\n")
+    if "--fail" in context.args:
+        context.stderr.write("failing\\n")
+        return 3
+    if "--exit" in context.args:
+        sys.exit(4)
+    if "--boom" in context.args:
+        raise RuntimeError("boom")
+    return 0
+
+
+if __name__ == "__main__":
+    print(f"subprocess pid={os.getpid()}")
+"""
+
+
+def test_inprocess_metadata_requires_python(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(plugins_dir / "inproc.py", _INPROCESS_PLUGIN)
+    _write_file(
+        plugins_dir / "shellinproc.sh",
+        "#!/bin/bash\n# PLUGIN_NAME: shellinproc\n# PLUGIN_INPROCESS: true\necho hi\n",
+    )
+
+    plugins = PluginManager(plugins_dir=plugins_dir).discover_plugins(force_refresh=True)
+
+    assert plugins["inproc"].in_process is True
+    assert plugins["shellinproc"].in_process is False
+
+
+def test_trusted_inprocess_plugin_runs_in_current_process(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(plugins_dir / "inproc.py", _INPROCESS_PLUGIN)
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    success, output, _ = pm.execute_plugin("inproc", conn, args=["a", "b"])
+
+    assert success is True
+    assert f"pid={os.getpid()}" in output
+    assert "host=1.2.3.4" in output
+    assert "args=a b" in output
+    assert "LAZYSSH_HOST" not in os.environ
+
+
+def test_inprocess_plugin_failures_map_to_exit_codes(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(plugins_dir / "inproc.py", _INPROCESS_PLUGIN)
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    success, output, _ = pm.execute_plugin("inproc", conn, args=["--fail"])
+    assert success is False
+    assert "failing" in output
+
+    success, _, _ = pm.execute_plugin("inproc", conn, args=["--exit"])
+    assert success is False
+
+    success, output, _ = pm.execute_plugin("inproc", conn, args=["--boom"])
+    assert success is False
+    assert "RuntimeError: boom" in output
+
+
+def test_untrusted_inprocess_plugin_falls_back_to_subprocess(tmp_path: Path, monkeypatch) -> None:
+    env_dir = tmp_path / "user"
+    pkg_dir = tmp_path / "pkg"
+    env_dir.mkdir()
+    pkg_dir.mkdir()
+    _write_file(env_dir / "inproc.py", _INPROCESS_PLUGIN)
+    monkeypatch.setenv("LAZYSSH_PLUGIN_DIRS", str(env_dir))
+    monkeypatch.delenv("LAZYSSH_TRUSTED_PLUGINS", raising=False)
+
+    pm = PluginManager(plugins_dir=pkg_dir)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    success, output, _ = pm.execute_plugin("inproc", conn)
+    assert success is True
+    assert "subprocess pid=" in output
+    assert f"pid={os.getpid()}" not in output
+
+    # Trust is granted by file path; the plugin name alone is not enough
+    monkeypatch.setenv("LAZYSSH_TRUSTED_PLUGINS", "other,inproc")
+    success, output, _ = pm.execute_plugin("inproc", conn)
+    assert success is True
+    assert f"pid={os.getpid()}" not in output
+
+    monkeypatch.setenv("LAZYSSH_TRUSTED_PLUGINS", f"/elsewhere/other.py:{env_dir / 'inproc.py'}")
+    success, output, _ = pm.execute_plugin("inproc", conn)
+    assert success is True
+    assert f"pid={os.getpid()}" in output
+
+
+def test_inprocess_entry_point_is_cached_until_modified(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    plugin_path = plugins_dir / "inproc.py"
+    _write_file(plugin_path, _INPROCESS_PLUGIN)
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    plugin = pm.get_plugin("inproc")
+    assert plugin is not None
+
+    first = pm._load_entry_point(plugin)
+    assert pm._load_entry_point(plugin) is first
+
+    stat_result = plugin_path.stat()
+    os.utime(plugin_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000))
+    reloaded = pm._load_entry_point(plugin)
+    assert reloaded is not first
+    assert len(pm._entry_cache) == 1
+
+
+def test_inprocess_plugin_without_main_reports_error(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "nomain.py",
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: nomain\n# PLUGIN_INPROCESS: yes\nVALUE = 1\n",
+    )
+    _write_file(
+        plugins_dir / "broken.py",
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: broken\n# PLUGIN_INPROCESS: 1\nraise ValueError\n",
+    )
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    success, output, _ = pm.execute_plugin("nomain", conn)
+    assert success is False
+    assert "main(context)" in output
+
+    chunks = list(pm.execute_plugin_streaming("broken", conn))
+    assert chunks[0][0] == "stderr"
+    assert "Failed to import" in chunks[0][1]
+
+
+def test_inprocess_plugin_streaming_yields_and_calls_back(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(plugins_dir / "inproc.py", _INPROCESS_PLUGIN)
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    chunks = list(pm.execute_plugin_streaming("inproc", conn, args=["--fail"]))
+    assert ("stderr", "failing\n") in chunks
+    assert any("host=1.2.3.4" in data for kind, data in chunks if kind == "stdout")
+
+    received: list[tuple[str, str]] = []
+    assert list(pm.execute_plugin_streaming("inproc", conn, on_chunk=received.append)) == []
+    assert any("args=" in data for _, data in received)
+
+
+def test_inprocess_plugin_timeout(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "slow.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: slow
+# PLUGIN_INPROCESS: true
+import time
+
+
+def main(context):
+    time.sleep(0.5)
+""",
+    )
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    plugin = pm.get_plugin("slow")
+    assert plugin is not None
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+    success, output, _ = pm._execute_in_process(plugin, conn, None, timeout=0)
+    assert success is False
+    assert "timed out" in output
+
+    chunks = list(pm.execute_plugin_streaming("slow", conn, timeout=0))
+    assert chunks == [("stderr", "Plugin 'slow' timed out after 0 seconds\n")]
+    received: list[tuple[str, str]] = []
+    list(pm.execute_plugin_streaming("slow", conn, timeout=0, on_chunk=received.append))
+    assert received
+    assert "timed out" in received[0][1]
+
+
+def _conn() -> SSHConnection:
+    return SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+
+def test_streaming_chunked_emits_partial_lines_immediately(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "partial.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: partial
+import sys
+import time
+sys.stdout.write("no newline yet")
+sys.stdout.flush()
+time.sleep(20)
+""",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+
+    start = time.monotonic()
+    stream = pm.execute_plugin_streaming("partial", _conn(), chunked=True)
+    assert next(stream) == ("stdout", "no newline yet")
+    assert time.monotonic() - start < 10
+    # Closing the generator early kills the plugin instead of leaking it
+    stream.close()
+
+
+def test_execute_plugin_handles_binary_and_large_output(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "noisy.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: noisy
+import sys
+sys.stdout.buffer.write(b"bad \\xff\\xfe bytes\\r\\n")
+sys.stdout.buffer.write(b"x" * 3_000_000)
+sys.stdout.buffer.write("\\ncaf\\u00e9\\n".encode())
+""",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+
+    success, output, _ = pm.execute_plugin("noisy", _conn())
+
+    assert success is True
+    assert output.startswith("bad �� bytes\n")
+    assert output.count("x") == 3_000_000
+    assert output.endswith("\ncafé\n")
+
+
+def test_streaming_flush_interval_coalesces_output(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "chatty.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: chatty
+for i in range(500):
+    print(i, flush=True)
+""",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+
+    chunks = list(pm.execute_plugin_streaming("chatty", _conn(), flush_interval=5))
+
+    stdout = "".join(data for kind, data in chunks if kind == "stdout")
+    assert stdout == "".join(f"{i}\n" for i in range(500))
+    assert len(chunks) < 50
+
+
+def test_inprocess_streaming_honors_chunked_and_flush_interval(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "chatty.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: chatty
+# PLUGIN_INPROCESS: true
+
+
+def main(context):
+    context.stdout.write("progress ")
+    for i in range(500):
+        context.stdout.write(f"{i}")
+        context.stdout.write("\\n")
+    context.stdout.write("tail")
+""",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+    expected = "progress " + "".join(f"{i}\n" for i in range(500)) + "tail"
+
+    # Line mode frames separate writes into whole lines
+    lines = list(pm.execute_plugin_streaming("chatty", _conn()))
+    assert lines[0] == ("stdout", "progress 0\n")
+    assert lines[-1] == ("stdout", "tail")
+    assert "".join(data for _, data in lines) == expected
+
+    # Chunked mode passes writes through as they happen
+    received: list[tuple[str, str]] = []
+    list(pm.execute_plugin_streaming("chatty", _conn(), chunked=True, on_chunk=received.append))
+    assert received[0] == ("stdout", "progress ")
+    assert "".join(data for _, data in received) == expected
+
+    coalesced = list(pm.execute_plugin_streaming("chatty", _conn(), chunked=True, flush_interval=5))
+    assert "".join(data for _, data in coalesced) == expected
+    assert len(coalesced) < 50
+
+
+def test_streaming_timeout_kills_plugin(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "sleepy.sh",
+        "#!/bin/bash\n# PLUGIN_NAME: sleepy\necho started\nexec sleep 20\n",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+
+    chunks = list(pm.execute_plugin_streaming("sleepy", _conn(), timeout=1))
+
+    assert chunks[0] == ("stdout", "started\n")
+    assert chunks[-1] == ("stderr", "Plugin 'sleepy' timed out after 1 seconds\n")
+
+
+def test_live_run_timeout(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "patient.py",
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: patient\n# PLUGIN_NO_TIMEOUT: true\n"
+        "import time\ntime.sleep(0.3)\nprint('done')\n",
+    )
+    _write_file(
+        plugins_dir / "patient_inproc.py",
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: patient-inproc\n# PLUGIN_INPROCESS: true\n"
+        "import time\n\ndef main(context):\n    time.sleep(0.3)\n"
+        "    context.stdout.write('done\\n')\n",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+    plugins = pm.discover_plugins()
+    assert (plugins["patient"].no_timeout, plugins["patient-inproc"].no_timeout) == (True, False)
+
+    for name in ("patient", "patient-inproc"):
+        received: list[tuple[str, str]] = []
+        success, output, _ = pm.execute_plugin_live(
+            name, _conn(), on_chunk=received.append, timeout=0
+        )
+        assert success is False
+        assert "timed out" in output
+
+        received = []
+        success, output, elapsed = pm.execute_plugin_live(
+            name, _conn(), on_chunk=received.append, timeout=None
+        )
+
+        assert success is True
+        assert output == "done\n"
+        assert received == [("stdout", "done\n")]
+        assert elapsed >= 0.3
+        assert list(pm.execute_plugin_streaming(name, _conn(), timeout=None)) == received
+
+    success, output, _ = pm.execute_plugin_live("missing", _conn(), on_chunk=received.append)
+    assert success is False
+    assert "not found" in output
+
+
+def test_execute_plugin_returns_when_background_child_holds_pipe(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "daemon.sh",
+        "#!/bin/bash\n# PLUGIN_NAME: daemon\necho parent done\nsleep 5 &\n",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+
+    start = time.monotonic()
+    success, output, _ = pm.execute_plugin("daemon", _conn())
+
+    assert success is True
+    assert output == "parent done\n"
+    assert time.monotonic() - start < 4
+
+
+def test_stream_decoder_bounds_partial_lines() -> None:
+    decoder = _StreamDecoder("stdout", lines=True, max_buffer=8)
+
+    decoder.feed(b"abc")
+    assert decoder.ready == []
+    decoder.feed(b"defghij\nkl\r")
+    assert decoder.take(coalesce=False) == ["abcdefghij\n"]
+    decoder.feed(b"\nmn\xc3")
+    assert decoder.take(coalesce=True) == ["kl\n"]
+    decoder.feed(b"\xa9", final=True)
+    assert decoder.take(coalesce=False) == ["mné"]
+
+    decoder.feed(b"0123456789")
+    assert decoder.take(coalesce=False) == ["0123456789"]
+
+
+def test_streaming_interrupt_lets_plugin_clean_up(tmp_path: Path) -> None:
+    import signal
+    import threading
+
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_file(
+        plugins_dir / "cancellable.py",
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: cancellable\n"
+        "import os, sys, time\n"
+        "try:\n"
+        "    print(os.getpid(), flush=True)\n"
+        "    time.sleep(30)\n"
+        "except KeyboardInterrupt:\n"
+        "    time.sleep(0.2)\n"
+        "    print('cleaned up', flush=True)\n"
+        "    sys.exit(130)\n",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+    chunks: list[tuple[str, str]] = []
+    interrupted = False
+
+    try:
+        for chunk in pm.execute_plugin_streaming("cancellable", _conn()):
+            chunks.append(chunk)
+            if len(chunks) == 1:
+                # What a terminal Ctrl-C does: SIGINT to the plugin and to lazyssh
+                os.kill(int(chunk[1]), signal.SIGINT)
+                threading.Timer(0.05, os.kill, (os.getpid(), signal.SIGINT)).start()
+    except KeyboardInterrupt:
+        interrupted = True
+
+    assert interrupted
+    assert chunks[-1] == ("stdout", "cleaned up\n")
+    assert pm.last_metrics is not None
+    assert pm.last_metrics.returncode == 130
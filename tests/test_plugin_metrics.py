@@ -0,0 +1,222 @@
+import json
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+import lazyssh
+from lazyssh.models import SSHConnection
+from lazyssh.plugin_manager import PluginManager
+from lazyssh.plugin_metrics import (
+    METRICS_FILE_ENV,
+    PluginRunMetrics,
+    append_history,
+    count_remote_commands,
+    history_path,
+    load_history,
+    percentile,
+    record_remote_command,
+    summarize,
+)
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path: Path, monkeypatch) -> Path:
+    template = str(tmp_path / "logs" / "{connection_name}")
+    monkeypatch.setattr("lazyssh.plugin_metrics.CONNECTION_LOG_DIR_TEMPLATE", template)
+    monkeypatch.setattr("lazyssh.plugin_manager.CONNECTION_LOG_DIR_TEMPLATE", template)
+    return tmp_path / "logs"
+
+
+@pytest.fixture(autouse=True)
+def _importable_lazyssh(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Plugin subprocesses import lazyssh.plugin_metrics; point them at the tree under test
+    src_dir = str(Path(lazyssh.__file__).resolve().parent.parent)
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([src_dir, os.environ.get("PYTHONPATH", "")]))
+
+
+def _run(plugin: str, wall: float, **kwargs) -> PluginRunMetrics:
+    return PluginRunMetrics(plugin=plugin, connection="c", started_at=0.0, wall_time=wall, **kwargs)
+
+
+def test_percentile_nearest_rank() -> None:
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0], 95) == 3.0
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile([5.0, 1.0, 3.0], 50) == 3.0
+
+
+def test_summarize_groups_and_orders_by_p95() -> None:
+    runs = [
+        _run("fast", 0.1, user_cpu=0.05, returncode=0),
+        _run("fast", 0.2, user_cpu=0.1, returncode=0),
+        _run("slow", 5.0, remote_commands=3, returncode=1, peak_rss_kb=100),
+        _run("slow", 9.0, remote_commands=5, returncode=0, peak_rss_kb=300),
+    ]
+
+    stats = summarize(runs)
+
+    assert [s.plugin for s in stats] == ["slow", "fast"]
+    slow = stats[0]
+    assert slow.runs == 2
+    assert slow.failures == 1
+    assert slow.wall_p50 == 5.0
+    assert slow.wall_p95 == 9.0
+    assert slow.remote_p95 == 5.0
+    assert slow.peak_rss_kb == 300
+    assert stats[1].cpu_p95 == pytest.approx(0.1)
+
+
+def test_history_round_trip_skips_bad_lines(log_dir: Path) -> None:
+    assert load_history("c") == []
+    append_history(_run("a", 1.0, returncode=0))
+    with history_path("c").open("a", encoding="utf-8") as handle:
+        handle.write("not json\n")
+        handle.write(json.dumps({"plugin": "b", "connection": "c", "started_at": 1, "x": 1}) + "\n")
+
+    runs = load_history("c")
+
+    assert history_path("c") == log_dir / "c" / "plugin_history.jsonl"
+    assert [r.plugin for r in runs] == ["a", "b"]
+    assert runs[0].wall_time == 1.0
+
+
+def test_append_history_failure_is_not_raised(tmp_path: Path, monkeypatch) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("x", encoding="utf-8")
+    monkeypatch.setattr(
+        "lazyssh.plugin_metrics.CONNECTION_LOG_DIR_TEMPLATE", str(blocker / "{connection_name}")
+    )
+    append_history(_run("a", 1.0))
+
+
+def test_record_and_count_remote_commands(tmp_path: Path, monkeypatch) -> None:
+    counter = tmp_path / "counter"
+    monkeypatch.delenv(METRICS_FILE_ENV, raising=False)
+    record_remote_command()  # no-op outside a plugin run
+    assert count_remote_commands(counter) == 0
+
+    monkeypatch.setenv(METRICS_FILE_ENV, str(counter))
+    record_remote_command()
+    record_remote_command(2)
+    record_remote_command(env={METRICS_FILE_ENV: str(counter)})
+    record_remote_command(env={METRICS_FILE_ENV: str(tmp_path / "missing" / "x")})
+
+    assert count_remote_commands(counter) == 4
+
+
+def _write_plugin(plugins_dir: Path, name: str, content: str) -> None:
+    path = plugins_dir / name
+    path.write_text(content, encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+
+
+_BUSY_PLUGIN = """#!/usr/bin/env python3
+# PLUGIN_NAME: busy
+import sys
+import time
+
+from lazyssh.plugin_metrics import record_remote_command
+
+end = time.process_time() + 0.05
+while time.process_time() < end:
+    pass
+record_remote_command()
+record_remote_command()
+print("done")
+print("oops", file=sys.stderr)
+"""
+
+
+def test_execute_plugin_records_metrics(tmp_path: Path, log_dir: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_plugin(plugins_dir, "busy.py", _BUSY_PLUGIN)
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="h", port=22, username="u", socket_path="/tmp/metricsconn")
+
+    success, _, _ = pm.execute_plugin("busy", conn)
+
+    assert success is True
+    metrics = pm.last_metrics
+    assert metrics is not None
+    assert metrics.plugin == "busy"
+    assert metrics.connection == "metricsconn"
+    assert metrics.mode == "subprocess"
+    assert metrics.returncode == 0
+    assert metrics.remote_commands == 2
+    assert metrics.stdout_bytes == len("done\n")
+    assert metrics.stderr_bytes == len("oops\n")
+    assert metrics.user_cpu + metrics.system_cpu >= 0.04
+    assert metrics.peak_rss_kb > 0
+    assert metrics.wall_time > 0
+    assert [r.plugin for r in load_history("metricsconn")] == ["busy"]
+
+
+def test_streaming_and_in_process_runs_record_metrics(tmp_path: Path) -> None:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_plugin(plugins_dir, "busy.py", _BUSY_PLUGIN)
+    _write_plugin(
+        plugins_dir,
+        "inproc.py",
+        """#!/usr/bin/env python3
+# PLUGIN_NAME: inproc
+# PLUGIN_INPROCESS: true
+from lazyssh.plugin_metrics import record_remote_command
+
+
+def main(context):
+    record_remote_command(3, env=context.env)
+    context.stdout.write("héllo\\n")
+""",
+    )
+    pm = PluginManager(plugins_dir=plugins_dir)
+    conn = SSHConnection(host="h", port=22, username="u", socket_path="/tmp/metricsconn")
+
+    list(pm.execute_plugin_streaming("busy", conn))
+    assert pm.last_metrics is not None
+    assert pm.last_metrics.remote_commands == 2
+    assert pm.last_metrics.stdout_bytes == 5
+
+    pm.execute_plugin("inproc", conn)
+    assert pm.last_metrics.mode == "in-process"
+    assert pm.last_metrics.remote_commands == 3
+    assert pm.last_metrics.stdout_bytes == len("héllo\n".encode())
+
+    list(pm.execute_plugin_streaming("inproc", conn))
+    assert pm.last_metrics.mode == "in-process"
+    assert pm.last_metrics.returncode == 0
+
+    assert [r.plugin for r in load_history("metricsconn")] == ["busy", "inproc", "inproc"]
+
+
+def test_accounted_popen_wait_timeout_and_kill() -> None:
+    import signal
+    import subprocess
+    import sys
+
+    from lazyssh.plugin_manager import _AccountedPopen
+
+    process = _AccountedPopen(
+        subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    )
+    try:
+        with pytest.raises(subprocess.TimeoutExpired):
+            process.wait(timeout=0.05)
+        process.kill()
+        assert process.wait() == -signal.SIGKILL
+        assert process.returncode == -signal.SIGKILL
+        assert process.rusage is not None
+    finally:
+        assert process.stdout is not None
+        assert process.stderr is not None
+        process.stdout.close()
+        process.stderr.close()
@@ -0,0 +1,139 @@
+import stat
+from pathlib import Path
+
+import pytest
+
+from lazyssh.models import SSHConnection
+from lazyssh.plugin_manager import PluginManager
+from lazyssh.plugin_output import (
+    DEFAULT_CAPTURE_LIMIT,
+    OutputCapture,
+    PluginOutput,
+    capture_limit_from_env,
+)
+
+
+def test_small_output_stays_in_memory(tmp_path: Path) -> None:
+    capture = OutputCapture(tmp_path / "logs", "demo", limit=1024)
+    capture.append("stdout", "hello\n")
+    capture.append("stderr", "warn\n")
+    capture.append("stdout", "world\n")
+
+    output = capture.result()
+
+    assert output == "hello\nworld\n\nwarn\n"
+    assert output.truncated is False
+    assert output.log_path is None
+    assert output.total_chars == len(output)
+    assert not (tmp_path / "logs").exists()
+
+
+def test_large_output_spills_and_keeps_head_and_tail(tmp_path: Path) -> None:
+    log_dir = tmp_path / "logs"
+    capture = OutputCapture(log_dir, "big/one", limit=1024, preview_chars=100)
+    lines = [f"line {i:05d}\n" for i in range(2000)]
+    for line in lines:
+        capture.append("stdout", line)
+    capture.append("stderr", "problem\n")
+
+    output = capture.result()
+    full = "".join(lines) + "\nproblem\n"
+
+    assert output.truncated is True
+    assert output.log_path is not None
+    assert output.log_path.parent == log_dir
+    assert output.log_path.name.startswith("plugin_big_one_")
+    assert output.log_path.read_text(encoding="utf-8") == full
+    assert stat.S_IMODE(output.log_path.stat().st_mode) == 0o600
+    assert output.total_chars == len(full)
+    # Only the preview is held in memory
+    assert len(output) < 400
+    assert output.startswith("line 00000\n")
+    assert "characters truncated" in output
+    assert output.endswith("line 01999\n\nproblem\n")
+    # Spill temp files are cleaned up
+    assert [p.name for p in log_dir.iterdir()] == [output.log_path.name]
+
+
+def test_plugin_output_page_and_search(tmp_path: Path) -> None:
+    capture = OutputCapture(tmp_path, "pager", limit=1024, preview_chars=50)
+    for i in range(500):
+        capture.append("stdout", f"row {i}\n")
+    output = capture.result()
+
+    assert output.page(10, 3) == ["row 10", "row 11", "row 12"]
+    assert output.search("row 49", max_results=2) == [(50, "row 49"), (491, "row 490")]
+    assert output.search(r"^row 4\d\d$", regex=True)[0] == (401, "row 400")
+
+    in_memory = PluginOutput("a\nb\nc\n")
+    assert in_memory.page(1, 5) == ["b", "c"]
+    assert in_memory.search("c") == [(3, "c")]
+
+
+def test_stdout_spills_straight_into_the_log(tmp_path: Path) -> None:
+    capture = OutputCapture(tmp_path, "direct", limit=1024)
+    capture.append("stdout", "x" * 2048)
+    capture.append("stdout", "tail\n")
+
+    # The log is written while the run is still going; result() only closes it
+    (log_path,) = tmp_path.glob("plugin_direct_*.log")
+    output = capture.result()
+
+    assert output.log_path == log_path
+    assert log_path.read_text(encoding="utf-8") == "x" * 2048 + "tail\n"
+    assert [p.name for p in tmp_path.iterdir()] == [log_path.name]
+
+
+def test_discard_removes_spill_files(tmp_path: Path) -> None:
+    capture = OutputCapture(tmp_path, "gone", limit=1024)
+    capture.append("stdout", "x" * 2048)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    capture.discard()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_capture_limit_from_env(monkeypatch) -> None:
+    monkeypatch.delenv("LAZYSSH_PLUGIN_CAPTURE_LIMIT", raising=False)
+    assert capture_limit_from_env() == DEFAULT_CAPTURE_LIMIT
+    monkeypatch.setenv("LAZYSSH_PLUGIN_CAPTURE_LIMIT", "4096")
+    assert capture_limit_from_env() == 4096
+    monkeypatch.setenv("LAZYSSH_PLUGIN_CAPTURE_LIMIT", "1")
+    assert capture_limit_from_env() == 1024
+
+
+@pytest.mark.parametrize("in_process", [False, True])
+def test_execute_plugin_spills_large_output(tmp_path: Path, monkeypatch, in_process) -> None:
+    monkeypatch.setattr(
+        "lazyssh.plugin_manager.CONNECTION_LOG_DIR_TEMPLATE", str(tmp_path / "{connection_name}")
+    )
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    body = (
+        "def main(context):\n    context.stdout.write('y' * 50000 + '\\nend\\n')\n"
+        if in_process
+        else "print('y' * 50000)\nprint('end')\n"
+    )
+    plugin = plugins_dir / "flood.py"
+    plugin.write_text(
+        "#!/usr/bin/env python3\n# PLUGIN_NAME: flood\n"
+        f"# PLUGIN_INPROCESS: {'true' if in_process else 'false'}\n{body}",
+        encoding="utf-8",
+    )
+    plugin.chmod(plugin.stat().st_mode | stat.S_IXUSR)
+
+    pm = PluginManager(plugins_dir=plugins_dir)
+    pm.capture_limit = 4096
+    conn = SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/floodconn")
+
+    success, output, _ = pm.execute_plugin("flood", conn)
+
+    assert success is True
+    assert isinstance(output, PluginOutput)
+    assert output.truncated is True
+    assert output.log_path is not None
+    assert output.log_path.parent == tmp_path / "floodconn"
+    assert output.log_path.read_text(encoding="utf-8") == "y" * 50000 + "\nend\n"
+    assert output.endswith("end\n")
+    assert len(output) < 50000
@@ -0,0 +1,198 @@
+import os
+import signal
+import stat
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from lazyssh.models import SSHConnection
+from lazyssh.plugin_manager import PluginManager
+from lazyssh.plugin_zygote import PluginZygote, zygote_enabled, zygote_supported
+
+pytestmark = pytest.mark.skipif(not zygote_supported(), reason="zygote requires fork")
+
+_PLUGIN = """#!/usr/bin/env python3
+# PLUGIN_NAME: probe
+import os
+import sys
+
+print(f"host={os.environ['LAZYSSH_HOST']} ppid={os.getppid()} argv={sys.argv[1:]}")
+print("to stderr", file=sys.stderr)
+if "--fail" in sys.argv:
+    sys.exit(3)
+if "--raise" in sys.argv:
+    raise RuntimeError("exploded")
+"""
+
+
+def _write_plugin(plugins_dir: Path, name: str, content: str) -> Path:
+    path = plugins_dir / name
+    path.write_text(content, encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+@pytest.fixture
+def conn() -> SSHConnection:
+    return SSHConnection(host="1.2.3.4", port=22, username="test", socket_path="/tmp/test")
+
+
+@pytest.fixture
+def zygote_manager(tmp_path: Path, monkeypatch) -> Iterator[PluginManager]:
+    plugins_dir = tmp_path / "plugins"
+    plugins_dir.mkdir()
+    _write_plugin(plugins_dir, "probe.py", _PLUGIN)
+    monkeypatch.setenv("LAZYSSH_PLUGIN_ZYGOTE", "true")
+    pm = PluginManager(plugins_dir=plugins_dir)
+    yield pm
+    pm.close()
+
+
+def test_zygote_enabled_reads_env(monkeypatch) -> None:
+    monkeypatch.delenv("LAZYSSH_PLUGIN_ZYGOTE", raising=False)
+    assert zygote_enabled() is False
+    monkeypatch.setenv("LAZYSSH_PLUGIN_ZYGOTE", "yes")
+    assert zygote_enabled() is True
+    monkeypatch.setattr("lazyssh.plugin_zygote.zygote_supported", lambda: False)
+    assert zygote_enabled() is False
+
+
+def test_manager_without_zygote_by_default(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("LAZYSSH_PLUGIN_ZYGOTE", raising=False)
+    assert PluginManager(plugins_dir=tmp_path)._zygote is None
+
+
+def test_zygote_runs_plugin_with_env_and_streams(zygote_manager: PluginManager, conn) -> None:
+    assert zygote_manager._zygote is not None
+
+    success, output, _ = zygote_manager.execute_plugin("probe", conn, args=["x"])
+
+    assert success is True
+    assert "host=1.2.3.4" in output
+    assert "argv=['x']" in output
+    assert "\nto stderr" in output
+    # Forked by the zygote's runner rather than by this process
+    assert f"ppid={os.getpid()} " not in output
+    assert zygote_manager._zygote.running is True
+
+    chunks = list(zygote_manager.execute_plugin_streaming("probe", conn))
+    assert ("stderr", "to stderr\n") in chunks
+    assert any(kind == "stdout" and "host=1.2.3.4" in data for kind, data in chunks)
+
+
+def test_zygote_preserves_exit_codes_and_tracebacks(zygote_manager: PluginManager, conn) -> None:
+    success, output, _ = zygote_manager.execute_plugin("probe", conn, args=["--fail"])
+    assert success is False
+    assert "to stderr" in output
+
+    success, output, _ = zygote_manager.execute_plugin("probe", conn, args=["--raise"])
+    assert success is False
+    assert "RuntimeError: exploded" in output
+
+
+def test_zygote_reports_syntax_errors(zygote_manager: PluginManager, conn) -> None:
+    _write_plugin(zygote_manager.plugins_dir, "broken.py", "#!/usr/bin/env python3\ndef broken(:\n")
+    zygote_manager.discover_plugins(force_refresh=True)
+
+    success, output, _ = zygote_manager.execute_plugin("broken", conn)
+
+    assert success is False
+    assert "SyntaxError" in output
+
+
+def test_zygote_restarts_after_dying(zygote_manager: PluginManager, conn) -> None:
+    zygote = zygote_manager._zygote
+    assert zygote is not None
+    assert zygote._process is not None
+    zygote._process.kill()
+    zygote._process.wait()
+
+    success, output, _ = zygote_manager.execute_plugin("probe", conn)
+
+    assert success is True
+    assert "host=1.2.3.4" in output
+    assert zygote.running is True
+
+
+def test_zygote_spawn_failure_falls_back_to_subprocess(
+    zygote_manager: PluginManager, conn, monkeypatch
+) -> None:
+    assert zygote_manager._zygote is not None
+
+    def broken_spawn(*_args, **_kwargs):
+        raise OSError("zygote gone")
+
+    monkeypatch.setattr(zygote_manager._zygote, "spawn", broken_spawn)
+
+    success, output, _ = zygote_manager.execute_plugin("probe", conn)
+
+    assert success is True
+    assert f"ppid={os.getpid()} " in output
+
+
+def test_zygote_start_failure_disables_zygote(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LAZYSSH_PLUGIN_ZYGOTE", "true")
+
+    def broken_start(self) -> None:
+        raise OSError("no fork for you")
+
+    monkeypatch.setattr(PluginZygote, "start", broken_start)
+
+    assert PluginManager(plugins_dir=tmp_path)._zygote is None
+
+
+def test_zygote_process_wait_timeout_and_kill(tmp_path: Path) -> None:
+    script = _write_plugin(tmp_path, "sleeper.py", "import time\ntime.sleep(30)\n")
+    zygote = PluginZygote()
+    try:
+        process = zygote.spawn(str(script), [], dict(os.environ))
+        assert process.poll() is None
+        with pytest.raises(subprocess.TimeoutExpired):
+            process.wait(timeout=0.05)
+
+        process.kill()
+        assert process.wait(timeout=10) == -signal.SIGKILL
+        assert process.poll() == -signal.SIGKILL
+        process.kill()  # already reaped: no-op
+
+        assert process.stdout is not None
+        assert process.stderr is not None
+        assert process.stdout.read() == b""
+        process.stdout.close()
+        process.stderr.close()
+    finally:
+        zygote.close()
+    assert zygote.running is False
+
+
+def test_zygote_uses_current_interpreter(tmp_path: Path) -> None:
+    script = _write_plugin(tmp_path, "exe.py", "import sys\nprint(sys.executable)\n")
+    zygote = PluginZygote()
+    try:
+        process = zygote.spawn(str(script), [], dict(os.environ))
+        assert process.wait(timeout=30) == 0
+        assert process.stdout is not None
+        assert process.stderr is not None
+        assert process.stdout.read().decode().strip() == sys.executable
+        process.stdout.close()
+        process.stderr.close()
+    finally:
+        zygote.close()
+
+
+def test_zygote_runs_report_metrics(zygote_manager: PluginManager, conn, monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "lazyssh.plugin_metrics.CONNECTION_LOG_DIR_TEMPLATE", str(tmp_path / "{connection_name}")
+    )
+
+    zygote_manager.execute_plugin("probe", conn, args=["--fail"])
+
+    metrics = zygote_manager.last_metrics
+    assert metrics is not None
+    assert metrics.mode == "zygote"
+    assert metrics.returncode == 3
+    assert metrics.stderr_bytes == len("to stderr\n")
+    assert metrics.peak_rss_kb > 0
@@ -0,0 +1,57 @@
+"""Tests for upload deduplication by content hash."""
+
+import hashlib
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from lazyssh.remote_hash import (
+    DEDUP_MIN_SIZE,
+    local_sha256,
+    parse_remote_sha256,
+    remote_sha256_command,
+    should_check,
+)
+
+
+def _run(command: str, path: str = "/usr/bin:/bin") -> str:
+    return subprocess.run(  # noqa: S603  # fixed local shell
+        ["/bin/sh", "-c", command],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PATH": path},
+    ).stdout
+
+
+def test_remote_command_matches_local_digest(tmp_path: Path) -> None:
+    target = tmp_path / "tool with 'quotes'.bin"
+    target.write_bytes(b"payload" * 100)
+    expected = hashlib.sha256(target.read_bytes()).hexdigest()
+
+    assert local_sha256(target) == expected
+    assert parse_remote_sha256(_run(remote_sha256_command(str(target)))) == expected
+    # Missing destinations and hosts without any hashing tool print nothing
+    assert _run(remote_sha256_command(str(tmp_path / "missing"))) == ""
+    assert _run(remote_sha256_command(str(target)), path=str(tmp_path)) == ""
+
+
+def test_parse_remote_sha256() -> None:
+    digest = "AB" * 32
+    assert parse_remote_sha256(f"{digest}  /tmp/x\n") == digest.lower()
+    assert parse_remote_sha256(f"{digest} */tmp/x\n") == digest.lower()
+    assert parse_remote_sha256("") is None
+    assert parse_remote_sha256("sha256sum: /tmp/x: Permission denied") is None
+
+
+def test_should_check(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    small, large = tmp_path / "small", tmp_path / "large"
+    small.write_bytes(b"x")
+    large.write_bytes(b"x" * DEDUP_MIN_SIZE)
+
+    assert should_check(large)
+    assert not should_check(small)
+    assert not should_check(tmp_path / "missing")
+    monkeypatch.setenv("LAZYSSH_UPLOAD_DEDUP", "false")
+    assert not should_check(large)
@@ -1152,6 +1152,39 @@ class TestSCPModeFileTransfers:
                 with mock.patch("lazyssh.scp_mode.update_transfer_stats"):
                     connected_scp_mode.cmd_put([str(test_file), "/remote/path/file.txt"])
 
+    def test_cmd_put_skips_identical_remote_copy(
+        self, connected_scp_mode: SCPMode, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test upload is skipped when the destination already has the same content."""
+        import hashlib
+        from unittest import mock
+
+        test_file = tmp_path / "tool.bin"
+        test_file.write_bytes(b"\x7fELF" * 20000)
+        digest = hashlib.sha256(test_file.read_bytes()).hexdigest()
+        monkeypatch.setattr(connected_scp_mode, "check_connection", lambda: True)
+
+        hash_result = mock.Mock(returncode=0, stdout=f"{digest}  /home/user/tool.bin\n")
+        with mock.patch("subprocess.run", return_value=hash_result) as mock_run:
+            with mock.patch("subprocess.Popen") as mock_popen:
+                connected_scp_mode.cmd_put([str(test_file)])
+        mock_popen.assert_not_called()
+        assert "sha256sum" in mock_run.call_args[0][0][-1]
+        assert "/home/user/tool.bin" in mock_run.call_args[0][0][-1]
+
+        # Without a matching digest the file is uploaded
+        mock_process = mock.Mock()
+        mock_process.poll.return_value = 0
+        mock_process.wait.return_value = 0
+        mock_process.stderr.read.return_value = ""
+        for result in (mock.Mock(returncode=0, stdout=""), mock.Mock(returncode=255)):
+            with mock.patch("subprocess.run", return_value=result):
+                with mock.patch("subprocess.Popen", return_value=mock_process) as mock_popen:
+                    with mock.patch("lazyssh.scp_mode.log_file_transfer"):
+                        with mock.patch("lazyssh.scp_mode.update_transfer_stats"):
+                            connected_scp_mode.cmd_put([str(test_file)])
+            mock_popen.assert_called_once()
+
     def test_cmd_put_failure(
         self, connected_scp_mode: SCPMode, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -0,0 +1,237 @@
+"""Tests for the enumerate survey archive and the survey-query plugin."""
+
+import io
+import json
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from lazyssh.plugins import survey_query
+from lazyssh.plugins._snapshot_store import (
+    SnapshotStore,
+    archive_surveys,
+    parse_time,
+    retention_days,
+    saved_survey_paths,
+    store_path,
+)
+
+NOW = datetime(2026, 5, 1, 12, 0, tzinfo=UTC)
+
+
+def _payload(age: timedelta, *findings: tuple[str, str]) -> dict:
+    return {
+        "collected_at": (NOW - age).isoformat(timespec="seconds"),
+        "probe_count": 1,
+        "warnings": ["partial"],
+        "priority_findings": [
+            {
+                "key": key,
+                "category": "users",
+                "severity": severity,
+                "headline": f"{key} headline",
+                "detail": f"{key} detail",
+                "evidence": ["line"],
+                "exploitation_difficulty": "",
+            }
+            for key, severity in findings
+        ],
+        "categories": {"users": {"id": {"status": 0, "duration": 0.5, "stdout": "uid=0(root)"}}},
+    }
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    with SnapshotStore(tmp_path / "db" / "surveys.sqlite3") as archive:
+        archive.ingest(
+            "web1", "10.0.0.1", _payload(timedelta(days=8), ("passwordless_sudo", "high"))
+        )
+        archive.ingest("web1", "10.0.0.1", _payload(timedelta(days=1), ("suid_binaries", "high")))
+        archive.ingest(
+            "db1",
+            "10.0.0.2",
+            _payload(
+                timedelta(days=2), ("passwordless_sudo", "high"), ("docker_escape", "critical")
+            ),
+        )
+        yield archive
+
+
+def test_store_path_and_retention_from_env() -> None:
+    assert store_path({}) == Path("/tmp/lazyssh/surveys.sqlite3")
+    assert store_path({"LAZYSSH_SURVEY_DB": "/x/a.db"}) == Path("/x/a.db")
+    assert store_path({"LAZYSSH_SURVEY_DB": "OFF"}) is None
+    assert retention_days({"LAZYSSH_SURVEY_RETENTION_DAYS": "7"}) == 7
+    assert retention_days({"LAZYSSH_SURVEY_RETENTION_DAYS": "soon"}) == 30
+
+
+def test_parse_time() -> None:
+    assert parse_time("7d", NOW) == NOW - timedelta(days=7)
+    assert parse_time("90m", NOW) == NOW - timedelta(minutes=90)
+    assert parse_time("2026-04-01") == datetime(2026, 4, 1, tzinfo=UTC)
+    with pytest.raises(ValueError, match="Invalid time"):
+        parse_time("last tuesday")
+
+
+def test_findings_across_hosts_and_runs(store: SnapshotStore) -> None:
+    sudo = store.findings(key="passwordless_sudo")
+    assert [(f.connection, f.host) for f in sudo] == [("db1", "10.0.0.2"), ("web1", "10.0.0.1")]
+    assert sudo[0].evidence == ["line"]
+    assert sudo[0].to_dict()["collected_at"] == (NOW - timedelta(days=2)).isoformat()
+
+    recent = store.findings(key="passwordless_sudo", since=parse_time("7d", NOW))
+    assert [f.connection for f in recent] == ["db1"]
+    assert [f.key for f in store.findings(severities=["critical"])] == ["docker_escape"]
+    assert [f.key for f in store.findings(host="10.0.0.1", category="users")] == [
+        "suid_binaries",
+        "passwordless_sudo",
+    ]
+    assert [f.key for f in store.findings(latest=True, until=NOW, limit=2)] == [
+        "suid_binaries",
+        "passwordless_sudo",
+    ]
+
+
+def test_runs_and_probe_output(store: SnapshotStore) -> None:
+    runs = store.runs(host="web1")
+    assert [run.finding_count for run in runs] == [1, 1]
+    assert runs[0].to_dict()["connection"] == "web1"
+    assert len(store.runs(since=parse_time("3d", NOW), limit=5)) == 2
+    assert store.probe_output(runs[0].id, "users", "id") == "uid=0(root)"
+    assert store.probe_output(runs[0].id, "users", "missing") is None
+
+
+def test_ingest_is_idempotent_and_prune_applies_retention(store: SnapshotStore) -> None:
+    assert store.ingest("db1", "10.0.0.2", _payload(timedelta(days=2))) is None
+
+    assert store.prune(max_age_days=5, now=NOW) == 1
+    assert [run.connection for run in store.runs()] == ["web1", "db1"]
+    assert store.prune(max_age_days=5, max_runs=0, now=NOW) == 2
+    assert store.findings() == []
+    # Cascading deletes leave no orphaned rows behind
+    assert store._db.execute("SELECT COUNT(*) FROM probes").fetchone()[0] == 0
+
+
+def test_import_saved_surveys(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "lazyssh.plugins._snapshot_store.CONNECTION_LOG_DIR_TEMPLATE",
+        str(tmp_path / "{connection_name}.d/logs"),
+    )
+    logs = tmp_path / "web1.d" / "logs"
+    logs.mkdir(parents=True)
+    (logs / "survey_1.json").write_text(json.dumps(_payload(timedelta(0), ("path", "info"))))
+    (logs / "survey_2.json").write_text("{not json")
+    (logs / "survey_3.json").write_text(json.dumps(_payload(timedelta(days=40), ("old", "info"))))
+    (logs / "other.json").write_text("{}")
+
+    assert [path.name for path in saved_survey_paths()] == [
+        "survey_1.json",
+        "survey_2.json",
+        "survey_3.json",
+    ]
+    with SnapshotStore(tmp_path / "surveys.sqlite3") as archive:
+        # The 40-day-old survey is outside the 30-day window and is not counted
+        assert archive.import_surveys(saved_survey_paths(), 30, now=NOW) == 1
+        assert archive.import_surveys(saved_survey_paths(), 30, now=NOW) == 0
+        (finding,) = archive.findings()
+    assert (finding.connection, finding.host, finding.key) == ("web1", "", "path")
+
+
+def test_archive_surveys(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LAZYSSH_SURVEY_DB", "off")
+    assert archive_surveys([("web1", "h", _payload(timedelta(0)), None)]) == 0
+
+    path = tmp_path / "surveys.sqlite3"
+    monkeypatch.setenv("LAZYSSH_SURVEY_DB", str(path))
+    payload = _payload(timedelta(0))
+    payload["collected_at"] = datetime.now(UTC).isoformat()
+    assert archive_surveys([("web1", "h", payload, "/s.json"), ("web1", "h", payload, None)]) == 1
+    monkeypatch.setenv("LAZYSSH_SURVEY_RETENTION_DAYS", "5")
+    stale = _payload(timedelta(0))
+    stale["collected_at"] = (datetime.now(UTC) - timedelta(days=6)).isoformat()
+    assert archive_surveys([("web1", "h", stale, None)]) == 0
+    with SnapshotStore(path) as archive:
+        assert archive.runs()[0].source == "/s.json"
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_enumerate_archive_failures_only_warn(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    from lazyssh.plugins import enumerate as enumerate_plugin
+
+    def broken(_surveys):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(enumerate_plugin, "archive_surveys", broken)
+
+    assert enumerate_plugin.archive_runs([], quiet=True) == 0
+    assert enumerate_plugin.archive_runs([], quiet=False) == 0
+    assert "Survey archive unavailable: database is locked" in capsys.readouterr().out
+
+
+class TestSurveyQueryPlugin:
+    """Tests for the survey-query plugin."""
+
+    def test_query_findings_and_runs(
+        self, store: SnapshotStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        parser = survey_query.build_parser()
+
+        args = parser.parse_args(["--key=passwordless_sudo", "--severity=high, critical"])
+        assert [f.connection for f in survey_query.run_query(store, args)] == ["db1", "web1"]
+
+        monkeypatch.setenv("LAZYSSH_SOCKET", "db1")
+        args = parser.parse_args(["--here", "--runs", "--since=2026-01-01", "--until=2099-01-01"])
+        runs = survey_query.run_query(store, args)
+        assert [run.connection for run in runs] == ["db1"]
+
+        with pytest.raises(ValueError, match="Invalid time"):
+            survey_query.run_query(store, parser.parse_args(["--since=yesterday"]))
+
+    def test_renderers(self, store: SnapshotStore) -> None:
+        findings = store.findings(key="passwordless_sudo")
+        runs = store.runs()
+
+        plain = survey_query.render_plain(findings)
+        assert (
+            "db1 (10.0.0.2)  [HIGH] passwordless_sudo headline - passwordless_sudo detail" in plain
+        )
+        assert plain.endswith("2 results across 2 connections\n")
+        assert "web1 (10.0.0.1): 1 findings, 1 probes" in survey_query.render_plain(runs)
+        assert survey_query.render_plain([]) == "No archived results match the query.\n"
+
+        for results in (findings, runs, []):
+            survey_query.render_rich(results)
+
+    def test_runs_in_process(self, store: SnapshotStore) -> None:
+        from lazyssh.models import SSHConnection
+        from lazyssh.plugin_manager import PluginContext, PluginManager
+
+        pm = PluginManager()
+        plugin = pm.get_plugin("survey-query")
+        assert plugin is not None
+        assert pm._should_run_in_process(plugin)
+
+        connection = SSHConnection(host="10.0.0.2", port=22, username="u", socket_path="/tmp/db1")
+        env = {"LAZYSSH_SURVEY_DB": str(store.path), "LAZYSSH_SOCKET": "db1"}
+        context = PluginContext("survey-query", connection, env, ["--here", "--json"])
+        context.stdout, context.stderr = io.StringIO(), io.StringIO()
+        assert survey_query.main(context) == 0
+        assert {f["connection"] for f in json.loads(context.stdout.getvalue())} == {"db1"}
+
+        # Rich output, argparse errors and failures all stay on the context's streams
+        context.args = ["--runs"]
+        context.stdout = io.StringIO()
+        assert survey_query.main(context) == 0
+        assert "results across" in context.stdout.getvalue()
+        context.args = ["--bogus"]
+        with pytest.raises(SystemExit):
+            survey_query.main(context)
+        assert "unrecognized arguments: --bogus" in context.stderr.getvalue()
+        context.env = {"LAZYSSH_SURVEY_DB": "off"}
+        context.args = []
+        assert survey_query.main(context) == 1
+        assert "archive is disabled" in context.stderr.getvalue()
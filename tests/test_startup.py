@@ -0,0 +1,78 @@
+"""Startup import cost: heavy subsystems stay off the launch path."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import lazyssh
+
+SRC_DIR = Path(lazyssh.__file__).resolve().parent.parent
+
+# Importing the entry point took ~440ms before SCP mode, the plugin manager,
+# prompt_toolkit and Rich markdown/layout were deferred, and ~150ms after.
+# Wall-clock budgets are too noisy for CI, so the tests check that none of
+# those subsystems is back on the import path instead.
+DEFERRED_MODULES = (
+    "prompt_toolkit",
+    "lazyssh.command_completer",
+    "lazyssh.scp_mode",
+    "lazyssh.plugin_manager",
+    "lazyssh.plugin_metrics",
+    "lazyssh.plugin_output",
+    "lazyssh.plugin_zygote",
+    "lazyssh.plugins._fingerprint",
+    "rich.markdown",
+    "rich.layout",
+)
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module ``module`` loads."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(SRC_DIR), os.environ.get("PYTHONPATH", "")]),
+    }
+    result = subprocess.run(  # noqa: S603  # fixed interpreter and arguments
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+        timeout=20,
+    )
+    timings: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (field.strip() for field in line.split("|"))
+        timings[name] = int(cumulative)
+    return timings
+
+
+def test_entry_point_defers_heavy_subsystems() -> None:
+    timings = _importtime("lazyssh.__main__")
+
+    assert "lazyssh.command_mode" in timings
+    for module in DEFERRED_MODULES:
+        assert not any(name == module or name.startswith(f"{module}.") for name in timings), module
+
+
+def test_package_import_skips_logging_setup() -> None:
+    assert "lazyssh.logging_module" not in _importtime("lazyssh")
+    assert "lazyssh.logging_module" not in _importtime("lazyssh.console_instance")
+
+
+def test_lazy_exports_resolve() -> None:
+    from lazyssh import __main__ as main_module
+    from lazyssh import command_completer, command_mode, logging_module
+
+    assert lazyssh.format_size is logging_module.format_size
+    assert "APP_LOGGER" in dir(lazyssh)
+    assert command_mode.LazySSHCompleter is command_completer.LazySSHCompleter
+    assert main_module.ssh_manager is main_module.get_ssh_manager()
+    for module in (lazyssh, command_mode, main_module):
+        with pytest.raises(AttributeError):
+            module.missing_attribute  # noqa: B018
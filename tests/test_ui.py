@@ -653,7 +653,64 @@ class TestPluginDisplayFunctions:
         """Test displaying empty plugin output."""
         ui.display_plugin_output("", 0.1, success=True)
 
+    def test_display_plugin_output_live(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test displaying live plugin output."""
+        ui.display_plugin_output_start()
+        ui.display_plugin_output_chunk("partial ")
+        ui.display_plugin_output_chunk("line\n")
+        ui.display_plugin_output_end(1.5, success=True)
+        out = capsys.readouterr().out
+        assert "Plugin Output" in out
+        assert "partial line\n" in out
+        assert "Execution time: 1.50s" in out
+
+    def test_display_plugin_output_live_failed(self) -> None:
+        """Test closing a failed live run."""
+        ui.display_plugin_output_end(0.5, success=False)
+
+    def test_display_plugin_output_live_empty(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test closing a run that printed nothing."""
+        ui.display_plugin_output_end(0.1, success=True, output_shown=False)
+        assert "Execution time: 0.10s" in capsys.readouterr().out
+
+    def test_display_plugin_stats(self) -> None:
+        """Test displaying plugin run statistics for CPU-, remote- and wait-bound plugins."""
+        from lazyssh.plugin_metrics import PluginStats
+
+        def row(name: str, cpu: float, remote: float, failures: int = 0) -> PluginStats:
+            return PluginStats(
+                plugin=name,
+                runs=3,
+                failures=failures,
+                wall_p50=1.0,
+                wall_p95=2.0,
+                cpu_p50=cpu,
+                cpu_p95=cpu,
+                remote_p50=remote,
+                remote_p95=remote,
+                peak_rss_kb=20480,
+                output_bytes_p50=4096,
+            )
+
+        ui.display_plugin_stats(
+            [row("cpu", 0.9, 0), row("remote", 0.1, 3, failures=1), row("idle", 0.0, 0)],
+            "conn",
+        )
+
     def test_display_plugin_output_with_ansi(self) -> None:
         """Test displaying plugin output with ANSI codes."""
         output = "\x1b[32mGreen text\x1b[0m\r\nNew line"
         ui.display_plugin_output(output, 0.5, success=True)
+
+    def test_display_plugin_output_lines(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test displaying numbered lines of plugin output."""
+        ui.display_plugin_output_lines([(9, "first"), (10, "\x1b[31msecond\x1b[0m")])
+        out = capsys.readouterr().out
+        assert "      9  first" in out
+        assert "     10  second" in out
+
+    def test_display_plugin_output_chunk_is_raw(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test that plugin ANSI codes and carriage returns reach the terminal unchanged."""
+        output = "\x1b[32mGreen text\x1b[0m\r\nNew line"
+        ui.display_plugin_output_chunk(output)
+        assert capsys.readouterr().out == output
@@ -2,30 +2,65 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
+import shlex
+import subprocess
+import tarfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
 from unittest import mock
 
 import pytest
 
+from lazyssh.plugins import upload_exec
 from lazyssh.plugins._arch_detection import (
     ARCH_MAP,
     PLATFORM_MAP,
     RemoteArch,
     detect_remote_arch,
 )
+from lazyssh.plugins._fingerprint import RemoteFingerprint, save_fingerprint
+from lazyssh.plugins._remote import RemoteTarget
 from lazyssh.plugins.upload_exec import (
     PAYLOAD_PRESETS,
+    HostRun,
     MsfvenomConfig,
+    _cancel_remote,
     _create_staging_dir,
     _scp_upload,
     _show_usage,
     _ssh_exec,
+    _ssh_pipe,
+    _ssh_stream,
+    build_bundle,
     build_parser,
+    bundle_and_execute,
+    bundle_script,
+    cached_arch,
+    cancel_script,
+    detect_arches,
+    fanout_execute,
     generate_msfvenom_payload,
     get_handler_command,
+    msfvenom_fanout,
     msfvenom_mode,
+    plan_payloads,
+    render_fanout_plain,
+    render_fanout_rich,
     upload_and_execute,
+    upload_fanout,
 )
 
+
+@pytest.fixture(autouse=True)
+def _isolated_payload_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LAZYSSH_PAYLOAD_CACHE", str(tmp_path / "payload-cache"))
+
+
 # ---------------------------------------------------------------------------
 # Architecture Detection Tests
 # ---------------------------------------------------------------------------
@@ -419,6 +454,34 @@ class TestScpUpload:
         ):
             assert _scp_upload("/tmp/local", "/tmp/remote") is False
 
+    def test_identical_remote_copy_is_not_resent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/sock")
+        monkeypatch.setenv("LAZYSSH_HOST", "testhost")
+        monkeypatch.setenv("LAZYSSH_USER", "testuser")
+        local = tmp_path / "linpeas.sh"
+        local.write_bytes(b"#!/bin/sh\n" * 10000)
+        digest = hashlib.sha256(local.read_bytes()).hexdigest()
+
+        def fake_run(cmd: list[str], **kwargs: Any) -> mock.MagicMock:
+            stdout = f"{digest}  /tmp/remote\n" if cmd[0] == "ssh" else ""
+            return mock.MagicMock(returncode=0, stdout=stdout, stderr="")
+
+        with mock.patch("subprocess.run", side_effect=fake_run) as mock_run:
+            assert _scp_upload(str(local), "/tmp/remote") is True
+        assert [call.args[0][0] for call in mock_run.call_args_list] == ["ssh"]
+
+        # A different or unreadable destination is uploaded as usual
+        with mock.patch("subprocess.run", side_effect=fake_run) as mock_run:
+            local.write_bytes(b"changed" * 10000)
+            assert _scp_upload(str(local), "/tmp/remote") is True
+        assert [call.args[0][0] for call in mock_run.call_args_list] == ["ssh", "scp"]
+
+        with mock.patch("subprocess.run", side_effect=fake_run) as mock_run:
+            assert _scp_upload(str(local), "/tmp/remote", dedup=False) is True
+        assert [call.args[0][0] for call in mock_run.call_args_list] == ["scp"]
+
 
 # ---------------------------------------------------------------------------
 # SSH Exec Tests
@@ -584,6 +647,32 @@ class TestUploadAndExecute:
             result = upload_and_execute(test_file, background=True)
             assert result == 0
 
+    @pytest.mark.parametrize(
+        ("options", "dedup"),
+        [({}, False), ({"no_cleanup": True}, True), ({"background": True}, True)],
+    )
+    def test_dedup_only_when_destination_survives(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        options: dict[str, bool],
+        dedup: bool,
+    ) -> None:
+        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/sock")
+        monkeypatch.setenv("LAZYSSH_HOST", "testhost")
+        monkeypatch.setenv("LAZYSSH_USER", "testuser")
+        test_file = tmp_path / "test_bin"
+        test_file.write_text("#!/bin/sh\necho hello\n")
+
+        with (
+            mock.patch(
+                "subprocess.run", return_value=mock.MagicMock(returncode=0, stdout="", stderr="")
+            ),
+            mock.patch("lazyssh.plugins.upload_exec._scp_upload", return_value=True) as upload,
+        ):
+            assert upload_and_execute(str(test_file), **options) == 0
+        assert upload.call_args.kwargs == {"dedup": dedup}
+
     def test_output_file(
         self, tmp_path: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
     ) -> None:
@@ -724,10 +813,14 @@ class TestMsfvenomMode:
                 "lazyssh.plugins.upload_exec.generate_msfvenom_payload",
                 return_value=True,
             ),
-            mock.patch("lazyssh.plugins.upload_exec.upload_and_execute", return_value=0),
+            mock.patch("lazyssh.plugins.upload_exec.upload_and_execute", return_value=0) as upload,
         ):
             result = msfvenom_mode(arch, lhost="10.0.0.1", background=True)
             assert result == 0
+            assert upload.call_args.kwargs["stream"] is False
+
+            assert msfvenom_mode(arch, lhost="10.0.0.1", stream=True) == 0
+            assert upload.call_args.kwargs["stream"] is True
 
 
 # ---------------------------------------------------------------------------
@@ -948,6 +1041,527 @@ class TestUploadAndExecuteEdgeCases:
             assert result == 2
 
 
+# ---------------------------------------------------------------------------
+# Bundled Upload-and-Execute Tests
+# ---------------------------------------------------------------------------
+
+
+def _toolkit(root: Path) -> Path:
+    toolkit = root / "toolkit"
+    (toolkit / "lib").mkdir(parents=True)
+    (toolkit / "lib" / "greeting").write_text("hello from lib\n")
+    (toolkit / "run.sh").write_text('#!/bin/sh\ncat lib/greeting\necho "args: $*"\nexit 3\n')
+    return toolkit
+
+
+def _run_locally(script: str, archive: bytes) -> subprocess.CompletedProcess[bytes]:
+    return subprocess.run(  # noqa: S603
+        ["/bin/sh", "-c", script], input=archive, capture_output=True, timeout=10
+    )
+
+
+class TestBundle:
+    """Tests for the single-channel bundle pipeline."""
+
+    def test_build_bundle_layout(self, tmp_path: Path) -> None:
+        toolkit = _toolkit(tmp_path)
+        extra = tmp_path / "extra.conf"
+        extra.write_text("x")
+
+        archive, entry = build_bundle([str(toolkit), str(extra)], entry="./run.sh")
+
+        assert entry == "run.sh"
+        with tarfile.open(fileobj=io.BytesIO(archive)) as bundle:
+            members = {info.name: info for info in bundle.getmembers()}
+        assert sorted(members) == ["extra.conf", "lib/greeting", "run.sh"]
+        assert {(info.uid, info.uname) for info in members.values()} == {(0, "")}
+
+    def test_build_bundle_entry_point(self, tmp_path: Path) -> None:
+        toolkit = _toolkit(tmp_path)
+        binary = tmp_path / "tool"
+        binary.write_text("#!/bin/sh\n")
+
+        assert build_bundle([str(binary), str(toolkit)])[1] == "tool"
+        assert build_bundle([str(binary), str(toolkit)], entry="toolkit/run.sh")[1] == (
+            "toolkit/run.sh"
+        )
+        with pytest.raises(ValueError, match="--entry is required"):
+            build_bundle([str(toolkit)])
+        with pytest.raises(ValueError, match="not a file in the bundle"):
+            build_bundle([str(binary), str(toolkit)], entry="toolkit")
+        with pytest.raises(ValueError, match="File not found"):
+            build_bundle([str(binary), str(tmp_path / "missing")])
+        with pytest.raises(ValueError, match="Nothing to bundle"):
+            build_bundle([])
+
+    def test_script_stages_runs_and_cleans_up(self, tmp_path: Path) -> None:
+        archive, entry = build_bundle([str(_toolkit(tmp_path))], entry="run.sh")
+        staging = tmp_path / "staging"
+
+        result = _run_locally(bundle_script(entry, "-v 'a b'", staging=str(staging)), archive)
+
+        assert result.returncode == 3
+        assert result.stdout == b"hello from lib\nargs: -v a b\n"
+        assert list(staging.iterdir()) == []
+        assert staging.stat().st_mode & 0o777 == 0o700
+
+    def test_script_keeps_bundle_without_cleanup(self, tmp_path: Path) -> None:
+        archive, entry = build_bundle([str(_toolkit(tmp_path))], entry="run.sh")
+        staging = tmp_path / "staging"
+
+        result = _run_locally(bundle_script(entry, staging=str(staging), no_cleanup=True), archive)
+
+        (kept,) = staging.iterdir()
+        assert f"Bundle kept at {kept}" in result.stderr.decode()
+        assert (kept / "run.sh").stat().st_mode & 0o100
+
+    def test_script_rejects_corrupt_archive(self, tmp_path: Path) -> None:
+        staging = tmp_path / "staging"
+
+        result = _run_locally(bundle_script("run.sh", staging=str(staging)), b"not a tarball")
+
+        assert result.returncode == 1
+        assert list(staging.iterdir()) == []
+
+    def test_background_script(self) -> None:
+        script = bundle_script("run.sh", "--x", background=True)
+        assert "nohup ./run.sh --x > /dev/null 2>&1 &" in script
+        assert "rm -rf" not in script.splitlines()[-2]
+
+    def test_bundle_and_execute_single_channel(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/sock")
+        monkeypatch.setenv("LAZYSSH_HOST", "testhost")
+        monkeypatch.setenv("LAZYSSH_USER", "testuser")
+        output = tmp_path / "out.txt"
+        completed = subprocess.CompletedProcess([], 3, stdout=b"hello\n", stderr=b"")
+
+        with mock.patch("subprocess.run", return_value=completed) as mock_run:
+            result = bundle_and_execute(
+                [str(_toolkit(tmp_path))], entry="run.sh", output_file=str(output)
+            )
+            assert (
+                bundle_and_execute([str(tmp_path / "toolkit")], entry="run.sh", background=True)
+                == 0
+            )
+
+        assert result == 3
+        assert output.read_text() == "hello\n"
+        assert mock_run.call_count == 2
+        argv = mock_run.call_args.args[0]
+        assert argv[:3] == ["ssh", "-S", "/tmp/sock"]
+        assert argv[-2] == "-c"
+        assert tarfile.is_tarfile(io.BytesIO(mock_run.call_args.kwargs["input"]))
+
+    def test_bundle_and_execute_errors(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        toolkit = _toolkit(tmp_path)
+        assert bundle_and_execute([str(toolkit)]) == 1
+        assert bundle_and_execute([str(toolkit)], entry="run.sh", dry_run=True) == 0
+
+        monkeypatch.delenv("LAZYSSH_SOCKET_PATH", raising=False)
+        assert bundle_and_execute([str(toolkit)], entry="run.sh") == 1
+        assert _ssh_pipe("true", b"") == (1, "", "Missing SSH environment variables")
+
+    def test_ssh_pipe_timeout(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/sock")
+        monkeypatch.setenv("LAZYSSH_HOST", "testhost")
+        monkeypatch.setenv("LAZYSSH_USER", "testuser")
+        with mock.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("ssh", 1)):
+            with pytest.raises(TimeoutError, match="Command timed out"):
+                _ssh_pipe("true", b"")
+            assert bundle_and_execute([str(_toolkit(tmp_path))], entry="run.sh") == 1
+
+    def test_parser_bundle_flags(self) -> None:
+        args = build_parser().parse_args(
+            ["./toolkit", "--with", "lib", "--with", "a.conf", "--entry", "run.sh"]
+        )
+        assert args.extra_paths == ["lib", "a.conf"]
+        assert args.entry == "run.sh"
+        assert args.bundle is False
+
+
+# ---------------------------------------------------------------------------
+# Fan-out Tests
+# ---------------------------------------------------------------------------
+
+FLEET = [
+    RemoteTarget("web1", "10.0.0.1", "alice", "/tmp/web1"),
+    RemoteTarget("web2", "10.0.0.2", "alice", "/tmp/web2", "2222"),
+    RemoteTarget("arm1", "10.0.0.3", "pi", "/tmp/arm1"),
+]
+X64 = RemoteArch("x86_64", "Linux", "x64", "linux")
+
+
+def _fake_ssh(*args: object, **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+    argv = args[0]
+    assert isinstance(argv, list)
+    if "pi@10.0.0.3" in argv:
+        raise subprocess.TimeoutExpired("ssh", 1)
+    return subprocess.CompletedProcess(argv, 0, stdout=f"ran on {argv[2]}\n".encode(), stderr=b"")
+
+
+@pytest.fixture
+def host_logs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(
+        upload_exec, "CONNECTION_LOG_DIR_TEMPLATE", str(tmp_path / "{connection_name}.d/logs")
+    )
+    return tmp_path
+
+
+class TestFanout:
+    """Tests for --all-hosts fan-out."""
+
+    def test_fanout_execute_per_host_results(self) -> None:
+        done: list[str] = []
+        with mock.patch("subprocess.run", side_effect=_fake_ssh) as mock_run:
+            runs = fanout_execute(
+                [(target, b"bundle", "tool") for target in FLEET],
+                "--scan",
+                timeout=7,
+                max_hosts=2,
+                on_host_done=lambda run: done.append(run.target.name),
+            )
+
+        assert [run.target.name for run in runs] == ["web1", "web2", "arm1"]
+        assert [run.stdout for run in runs[:2]] == ["ran on /tmp/web1\n", "ran on /tmp/web2\n"]
+        assert [run.ok for run in runs] == [True, True, False]
+        assert runs[2].error == "Command timed out"
+        assert sorted(done) == ["arm1", "web1", "web2"]
+        assert {call.kwargs["timeout"] for call in mock_run.call_args_list} == {7}
+        assert "./tool --scan < /dev/null" in mock_run.call_args.args[0][-1]
+        assert fanout_execute([]) == []
+        with mock.patch("subprocess.run", side_effect=_fake_ssh):
+            assert fanout_execute([(FLEET[0], b"", "tool")])[0].exit_code == 0
+
+    def test_fanout_timeout_stops_remote_process(self) -> None:
+        marker = f"{upload_exec.PID_MARKER}4242\n".encode()
+        calls: list[list[str]] = []
+
+        def fake_ssh(argv: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+            calls.append(argv)
+            if argv[-1] == shlex.quote(cancel_script("4242")):
+                return subprocess.CompletedProcess(argv, 0, stdout=b"", stderr=b"")
+            if "alice@10.0.0.1" in argv:
+                raise subprocess.TimeoutExpired("ssh", 1, output=b"", stderr=marker)
+            return subprocess.CompletedProcess(argv, 0, stdout=b"ok\n", stderr=marker + b"warn\n")
+
+        with mock.patch("subprocess.run", side_effect=fake_ssh):
+            timed_out, finished = fanout_execute([(target, b"", "tool") for target in FLEET[:2]])
+
+        assert (timed_out.exit_code, timed_out.error) == (None, "Command timed out")
+        # The entry point's PID comes back on stderr and is killed over the control socket
+        (cancel,) = [argv for argv in calls if argv[-1] == shlex.quote(cancel_script("4242"))]
+        assert "alice@10.0.0.1" in cancel
+        assert (finished.exit_code, finished.stderr) == (0, "warn\n")
+
+    def test_detect_arches_uses_each_connection_cache(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        paths: list[Path] = []
+
+        def fake_fingerprint(target: RemoteTarget, path: Path) -> mock.MagicMock:
+            paths.append(path)
+            if target.name == "arm1":
+                raise RuntimeError("ssh failed")
+            return mock.MagicMock(remote_arch=mock.MagicMock(return_value=X64))
+
+        monkeypatch.setattr(upload_exec, "get_fingerprint", fake_fingerprint)
+
+        assert detect_arches(FLEET) == {"web1": X64, "web2": X64, "arm1": "ssh failed"}
+        assert Path("/tmp/lazyssh/web2.d/fingerprint.json") in paths
+
+    def test_plan_payloads_groups_by_arch(self) -> None:
+        arm = RemoteArch("aarch64", "Linux", "aarch64", "linux")
+        mips = RemoteArch("mips", "Linux", "mipsbe", "linux")
+        arches: dict[str, RemoteArch | str] = {"web1": X64, "web2": X64, "arm1": arm}
+
+        groups, failed = plan_payloads(FLEET, arches)
+        assert {payload: [t.name for t in hosts] for payload, hosts in groups.items()} == {
+            PAYLOAD_PRESETS["x64"]: ["web1", "web2"],
+            PAYLOAD_PRESETS["aarch64"]: ["arm1"],
+        }
+        assert failed == []
+
+        groups, failed = plan_payloads(FLEET, {"web1": X64, "web2": mips}, payload=None)
+        assert list(groups) == [PAYLOAD_PRESETS["x64"]]
+        assert [run.error for run in failed] == [
+            "No preset payload for architecture mipsbe",
+            "Architecture detection failed: no result",
+        ]
+        groups, _ = plan_payloads(FLEET, arches, payload="linux/x64/shell_reverse_tcp")
+        assert [len(hosts) for hosts in groups.values()] == [3]
+
+    def test_msfvenom_fanout_generates_once_per_arch(
+        self, host_logs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        arm = RemoteArch("aarch64", "Linux", "aarch64", "linux")
+        targets = [*FLEET[:2], RemoteTarget("arm1", "10.0.0.9", "pi", "/tmp/arm1")]
+        monkeypatch.setattr(
+            upload_exec, "detect_arches", lambda *_: {"web1": X64, "web2": X64, "arm1": arm}
+        )
+        generated: list[str] = []
+
+        def fake_generate(config: MsfvenomConfig, output_path: str) -> bool:
+            generated.append(config.payload)
+            Path(output_path).write_bytes(b"ELF")
+            return True
+
+        monkeypatch.setattr(upload_exec, "generate_msfvenom_payload", fake_generate)
+        with (
+            mock.patch("shutil.which", return_value="/usr/bin/msfvenom"),
+            mock.patch("subprocess.run", side_effect=_fake_ssh) as mock_run,
+        ):
+            result = msfvenom_fanout(targets, lhost="10.0.0.254", use_plain=True)
+            assert msfvenom_fanout(targets, lhost="10.0.0.254", dry_run=True) == 0
+
+        assert result == 0
+        assert generated == [PAYLOAD_PRESETS["x64"], PAYLOAD_PRESETS["aarch64"]]
+        assert mock_run.call_count == 3
+        (log,) = (host_logs / "arm1.d" / "logs").iterdir()
+        assert json.loads(log.read_text())["arch"] == "aarch64"
+
+    def test_msfvenom_fanout_failures(
+        self, host_logs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        assert msfvenom_fanout([], lhost="10.0.0.254") == 1
+        with mock.patch("shutil.which", return_value=None):
+            assert msfvenom_fanout(FLEET, lhost="10.0.0.254") == 1
+        with mock.patch("shutil.which", return_value="/usr/bin/msfvenom"):
+            assert msfvenom_fanout(FLEET) == 1
+            monkeypatch.setattr(upload_exec, "detect_arches", lambda *_: {"web1": X64})
+            assert msfvenom_fanout(FLEET, lhost="10.0.0.254", dry_run=True) == 0
+            monkeypatch.setattr(upload_exec, "generate_msfvenom_payload", lambda *_: False)
+            assert msfvenom_fanout(FLEET[:1], lhost="10.0.0.254") == 1
+
+        log = next((host_logs / "web1.d" / "logs").iterdir())
+        assert json.loads(log.read_text())["error"] == "Payload generation failed"
+
+    def test_cached_arch(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            upload_exec, "connection_fingerprint_path", lambda name: tmp_path / f"{name}.json"
+        )
+        web1, web2 = FLEET[:2]
+        save_fingerprint(
+            tmp_path / "web1.json",
+            RemoteFingerprint(
+                web1.host, web1.user, None, "x86_64", "Linux", collected_at=time.time()
+            ),
+        )
+        # A cache left by a different host behind the same connection name is ignored
+        save_fingerprint(
+            tmp_path / "web2.json",
+            RemoteFingerprint(
+                "10.9.9.9", web2.user, "2222", "aarch64", "Linux", collected_at=time.time()
+            ),
+        )
+
+        assert [cached_arch(target) for target in FLEET] == ["x86_64", "", ""]
+
+    def test_upload_fanout(
+        self, tmp_path: Path, host_logs: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        tool = tmp_path / "tool"
+        tool.write_text("#!/bin/sh\n")
+        monkeypatch.setattr(
+            upload_exec, "cached_arch", lambda target: "armv7l" if target.name == "web2" else ""
+        )
+
+        assert upload_fanout([], [str(tool)]) == 1
+        assert upload_fanout(FLEET, [str(tmp_path / "missing")]) == 1
+        assert upload_fanout(FLEET, [str(tool)], dry_run=True) == 0
+        with mock.patch("subprocess.run", side_effect=_fake_ssh):
+            assert upload_fanout(FLEET[:2], [str(tool)], remote_args="-q") == 0
+            (log,) = (host_logs / "web2.d" / "logs").iterdir()
+            assert upload_fanout(FLEET, [str(tool)]) == 1
+
+        saved = json.loads(next((host_logs / "web1.d" / "logs").iterdir()).read_text())
+        assert (saved["command"], saved["arch"]) == ("./tool", "")
+        assert json.loads(log.read_text())["arch"] == "armv7l"
+        saved = json.loads(next((host_logs / "arm1.d" / "logs").iterdir()).read_text())
+        assert (saved["exit_code"], saved["error"], saved["stderr"]) == (
+            None,
+            "Command timed out",
+            "",
+        )
+        assert log.name.startswith("upload_exec_")
+
+    def test_summary_renderers(self, host_logs: Path) -> None:
+        runs = [
+            HostRun(FLEET[0], arch="x86_64", exit_code=0, stdout="ok\nmore", duration=1.25),
+            HostRun(FLEET[1], exit_code=2, stderr="boom"),
+            HostRun(FLEET[2], error="Command timed out"),
+        ]
+        plain = render_fanout_plain(runs)
+        assert "  web1 (10.0.0.1) [x86_64] exit 0 in 1.2s: ok\n" in plain
+        assert "  web2 (10.0.0.2) [?] exit 2 in 0.0s: boom\n" in plain
+        assert "arm1 (10.0.0.3) [?] Command timed out in 0.0s\n" in plain
+        assert plain.endswith("1/3 hosts succeeded\n")
+        render_fanout_rich(runs)
+
+        upload_exec.write_host_logs([HostRun(RemoteTarget("bad\0", "h", "u", "/s"))], "x")
+
+    def test_parser_fanout_flags(self) -> None:
+        args = build_parser().parse_args(["tool", "--all-hosts", "--max-hosts", "3"])
+        assert args.all_hosts is True
+        assert args.max_hosts == 3
+
+
+# ---------------------------------------------------------------------------
+# Streaming Exec Tests
+# ---------------------------------------------------------------------------
+
+MARKER = f'echo "{upload_exec.PID_MARKER}$$" >&2'
+
+
+@pytest.fixture
+def local_ssh(host_logs: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run "remote" commands with the local shell instead of ssh."""
+    monkeypatch.setattr(
+        RemoteTarget, "ssh_command", lambda self, *args: ["/bin/sh", "-c", " ".join(args)]
+    )
+    monkeypatch.setattr(upload_exec, "CANCEL_GRACE", 0)
+    monkeypatch.setenv("LAZYSSH_SOCKET_PATH", "/tmp/web1")
+    monkeypatch.setenv("LAZYSSH_HOST", "testhost")
+    monkeypatch.setenv("LAZYSSH_USER", "testuser")
+    return host_logs / "web1.d" / "logs"
+
+
+def _gone(pid: int) -> bool:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+        except (FileNotFoundError, ProcessLookupError):
+            return True
+        if state == "Z":
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestStreaming:
+    """Tests for --stream live output and remote cancellation."""
+
+    def test_stream_tees_output(
+        self, local_ssh: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        output = tmp_path / "out.txt"
+        command = f"{MARKER}; echo out1; echo err1 >&2; echo out2; exit 4"
+
+        assert _ssh_stream(command, output_file=str(output)) == 4
+
+        captured = capsys.readouterr()
+        assert "out1\nout2\n" in captured.out
+        assert captured.err == "err1\n"
+        assert output.read_text() == "out1\nout2\n"
+        (log,) = local_ssh.iterdir()
+        assert log.name.startswith("upload_exec_")
+        assert sorted(log.read_text().splitlines()) == ["err1", "out1", "out2"]
+
+    def test_stream_feeds_stdin(self, local_ssh: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        assert _ssh_stream(f"{MARKER}; cat", data=b"from stdin\n") == 0
+        assert "from stdin\n" in capsys.readouterr().out
+
+    def test_stream_bundle_end_to_end(
+        self, local_ssh: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        archive, entry = build_bundle([str(_toolkit(tmp_path))], entry="run.sh")
+        staging = tmp_path / "staging"
+        script = bundle_script(entry, "x", staging=str(staging), report_pid=True)
+
+        assert _ssh_stream(script, data=archive) == 3
+        assert "hello from lib\nargs: x\n" in capsys.readouterr().out
+        assert list(staging.iterdir()) == []
+
+    def test_interrupt_cancels_remote_process(
+        self, local_ssh: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        seen: list[str] = []
+        real = upload_exec.iter_process_output
+
+        def interrupted(*args: Any, **kwargs: Any) -> Iterator[tuple[str, str]]:
+            for kind, text in real(*args, **kwargs):
+                seen.append(text)
+                yield kind, text
+                # Both streams are read independently, so wait for the PID and the output
+                if "started\n" in seen and any(upload_exec.PID_MARKER in s for s in seen):
+                    raise KeyboardInterrupt
+
+        monkeypatch.setattr(upload_exec, "iter_process_output", interrupted)
+        command = f'sleep 30 & echo "{upload_exec.PID_MARKER}$!" >&2; echo started; wait'
+
+        start = time.monotonic()
+        assert _ssh_stream(command) == 130
+        assert time.monotonic() - start < 10
+        (marker,) = (text for text in seen if upload_exec.PID_MARKER in text)
+        pid = int(marker.split("=")[1])
+        assert _gone(pid)
+
+    def test_timeout_cancels_remote_process(self, local_ssh: Path) -> None:
+        start = time.monotonic()
+        assert _ssh_stream(f"{MARKER}; exec sleep 30", timeout=1) == 1
+        # Without a reported PID only the local ssh client is stopped
+        assert _ssh_stream("exec sleep 30", timeout=1) == 1
+        assert time.monotonic() - start < 10
+
+    def test_stream_without_target_or_log_dir(
+        self, local_ssh: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        monkeypatch.setattr(
+            upload_exec, "CONNECTION_LOG_DIR_TEMPLATE", "/dev/null/{connection_name}"
+        )
+        assert _ssh_stream(f"{MARKER}; echo ok") == 0
+        assert "ok\n" in capsys.readouterr().out
+
+        monkeypatch.delenv("LAZYSSH_SOCKET_PATH")
+        assert _ssh_stream("true") == 1
+
+    def test_stdin_feed_ignores_closed_remote(self) -> None:
+        pipe = mock.MagicMock()
+        pipe.write.side_effect = BrokenPipeError
+        upload_exec._feed_stdin(pipe, b"data")
+        pipe.close.assert_not_called()
+
+    def test_cancel_script_and_failures(self) -> None:
+        assert cancel_script("42").startswith("kill -TERM -- -42 2>/dev/null || kill -TERM 42")
+        target = RemoteTarget("web1", "h", "u", "/tmp/web1")
+        with mock.patch("subprocess.run") as mock_run:
+            _cancel_remote(target, None)
+            assert mock_run.call_count == 0
+        with mock.patch("subprocess.run", side_effect=subprocess.TimeoutExpired("ssh", 1)):
+            _cancel_remote(target, "42")
+
+    def test_upload_and_execute_streams(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        tool = tmp_path / "tool"
+        tool.write_text("#!/bin/sh\n")
+        streamed: list[str] = []
+
+        def fake_stream(command: str, **kwargs: object) -> int:
+            streamed.append(command)
+            return 3 if len(streamed) <= 2 else 0
+
+        monkeypatch.setattr(upload_exec, "_ssh_stream", fake_stream)
+        with (
+            mock.patch.object(upload_exec, "_ssh_exec", return_value=(0, "", "")),
+            mock.patch.object(upload_exec, "_scp_upload", return_value=True),
+        ):
+            assert upload_and_execute(str(tool), remote_args="-v", stream=True) == 3
+            assert bundle_and_execute([str(tool)], stream=True) == 3
+            assert upload_and_execute(str(tool), stream=True) == 0
+            assert bundle_and_execute([str(tool)], stream=True) == 0
+
+        assert streamed[0].endswith("; exec /tmp/.lazyssh_exec/tool -v < /dev/null")
+        assert "wait $child" in streamed[1]
+
+    def test_parser_stream_flag(self) -> None:
+        assert build_parser().parse_args(["tool", "--stream"]).stream is True
+
+
 class TestShowUsage:
     """Tests for _show_usage function."""
 